@@ -28,6 +28,8 @@ from ui.performance_optimizer import PerformanceOptimizer
 from parsers.plan_parser import PlanParser
 from visualizers.charts import ChartGenerator
 from utils.plan_processor import PlanProcessor
+from utils.plan_worker_pool import get_plan_worker_pool
+from config.provider_settings import get_environment_settings
 
 # Try to import enhanced features, fall back to basic if not available
 try:
@@ -42,12 +44,12 @@ except ImportError as e:
 st.set_page_config(page_title="Terraform Plan Impact Dashboard", page_icon="🚀", layout="wide", initial_sidebar_state="expanded")
 
 
-def initialize_components(session_manager):
+def initialize_components(session_manager, worker_pool=None):
     """Initialize all dashboard components."""
     return {
         'header': HeaderComponent(),
         'sidebar': SidebarComponent(),
-        'upload': UploadComponent(session_manager),
+        'upload': UploadComponent(session_manager, worker_pool=worker_pool),
         'summary_cards': SummaryCardsComponent(session_manager),
         'visualizations': VisualizationsComponent(session_manager),
         'data_table': DataTableComponent(),
@@ -99,6 +101,9 @@ def process_plan_data(plan_input, components, session_manager, error_handler, pl
         components['enhanced_sections'].render_multi_cloud_risk_section(enhanced_risk_result, resource_changes)
         components['enhanced_sections'].render_cross_cloud_insights_section(enhanced_risk_assessor, resource_changes, plan_data)
 
+    components['enhanced_sections'].render_plan_comparison_section(processed_data.get('plan_comparison'))
+    components['enhanced_sections'].render_dependency_impact_section(parser, resource_changes)
+
     if show_debug:
         components['enhanced_sections'].render_debug_section(debug_info, resource_changes, summary, ENHANCED_FEATURES_AVAILABLE, enable_multi_cloud)
 
@@ -112,7 +117,8 @@ def process_plan_data(plan_input, components, session_manager, error_handler, pl
         summary=summary, resource_types=resource_types, resource_changes=resource_changes,
         plan_data=plan_data, chart_gen=chart_gen, parser=parser,
         enhanced_risk_assessor=enhanced_risk_assessor, enhanced_features_available=ENHANCED_FEATURES_AVAILABLE,
-        enable_multi_cloud=enable_multi_cloud, show_debug=show_debug
+        enable_multi_cloud=enable_multi_cloud, show_debug=show_debug,
+        module_trie=processed_data.get('module_trie')
     )
     error_handler.track_user_progress('charts_viewed')
     components['onboarding_checklist'].mark_item_completed('charts_explored')
@@ -146,8 +152,10 @@ def main():
     # Initialize core services and components
     session_manager = SessionStateManager()
     error_handler = ErrorHandler(debug_mode=session_manager.get_debug_state())
-    plan_processor = PlanProcessor()
-    components = initialize_components(session_manager)
+    worker_processes = get_environment_settings()['worker_processes']
+    worker_pool = get_plan_worker_pool(worker_processes) if worker_processes > 0 else None
+    plan_processor = PlanProcessor(worker_pool=worker_pool)
+    components = initialize_components(session_manager, worker_pool)
     
     # Render header and sidebar
     components['header'].render_css()
@@ -173,7 +181,8 @@ def main():
     components['onboarding_checklist'].render_contextual_hints('file_upload')
     
     if plan_input is not None:
-        # Both upload methods now return secure plan data dictionaries
+        # Both upload methods return secure plan data dictionaries (large uploads
+        # analyzed in a worker process are passed on as the uploaded file)
         # Track progress for successful plan data retrieval
         error_handler.track_user_progress('plan_data_loaded')
         components['onboarding_checklist'].mark_item_completed('file_uploaded')
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Terraform Plan CI Gate
+
+Command-line entry point for pipelines. Analyzes one or more plan files
+produced by ``terraform show -json`` and prints risk, security and compliance
+results as JSON. The exit code tells the pipeline whether the plans pass the
+configured thresholds.
+
+Usage:
+    python cli.py plan.json [more-plans.json ...] [--fail-on High] [--max-score 80]
+    python cli.py plans/*.json --portfolio --workers 8
+    python cli.py plans/ --watch --interval 30
+
+Exit codes:
+    0  all plans are within the thresholds
+    1  at least one plan exceeds a threshold
+    2  a plan could not be read or analyzed
+
+Only the plan parser and the scoring modules are imported; Streamlit, the UI
+components and the charting/reporting libraries are never loaded, so the
+gate starts in a fraction of a second.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Make the project packages importable when run from another directory
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from utils.analysis_engine import analyze_plan  # noqa: E402
+
+
+EXIT_PASS = 0
+EXIT_FAIL = 1
+EXIT_ERROR = 2
+
+RISK_LEVELS = ('Low', 'Medium', 'High')
+
+
+def evaluate_thresholds(report: Dict[str, Any],
+                        fail_on: Optional[str] = None,
+                        max_score: Optional[float] = None,
+                        min_security_score: Optional[float] = None) -> List[str]:
+    """
+    Check one plan report against the gate thresholds.
+
+    Args:
+        report: Dictionary produced by AnalysisResult.to_dict()
+        fail_on: Lowest overall risk level that fails the gate
+        max_score: Highest overall risk score that still passes
+        min_security_score: Lowest overall security score that still passes
+
+    Returns:
+        List of human-readable threshold violations (empty if the plan passes)
+    """
+    violations = []
+    risk = report.get('risk') or {}
+    level = risk.get('level', 'Low')
+    score = risk.get('score', 0)
+
+    if fail_on and level in RISK_LEVELS and RISK_LEVELS.index(level) >= RISK_LEVELS.index(fail_on):
+        violations.append(f"Risk level {level} is at or above {fail_on}")
+
+    if max_score is not None and score > max_score:
+        violations.append(f"Risk score {score} exceeds {max_score}")
+
+    security = report.get('security')
+    if min_security_score is not None and security:
+        security_score = security.get('overall_security_score', 0)
+        if security_score < min_security_score:
+            violations.append(f"Security score {security_score:.1f} is below {min_security_score}")
+
+    return violations
+
+
+def analyze_file(path: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Analyze one plan file and apply the gate thresholds.
+
+    Args:
+        path: Path to the plan JSON file
+        args: Parsed command-line arguments
+
+    Returns:
+        Report dictionary for the file (with 'error' set if analysis failed)
+    """
+    try:
+        result = analyze_plan(path, enhanced=not args.basic, include_security=not args.no_security)
+    except (OSError, ValueError) as e:
+        return {'file': path, 'error': str(e)}
+    except Exception as e:
+        return {'file': path, 'error': f"Analysis failed: {e}"}
+
+    report = {'file': path}
+    report.update(result.to_dict())
+    if not args.include_assessments:
+        report['risk'].pop('detailed_assessments', None)
+
+    violations = evaluate_thresholds(
+        report,
+        fail_on=args.fail_on,
+        max_score=args.max_score,
+        min_security_score=args.min_security_score
+    )
+    report['passed'] = not violations
+    report['violations'] = violations
+    return report
+
+
+def run_portfolio(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Analyze all plan files in worker processes and merge a portfolio report.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Portfolio report dictionary with per-plan threshold results
+    """
+    from utils.batch_analysis import BatchAnalyzer
+
+    analyzer = BatchAnalyzer(
+        max_workers=args.workers,
+        enhanced=not args.basic,
+        include_security=not args.no_security
+    )
+    portfolio = analyzer.analyze(args.plans).to_dict()
+
+    for plan in portfolio['plans']:
+        violations = evaluate_thresholds(
+            plan,
+            fail_on=args.fail_on,
+            max_score=args.max_score,
+            min_security_score=args.min_security_score
+        )
+        plan['passed'] = not violations
+        plan['violations'] = violations
+    return portfolio
+
+
+def run_watch(args: argparse.Namespace) -> int:
+    """
+    Watch a directory and print one JSON line per changed plan file.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Process exit code once interrupted
+    """
+    from utils.plan_watcher import IncrementalPlanAnalyzer, PlanDirectoryWatcher
+
+    directory = args.plans[0]
+    if len(args.plans) != 1 or not Path(directory).is_dir():
+        print(json.dumps({'error': "--watch expects exactly one directory"}), file=sys.stderr)
+        return EXIT_ERROR
+
+    watcher = PlanDirectoryWatcher(
+        directory,
+        analyzer=IncrementalPlanAnalyzer(include_security=not args.no_security)
+    )
+
+    def emit(events: List[Dict[str, Any]]) -> None:
+        for event in events:
+            if 'summary' in event:
+                violations = evaluate_thresholds(
+                    event['summary'],
+                    fail_on=args.fail_on,
+                    max_score=args.max_score,
+                    min_security_score=args.min_security_score
+                )
+                event['passed'] = not violations
+                event['violations'] = violations
+            print(json.dumps(event, default=str), flush=True)
+
+    try:
+        watcher.watch(emit, interval=args.interval)
+    except KeyboardInterrupt:
+        pass
+    return EXIT_PASS
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Analyze Terraform plan JSON files and gate on risk thresholds."
+    )
+    parser.add_argument('plans', nargs='+', help="Plan files from 'terraform show -json'")
+    parser.add_argument('--fail-on', choices=RISK_LEVELS + ('none',), default='High',
+                        help="Fail when a plan's risk level is at or above this level (default: High)")
+    parser.add_argument('--max-score', type=float, default=None,
+                        help="Fail when a plan's risk score exceeds this value")
+    parser.add_argument('--min-security-score', type=float, default=None,
+                        help="Fail when a plan's overall security score is below this value")
+    parser.add_argument('--no-security', action='store_true',
+                        help="Skip security and compliance analysis")
+    parser.add_argument('--basic', action='store_true',
+                        help="Use the basic risk assessment instead of the multi-cloud one")
+    parser.add_argument('--include-assessments', action='store_true',
+                        help="Include per-resource risk assessments in the output")
+    parser.add_argument('--portfolio', action='store_true',
+                        help="Analyze the plans in parallel and emit a merged portfolio report")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes for --portfolio (default: CPU count)")
+    parser.add_argument('--watch', action='store_true',
+                        help="Watch a directory and re-analyze plan files as they change")
+    parser.add_argument('--interval', type=float, default=5.0,
+                        help="Seconds between directory scans for --watch (default: 5)")
+    parser.add_argument('--output', '-o', default=None,
+                        help="Write the JSON report to this file instead of stdout")
+    parser.add_argument('--pretty', action='store_true', help="Indent the JSON output")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the CI gate.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    if args.fail_on == 'none':
+        args.fail_on = None
+
+    if args.watch:
+        return run_watch(args)
+
+    if args.portfolio:
+        portfolio = run_portfolio(args)
+        reports = portfolio['plans'] + portfolio['errors']
+    else:
+        portfolio = None
+        reports = [analyze_file(path, args) for path in args.plans]
+
+    if any('error' in report for report in reports):
+        exit_code = EXIT_ERROR
+    elif all(report['passed'] for report in reports):
+        exit_code = EXIT_PASS
+    else:
+        exit_code = EXIT_FAIL
+
+    output = {
+        'passed': exit_code == EXIT_PASS,
+        'exit_code': exit_code,
+        'thresholds': {
+            'fail_on': args.fail_on,
+            'max_score': args.max_score,
+            'min_security_score': args.min_security_score
+        }
+    }
+    if portfolio is not None:
+        output['portfolio'] = portfolio
+    else:
+        output['plans'] = reports
+    text = json.dumps(output, indent=2 if args.pretty else None, default=str)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(text + '\n')
+    else:
+        print(text)
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,16 @@
 import streamlit as st
 import pandas as pd
-import re
 from typing import Dict, List, Any, Optional
 from ui.progress_tracker import ProgressTracker
 from ui.performance_optimizer import PerformanceOptimizer
 from ui.session_manager import SessionStateManager
+from utils.attribute_diff import AttributeDiffCache, diff_rows, is_diffable
+from utils.filter_bitmaps import Bitset, FilterBitmaps
+from utils.filter_expression import compile_filter_expression
+from utils.instance_groups import InstanceGroups, group_label
+from utils.search_index import ResourceSearchIndex
+from utils.table_styles import PageStyleCache, page_styles, style_page
+from utils.table_view import DEFAULT_PAGE_SIZE, PAGE_SIZES, SortPermutations, TablePage, page_of_row, paginate
 
 # Try to import enhanced features, fall back to basic if not available
 try:
@@ -14,6 +20,20 @@ except ImportError:
     from utils.risk_assessment import RiskAssessment
     ENHANCED_FEATURES_AVAILABLE = False
 
+# Maximum number of selected rows whose attribute diffs are shown at once
+MAX_EXPANDED_DIFFS = 10
+
+# Columns the table can be sorted by, with their labels
+TABLE_SORT_COLUMNS = {
+    'action': 'Action',
+    'risk_level': 'Risk Level',
+    'resource_type': 'Resource Type',
+    'resource_name': 'Resource Name',
+    'resource_address': 'Address',
+    'provider': 'Provider',
+    'instances': 'Instances'
+}
+
 
 class DataTableComponent:
     """Component for displaying resource change details table with filtering and export functionality"""
@@ -22,6 +42,11 @@ class DataTableComponent:
         self.enhanced_features_available = ENHANCED_FEATURES_AVAILABLE
         self.performance_optimizer = PerformanceOptimizer()
         self.session_manager = SessionStateManager()
+        # Search index of the current plan's table, built on the first search
+        self._search_index: Optional[ResourceSearchIndex] = None
+        # Unfiltered table of the current render, used for cached sort permutations
+        self._detailed_df: Optional[pd.DataFrame] = None
+        self._risk_source = 'basic'
     
     def render(self, parser, resource_changes: List[Dict[str, Any]], plan_data: Dict[str, Any], 
                enhanced_risk_assessor=None, enhanced_risk_result=None, enable_multi_cloud: bool = True) -> None:
@@ -43,9 +68,6 @@ class DataTableComponent:
             st.info("No resource changes found in the plan.")
             return
         
-        # Initialize progress tracker for data processing
-        progress_tracker = ProgressTracker()
-        
         # Create detailed dataframe with performance optimization
         try:
             # Track filter usage for onboarding
@@ -68,51 +90,10 @@ class DataTableComponent:
             
             if filters_modified:
                 error_handler.track_user_progress('filters_used')
-            # Use performance optimizer for dataframe creation
-            with self.performance_optimizer.performance_monitor("dataframe_creation"):
-                detailed_df = self.performance_optimizer.optimize_dataframe_creation(
-                    resource_changes, parser, use_cache=True
-                )
-            
-            # Add risk assessment with performance optimization
-            total_resources = len(detailed_df)
-            
-            with self.performance_optimizer.performance_monitor("risk_assessment"):
-                if total_resources > 50:  # Use optimized processing for larger datasets
-                    progress_tracker.initialize_progress_container()
-                    
-                    # Use performance optimizer for risk assessment
-                    risk_assessor = enhanced_risk_assessor if (self.enhanced_features_available and enable_multi_cloud and enhanced_risk_assessor) else RiskAssessment()
-                    
-                    # Convert DataFrame rows to list format for optimizer
-                    resource_list = []
-                    for _, row in detailed_df.iterrows():
-                        resource_list.append({
-                            'type': row['resource_type'],
-                            'action': row['action'],
-                            'address': row['resource_address']
-                        })
-                    
-                    # Use optimized risk assessment
-                    risk_levels = self.performance_optimizer.optimize_risk_assessment(
-                        resource_list, risk_assessor, plan_data, use_cache=True
-                    )
-                    
-                    # Update progress during assignment
-                    for i in range(len(risk_levels)):
-                        if i % 50 == 0 or i == len(risk_levels) - 1:
-                            progress_tracker.show_data_processing_progress(
-                                "🔍 Applying risk assessments", i + 1, len(risk_levels)
-                            )
-                    
-                    detailed_df['risk_level'] = risk_levels
-                    progress_tracker.clear_progress()
-                else:
-                    # For smaller datasets, use standard processing
-                    detailed_df['risk_level'] = detailed_df.apply(
-                        lambda row: self._get_risk_level(row, enhanced_risk_assessor, plan_data, enable_multi_cloud), 
-                        axis=1
-                    )
+            # Resource table with risk levels, built once per plan; filter-only
+            # reruns go straight to the cached bitmaps
+            detailed_df = self._get_risk_table(resource_changes, parser, plan_data,
+                                               enhanced_risk_assessor, enable_multi_cloud)
             
             # Apply filters and display table
             filtered_df = self._apply_filters(detailed_df, enhanced_risk_result, enable_multi_cloud)
@@ -121,9 +102,9 @@ class DataTableComponent:
                 # Show progress for table rendering if dataset is large
                 if len(filtered_df) > 100:
                     with st.spinner("📋 Rendering data table..."):
-                        self._display_table(filtered_df)
+                        self._display_table(filtered_df, resource_changes, self._get_instance_groups(parser))
                 else:
-                    self._display_table(filtered_df)
+                    self._display_table(filtered_df, resource_changes, self._get_instance_groups(parser))
                     
                 self._display_download_button(filtered_df)
             else:
@@ -132,6 +113,101 @@ class DataTableComponent:
         except Exception as e:
             st.error(f"Error creating resource table: {e}")
     
+    def _get_risk_table(self, resource_changes: List[Dict[str, Any]], parser, plan_data: Dict[str, Any],
+                        enhanced_risk_assessor, enable_multi_cloud: bool) -> pd.DataFrame:
+        """
+        Get the resource table with risk levels, built once per plan and risk source
+        
+        Args:
+            resource_changes: List of resource changes
+            parser: PlanParser instance
+            plan_data: Original plan data
+            enhanced_risk_assessor: Enhanced risk assessor instance (optional)
+            enable_multi_cloud: Whether multi-cloud features are enabled (selects the risk assessor)
+            
+        Returns:
+            Unfiltered resource table with a 'risk_level' column
+        """
+        plan_index = self._get_plan_index()
+        risk_source = self._get_risk_source(enable_multi_cloud)
+        cached = st.session_state.get('risk_table_cache')
+        if (isinstance(cached, dict) and plan_index is not None and cached.get('index') is plan_index
+                and cached.get('risk_source') == risk_source):
+            return cached['table']
+        
+        detailed_df = self._build_risk_table(resource_changes, parser, plan_data,
+                                             enhanced_risk_assessor, enable_multi_cloud)
+        if plan_index is not None:
+            st.session_state['risk_table_cache'] = {
+                'index': plan_index, 'risk_source': risk_source, 'table': detailed_df
+            }
+        return detailed_df
+    
+    def _build_risk_table(self, resource_changes: List[Dict[str, Any]], parser, plan_data: Dict[str, Any],
+                          enhanced_risk_assessor, enable_multi_cloud: bool) -> pd.DataFrame:
+        """
+        Build the resource table and assess the risk level of every row
+        
+        Args:
+            resource_changes: List of resource changes
+            parser: PlanParser instance
+            plan_data: Original plan data
+            enhanced_risk_assessor: Enhanced risk assessor instance (optional)
+            enable_multi_cloud: Whether multi-cloud features are enabled
+            
+        Returns:
+            Resource table with a 'risk_level' column
+        """
+        progress_tracker = ProgressTracker()
+        
+        # Use performance optimizer for dataframe creation
+        with self.performance_optimizer.performance_monitor("dataframe_creation"):
+            # The optimizer's cache returns shared frames; the risk column is added to a copy
+            detailed_df = self.performance_optimizer.optimize_dataframe_creation(
+                resource_changes, parser, use_cache=True
+            ).copy()
+        
+        # Add risk assessment with performance optimization
+        total_resources = len(detailed_df)
+        
+        with self.performance_optimizer.performance_monitor("risk_assessment"):
+            if total_resources > 50:  # Use optimized processing for larger datasets
+                progress_tracker.initialize_progress_container()
+                
+                # Use performance optimizer for risk assessment
+                risk_assessor = enhanced_risk_assessor if (self.enhanced_features_available and enable_multi_cloud and enhanced_risk_assessor) else RiskAssessment()
+                
+                # Convert DataFrame columns to list format for optimizer
+                resource_list = [
+                    {'type': resource_type, 'action': action, 'address': address}
+                    for resource_type, action, address in zip(
+                        detailed_df['resource_type'], detailed_df['action'], detailed_df['resource_address']
+                    )
+                ]
+                
+                # Use optimized risk assessment
+                risk_levels = self.performance_optimizer.optimize_risk_assessment(
+                    resource_list, risk_assessor, plan_data, use_cache=True
+                )
+                
+                # Update progress during assignment
+                for i in range(len(risk_levels)):
+                    if i % 50 == 0 or i == len(risk_levels) - 1:
+                        progress_tracker.show_data_processing_progress(
+                            "🔍 Applying risk assessments", i + 1, len(risk_levels)
+                        )
+                
+                detailed_df['risk_level'] = risk_levels
+                progress_tracker.clear_progress()
+            else:
+                # For smaller datasets, use standard processing
+                detailed_df['risk_level'] = detailed_df.apply(
+                    lambda row: self._get_risk_level(row, enhanced_risk_assessor, plan_data, enable_multi_cloud), 
+                    axis=1
+                )
+        
+        return detailed_df
+    
     def _get_risk_level(self, row: pd.Series, enhanced_risk_assessor, plan_data: Dict[str, Any], 
                        enable_multi_cloud: bool) -> str:
         """
@@ -315,6 +391,11 @@ class DataTableComponent:
         use_advanced_filters = st.session_state.get('use_advanced_filters', False)
         filter_expression = st.session_state.get('filter_expression', '')
         
+        # Per-value bitmaps of the filter columns, built once per plan
+        bitmaps = self._get_filter_bitmaps(detailed_df, enable_multi_cloud)
+        self._detailed_df = detailed_df
+        self._risk_source = self._get_risk_source(enable_multi_cloud)
+        
         # Apply filters based on logic
         if use_advanced_filters and filter_expression.strip():
             # Use advanced filter expression
@@ -323,14 +404,18 @@ class DataTableComponent:
             except Exception as e:
                 # Fall back to basic filtering if expression fails
                 st.warning(f"⚠️ Advanced filter expression failed: {e}. Using basic filters.")
-                filtered_df = self._apply_basic_filters(detailed_df, action_filter, risk_filter, provider_filter, filter_logic)
+                filtered_df = self._apply_basic_filters(detailed_df, action_filter, risk_filter, provider_filter,
+                                                        filter_logic, bitmaps)
         else:
             # Use basic filter logic
-            filtered_df = self._apply_basic_filters(detailed_df, action_filter, risk_filter, provider_filter, filter_logic)
+            selection = self._select_basic_filters(bitmaps, action_filter, risk_filter, provider_filter, filter_logic)
+            st.sidebar.caption(f"{selection.count()} of {len(bitmaps)} resources match the filters")
+            filtered_df = detailed_df[selection.to_mask()]
         
         # Apply search filter
+        self._search_index = None
         if search_query.strip():
-            filtered_df = self._apply_search_filter(filtered_df, search_query)
+            filtered_df = self._apply_search_filter(filtered_df, search_query, self._get_search_index(detailed_df))
         
         # Update search results count
         self.session_manager.set_search_results_count(len(filtered_df))
@@ -376,13 +461,16 @@ class DataTableComponent:
         
         return filtered_df
     
-    def _apply_search_filter(self, df: pd.DataFrame, search_query: str) -> pd.DataFrame:
+    def _apply_search_filter(self, df: pd.DataFrame, search_query: str,
+                             search_index: Optional[ResourceSearchIndex] = None) -> pd.DataFrame:
         """
         Apply search filter to dataframe based on search query
         
         Args:
             df: Dataframe to search
             search_query: Search query string
+            search_index: Search index of the full table (``df`` may be a row subset);
+                built for ``df`` if not given
             
         Returns:
             Filtered dataframe containing only rows matching the search query
@@ -390,44 +478,26 @@ class DataTableComponent:
         if not search_query.strip():
             return df
         
-        # Clean and prepare search query
-        query = search_query.strip().lower()
+        if search_index is None:
+            search_index = ResourceSearchIndex.from_dataframe(df)
         
-        # Create search mask - search across multiple columns
-        search_columns = ['resource_name', 'resource_type', 'resource_address']
-        
-        # Initialize mask as False for all rows
-        search_mask = pd.Series([False] * len(df), index=df.index)
-        
-        # Search in each available column
-        for column in search_columns:
-            if column in df.columns:
-                # Case-insensitive partial match
-                column_mask = df[column].astype(str).str.lower().str.contains(
-                    re.escape(query), na=False, regex=True
-                )
-                search_mask = search_mask | column_mask
-        
-        # Also search in provider column if available
-        if 'provider' in df.columns:
-            provider_mask = df['provider'].astype(str).str.lower().str.contains(
-                re.escape(query), na=False, regex=True
-            )
-            search_mask = search_mask | provider_mask
+        # Case-insensitive partial match across name, type, address and provider
+        filtered_df = df[search_index.search(search_query).mask(df)]
         
         # Store search result indices for navigation
-        search_result_indices = df[search_mask].index.tolist()
-        self.session_manager.set_search_result_indices(search_result_indices)
+        self.session_manager.set_search_result_indices(filtered_df.index.tolist())
         
-        return df[search_mask]
+        return filtered_df
     
-    def _add_search_highlighting(self, df: pd.DataFrame, search_query: str) -> pd.DataFrame:
+    def _add_search_highlighting(self, df: pd.DataFrame, search_query: str,
+                                 search_index: Optional[ResourceSearchIndex] = None) -> pd.DataFrame:
         """
         Add search highlighting indicators to the dataframe
         
         Args:
             df: Dataframe to add indicators to
             search_query: Search query to match
+            search_index: Search index of the full table; built for ``df`` if not given
             
         Returns:
             Dataframe with search match indicators
@@ -435,42 +505,41 @@ class DataTableComponent:
         if not search_query.strip():
             return df
         
+        if search_index is None:
+            search_index = ResourceSearchIndex.from_dataframe(df)
+        
         # Create a copy to avoid modifying original
         highlighted_df = df.copy()
-        query = search_query.strip().lower()
-        
-        # Add search indicator column
-        highlighted_df['search_indicator'] = ''
-        
-        # Check each row for matches and add indicators
-        search_columns = ['resource_name', 'resource_type', 'resource_address']
-        if 'provider' in highlighted_df.columns:
-            search_columns.append('provider')
-        
-        for idx, row in highlighted_df.iterrows():
-            matches = []
-            for column in search_columns:
-                if column in highlighted_df.columns:
-                    cell_value = str(row[column]).lower()
-                    if query in cell_value:
-                        # Determine which part matched
-                        if column == 'resource_name':
-                            matches.append('NAME')
-                        elif column == 'resource_type':
-                            matches.append('TYPE')
-                        elif column == 'resource_address':
-                            matches.append('ADDR')
-                        elif column == 'provider':
-                            matches.append('PROV')
-            
-            if matches:
-                highlighted_df.loc[idx, 'search_indicator'] = '🔍 ' + '+'.join(matches)
+        highlighted_df['search_indicator'] = search_index.search(search_query).indicators(highlighted_df)
         
         return highlighted_df
     
+    def _get_search_index(self, detailed_df: pd.DataFrame) -> ResourceSearchIndex:
+        """
+        Get the search index of the resource table, built once per plan
+        
+        Args:
+            detailed_df: Unfiltered resource table
+            
+        Returns:
+            ResourceSearchIndex over the rows of ``detailed_df``
+        """
+        plan_index = self._get_plan_index()
+        cached = st.session_state.get('resource_search_index_cache')
+        if (isinstance(cached, dict) and plan_index is not None and cached.get('index') is plan_index
+                and cached['search_index'].covers(detailed_df)):
+            search_index = cached['search_index']
+        else:
+            search_index = ResourceSearchIndex.from_dataframe(detailed_df)
+            if plan_index is not None:
+                st.session_state['resource_search_index_cache'] = {'index': plan_index, 'search_index': search_index}
+        
+        self._search_index = search_index
+        return search_index
+    
     def _apply_basic_filters(self, df: pd.DataFrame, action_filter: List[str], 
                            risk_filter: List[str], provider_filter: Optional[List[str]], 
-                           filter_logic: str) -> pd.DataFrame:
+                           filter_logic: str, bitmaps: Optional[FilterBitmaps] = None) -> pd.DataFrame:
         """
         Apply basic filter logic (AND/OR) to the dataframe.
         
@@ -480,36 +549,75 @@ class DataTableComponent:
             risk_filter: List of risk levels to include
             provider_filter: List of providers to include (optional)
             filter_logic: 'AND' or 'OR' logic
+            bitmaps: Filter bitmaps of ``df``; built for ``df`` if not given
             
         Returns:
             Filtered dataframe
         """
-        if filter_logic == 'AND':
-            # AND logic: resource must match ALL selected filters
-            filtered_df = df[
-                (df['action'].isin(action_filter)) &
-                (df['risk_level'].isin(risk_filter))
-            ]
-            
-            # Apply provider filter if enabled
-            if provider_filter is not None and 'provider' in df.columns:
-                filtered_df = filtered_df[filtered_df['provider'].isin(provider_filter)]
-        else:
-            # OR logic: resource must match ANY selected filter
-            action_mask = df['action'].isin(action_filter)
-            risk_mask = df['risk_level'].isin(risk_filter)
+        if bitmaps is None or not bitmaps.covers(df):
+            bitmaps = FilterBitmaps.from_dataframe(df)
+        
+        selection = self._select_basic_filters(bitmaps, action_filter, risk_filter, provider_filter, filter_logic)
+        return df[selection.to_mask()]
+    
+    def _select_basic_filters(self, bitmaps: FilterBitmaps, action_filter: List[str],
+                              risk_filter: List[str], provider_filter: Optional[List[str]],
+                              filter_logic: str) -> Bitset:
+        """
+        Select the rows matching the basic filters without materializing them.
+        
+        Args:
+            bitmaps: Filter bitmaps of the table
+            action_filter: List of actions to include
+            risk_filter: List of risk levels to include
+            provider_filter: List of providers to include (None to skip)
+            filter_logic: 'AND' (match all selected filters) or 'OR' (match any)
             
-            # Start with action OR risk
-            combined_mask = action_mask | risk_mask
+        Returns:
+            Bitset of the matching rows
+        """
+        return bitmaps.filter({
+            'action': action_filter,
+            'risk_level': risk_filter,
+            'provider': provider_filter
+        }, filter_logic)
+    
+    def _get_risk_source(self, enable_multi_cloud: bool) -> str:
+        """
+        Get which assessor produced the table's risk levels
+        
+        Args:
+            enable_multi_cloud: Whether multi-cloud features are enabled
             
-            # Add provider filter to OR logic if enabled
-            if provider_filter is not None and 'provider' in df.columns:
-                provider_mask = df['provider'].isin(provider_filter)
-                combined_mask = combined_mask | provider_mask
+        Returns:
+            'enhanced' or 'basic'
+        """
+        return 'enhanced' if (self.enhanced_features_available and enable_multi_cloud) else 'basic'
+    
+    def _get_filter_bitmaps(self, detailed_df: pd.DataFrame, enable_multi_cloud: bool) -> FilterBitmaps:
+        """
+        Get the filter bitmaps of the resource table, built once per plan
+        
+        Args:
+            detailed_df: Unfiltered resource table with risk levels
+            enable_multi_cloud: Whether multi-cloud features are enabled (selects the risk assessor)
             
-            filtered_df = df[combined_mask]
+        Returns:
+            FilterBitmaps over the rows of ``detailed_df``
+        """
+        plan_index = self._get_plan_index()
+        risk_source = self._get_risk_source(enable_multi_cloud)
+        cached = st.session_state.get('filter_bitmaps_cache')
+        if (isinstance(cached, dict) and plan_index is not None and cached.get('index') is plan_index
+                and cached.get('risk_source') == risk_source and cached['bitmaps'].covers(detailed_df)):
+            return cached['bitmaps']
         
-        return filtered_df
+        bitmaps = FilterBitmaps.from_dataframe(detailed_df)
+        if plan_index is not None:
+            st.session_state['filter_bitmaps_cache'] = {
+                'index': plan_index, 'risk_source': risk_source, 'bitmaps': bitmaps
+            }
+        return bitmaps
     
     def _apply_advanced_filter_expression(self, df: pd.DataFrame, expression: str) -> pd.DataFrame:
         """
@@ -521,20 +629,14 @@ class DataTableComponent:
             
         Returns:
             Filtered dataframe
+            
+        Raises:
+            FilterExpressionError: If the expression is invalid or refers to a missing column
         """
         if not expression.strip():
             return df
         
-        try:
-            # Parse and apply the filter expression
-            # This is a simplified implementation - in production you'd want a proper parser
-            filter_mask = self._evaluate_filter_expression(df, expression)
-            return df[filter_mask]
-            
-        except Exception as e:
-            # Log error and return original dataframe
-            st.error(f"Error applying advanced filter: {e}")
-            return df
+        return df[self._evaluate_filter_expression(df, expression)]
     
     def _evaluate_filter_expression(self, df: pd.DataFrame, expression: str) -> pd.Series:
         """
@@ -546,136 +648,57 @@ class DataTableComponent:
             
         Returns:
             Boolean series indicating which rows match the expression
-        """
-        # This is a simplified implementation
-        # In production, you'd want a proper expression parser/evaluator
-        
-        # Initialize result mask as all True
-        result_mask = pd.Series([True] * len(df), index=df.index)
-        
-        try:
-            # Simple expression evaluation
-            # Replace field names with actual column references
-            eval_expression = expression.lower()
-            
-            # Map field names to actual column names
-            field_mapping = {
-                'action': 'action',
-                'risk': 'risk_level',
-                'provider': 'provider',
-                'type': 'resource_type',
-                'name': 'resource_name'
-            }
             
-            # This is a very basic implementation
-            # For production use, implement a proper expression parser
-            if 'action=' in eval_expression:
-                # Extract action value
-                import re
-                action_match = re.search(r"action\s*=\s*['\"]([^'\"]+)['\"]", eval_expression)
-                if action_match:
-                    action_value = action_match.group(1)
-                    action_mask = df['action'] == action_value
-                    
-                    if 'and' in eval_expression.lower():
-                        result_mask = result_mask & action_mask
-                    elif 'or' in eval_expression.lower():
-                        result_mask = result_mask | action_mask
-                    else:
-                        result_mask = action_mask
-            
-            if 'risk=' in eval_expression:
-                # Extract risk value
-                risk_match = re.search(r"risk\s*=\s*['\"]([^'\"]+)['\"]", eval_expression)
-                if risk_match:
-                    risk_value = risk_match.group(1).title()  # Convert to title case
-                    risk_mask = df['risk_level'] == risk_value
-                    
-                    if 'and' in eval_expression.lower():
-                        result_mask = result_mask & risk_mask
-                    elif 'or' in eval_expression.lower():
-                        result_mask = result_mask | risk_mask
-                    else:
-                        result_mask = risk_mask
-            
-            if 'provider=' in eval_expression and 'provider' in df.columns:
-                # Extract provider value
-                provider_match = re.search(r"provider\s*=\s*['\"]([^'\"]+)['\"]", eval_expression)
-                if provider_match:
-                    provider_value = provider_match.group(1)
-                    provider_mask = df['provider'] == provider_value
-                    
-                    if 'and' in eval_expression.lower():
-                        result_mask = result_mask & provider_mask
-                    elif 'or' in eval_expression.lower():
-                        result_mask = result_mask | provider_mask
-                    else:
-                        result_mask = provider_mask
-            
-            # Handle IN expressions
-            if ' in ' in eval_expression.lower():
-                in_matches = re.findall(r"(\w+)\s+in\s*\(([^)]+)\)", eval_expression.lower())
-                for field, values_str in in_matches:
-                    # Parse values
-                    values = [v.strip().strip("'\"") for v in values_str.split(',')]
-                    
-                    if field in field_mapping and field_mapping[field] in df.columns:
-                        column_name = field_mapping[field]
-                        if field == 'risk':
-                            values = [v.title() for v in values]  # Convert to title case for risk
-                        
-                        in_mask = df[column_name].isin(values)
-                        
-                        if 'and' in eval_expression.lower():
-                            result_mask = result_mask & in_mask
-                        elif 'or' in eval_expression.lower():
-                            result_mask = result_mask | in_mask
-                        else:
-                            result_mask = in_mask
-            
-            return result_mask
-            
-        except Exception as e:
-            # Return all True if evaluation fails
-            st.warning(f"Filter expression evaluation failed: {e}")
-            return pd.Series([True] * len(df), index=df.index)
+        Raises:
+            FilterExpressionError: If the expression is invalid or refers to a missing column
+        """
+        # Compiled expressions are cached by text, so repeated filters skip parsing
+        compiled = compile_filter_expression(expression)
+        return pd.Series(compiled.mask(df), index=df.index)
     
-    def _display_table(self, filtered_df: pd.DataFrame) -> None:
+    def _display_table(self, filtered_df: pd.DataFrame,
+                       resource_changes: Optional[List[Dict[str, Any]]] = None,
+                       instance_groups: Optional[InstanceGroups] = None) -> None:
         """
         Display the filtered dataframe as a table with optimization for large datasets
         
         Args:
             filtered_df: Filtered dataframe to display
+            resource_changes: Resource changes, used for the attribute diffs of selected rows
+            instance_groups: Instance groups of the plan, used to collapse count/for_each fan-outs
         """
-        # Use performance optimizer for table rendering
-        with self.performance_optimizer.performance_monitor("table_rendering"):
-            optimized_df, is_truncated = self.performance_optimizer.optimize_table_rendering(
-                filtered_df, max_rows=1000
+        table_df = filtered_df
+        if instance_groups is not None and instance_groups.compressed_instances:
+            collapse = st.toggle(
+                "Collapse instance groups",
+                value=True,
+                key="collapse_instance_groups",
+                help="Show count/for_each instances with the same type, action and change shape as one row."
             )
-            
-            # Apply search highlighting and current result indication
+            if collapse:
+                table_df = self._collapse_instance_groups(filtered_df, instance_groups)
+        
+        # Render only the visible page, sorted with cached permutations of the full table
+        with self.performance_optimizer.performance_monitor("table_rendering"):
             search_query = self.session_manager.get_search_query()
-            display_df = optimized_df.copy()
+            current_row = self._get_current_search_result_row() if search_query.strip() else None
+            table_page = self._paginate_table(table_df, current_row)
+            display_df = table_page.rows.copy()
             
             if search_query.strip():
                 # Add search highlighting indicators
-                display_df = self._add_search_highlighting(display_df, search_query)
+                display_df = self._add_search_highlighting(display_df, search_query, self._search_index)
                 
                 # Highlight current search result if navigation is active
-                search_info = self.session_manager.get_current_search_result_info()
-                if search_info['has_results']:
-                    current_result_index = self.session_manager.get_current_search_result_index()
-                    search_indices = self.session_manager.get_search_result_indices()
-                    
-                    if current_result_index < len(search_indices):
-                        current_row_index = search_indices[current_result_index]
-                        # Add indicator for current search result
-                        if current_row_index in display_df.index:
-                            display_df.loc[current_row_index, 'search_indicator'] = '🎯 CURRENT'
+                if current_row is not None and current_row in display_df.index:
+                    display_df.loc[current_row, 'search_indicator'] = '🎯 CURRENT'
             
-            # Show truncation warning if applicable
-            if is_truncated:
-                st.warning(f"⚠️ Showing first 1,000 rows of {len(filtered_df):,} total resources. Use filters to narrow results or download CSV for complete data.")
+            if table_page.total_rows:
+                st.caption(
+                    f"Rows {table_page.start + 1:,}–{table_page.start + len(display_df):,} of "
+                    f"{table_page.total_rows:,} ({len(filtered_df):,} resources) · "
+                    f"page {table_page.page:,} of {table_page.page_count:,}"
+                )
             
             # Column configuration
             column_config = {
@@ -688,6 +711,9 @@ class DataTableComponent:
             if 'provider' in display_df.columns:
                 column_config["provider"] = st.column_config.TextColumn("Provider", width="small")
             
+            if 'instances' in display_df.columns:
+                column_config["instances"] = st.column_config.NumberColumn("Instances", width="small")
+            
             # Add search indicator column if search is active
             if search_query.strip() and 'search_indicator' in display_df.columns:
                 column_config["search_indicator"] = st.column_config.TextColumn("Match", width="small")
@@ -700,18 +726,302 @@ class DataTableComponent:
                     
                     with col1:
                         st.metric("Total Resources", f"{len(filtered_df):,}")
-                        st.metric("Displayed Rows", f"{len(optimized_df):,}")
+                        st.metric("Displayed Rows", f"{len(display_df):,}")
                         
                     with col2:
                         cache_stats = metrics['cache_stats']
                         st.metric("Cache Hit Rate", f"{cache_stats['hit_rate']:.1f}%")
                         st.metric("Cache Size", cache_stats['cache_size'])
             
-            st.dataframe(
-                display_df,
+            table_event = st.dataframe(
+                self._style_table_page(display_df, table_page),
                 use_container_width=True,
-                column_config=column_config
+                column_config=column_config,
+                on_select="rerun",
+                selection_mode="multi-row",
+                # Selections are row positions, so each page and sort order keeps its own
+                key=f"resource_table_{table_page.start}_{table_page.sort_column}_{table_page.ascending}"
             )
+        
+        if resource_changes:
+            self._display_attribute_diffs(display_df, table_event, resource_changes)
+    
+    def _style_table_page(self, display_df: pd.DataFrame, table_page: TablePage):
+        """
+        Color the risk level cells of the visible page
+        
+        Args:
+            display_df: Rows of the visible page
+            table_page: Page the rows belong to
+            
+        Returns:
+            Styler of the page, or the page itself if it has no risk levels
+        """
+        if display_df.empty or 'risk_level' not in display_df.columns:
+            return display_df
+        
+        key = (self._risk_source, table_page.start, table_page.sort_column, table_page.ascending)
+        styles = self._get_page_style_cache().get(
+            key, display_df, lambda page: page_styles(page, 'risk_level', columns=['risk_level'])
+        )
+        return style_page(display_df, styles)
+    
+    def _get_page_style_cache(self) -> PageStyleCache:
+        """
+        Get the cached CSS of the current plan's table pages
+        
+        Returns:
+            PageStyleCache of the current plan (a fresh one if no plan is recorded)
+        """
+        plan_index = self._get_plan_index()
+        cached = st.session_state.get('table_style_cache')
+        if isinstance(cached, dict) and plan_index is not None and cached.get('index') is plan_index:
+            return cached['cache']
+        
+        cache = PageStyleCache()
+        if plan_index is not None:
+            st.session_state['table_style_cache'] = {'index': plan_index, 'cache': cache}
+        return cache
+    
+    def _paginate_table(self, table_df: pd.DataFrame, current_row=None) -> TablePage:
+        """
+        Render the sort and page controls and get the visible page of the table
+        
+        Args:
+            table_df: Filtered (and possibly collapsed) table
+            current_row: Row label of the current search result; its page is
+                shown when the search navigation moves to it
+            
+        Returns:
+            TablePage with the rows to display
+        """
+        sort_options = [None] + [column for column in TABLE_SORT_COLUMNS if column in table_df.columns]
+        sort_col, order_col, size_col, page_col = st.columns([3, 2, 2, 2])
+        
+        with sort_col:
+            sort_column = st.selectbox(
+                "Sort by",
+                options=sort_options,
+                format_func=lambda column: 'Plan order' if column is None else TABLE_SORT_COLUMNS[column],
+                key="resource_table_sort"
+            )
+        with order_col:
+            descending = st.toggle("Descending", key="resource_table_descending")
+        with size_col:
+            page_size = st.selectbox(
+                "Rows per page",
+                options=list(PAGE_SIZES),
+                index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE),
+                key="resource_table_page_size"
+            )
+        
+        if sort_column not in sort_options:
+            sort_column = None
+        ascending = descending is not True
+        if page_size not in PAGE_SIZES:
+            page_size = DEFAULT_PAGE_SIZE
+        permutations = self._get_sort_permutations()
+        
+        page = st.session_state.get('resource_table_page', 1)
+        if not isinstance(page, int):
+            page = 1
+        # Follow the search navigation once per result, then let the page controls take over
+        if current_row is not None and current_row != st.session_state.get('resource_table_search_target'):
+            st.session_state['resource_table_search_target'] = current_row
+            page = page_of_row(table_df, current_row, page_size, sort_column, ascending, permutations) or page
+        
+        table_page = paginate(table_df, page, page_size, sort_column, ascending, permutations)
+        
+        # The widget reads the clamped page from session state
+        st.session_state['resource_table_page'] = table_page.page
+        with page_col:
+            st.number_input(
+                "Page",
+                min_value=1,
+                max_value=table_page.page_count,
+                step=1,
+                key="resource_table_page",
+                help=f"{table_page.page_count:,} pages"
+            )
+        
+        return table_page
+    
+    def _get_sort_permutations(self) -> Optional[SortPermutations]:
+        """
+        Get the cached sort permutations of the current plan's unfiltered table
+        
+        Returns:
+            SortPermutations, or None if no table was filtered in this render
+        """
+        detailed_df = self._detailed_df
+        if detailed_df is None:
+            return None
+        
+        plan_index = self._get_plan_index()
+        cached = st.session_state.get('table_sort_cache')
+        if (isinstance(cached, dict) and plan_index is not None and cached.get('index') is plan_index
+                and cached.get('risk_source') == self._risk_source and cached['permutations'].covers(detailed_df)):
+            return cached['permutations']
+        
+        permutations = SortPermutations(detailed_df)
+        if plan_index is not None:
+            st.session_state['table_sort_cache'] = {
+                'index': plan_index, 'risk_source': self._risk_source, 'permutations': permutations
+            }
+        return permutations
+    
+    def _get_current_search_result_row(self):
+        """
+        Get the row label of the current search result
+        
+        Returns:
+            Row label, or None if search navigation has no current result
+        """
+        search_info = self.session_manager.get_current_search_result_info()
+        if not search_info['has_results']:
+            return None
+        current_result_index = self.session_manager.get_current_search_result_index()
+        search_indices = self.session_manager.get_search_result_indices()
+        if current_result_index < len(search_indices):
+            return search_indices[current_result_index]
+        return None
+    
+    def _display_attribute_diffs(self, display_df: pd.DataFrame, table_event,
+                                 resource_changes: List[Dict[str, Any]]) -> None:
+        """
+        Display attribute-level diffs of the rows selected in the table
+        
+        Diffs are only computed for selected rows, and memoized per resource
+        in the session so reruns do not recompute them.
+        
+        Args:
+            display_df: Dataframe shown in the table
+            table_event: Selection state returned by st.dataframe
+            resource_changes: Resource changes of the plan
+        """
+        selection = getattr(table_event, 'selection', None)
+        selected_rows = getattr(selection, 'rows', None)
+        if not isinstance(selected_rows, list) or not selected_rows:
+            st.caption("💡 Select rows in the table to inspect their attribute-level changes.")
+            return
+        
+        if len(selected_rows) > MAX_EXPANDED_DIFFS:
+            st.info(f"Showing attribute changes for the first {MAX_EXPANDED_DIFFS} of {len(selected_rows)} selected resources.")
+        
+        selected_addresses = [
+            display_df.iloc[row]['resource_address']
+            for row in selected_rows[:MAX_EXPANDED_DIFFS]
+            if 0 <= row < len(display_df)
+        ]
+        instance_counts = {}
+        if 'instances' in display_df.columns:
+            instance_counts = dict(zip(display_df['resource_address'], display_df['instances']))
+        wanted = set(selected_addresses)
+        changes_by_address = {change['address']: change for change in resource_changes if change.get('address') in wanted}
+        diff_cache = self._get_attribute_diff_cache()
+        
+        for address in selected_addresses:
+            change = changes_by_address.get(address)
+            if change is None:
+                continue
+            
+            with st.expander(f"🔍 {address} ({change.get('action', 'unknown')})", expanded=True):
+                if instance_counts.get(address, 1) > 1:
+                    st.caption(f"Representative of {instance_counts[address]:,} instances with the same change shape.")
+                if not is_diffable(change):
+                    st.caption("Attribute-level changes are shown for updates and replacements.")
+                    continue
+                
+                attribute_changes = diff_cache.get_diff(change, self._get_resource_content_hash(address))
+                if not attribute_changes:
+                    st.caption("No attribute differences between before and after.")
+                    continue
+                
+                rows, omitted = diff_rows(attribute_changes)
+                st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+                if omitted:
+                    st.caption(f"... and {omitted:,} more attribute changes")
+    
+    def _get_instance_groups(self, parser) -> Optional[InstanceGroups]:
+        """
+        Get the instance groups of the plan
+        
+        Args:
+            parser: PlanParser instance
+            
+        Returns:
+            InstanceGroups, or None if the parser does not provide them
+        """
+        instance_groups = parser.get_instance_groups() if hasattr(parser, 'get_instance_groups') else None
+        return instance_groups if isinstance(instance_groups, InstanceGroups) else None
+    
+    def _collapse_instance_groups(self, df: pd.DataFrame, instance_groups: InstanceGroups) -> pd.DataFrame:
+        """
+        Collapse the rows of each instance group into its first row
+        
+        The remaining row keeps the address of that instance (so its attribute
+        diff can be shown), gets a ``[*]`` resource name and the number of
+        instances it stands for.
+        
+        Args:
+            df: Resource table rows
+            instance_groups: Instance groups of the plan
+            
+        Returns:
+            Dataframe with one row per group and an 'instances' column
+        """
+        group_ids = df['resource_address'].map(instance_groups.group_ids())
+        # Rows outside any group stay on their own
+        ungrouped = pd.Series(range(-1, -len(df) - 1, -1), index=df.index)
+        group_ids = group_ids.fillna(ungrouped)
+        
+        first = ~group_ids.duplicated()
+        collapsed = df[first].copy()
+        collapsed['instances'] = group_ids[first].map(group_ids.value_counts()).astype(int)
+        
+        grouped = collapsed['instances'] > 1
+        if grouped.any():
+            collapsed.loc[grouped, 'resource_name'] = [
+                group_label(address).rsplit('.', 1)[-1] for address in collapsed.loc[grouped, 'resource_address']
+            ]
+        return collapsed
+    
+    def _get_attribute_diff_cache(self) -> AttributeDiffCache:
+        """
+        Get the session's attribute diff cache
+        
+        Returns:
+            AttributeDiffCache stored in session state
+        """
+        cache = st.session_state.get('attribute_diff_cache')
+        if not isinstance(cache, AttributeDiffCache):
+            cache = AttributeDiffCache()
+            st.session_state['attribute_diff_cache'] = cache
+        return cache
+    
+    def _get_resource_content_hash(self, address: str) -> Optional[str]:
+        """
+        Get the structural hash of a resource recorded when the plan was processed
+        
+        Args:
+            address: Resource address
+            
+        Returns:
+            Root hash of the resource change, or None if not recorded
+        """
+        plan_index = self._get_plan_index()
+        hashes = plan_index.hashes.get(address) if plan_index is not None else None
+        return hashes.root if hashes is not None else None
+    
+    def _get_plan_index(self):
+        """
+        Get the structural index of the current plan recorded when it was processed
+        
+        Returns:
+            PlanIndex of the current plan, or None if not recorded
+        """
+        tracked = st.session_state.get('plan_change_tracking')
+        return tracked.get('current_index') if isinstance(tracked, dict) else None
     
     def _display_download_button(self, filtered_df: pd.DataFrame) -> None:
         """
@@ -15,6 +15,8 @@ import logging
 import hashlib
 from dataclasses import dataclass, field
 
+from utils.instance_groups import InstanceGroups
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -1091,16 +1093,21 @@ Please check your data and try again.
         # Detailed changes (limited based on template configuration)
         if resource_changes:
             max_resources = self.current_template.max_resources_shown
-            title = f"Detailed Changes (Top {max_resources})" if len(resource_changes) > max_resources else "Detailed Changes"
+            # count/for_each instances with the same change shape share one row
+            groups = InstanceGroups.build(resource_changes).groups
+            title = f"Detailed Changes (Top {max_resources})" if len(groups) > max_resources else "Detailed Changes"
             story.append(Paragraph(title, self.styles['SubsectionHeading']))
             
             change_data = [['Resource Address', 'Action', 'Type', 'Provider']]
             
-            for i, change in enumerate(resource_changes[:max_resources]):
-                address = change.get('address', 'Unknown')
+            for group in groups[:max_resources]:
+                change = group.representative
+                address = group.label
+                count_suffix = f" ×{group.count:,}" if group.count > 1 else ""
                 # Truncate long addresses for better formatting
-                if len(address) > 40:
-                    address = address[:37] + "..."
+                if len(address) + len(count_suffix) > 40:
+                    address = address[:37 - len(count_suffix)] + "..."
+                address += count_suffix
                 
                 actions = change.get('change', {}).get('actions', ['unknown'])
                 action_str = ', '.join(actions)
@@ -1128,11 +1135,10 @@ Please check your data and try again.
             story.append(change_table)
             
             # Add note if there are more changes
-            max_resources = self.current_template.max_resources_shown
-            if len(resource_changes) > max_resources:
+            if len(groups) > max_resources:
                 story.append(Spacer(1, 10))
                 story.append(Paragraph(
-                    f"<i>... and {len(resource_changes) - max_resources} more resource changes</i>",
+                    f"<i>... and {sum(group.count for group in groups[max_resources:])} more resource changes</i>",
                     self.styles['Metadata']
                 ))
         
@@ -7,6 +7,8 @@ the rendering of enhanced multi-cloud sections extracted from the main app.py.
 
 import streamlit as st
 import pandas as pd
+from utils.dependency_graph import rank_blast_radius
+from utils.deployment_schedule import provider_timeline
 
 # Try to import enhanced features, fall back to basic if not available
 try:
@@ -161,6 +163,12 @@ class EnhancedSectionsComponent:
                     delta=f"Avg Risk: {avg_risk_score}"
                 )
 
+            # Simulated apply timeline
+            deployment_schedule = enhanced_risk_result.get('deployment_schedule') \
+                if isinstance(enhanced_risk_result, dict) else None
+            if deployment_schedule and deployment_schedule.get('resource_count'):
+                self._render_deployment_timeline(deployment_schedule)
+
             # Provider Risk Breakdown
             if provider_risk_summary:
                 st.markdown("### 📈 Provider Risk Breakdown")
@@ -193,6 +201,32 @@ class EnhancedSectionsComponent:
         except Exception as e:
             st.error(f"Error in multi-cloud risk section: {e}")
 
+    def _render_deployment_timeline(self, deployment_schedule):
+        """
+        Render the simulated apply timeline.
+
+        Args:
+            deployment_schedule: Result of DeploymentSchedule.to_dict()
+        """
+        st.markdown("### ⏱️ Deployment Timeline")
+        st.caption(
+            f"Simulated apply with parallelism {deployment_schedule['parallelism']}: "
+            f"{deployment_schedule['makespan_seconds'] / 60:.1f} min, of which the longest dependency chain "
+            f"takes {deployment_schedule['critical_path_seconds'] / 60:.1f} min "
+            f"({deployment_schedule['sequential_seconds'] / 60:.1f} min if applied one at a time)."
+        )
+
+        chart_gen = ChartGenerator()
+        fig = chart_gen.create_deployment_timeline_gantt({
+            'provider_specific_times': provider_timeline(deployment_schedule)
+        })
+        st.plotly_chart(fig, use_container_width=True)
+
+        critical_path = deployment_schedule.get('critical_path', [])
+        if len(critical_path) > 1:
+            with st.expander(f"Critical path ({len(critical_path)} resources)"):
+                st.write(" → ".join(critical_path))
+
     def render_cross_cloud_insights_section(self, enhanced_risk_assessor, resource_changes, plan_data):
         """
         Create cross-cloud insights and recommendations section.
@@ -245,6 +279,99 @@ class EnhancedSectionsComponent:
         except Exception as e:
             st.error(f"Error in cross-cloud insights: {e}")
 
+    def render_plan_comparison_section(self, plan_comparison):
+        """
+        Render what changed since the previous plan analyzed in this session.
+        
+        Args:
+            plan_comparison: PlanComparison with the previous plan, or None
+        """
+        if plan_comparison is None:
+            return
+
+        try:
+            st.markdown("---")
+            st.markdown("## 🔁 Changes Since Previous Plan")
+            st.caption("Resources whose planned change differs from the previous plan uploaded in this session.")
+
+            if not plan_comparison.has_changes:
+                st.info("✅ This plan is identical to the previous plan")
+                return
+
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("New in Plan", len(plan_comparison.added))
+            with col2:
+                st.metric("No Longer in Plan", len(plan_comparison.removed))
+            with col3:
+                st.metric("Changed", len(plan_comparison.altered))
+            with col4:
+                st.metric("Unchanged", plan_comparison.unchanged)
+
+            rows = [{'Resource': address, 'Difference': 'New in plan'} for address in plan_comparison.added]
+            rows.extend({'Resource': address, 'Difference': 'No longer in plan'} for address in plan_comparison.removed)
+            for entry in plan_comparison.altered:
+                parts = []
+                if entry['previous_actions'] != entry['actions']:
+                    parts.append(f"actions {'/'.join(entry['previous_actions'])} → {'/'.join(entry['actions'])}")
+                if entry['before_changed']:
+                    parts.append("current state")
+                if entry['after_changed']:
+                    parts.append("planned values")
+                if entry['metadata_changed'] and not parts:
+                    parts.append("plan metadata")
+                rows.append({'Resource': entry['address'], 'Difference': ', '.join(parts)})
+
+            with st.expander(f"📋 {len(rows)} differing resources", expanded=len(rows) <= 20):
+                st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+        except Exception as e:
+            st.error(f"Error in plan comparison section: {e}")
+
+    def render_dependency_impact_section(self, parser, resource_changes):
+        """
+        Render the changes with the largest downstream impact.
+        
+        Args:
+            parser: PlanParser instance
+            resource_changes: List of resource changes from the plan
+        """
+        try:
+            graph = parser.get_dependency_graph()
+            if len(graph) == 0:
+                return
+
+            impact = rank_blast_radius(graph, resource_changes)
+
+            st.markdown("---")
+            st.markdown("## 💥 Downstream Impact")
+            st.caption("Changed resources ranked by how many configured resources depend on them, directly or through modules.")
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Configured Resources", sum(1 for kind in graph.kinds if kind == 'resource'))
+            with col2:
+                st.metric("Changes With Dependents", impact['changes_with_dependents'])
+            with col3:
+                st.metric("Resources Downstream of Changes", impact['affected_resources'])
+
+            if impact['top_changes']:
+                rows = [
+                    {
+                        'Resource': item['address'],
+                        'Action': item['action'],
+                        'Dependent Resources': item['downstream_count'],
+                        'Also Changing': item['downstream_changed']
+                    }
+                    for item in impact['top_changes']
+                ]
+                st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+            else:
+                st.info("✅ No other configured resources depend on the changed resources")
+
+        except Exception as e:
+            st.error(f"Error in downstream impact section: {e}")
+
     def render_debug_section(self, debug_info, resource_changes, summary, enhanced_features_available, enable_multi_cloud):
         """
         Render debug information section.
@@ -9,12 +9,15 @@ from typing import Dict, Any, Optional, List
 import streamlit as st
 from datetime import datetime
 import json
+import html
 import base64
 import tempfile
 import os
 from io import BytesIO
 from jinja2 import Template
 from .base_component import BaseComponent
+from utils.attribute_diff import AttributeDiffCache, is_diffable
+from utils.instance_groups import InstanceGroups
 
 # Import enhanced PDF generator
 try:
@@ -24,6 +27,8 @@ except ImportError as e:
     PDF_GENERATOR_AVAILABLE = False
     PDF_GENERATOR_ERROR = str(e)
 
+# Member addresses listed under a collapsed instance group
+MAX_GROUP_MEMBERS_LISTED = 20
 
 class ReportGeneratorComponent(BaseComponent):
     """Component for generating comprehensive reports with executive summary, risk analysis, and detailed changes"""
@@ -319,6 +324,7 @@ class ReportGeneratorComponent(BaseComponent):
         
         # Generate changes tables
         changes_html = ""
+        diff_cache = self._get_attribute_diff_cache()
         
         for action, changes in changes_by_action.items():
             if not changes:
@@ -327,9 +333,13 @@ class ReportGeneratorComponent(BaseComponent):
             action_icon = {'create': '🟢', 'update': '🔵', 'delete': '🔴'}.get(action, '⚪')
             action_title = action.title()
             
+            # count/for_each instances with the same change shape share one row
+            groups = InstanceGroups.build(changes).groups
+            group_note = f", {len(groups)} groups" if len(groups) < len(changes) else ""
+            
             changes_html += f"""
             <div class="changes-section">
-                <h3>{action_icon} {action_title} Operations ({len(changes)} resources)</h3>
+                <h3>{action_icon} {action_title} Operations ({len(changes)} resources{group_note})</h3>
                 <table class="changes-table">
                     <thead>
                         <tr>
@@ -342,8 +352,17 @@ class ReportGeneratorComponent(BaseComponent):
                     <tbody>
             """
             
-            for change in changes[:50]:  # Limit to first 50 for readability
-                address = change.get('address', 'Unknown')
+            for group in groups[:50]:  # Limit to first 50 for readability
+                change = group.representative
+                address_html = f"<code>{html.escape(group.label)}</code>"
+                if group.count > 1:
+                    members = "<br>".join(
+                        f"<code>{html.escape(address)}</code>" for address in group.addresses[:MAX_GROUP_MEMBERS_LISTED]
+                    )
+                    if group.count > MAX_GROUP_MEMBERS_LISTED:
+                        members += f"<br>... and {group.count - MAX_GROUP_MEMBERS_LISTED:,} more"
+                    address_html += f"""
+                    <details class="instance-group"><summary>{group.count:,} instances</summary>{members}</details>"""
                 resource_type = change.get('type', 'Unknown')
                 provider = change.get('provider_name', 'Unknown').split('/')[-1] if change.get('provider_name') else 'Unknown'
                 
@@ -353,39 +372,41 @@ class ReportGeneratorComponent(BaseComponent):
                 after = change_data.get('after')
                 
                 key_changes = []
-                if action == 'create':
+                if is_diffable(change) and before and after:
+                    # Attribute-level changes of updates and replacements
+                    attribute_changes = diff_cache.get_diff(change)
+                    if action != 'update':
+                        key_changes.append("Replacement")
+                    key_changes.extend(item.describe() for item in attribute_changes[:3])
+                    if len(attribute_changes) > 3:
+                        key_changes.append(f"+{len(attribute_changes) - 3} more")
+                    if not attribute_changes:
+                        key_changes.append("Configuration updated")
+                elif action == 'create':
                     key_changes.append("New resource")
                 elif action == 'delete':
                     key_changes.append("Resource removal")
-                elif action == 'update' and before and after:
-                    # Try to identify key changed fields
-                    if isinstance(before, dict) and isinstance(after, dict):
-                        for key in after.keys():
-                            if key in before and before[key] != after[key]:
-                                key_changes.append(f"{key} modified")
-                        if not key_changes:
-                            key_changes.append("Configuration updated")
                 
-                key_changes_str = ", ".join(key_changes[:3]) if key_changes else "No details available"
+                key_changes_str = html.escape(", ".join(key_changes)) if key_changes else "No details available"
                 
                 changes_html += f"""
                 <tr>
-                    <td><code>{address}</code></td>
+                    <td>{address_html}</td>
                     <td>{resource_type}</td>
                     <td>{provider}</td>
                     <td>{key_changes_str}</td>
                 </tr>
                 """
             
-            if len(changes) > 50:
+            if len(groups) > 50:
+                remaining = sum(group.count for group in groups[50:])
                 changes_html += f"""
                 <tr>
                     <td colspan="4" class="truncated-notice">
-                        ... and {len(changes) - 50} more {action} operations
+                        ... and {remaining} more {action} operations
                     </td>
                 </tr>
                 """
-            
             changes_html += "</tbody></table></div>"
         
         # Generate resource type summary
@@ -420,6 +441,19 @@ class ReportGeneratorComponent(BaseComponent):
         </div>
         """
     
+    def _get_attribute_diff_cache(self) -> AttributeDiffCache:
+        """
+        Get the session's attribute diff cache (shared with the resource table)
+        
+        Returns:
+            AttributeDiffCache stored in session state
+        """
+        cache = self._get_session_state('attribute_diff_cache')
+        if not isinstance(cache, AttributeDiffCache):
+            cache = AttributeDiffCache()
+            self._set_session_state('attribute_diff_cache', cache)
+        return cache
+    
     def generate_recommendations(self, 
                                summary: Dict[str, int],
                                risk_summary: Dict[str, Any],
@@ -711,6 +745,12 @@ class ReportGeneratorComponent(BaseComponent):
                 text-align: center;
             }}
             
+            .instance-group summary {{
+                cursor: pointer;
+                color: #666;
+                font-size: 0.9em;
+            }}
+            
             .recommendations-content ul {{
                 list-style-type: none;
                 padding-left: 0;
@@ -12,6 +12,8 @@ import plotly.express as px
 import plotly.graph_objects as go
 from typing import Dict, List, Any, Optional
 from utils.security_analyzer import SecurityAnalyzer
+from utils.table_styles import PageStyleCache, page_styles, risk_levels_from_scores, style_page
+from utils.table_view import DEFAULT_PAGE_SIZE, TablePage, page_count, paginate
 from .base_component import BaseComponent
 
 
@@ -238,28 +240,24 @@ class SecurityAnalysisComponent(BaseComponent):
                     'Category': r['category'].title(),
                     'Actions': ', '.join(r['actions']),
                     'Risk Score': r['risk_score'],
-                    'Risk Level': 'Critical' if r['risk_score'] >= 8 else 'High' if r['risk_score'] >= 6 else 'Medium' if r['risk_score'] >= 4 else 'Low',
                     'Description': r['description']
                 }
                 for r in security_data['security_resources']
             ])
+            resources_df.insert(5, 'Risk Level', risk_levels_from_scores(resources_df['Risk Score']))
             
             # Sort by risk score descending
-            resources_df = resources_df.sort_values('Risk Score', ascending=False)
+            resources_df = resources_df.sort_values('Risk Score', ascending=False, kind='stable')
             
-            # Color-code risk levels
-            def highlight_risk(row):
-                if row['Risk Score'] >= 8:
-                    return ['background-color: #ffebee'] * len(row)  # Light red
-                elif row['Risk Score'] >= 6:
-                    return ['background-color: #fff3e0'] * len(row)  # Light orange
-                elif row['Risk Score'] >= 4:
-                    return ['background-color: #fffde7'] * len(row)  # Light yellow
-                else:
-                    return ['background-color: #e8f5e8'] * len(row)  # Light green
+            # Only the visible page is styled, so large plans are paginated
+            table_page = self._paginate_security_resources(resources_df)
             
+            # Color-code risk levels
+            styles = self._get_page_style_cache().get(
+                table_page.start, table_page.rows, lambda page: page_styles(page, 'Risk Level')
+            )
             st.dataframe(
-                resources_df.style.apply(highlight_risk, axis=1),
+                style_page(table_page.rows, styles),
                 use_container_width=True,
                 column_config={
                     "Risk Score": st.column_config.ProgressColumn(
@@ -306,6 +304,50 @@ class SecurityAnalysisComponent(BaseComponent):
                 fig.update_layout(showlegend=False)
                 st.plotly_chart(fig, use_container_width=True)
     
+    def _paginate_security_resources(self, resources_df: pd.DataFrame) -> TablePage:
+        """
+        Get the visible page of the security resources table
+        
+        Args:
+            resources_df: Security resources sorted by risk score
+        
+        Returns:
+            TablePage of the resources shown
+        """
+        pages = page_count(len(resources_df), DEFAULT_PAGE_SIZE)
+        if pages == 1:
+            return paginate(resources_df, 1, DEFAULT_PAGE_SIZE)
+        
+        # Clamp before the widget is created (the plan may have fewer pages now)
+        page = min(max(int(self._get_session_state('security_resources_page', 1) or 1), 1), pages)
+        self._set_session_state('security_resources_page', page)
+        st.number_input("Page", min_value=1, max_value=pages, step=1, key="security_resources_page")
+        
+        table_page = paginate(resources_df, page, DEFAULT_PAGE_SIZE)
+        st.caption(
+            f"Resources {table_page.start + 1:,}–{table_page.start + len(table_page.rows):,} of "
+            f"{table_page.total_rows:,} · page {table_page.page:,} of {table_page.page_count:,}"
+        )
+        return table_page
+    
+    def _get_page_style_cache(self) -> PageStyleCache:
+        """
+        Get the cached CSS of the current plan's security resource pages
+        
+        Returns:
+            PageStyleCache of the current plan (a fresh one if no plan is recorded)
+        """
+        tracked = self._get_session_state('plan_change_tracking')
+        plan_index = tracked.get('current_index') if isinstance(tracked, dict) else None
+        cached = self._get_session_state('security_style_cache')
+        if isinstance(cached, dict) and plan_index is not None and cached.get('index') is plan_index:
+            return cached['cache']
+        
+        cache = PageStyleCache()
+        if plan_index is not None:
+            self._set_session_state('security_style_cache', {'index': plan_index, 'cache': cache})
+        return cache
+    
     def _render_security_risks(self, security_data: Dict[str, Any]) -> None:
         """Render security risks and recommendations"""
         st.markdown("### ⚠️ Security Risks & Recommendations")
@@ -8,6 +8,7 @@ extracted from the main app.py file.
 import streamlit as st
 from ui.session_manager import SessionStateManager
 from ui.error_handler import ErrorHandler
+from utils.filter_expression import FILTER_FIELDS, FilterExpressionError, compile_filter_expression
 
 
 class SidebarComponent:
@@ -276,15 +277,16 @@ class SidebarComponent:
                     placeholder="(action='create' OR action='update') AND risk='High'",
                     help="""
                     **Expression Syntax:**
-                    • Use field names: action, risk, provider, type, name
-                    • Operators: =, !=, IN, NOT IN
+                    • Use field names: action, risk, provider, type, name, module, sensitive
+                    • Operators: =, !=, IN, NOT IN, LIKE, NOT LIKE (% and _ wildcards)
                     • Logic: AND, OR, NOT, ( )
-                    • Values: 'create', 'High', etc.
+                    • Values: 'create', 'High', true, etc.
                     
                     **Examples:**
                     • action='create' AND risk='High'
                     • (action='delete' OR action='replace') AND provider='aws'
-                    • risk IN ('Medium', 'High') AND type LIKE 'aws_instance'
+                    • risk IN ('Medium', 'High') AND type LIKE 'aws_%'
+                    • module LIKE 'module.network%' AND NOT sensitive
                     """,
                     height=100
                 )
@@ -320,6 +322,8 @@ class SidebarComponent:
                             • provider: 'aws', 'azure', 'gcp'
                             • type: resource type (e.g., 'aws_instance')
                             • name: resource name
+                            • module: module address (e.g., 'module.vpc', '' for root)
+                            • sensitive: true or false
                             """)
                 
                 # Expression templates
@@ -554,7 +558,7 @@ class SidebarComponent:
                 return {'valid': False, 'error': 'Unbalanced parentheses', 'parsed': ''}
             
             # Check for valid field names
-            valid_fields = ['action', 'risk', 'provider', 'type', 'name']
+            valid_fields = list(FILTER_FIELDS)
             valid_operators = ['=', '!=', 'IN', 'NOT IN', 'LIKE', 'NOT LIKE']
             valid_logic = ['AND', 'OR', 'NOT']
             
@@ -572,7 +576,12 @@ class SidebarComponent:
             if not has_valid_field and expression.strip():
                 return {'valid': False, 'error': f'No valid field names found. Use: {", ".join(valid_fields)}', 'parsed': ''}
             
-            # Basic syntax validation passed
+            # Full parse catches misplaced operators, unknown fields and bad values
+            try:
+                compile_filter_expression(expression)
+            except FilterExpressionError as e:
+                return {'valid': False, 'error': str(e), 'parsed': ''}
+            
             parsed_expression = self._parse_filter_expression(expression)
             
             return {
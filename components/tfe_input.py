@@ -12,9 +12,11 @@ from typing import Optional, Dict, Any, Tuple, List
 from ui.error_handler import ErrorHandler
 from utils.credential_manager import CredentialManager
 from providers.tfe_client import TFEClient
+from providers.run_watcher import RunWatch, get_run_watcher, WatchState
 # Import the working standalone client as primary TFE integration
 try:
     from providers.standalone_tfe_client import process_tfe_yaml_upload
+    from providers.run_watcher import watch_tfe_yaml_upload
     STANDALONE_CLIENT_AVAILABLE = True
 except ImportError:
     STANDALONE_CLIENT_AVAILABLE = False
@@ -155,6 +157,7 @@ class TFEInputComponent(BaseComponent):
         
         # Show example configuration if no file uploaded
         if uploaded_config is None:
+            self._release_run_watch()
             self._show_example_configuration()
             st.markdown('</div>', unsafe_allow_html=True)
             return None
@@ -182,6 +185,12 @@ class TFEInputComponent(BaseComponent):
             # Use standalone TFE client (primary implementation)
             if STANDALONE_CLIENT_AVAILABLE:
                 st.info("🔄 Connecting to Terraform Cloud/Enterprise...")
+                
+                # Runs that are still planning are watched in the background
+                handled, plan_data = self._check_run_watch(yaml_content)
+                if handled:
+                    return plan_data
+                
                 plan_data, error = process_tfe_yaml_upload(yaml_content)
                 
                 if error:
@@ -191,24 +200,7 @@ class TFEInputComponent(BaseComponent):
                     st.success("✅ Plan data retrieved successfully from TFE!")
                     
                     # Show status warnings if present
-                    if plan_data and '_tfe_status' in plan_data:
-                        status_info = plan_data['_tfe_status']
-                        
-                        if status_info.get('run_status_warning'):
-                            if status_info['run_status_warning'].startswith('❌'):
-                                st.error(f"Run Status: {status_info['run_status_warning']}")
-                            elif status_info['run_status_warning'].startswith('⚠️'):
-                                st.warning(f"Run Status: {status_info['run_status_warning']}")
-                            else:
-                                st.info(f"Run Status: {status_info['run_status_warning']}")
-                        
-                        if status_info.get('plan_status_warning'):
-                            if status_info['plan_status_warning'].startswith('❌'):
-                                st.error(f"Plan Status: {status_info['plan_status_warning']}")
-                            elif status_info['plan_status_warning'].startswith('⚠️'):
-                                st.warning(f"Plan Status: {status_info['plan_status_warning']}")
-                            else:
-                                st.info(f"Plan Status: {status_info['plan_status_warning']}")
+                    self._show_tfe_status(plan_data)
                     
                     # Show plan summary
                     if plan_data and 'resource_changes' in plan_data:
@@ -237,6 +229,87 @@ class TFEInputComponent(BaseComponent):
             self.error_handler.handle_upload_error(e, uploaded_file.name)
             return None
     
+    def _check_run_watch(self, yaml_content: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Start or poll a background watch for the configured run
+        
+        Only runs that are still planning are watched; finished runs are
+        retrieved directly without waiting on a watch.
+        
+        Args:
+            yaml_content: TFE YAML configuration content
+            
+        Returns:
+            Tuple of (handled, plan_data); handled is False when the regular
+            retrieval path should run instead
+        """
+        current = st.session_state.get('tfe_run_watch')
+        watch, error = watch_tfe_yaml_upload(yaml_content, current)
+        if watch is not current:
+            # The session moved to another run; release the previous subscription
+            self._release_run_watch()
+            if watch is not None:
+                st.session_state['tfe_run_watch'] = watch
+        if error or watch is None:
+            # Let the regular retrieval path report configuration/auth errors
+            return False, None
+        
+        if watch.state == WatchState.READY:
+            if watch.analysis is not None:
+                st.session_state['tfe_prefetched_analysis'] = watch.analysis
+            st.success("✅ Plan data retrieved successfully from TFE!")
+            self._show_tfe_status(watch.plan_data)
+            return True, watch.plan_data
+        
+        if watch.state == WatchState.PENDING:
+            status = watch.run_status or 'pending'
+            st.info(
+                f"⏳ Run is still planning (status: `{status}`). The plan will be downloaded "
+                "and analyzed in the background as soon as it is ready."
+            )
+            if st.button("🔄 Check run status", key="tfe_watch_refresh"):
+                st.rerun()
+            return True, None
+        
+        if watch.state == WatchState.FAILED:
+            st.error(f"❌ TFE Integration Error: {watch.error or 'Run did not produce a plan'}")
+            return True, None
+        
+        # Timed out or stopped watches fall back to a direct retrieval attempt
+        return False, None
+    
+    def _release_run_watch(self) -> None:
+        """Release this session's subscription to a background run watch"""
+        watch = st.session_state.pop('tfe_run_watch', None)
+        if isinstance(watch, RunWatch):
+            get_run_watcher().unwatch(watch)
+    
+    def _show_tfe_status(self, plan_data: Optional[Dict[str, Any]]) -> None:
+        """
+        Show run and plan status warnings attached to TFE plan data
+        
+        Args:
+            plan_data: Plan data returned by the standalone TFE client
+        """
+        if plan_data and '_tfe_status' in plan_data:
+            status_info = plan_data['_tfe_status']
+
+            if status_info.get('run_status_warning'):
+                if status_info['run_status_warning'].startswith('❌'):
+                    st.error(f"Run Status: {status_info['run_status_warning']}")
+                elif status_info['run_status_warning'].startswith('⚠️'):
+                    st.warning(f"Run Status: {status_info['run_status_warning']}")
+                else:
+                    st.info(f"Run Status: {status_info['run_status_warning']}")
+
+            if status_info.get('plan_status_warning'):
+                if status_info['plan_status_warning'].startswith('❌'):
+                    st.error(f"Plan Status: {status_info['plan_status_warning']}")
+                elif status_info['plan_status_warning'].startswith('⚠️'):
+                    st.warning(f"Plan Status: {status_info['plan_status_warning']}")
+                else:
+                    st.info(f"Plan Status: {status_info['plan_status_warning']}")
+    
     def _show_validation_errors(self, errors: List[Any]) -> None:
         """
         Display validation errors with helpful guidance
@@ -284,146 +357,56 @@ class TFEInputComponent(BaseComponent):
     
     def _initiate_plan_fetch(self) -> Optional[Dict[str, Any]]:
         """
-        Initiate the plan fetch process with enhanced progress indicators and loading states
+        Retrieve plan data for the stored configuration in the background
+        
+        Connection validation, authentication and the download run on a run
+        watcher thread, so rate-limit and backoff waits never block the
+        Streamlit script; this method only reports their progress.
         
         Returns:
-            Plan data if successful, None otherwise
+            Plan data once retrieved, None while pending or on failure
         """
         config = self.credential_manager.get_config()
         if not config:
             st.error("❌ No configuration available")
             return None
         
-        # Create enhanced progress container with overall progress bar
-        progress_container = st.container()
+        current = st.session_state.get('tfe_run_watch')
+        watch = get_run_watcher().fetch(self.credential_manager, current)
+        if watch is not current:
+            # The session moved to another run; release the previous subscription
+            self._release_run_watch()
+            st.session_state['tfe_run_watch'] = watch
         
-        with progress_container:
-            st.markdown("### 🔄 Connecting to TFE...")
-            
-            # Overall progress tracking
-            total_steps = 4
-            overall_progress = st.progress(0)
-            overall_status = st.empty()
-            
-            # Detailed step tracking
-            step_container = st.container()
-            
-            with step_container:
-                # Step 1: Connection validation
-                overall_status.info("🔍 **Step 1/4:** Validating connection to TFE server...")
-                step1_status = st.empty()
-                step1_spinner = st.empty()
-                
-                with step1_spinner:
-                    with st.spinner("Checking TFE server connectivity..."):
-                        is_connected, connection_message = self.tfe_client.validate_connection()
-                
-                step1_spinner.empty()
-                overall_progress.progress(1/total_steps)
-                
-                if not is_connected:
-                    step1_status.error(f"❌ **Step 1 Failed:** {connection_message}")
-                    overall_status.error("❌ **Connection Failed** - Unable to reach TFE server")
-                    self._show_connection_troubleshooting(connection_message)
-                    return None
-                
-                step1_status.success("✅ **Step 1:** Connection to TFE server validated")
-                
-                # Step 2: Authentication
-                overall_status.info("🔐 **Step 2/4:** Authenticating with TFE...")
-                step2_status = st.empty()
-                step2_spinner = st.empty()
-                
-                with step2_spinner:
-                    with st.spinner("Verifying API token and organization access..."):
-                        is_authenticated, auth_error = self.tfe_client.authenticate(
-                            config.tfe_server, 
-                            config.token, 
-                            config.organization
-                        )
-                
-                step2_spinner.empty()
-                overall_progress.progress(2/total_steps)
-                
-                if not is_authenticated:
-                    step2_status.error(f"❌ **Step 2 Failed:** {auth_error}")
-                    overall_status.error("❌ **Authentication Failed** - Check your token and organization")
-                    self._show_authentication_troubleshooting(auth_error)
-                    return None
-                
-                step2_status.success("✅ **Step 2:** Successfully authenticated with TFE")
-                
-                # Step 3: Workspace and run validation
-                overall_status.info("🔍 **Step 3/4:** Validating workspace and run access...")
-                step3_status = st.empty()
-                step3_spinner = st.empty()
-                
-                with step3_spinner:
-                    with st.spinner("Checking workspace and run permissions..."):
-                        # This could be a separate validation step in the TFE client
-                        import time
-                        time.sleep(0.5)  # Simulate validation time
-                        validation_success = True  # Placeholder for actual validation
-                
-                step3_spinner.empty()
-                overall_progress.progress(3/total_steps)
-                
-                if not validation_success:
-                    step3_status.error("❌ **Step 3 Failed:** Invalid workspace or run ID")
-                    overall_status.error("❌ **Validation Failed** - Check your workspace and run IDs")
-                    return None
-                
-                step3_status.success("✅ **Step 3:** Workspace and run access validated")
-                
-                # Step 4: Plan retrieval
-                overall_status.info("📥 **Step 4/4:** Retrieving plan data from workspace run...")
-                step4_status = st.empty()
-                step4_spinner = st.empty()
-                
-                with step4_spinner:
-                    with st.spinner("Downloading and processing plan data..."):
-                        plan_data, error_message = self.tfe_client.get_plan_json(
-                            config.workspace_id, 
-                            config.run_id
-                        )
-                
-                step4_spinner.empty()
-                overall_progress.progress(4/total_steps)
-                
-                if error_message:
-                    step4_status.error(f"❌ **Step 4 Failed:** {error_message}")
-                    overall_status.error("❌ **Plan Retrieval Failed** - Unable to fetch plan data")
-                    self._show_plan_retrieval_troubleshooting(error_message)
-                    return None
-                
-                step4_status.success("✅ **Step 4:** Plan data retrieved successfully")
-                overall_status.success("🎉 **All Steps Complete!** Plan data ready for analysis")
-                
-                # Show completion summary with timing
-                completion_time = st.empty()
-                completion_time.info("⏱️ **Process completed successfully** - Plan data is now being processed...")
-                
-                # Store plan data securely and show summary
-                if plan_data:
-                    config = self.credential_manager.get_config()
-                    self.plan_manager.store_plan_data(
-                        plan_data,
-                        source="tfe_integration", 
-                        workspace_id=config.workspace_id if config else None,
-                        run_id=config.run_id if config else None
-                    )
-                    
-                    # Show processing spinner for plan analysis
-                    with st.spinner("Processing plan data for analysis..."):
-                        import time
-                        time.sleep(1)  # Simulate processing time
-                    
-                    completion_time.success("✅ **Ready for Analysis!** Your plan has been successfully loaded and processed.")
-                    self._show_plan_summary_secure()
-                
-                return plan_data
-    
-
+        if watch.state == WatchState.PENDING:
+            st.info(f"🔄 {watch.message or 'Connecting to TFE...'}")
+            if st.button("🔄 Check progress", key="tfe_fetch_refresh"):
+                st.rerun()
+            return None
+        
+        if watch.state != WatchState.READY:
+            error_message = watch.error or "Plan retrieval did not complete"
+            st.error(f"❌ **Plan Retrieval Failed:** {error_message}")
+            self._show_plan_retrieval_troubleshooting(error_message)
+            if st.button("🔄 Retry", key="tfe_fetch_retry"):
+                self._release_run_watch()
+                st.rerun()
+            return None
+        
+        plan_data = watch.plan_data
+        if watch.analysis is not None:
+            st.session_state['tfe_prefetched_analysis'] = watch.analysis
+        st.success("✅ Plan data retrieved successfully from TFE!")
+        
+        # Store plan data securely and show summary
+        self.plan_manager.store_plan_data(
+            plan_data,
+            source="tfe_integration",
+            workspace_id=config.workspace_id,
+            run_id=config.run_id
+        )
+        self._show_plan_summary_secure()
+        return plan_data
     
     def _show_plan_summary_secure(self) -> None:
         """
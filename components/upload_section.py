@@ -10,15 +10,24 @@ import json
 from typing import Optional, Dict, Any, Tuple, List
 from ui.error_handler import ErrorHandler
 from components.tfe_input import TFEInputComponent
+from utils.analysis_engine import has_minimal_plan_structure, plan_structure_issues
 from utils.secure_plan_manager import SecurePlanManager
 
 
 class UploadComponent:
     """Component for handling Terraform plan file uploads"""
     
-    def __init__(self, session_manager=None):
-        """Initialize the UploadComponent"""
+    def __init__(self, session_manager=None, worker_pool=None):
+        """
+        Initialize the UploadComponent
+        
+        Args:
+            session_manager: Optional SessionStateManager providing the shared plan manager
+            worker_pool: Optional PlanWorkerPool; uploads large enough to be offloaded
+                are passed on unparsed so the worker validates and parses them
+        """
         self.session_manager = session_manager
+        self.worker_pool = worker_pool
         # Use shared plan manager from session state if available
         if session_manager:
             self.plan_manager = session_manager.get_plan_manager()
@@ -31,6 +40,7 @@ class UploadComponent:
         
         Returns:
             Optional[Dict[str, Any]]: The plan data (from file or TFE) as a dictionary,
+                                    the uploaded file itself for plans analyzed in a worker,
                                     or None if no plan is available
         """
         error_handler = ErrorHandler()
@@ -62,7 +72,8 @@ class UploadComponent:
         Render the file upload tab content
         
         Returns:
-            Optional[Dict[str, Any]]: The uploaded plan data or None
+            Optional[Dict[str, Any]]: The uploaded plan data, the uploaded file for
+                                    plans analyzed in a worker, or None
         """
         error_handler = ErrorHandler()
         
@@ -173,6 +184,14 @@ class UploadComponent:
                 show_once=True
             )
 
+        # Large plans are validated and parsed by the worker pool, not here
+        if uploaded_file is not None and self.worker_pool is not None \
+                and self.worker_pool.should_offload(len(uploaded_file.getvalue())):
+            # Never leave a previous plan behind for this session
+            self.plan_manager.clear_plan_data()
+            st.info("⚙️ **Large plan:** validation and analysis run in a background worker process")
+            return uploaded_file
+        
         # Process and secure the uploaded file data if available
         if uploaded_file is not None:
             # Show processing progress for file upload
@@ -325,22 +344,11 @@ class UploadComponent:
             validation_issues = self._validate_plan_structure(plan_data)
             
             if validation_issues:
-                error_handler.show_data_quality_warning(
-                    "Terraform Plan",
-                    validation_issues,
-                    [
-                        "Re-generate your plan with: terraform plan -out=tfplan && terraform show -json tfplan > plan.json",
-                        "Ensure your Terraform configuration has pending changes",
-                        "Check that the plan generation completed successfully"
-                    ]
-                )
-                
                 # Still return the data if it's parseable, just with warnings
-                if self._has_minimal_required_structure(plan_data):
-                    st.info("⚠️ Proceeding with analysis despite data quality issues")
-                    return plan_data, None
-                else:
-                    return None, "File structure is incompatible with analysis"
+                error_msg = self.report_structure_issues(
+                    validation_issues, self._has_minimal_required_structure(plan_data), error_handler
+                )
+                return (None, error_msg) if error_msg else (plan_data, None)
             
             # Show success message with file details
             st.success("✅ File validated successfully!")
@@ -380,6 +388,33 @@ class UploadComponent:
             error_handler.handle_upload_error(e, uploaded_file.name)
             return None, str(e)
     
+    def report_structure_issues(self, issues: List[str], can_proceed: bool, error_handler) -> Optional[str]:
+        """
+        Show plan structure issues found during validation
+        
+        Args:
+            issues: Validation issues found in the plan
+            can_proceed: Whether the plan has the minimal structure for analysis
+            error_handler: ErrorHandler used to display the warning
+            
+        Returns:
+            Error message if the plan cannot be analyzed, None otherwise
+        """
+        error_handler.show_data_quality_warning(
+            "Terraform Plan",
+            issues,
+            [
+                "Re-generate your plan with: terraform plan -out=tfplan && terraform show -json tfplan > plan.json",
+                "Ensure your Terraform configuration has pending changes",
+                "Check that the plan generation completed successfully"
+            ]
+        )
+        
+        if can_proceed:
+            st.info("⚠️ Proceeding with analysis despite data quality issues")
+            return None
+        return "File structure is incompatible with analysis"
+    
     def _validate_plan_structure(self, plan_data: Dict[str, Any]) -> List[str]:
         """
         Validate the structure of the Terraform plan and return list of issues
@@ -390,36 +425,7 @@ class UploadComponent:
         Returns:
             List of validation issues found
         """
-        issues = []
-        
-        # Check for required fields
-        if 'terraform_version' not in plan_data:
-            issues.append("Missing 'terraform_version' field")
-        
-        if 'resource_changes' not in plan_data:
-            issues.append("Missing 'resource_changes' array - this is required for analysis")
-        elif not isinstance(plan_data['resource_changes'], list):
-            issues.append("'resource_changes' should be an array")
-        elif len(plan_data['resource_changes']) == 0:
-            issues.append("No resource changes found - plan may be up-to-date")
-        
-        # Check resource changes structure
-        if 'resource_changes' in plan_data and isinstance(plan_data['resource_changes'], list):
-            for i, change in enumerate(plan_data['resource_changes'][:5]):  # Check first 5
-                if not isinstance(change, dict):
-                    issues.append(f"Resource change {i} is not a valid object")
-                    continue
-                
-                if 'change' not in change:
-                    issues.append(f"Resource change {i} missing 'change' field")
-                elif 'actions' not in change.get('change', {}):
-                    issues.append(f"Resource change {i} missing 'actions' field")
-        
-        # Check for common format issues
-        if 'format_version' not in plan_data:
-            issues.append("Missing 'format_version' - may indicate old Terraform version")
-        
-        return issues
+        return plan_structure_issues(plan_data)
     
     def cleanup(self) -> None:
         """Clean up resources and plan data"""
@@ -435,11 +441,7 @@ class UploadComponent:
         Returns:
             True if plan can be analyzed despite issues
         """
-        return (
-            isinstance(plan_data, dict) and
-            'resource_changes' in plan_data and
-            isinstance(plan_data['resource_changes'], list)
-        )
+        return has_minimal_plan_structure(plan_data)
     
     def render_instructions(self) -> None:
         """
@@ -35,7 +35,8 @@ class VisualizationsComponent(BaseComponent):
                enhanced_risk_assessor: Any = None,
                enhanced_features_available: bool = False,
                enable_multi_cloud: bool = False,
-               show_debug: bool = False) -> None:
+               show_debug: bool = False,
+               module_trie: Any = None) -> None:
         """
         Render the main visualizations section with progress tracking
         
@@ -50,6 +51,7 @@ class VisualizationsComponent(BaseComponent):
             enhanced_features_available: Whether enhanced features are available
             enable_multi_cloud: Whether multi-cloud features are enabled
             show_debug: Whether to show debug information
+            module_trie: ModuleTrie of the plan (optional, for the module breakdown)
         """
         # Only show visualizations if we have data
         if summary['total'] > 0:
@@ -135,9 +137,46 @@ class VisualizationsComponent(BaseComponent):
                         enhanced_features_available, enable_multi_cloud
                     )
                     break
+            
+            # Module breakdown, answered from the precomputed module trie
+            if module_trie is not None and len(module_trie) > 1:
+                self._render_module_breakdown(module_trie, chart_gen)
         else:
             st.info("🎉 No changes detected in this plan! All resources are up to date.")
     
+    def _render_module_breakdown(self, module_trie: Any, chart_gen: Any) -> None:
+        """
+        Render the drill-down table, treemap and sunburst of the module hierarchy
+        
+        Args:
+            module_trie: ModuleTrie of the plan
+            chart_gen: ChartGenerator instance
+        """
+        st.markdown("### 🧩 Changes by Module")
+        st.caption("Resource changes and risk aggregated per module instance. Colors show the share of high-risk changes.")
+        try:
+            module_options = [node.address for node in module_trie.iter_nodes()]
+            selected_module = st.selectbox(
+                "Drill down into module",
+                module_options,
+                format_func=lambda address: address or "root module",
+                key="module_drill_down"
+            )
+            
+            st.dataframe(module_trie.drill_down(selected_module), use_container_width=True, hide_index=True)
+            
+            hierarchy = module_trie.to_hierarchy(selected_module, max_depth=4)
+            if len(hierarchy['ids']) > 1:
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.plotly_chart(chart_gen.create_module_treemap(hierarchy), use_container_width=True)
+                with col2:
+                    st.plotly_chart(chart_gen.create_module_sunburst(hierarchy), use_container_width=True)
+            else:
+                st.info("This module has no submodules with changes.")
+        except Exception as e:
+            self._render_error("Failed to create module breakdown", str(e))
+    
     def _render_pie_chart(self, resource_types: Dict[str, int], chart_gen: Any) -> None:
         """Render resource types pie chart with performance optimization"""
         st.markdown("### 🏷️ Resource Types Distribution")
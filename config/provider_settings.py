@@ -170,7 +170,17 @@ def get_environment_settings() -> Dict[str, Any]:
         'debug_mode': os.getenv('TERRAFORM_DASHBOARD_DEBUG', 'false').lower() == 'true',
         'risk_profile': os.getenv('TERRAFORM_DASHBOARD_RISK_PROFILE', 'conservative'),
         'theme': os.getenv('TERRAFORM_DASHBOARD_THEME', 'light'),
-        'max_file_size_mb': int(os.getenv('TERRAFORM_DASHBOARD_MAX_FILE_SIZE', '50'))
+        'max_file_size_mb': int(os.getenv('TERRAFORM_DASHBOARD_MAX_FILE_SIZE', '50')),
+        # 0 disables worker processes; plans are then analyzed in the server process
+        'worker_processes': int(os.getenv('TERRAFORM_DASHBOARD_WORKER_PROCESSES', '0')),
+        # User security rule pack files (YAML or JSON), separated by os.pathsep
+        'security_rule_packs': [
+            path for path in os.getenv('TERRAFORM_DASHBOARD_SECURITY_RULE_PACKS', '').split(os.pathsep) if path
+        ],
+        # 'objects' keeps uploaded plans as Python objects, 'arena' in one zeroable buffer
+        'plan_storage_mode': os.getenv('TERRAFORM_DASHBOARD_PLAN_STORAGE', 'objects'),
+        # Idle seconds after which a session's plan is cleared; unset or 0 keeps it
+        'plan_retention_seconds': float(os.getenv('TERRAFORM_DASHBOARD_PLAN_RETENTION_SECONDS') or 0) or None
     }
 
 
@@ -0,0 +1,236 @@
+"""
+Built-in security rule pack
+
+Rules are declarative conditions on attribute paths of a resource's planned
+values (``change.after``); see utils.security_rules for the condition syntax.
+User rule packs use the same format (as YAML or JSON files) and can add
+rules, replace built-in rules by id or disable them with ``enabled: false``.
+"""
+
+from typing import Any, Dict
+
+SENSITIVE_PORTS = [22, 3389, 1433, 3306, 5432, 6379, 27017]
+
+DEFAULT_SECURITY_RULE_PACK: Dict[str, Any] = {
+    'name': 'default',
+    'rules': [
+        # Network exposure
+        {
+            'id': 'aws_security_group_open_ingress',
+            'resource_types': ['aws_security_group'],
+            'when': ['ingress[*].cidr_blocks contains "0.0.0.0/0"'],
+            'issue': 'open_to_world',
+            'severity': 'critical',
+            'description': 'Ingress rule allows access from anywhere on the internet'
+        },
+        {
+            'id': 'aws_security_group_open_ingress_ipv6',
+            'resource_types': ['aws_security_group'],
+            'when': ['ingress[*].ipv6_cidr_blocks contains "::/0"'],
+            'issue': 'open_to_world',
+            'severity': 'critical',
+            'description': 'Ingress rule allows IPv6 access from anywhere on the internet'
+        },
+        {
+            'id': 'aws_security_group_sensitive_ports',
+            'resource_types': ['aws_security_group'],
+            'when': [f'ingress[*] exposes {SENSITIVE_PORTS}'],
+            'issue': 'sensitive_ports',
+            'severity': 'high',
+            'description': 'Ingress rule exposes sensitive ports (SSH, RDP, databases)'
+        },
+        {
+            'id': 'aws_security_group_rule_open_ingress',
+            'resource_types': ['aws_security_group_rule'],
+            'when': ['type != "egress"', 'cidr_blocks contains "0.0.0.0/0"'],
+            'issue': 'open_to_world',
+            'severity': 'critical',
+            'description': 'Ingress rule allows access from anywhere on the internet'
+        },
+        {
+            'id': 'aws_vpc_security_group_ingress_rule_open',
+            'resource_types': ['aws_vpc_security_group_ingress_rule'],
+            'when': ['cidr_ipv4 == "0.0.0.0/0"'],
+            'issue': 'open_to_world',
+            'severity': 'critical',
+            'description': 'Ingress rule allows access from anywhere on the internet'
+        },
+        {
+            'id': 'aws_security_group_rule_sensitive_ports',
+            'resource_types': ['aws_security_group_rule'],
+            'when': ['type != "egress"', f'$ exposes {SENSITIVE_PORTS}'],
+            'issue': 'sensitive_ports',
+            'severity': 'high',
+            'description': 'Ingress rule exposes sensitive ports (SSH, RDP, databases)'
+        },
+        {
+            'id': 'aws_vpc_security_group_ingress_rule_sensitive_ports',
+            'resource_types': ['aws_vpc_security_group_ingress_rule'],
+            'when': ['cidr_ipv4 == "0.0.0.0/0"', f'$ exposes {SENSITIVE_PORTS}'],
+            'issue': 'sensitive_ports',
+            'severity': 'critical',
+            'description': 'Ingress rule exposes sensitive ports (SSH, RDP, databases) to the internet'
+        },
+        {
+            'id': 'azurerm_network_security_rule_open_inbound',
+            'resource_types': ['azurerm_network_security_rule'],
+            'when': ['direction == "Inbound"', 'access == "Allow"',
+                     'source_address_prefix in ["*", "0.0.0.0/0", "Internet", "Any"]'],
+            'issue': 'open_to_world',
+            'severity': 'critical',
+            'description': 'Inbound rule allows access from anywhere on the internet'
+        },
+        {
+            'id': 'azurerm_network_security_group_open_inbound',
+            'resource_types': ['azurerm_network_security_group'],
+            'when': ['security_rule[*].source_address_prefix in ["*", "0.0.0.0/0", "Internet", "Any"]'],
+            'issue': 'open_to_world',
+            'severity': 'high',
+            'description': 'Security rule allows traffic from anywhere on the internet'
+        },
+        {
+            'id': 'google_compute_firewall_open_ingress',
+            'resource_types': ['google_compute_firewall'],
+            'when': ['direction != "EGRESS"', 'source_ranges contains "0.0.0.0/0"'],
+            'issue': 'open_to_world',
+            'severity': 'critical',
+            'description': 'Firewall rule allows access from anywhere on the internet'
+        },
+        {
+            'id': 'google_sql_open_authorized_network',
+            'resource_types': ['google_sql_database_instance'],
+            'when': ['settings[*].ip_configuration[*].authorized_networks[*].value == "0.0.0.0/0"'],
+            'issue': 'open_to_world',
+            'severity': 'critical',
+            'description': 'Database accepts connections from anywhere on the internet'
+        },
+
+        # Encryption
+        {
+            'id': 'aws_s3_bucket_encryption_missing',
+            'resource_types': ['aws_s3_bucket'],
+            'when': ['server_side_encryption_configuration missing'],
+            'issue': 'unencrypted',
+            'severity': 'medium',
+            'description': 'Bucket has no inline server-side encryption configuration'
+        },
+        {
+            'id': 'aws_db_storage_unencrypted',
+            'resource_types': ['aws_db_instance', 'aws_rds_cluster'],
+            'when': ['storage_encrypted != true'],
+            'issue': 'unencrypted',
+            'severity': 'high',
+            'description': 'Database storage is not encrypted'
+        },
+        {
+            'id': 'aws_ebs_volume_unencrypted',
+            'resource_types': ['aws_ebs_volume'],
+            'when': ['encrypted != true'],
+            'issue': 'unencrypted',
+            'severity': 'high',
+            'description': 'Volume is not encrypted'
+        },
+        {
+            'id': 'aws_kms_key_rotation_disabled',
+            'resource_types': ['aws_kms_key'],
+            'when': ['enable_key_rotation != true'],
+            'issue': 'key_rotation_disabled',
+            'severity': 'medium',
+            'description': 'Key rotation is disabled'
+        },
+        {
+            'id': 'azurerm_storage_account_old_tls',
+            'resource_types': ['azurerm_storage_account'],
+            'when': ['min_tls_version in ["TLS1_0", "TLS1_1"]'],
+            'issue': 'unencrypted',
+            'severity': 'high',
+            'description': 'Storage account accepts TLS versions older than 1.2'
+        },
+
+        # Public access
+        {
+            'id': 'aws_s3_bucket_public_acl',
+            'resource_types': ['aws_s3_bucket', 'aws_s3_bucket_acl'],
+            'when': ['acl in ["public-read", "public-read-write", "authenticated-read"]'],
+            'issue': 'public_access',
+            'severity': 'high',
+            'description': 'Bucket ACL grants public access'
+        },
+        {
+            'id': 'aws_s3_public_access_block_disabled',
+            'resource_types': ['aws_s3_bucket_public_access_block', 'aws_s3_account_public_access_block'],
+            'when': ['block_public_acls != true'],
+            'issue': 'public_access',
+            'severity': 'medium',
+            'description': 'Public ACLs are not blocked'
+        },
+        {
+            'id': 'aws_s3_public_policy_not_blocked',
+            'resource_types': ['aws_s3_bucket_public_access_block', 'aws_s3_account_public_access_block'],
+            'when': ['block_public_policy != true'],
+            'issue': 'public_access',
+            'severity': 'medium',
+            'description': 'Public bucket policies are not blocked'
+        },
+        {
+            'id': 'aws_db_publicly_accessible',
+            'resource_types': ['aws_db_instance'],
+            'when': ['publicly_accessible == true'],
+            'issue': 'public_access',
+            'severity': 'high',
+            'description': 'Database is publicly accessible'
+        },
+        {
+            'id': 'azurerm_storage_account_public_blobs',
+            'resource_types': ['azurerm_storage_account'],
+            'when': ['allow_nested_items_to_be_public == true'],
+            'issue': 'public_access',
+            'severity': 'medium',
+            'description': 'Storage account allows public blob access'
+        },
+        {
+            'id': 'google_storage_bucket_public_members',
+            'resource_types': ['google_storage_bucket_iam_member', 'google_storage_bucket_iam_binding'],
+            'when': ['member in ["allUsers", "allAuthenticatedUsers"]'],
+            'issue': 'public_access',
+            'severity': 'high',
+            'description': 'Bucket access is granted to all users'
+        },
+
+        # Administrative access
+        {
+            'id': 'aws_iam_admin_policy_attachment',
+            'resource_types': ['aws_iam_*_policy_attachment', 'aws_iam_policy_attachment'],
+            'when': ['policy_arn matches ":policy/(AdministratorAccess|IAMFullAccess)$"'],
+            'issue': 'admin_access',
+            'severity': 'high',
+            'description': 'Attaches an administrative managed policy'
+        },
+        {
+            'id': 'google_primitive_role_member',
+            'resource_types': ['google_project_iam_member', 'google_project_iam_binding'],
+            'when': ['role in ["roles/owner", "roles/editor"]'],
+            'issue': 'admin_access',
+            'severity': 'high',
+            'description': 'Grants a primitive project role'
+        },
+        {
+            'id': 'azurerm_owner_role_assignment',
+            'resource_types': ['azurerm_role_assignment'],
+            'when': ['role_definition_name in ["Owner", "Contributor", "User Access Administrator"]'],
+            'issue': 'admin_access',
+            'severity': 'high',
+            'description': 'Assigns a privileged built-in role'
+        },
+
+        # Monitoring
+        {
+            'id': 'aws_cloudtrail_log_validation_disabled',
+            'resource_types': ['aws_cloudtrail'],
+            'when': ['enable_log_file_validation != true'],
+            'issue': 'logging',
+            'severity': 'medium',
+            'description': 'Log file validation is disabled'
+        }
+    ]
+}
@@ -0,0 +1,212 @@
+"""
+Terraform resource address parser
+
+Parses addresses such as ``module.net.module.vpc["eu"].aws_subnet.private[3]``
+into their module path, mode, type, name and instance key. Instance keys are
+scanned as quoted strings, so keys containing dots, brackets or escaped
+quotes (``["kubernetes.io/role"]``) are handled correctly.
+"""
+
+import json
+import re
+from typing import NamedTuple, Optional, Tuple, Union
+
+
+InstanceKey = Optional[Union[int, str]]
+
+# Leading ``module.<name>[<key>].`` steps of an address
+_MODULE_PREFIX = re.compile(r'(?:module\.[\w-]+(?:\[(?:\d+|"(?:[^"\\]|\\.)*")\])?\.)*')
+
+
+class AddressParseError(ValueError):
+    """Raised when a resource address is not valid Terraform syntax"""
+
+
+class ModuleInstance(NamedTuple):
+    """One step of a module path, e.g. ``module.vpc["eu"]``"""
+    name: str
+    key: InstanceKey = None
+
+    def __str__(self) -> str:
+        return f"module.{self.name}{format_instance_key(self.key)}"
+
+
+class ResourceAddress(NamedTuple):
+    """Parsed resource instance address"""
+    module_path: Tuple[ModuleInstance, ...]
+    mode: str
+    type: str
+    name: str
+    key: InstanceKey = None
+
+    @property
+    def module_address(self) -> str:
+        """Address of the containing module instance ('' for the root module)."""
+        return format_module_path(self.module_path)
+
+    @property
+    def instance_name(self) -> str:
+        """Resource name with its instance key, e.g. ``private[3]``."""
+        return f"{self.name}{format_instance_key(self.key)}"
+
+    def __str__(self) -> str:
+        resource = f"{'data.' if self.mode == 'data' else ''}{self.type}.{self.instance_name}"
+        module_address = self.module_address
+        return f"{module_address}.{resource}" if module_address else resource
+
+
+def format_instance_key(key: InstanceKey) -> str:
+    """
+    Render an instance key in address syntax.
+
+    Args:
+        key: count index, for_each key or None
+
+    Returns:
+        ``[3]``, ``["eu"]`` or '' when there is no key
+    """
+    if key is None:
+        return ''
+    if isinstance(key, int):
+        return f"[{key}]"
+    return f"[{json.dumps(key)}]"
+
+
+def format_module_path(module_path: Tuple[ModuleInstance, ...]) -> str:
+    """
+    Render a module path in address syntax.
+
+    Args:
+        module_path: Module instances from the root down
+
+    Returns:
+        Address such as ``module.net.module.vpc["eu"]`` ('' for the root module)
+    """
+    return '.'.join(str(step) for step in module_path)
+
+
+class _Scanner:
+    """Character scanner over one address"""
+
+    def __init__(self, address: str):
+        self.address = address
+        self.pos = 0
+
+    def at_end(self) -> bool:
+        return self.pos >= len(self.address)
+
+    def peek(self) -> str:
+        return self.address[self.pos] if self.pos < len(self.address) else ''
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            found = repr(self.peek()) if self.peek() else 'end of address'
+            raise AddressParseError(f"Expected {char!r} at position {self.pos} of {self.address!r}, found {found}")
+        self.pos += 1
+
+    def identifier(self) -> str:
+        start = self.pos
+        while not self.at_end() and (self.address[self.pos].isalnum() or self.address[self.pos] in '_-'):
+            self.pos += 1
+        if self.pos == start:
+            raise AddressParseError(f"Expected a name at position {start} of {self.address!r}")
+        return self.address[start:self.pos]
+
+    def instance_key(self) -> InstanceKey:
+        if self.peek() != '[':
+            return None
+        self.pos += 1
+
+        if self.peek() == '"':
+            # JSON-compatible string literal, so escapes and dots are kept intact
+            try:
+                key, end = json.JSONDecoder().raw_decode(self.address, self.pos)
+            except json.JSONDecodeError as e:
+                raise AddressParseError(f"Invalid instance key in {self.address!r}: {e.msg}") from e
+            self.pos = end
+        else:
+            start = self.pos
+            while self.peek().isdigit():
+                self.pos += 1
+            if self.pos == start:
+                raise AddressParseError(f"Invalid instance key at position {start} of {self.address!r}")
+            key = int(self.address[start:self.pos])
+
+        self.expect(']')
+        return key
+
+
+def parse_address(address: str) -> ResourceAddress:
+    """
+    Parse a resource instance address.
+
+    Args:
+        address: Address from the plan, e.g. ``module.app.aws_instance.web[0]``
+
+    Returns:
+        ResourceAddress
+
+    Raises:
+        AddressParseError: If the address is not valid
+    """
+    scanner = _Scanner(address)
+    module_path = []
+
+    while True:
+        start = scanner.pos
+        word = scanner.identifier()
+        if word == 'module' and scanner.peek() == '.':
+            scanner.expect('.')
+            name = scanner.identifier()
+            module_path.append(ModuleInstance(name, scanner.instance_key()))
+            scanner.expect('.')
+            continue
+        scanner.pos = start
+        break
+
+    mode = 'managed'
+    if address.startswith('data.', scanner.pos):
+        mode = 'data'
+        scanner.pos += len('data.')
+
+    resource_type = scanner.identifier()
+    scanner.expect('.')
+    name = scanner.identifier()
+    key = scanner.instance_key()
+
+    if not scanner.at_end():
+        raise AddressParseError(f"Unexpected {scanner.peek()!r} at position {scanner.pos} of {address!r}")
+    return ResourceAddress(tuple(module_path), mode, resource_type, name, key)
+
+
+def resource_name_from_address(address: str) -> str:
+    """
+    Get a display name for a resource from its address.
+
+    Args:
+        address: Resource address
+
+    Returns:
+        Resource name with instance key, or the last address segment if the
+        address cannot be parsed
+    """
+    try:
+        return parse_address(address).instance_name
+    except AddressParseError:
+        return address.split('.')[-1]
+
+
+def module_address_from_address(address: str) -> str:
+    """
+    Get the address of the module instance containing a resource.
+
+    Matches the leading module steps only, so it is much cheaper than
+    parse_address for bulk lookups.
+
+    Args:
+        address: Resource address
+
+    Returns:
+        Module instance address such as ``module.vpc["eu"]`` ('' for the root module)
+    """
+    return _MODULE_PREFIX.match(address).group()[:-1]
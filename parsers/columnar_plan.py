@@ -0,0 +1,312 @@
+"""
+Columnar Plan Parser
+
+Parser view of a plan analyzed in a worker process. The worker encodes the
+plan's resource changes as a columnar table (see utils.plan_worker_pool);
+the dashboard reads that table through ColumnarPlanParser, which answers
+the same queries as PlanParser without decoding the plan JSON in the
+Streamlit process.
+
+Addresses, types, names, actions, structural hashes and instance group keys
+are columns. Each row also keeps its plan entry as a JSON string, which is
+only decoded when a component reads the entry's before/after values.
+"""
+
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from parsers.plan_parser import PlanParser, primary_action
+from utils.instance_groups import InstanceGroups
+from utils.plan_aggregates import ChangeAggregate
+from utils.plan_comparison import PlanIndex
+from utils.plan_worker_pool import ColumnarAssessments
+from utils.structural_hash import ResourceHashes
+
+
+# Top-level plan sections the dashboard never reads; they stay in the worker
+STATE_SECTIONS = frozenset({'resource_changes', 'planned_values', 'prior_state', 'resource_drift'})
+
+_HASH_COLUMNS = ('hash_root', 'hash_before', 'hash_after', 'hash_meta')
+_FLAG_COLUMNS = ('has_before', 'has_after', 'is_sensitive')
+
+
+class LazyRecord(dict):
+    """
+    Dictionary holding some keys up front and loading the rest on first use.
+
+    Lookups of the keys present from the start never load; any other access
+    calls the loader once, after which the record is an ordinary dictionary.
+    Copies and pickles are plain dictionaries.
+    """
+
+    __slots__ = ('_loader',)
+
+    def __init__(self, fields: Dict[str, Any], loader: Callable[['LazyRecord'], Dict[str, Any]]):
+        """
+        Args:
+            fields: Keys available without loading
+            loader: Returns the complete record (all keys, in order) for a record
+        """
+        super().__init__(fields)
+        self._loader = loader
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the remaining keys have been loaded."""
+        return getattr(self, '_loader', None) is None
+
+    def load(self) -> None:
+        """Load the remaining keys if not done yet."""
+        loader = getattr(self, '_loader', None)
+        if loader is not None:
+            self._loader = None
+            complete = loader(self)
+            dict.clear(self)
+            dict.update(self, complete)
+
+    def __getitem__(self, key: Any) -> Any:
+        if not dict.__contains__(self, key):
+            self.load()
+        return dict.__getitem__(self, key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if not dict.__contains__(self, key):
+            self.load()
+        return dict.get(self, key, default)
+
+    def __contains__(self, key: Any) -> bool:
+        if dict.__contains__(self, key):
+            return True
+        self.load()
+        return dict.__contains__(self, key)
+
+    def __eq__(self, other: Any) -> bool:
+        self.load()
+        if isinstance(other, LazyRecord):
+            other.load()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: Any) -> bool:
+        self.load()
+        if isinstance(other, LazyRecord):
+            other.load()
+        return dict.__ne__(self, other)
+
+    __hash__ = None
+
+    def __reduce_ex__(self, protocol: int) -> Tuple[Any, ...]:
+        self.load()
+        return dict, (dict(self),)
+
+
+def _loading(name: str) -> Callable[..., Any]:
+    """Wrap a dict method so that it loads the record first."""
+    method = getattr(dict, name)
+
+    def wrapper(self, *args, **kwargs):
+        self.load()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in ('__iter__', '__len__', '__repr__', '__reversed__', '__setitem__', '__delitem__', '__or__',
+              '__ior__', 'keys', 'items', 'values', 'copy', 'pop', 'popitem', 'setdefault', 'update'):
+    setattr(LazyRecord, _name, _loading(_name))
+del _name
+
+
+def _decode_entry(entry: str) -> Callable[[LazyRecord], Dict[str, Any]]:
+    """Loader decoding a plan entry from its JSON text."""
+    return lambda record: json.loads(entry)
+
+
+def _normalized_loader(raw: LazyRecord) -> Callable[[LazyRecord], Dict[str, Any]]:
+    """Loader completing a normalized change (PlanParser.get_resource_changes() layout) from its plan entry."""
+    def load(record: LazyRecord) -> Dict[str, Any]:
+        change = raw.get('change', {})
+        return {
+            'address': dict.__getitem__(record, 'address'),
+            'type': dict.__getitem__(record, 'type'),
+            'name': dict.__getitem__(record, 'name'),
+            'action': dict.__getitem__(record, 'action'),
+            'actions': dict.__getitem__(record, 'actions'),
+            'before': change.get('before'),
+            'after': change.get('after'),
+            'change': change,
+            'provider': dict.__getitem__(record, 'provider')
+        }
+    return load
+
+
+def build_change_table(parser: PlanParser, plan_index: PlanIndex) -> ColumnarAssessments:
+    """
+    Encode the resource changes of a parsed plan as a columnar table.
+
+    Runs in the worker process, after the analysis, so the parser's instance
+    groups are already built.
+
+    Args:
+        parser: PlanParser of the plan
+        plan_index: PlanIndex of the plan
+
+    Returns:
+        ColumnarAssessments with one row per plan entry (including no-ops)
+    """
+    instance_groups = parser.get_instance_groups()
+    normalized = iter(parser.get_resource_changes())
+    rows = []
+    for change in parser.resource_changes:
+        address = change.get('address', '')
+        actions = list(change.get('change', {}).get('actions', []))
+        action = primary_action(actions)
+        hashes = plan_index.hashes[address]
+        row = {
+            'address': address,
+            'type': change.get('type') or '',
+            'name': change.get('name') or '',
+            'provider': parser._extract_provider_from_resource_type(change.get('type', '')),
+            'action': action or '',
+            'actions': actions,
+            'entry': json.dumps(change, separators=(',', ':')),
+            'hash_root': hashes.root,
+            'hash_before': hashes.before,
+            'hash_after': hashes.after,
+            'hash_meta': hashes.meta,
+            'group_config': '',
+            'group_shape': '',
+            'has_before': 0.0,
+            'has_after': 0.0,
+            'is_sensitive': 0.0
+        }
+        if action is not None:
+            normalized_change = next(normalized)
+            group_config, _, group_shape = instance_groups.group_of(address).key
+            row['group_config'] = group_config
+            row['group_shape'] = group_shape
+            for column, flag in zip(_FLAG_COLUMNS, parser.get_change_flags(normalized_change)):
+                row[column] = float(flag)
+        rows.append(row)
+    return ColumnarAssessments.from_records(rows)
+
+
+class ColumnarPlanParser(PlanParser):
+    """
+    PlanParser over the columnar change table of a worker analysis.
+
+    Summaries computed by the worker are returned as they are; resource
+    changes, instance groups, table flags and the plan index are rebuilt
+    from the table columns.
+    """
+
+    def __init__(self, table: ColumnarAssessments, sections: Dict[str, Any],
+                 change_aggregate: ChangeAggregate, resource_types: Dict[str, int],
+                 debug_info: Dict[str, Any], detected_providers: Dict[str, int]):
+        """
+        Args:
+            table: Change table built by build_change_table()
+            sections: Top-level plan sections other than STATE_SECTIONS
+            change_aggregate: ChangeAggregate of the whole plan
+            resource_types: Resource type counts (PlanParser.get_resource_types())
+            debug_info: Debug information (PlanParser.get_debug_info())
+            detected_providers: Resource counts per detected provider
+        """
+        self._table = table
+        self._change_aggregate = change_aggregate
+        self._resource_types = resource_types
+        self._debug_info = debug_info
+        self._changes: Optional[List[LazyRecord]] = None
+        self._flags: Optional[Dict[str, Tuple[bool, bool, bool]]] = None
+
+        columns = table.columns
+        self.resource_changes = [
+            LazyRecord({'address': address, 'type': resource_type, 'name': name}, _decode_entry(entry))
+            for address, resource_type, name, entry in zip(
+                columns['address'], columns['type'], columns['name'], columns['entry']
+            )
+        ] if table.rows else []
+        self.plan_data = dict(sections)
+        self.plan_data['resource_changes'] = self.resource_changes
+        self.terraform_version = sections.get('terraform_version', 'Unknown')
+        self.format_version = sections.get('format_version', 'Unknown')
+        self.detected_providers = detected_providers
+
+        self._dependency_graph = None
+        self._instance_groups = None
+
+    def get_change_aggregate(self, resource_changes: Optional[List[Dict[str, Any]]] = None) -> ChangeAggregate:
+        if resource_changes is None:
+            return self._change_aggregate
+        return super().get_change_aggregate(resource_changes)
+
+    def get_resource_changes(self) -> List[Dict[str, Any]]:
+        """Get the normalized resource changes; before/after are decoded on first use"""
+        if self._changes is None:
+            columns = self._table.columns
+            self._changes = [
+                LazyRecord(
+                    {'address': columns['address'][row], 'type': columns['type'][row], 'name': columns['name'][row],
+                     'action': action, 'actions': columns['actions'][row], 'provider': columns['provider'][row]},
+                    _normalized_loader(self.resource_changes[row])
+                )
+                for row, action in enumerate(columns['action']) if action
+            ] if self._table.rows else []
+        return list(self._changes)
+
+    def get_resource_types(self) -> Dict[str, int]:
+        return dict(self._resource_types)
+
+    def get_debug_info(self) -> Dict[str, Any]:
+        return dict(self._debug_info)
+
+    def get_plan_metadata(self) -> Dict[str, Any]:
+        metadata = super().get_plan_metadata()
+        plan_keys = self._debug_info.get('plan_keys', [])
+        metadata['has_planned_values'] = 'planned_values' in plan_keys
+        metadata['has_prior_state'] = 'prior_state' in plan_keys
+        return metadata
+
+    def get_instance_groups(self) -> InstanceGroups:
+        """Get the instance groups from the group keys computed by the worker"""
+        if self._instance_groups is None:
+            columns = self._table.columns
+            positions = [row for row, action in enumerate(columns['action']) if action] if self._table.rows else []
+            groups = InstanceGroups()
+            for change, row in zip(self.get_resource_changes(), positions):
+                key = (columns['group_config'][row], tuple(columns['actions'][row]), columns['group_shape'][row])
+                groups.add(change, key=key)
+            self._instance_groups = groups
+        return self._instance_groups
+
+    def get_change_flags(self, change: Dict[str, Any]) -> Tuple[bool, bool, bool]:
+        if self._flags is None:
+            columns = self._table.columns
+            self._flags = {
+                address: (bool(has_before), bool(has_after), bool(is_sensitive))
+                for address, action, has_before, has_after, is_sensitive in zip(
+                    columns['address'], columns['action'],
+                    *(columns[column].tolist() for column in _FLAG_COLUMNS)
+                )
+                if action
+            } if self._table.rows else {}
+        flags = self._flags.get(change.get('address'))
+        return flags if flags is not None else super().get_change_flags(change)
+
+    def get_plan_index(self) -> PlanIndex:
+        """
+        Get the PlanIndex of the plan from the hashes computed by the worker.
+
+        Returns:
+            PlanIndex equal to PlanIndex.from_plan() of the original plan
+        """
+        columns = self._table.columns
+        hashes = {}
+        actions = {}
+        if self._table.rows:
+            for address, entry_actions, *entry_hashes in zip(
+                    columns['address'], columns['actions'], *(columns[column] for column in _HASH_COLUMNS)):
+                hashes[address] = ResourceHashes(*entry_hashes)
+                actions[address] = list(entry_actions)
+        return PlanIndex(hashes, actions)
@@ -1,13 +1,49 @@
 import json
-import pandas as pd
-from typing import Dict, List, Any, Optional
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple
 from collections import defaultdict, Counter
 
+from parsers.address_parser import resource_name_from_address
+from utils.dependency_graph import KIND_DATA, KIND_RESOURCE, DependencyGraph, rank_blast_radius
+from utils.instance_groups import InstanceGroups
+from utils.plan_aggregates import ChangeAggregate
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def primary_action(change_actions: List[str]) -> Optional[str]:
+    """
+    Normalize the actions of a resource change to a single primary action for display.
+
+    Args:
+        change_actions: Actions of the plan entry
+
+    Returns:
+        'create', 'update', 'delete' or 'replace', or None for unchanged (no-op) resources
+    """
+    if not change_actions or change_actions == ['no-op']:
+        return None
+    if set(change_actions) == {'create', 'delete'}:
+        # This is a replacement
+        return 'replace'
+    if 'delete' in change_actions:
+        return 'delete'
+    if 'update' in change_actions:
+        return 'update'
+    if 'create' in change_actions:
+        return 'create'
+    return 'update'  # Default for unknown actions
+
 
 class PlanParser:
     """Enhanced parser for Terraform plan JSON files with multi-cloud support"""
 
-    def __init__(self, plan_data: Dict[str, Any]):
+    def __init__(self, plan_data: Dict[str, Any], instance_groups: Optional[InstanceGroups] = None):
+        """
+        Args:
+            plan_data: Terraform plan JSON data
+            instance_groups: Instance groups already built for this plan (e.g. on an earlier rerun)
+        """
         self.plan_data = plan_data
         self.resource_changes = plan_data.get('resource_changes', [])
         self.terraform_version = plan_data.get('terraform_version', 'Unknown')
@@ -16,6 +52,10 @@ class PlanParser:
         # Multi-cloud detection
         self.detected_providers = self._detect_providers()
 
+        # Built on first use
+        self._dependency_graph = None
+        self._instance_groups = instance_groups
+
     def _detect_providers(self) -> Dict[str, int]:
         """Detect cloud providers from resource types"""
         providers = Counter()
@@ -37,50 +77,22 @@ class PlanParser:
 
     def get_summary(self) -> Dict[str, int]:
         """Get summary of planned changes"""
-        summary = {
-            'create': 0,
-            'update': 0,
-            'delete': 0,
-            'total': 0
-        }
-
-        for change in self.resource_changes:
-            actions = change.get('change', {}).get('actions', [])
+        return self.get_change_aggregate().summary()
 
-            # Skip no-op actions (unchanged resources)
-            if not actions or actions == ['no-op']:
-                continue
+    def get_change_aggregate(self, resource_changes: Optional[List[Dict[str, Any]]] = None) -> ChangeAggregate:
+        """
+        Aggregate action counts into a mergeable partial result.
 
-            # Handle different action combinations
-            if actions == ['create']:
-                summary['create'] += 1
-            elif actions == ['delete']:
-                summary['delete'] += 1
-            elif actions == ['update']:
-                summary['update'] += 1
-            elif set(actions) == {'create', 'delete'}:
-                # This is a replacement: destroy old, create new
-                # Count as both create and delete for action totals
-                summary['create'] += 1
-                summary['delete'] += 1
-            elif 'update' in actions:
-                summary['update'] += 1
-            elif 'create' in actions:
-                summary['create'] += 1
-            elif 'delete' in actions:
-                summary['delete'] += 1
+        Args:
+            resource_changes: Raw resource changes to aggregate (defaults to
+                the whole plan; pass a shard to aggregate it independently)
 
-        # Calculate total as actual changed resources (not sum of actions)
-        # Count replacements as single resources, not double
-        total_changed = 0
-        for change in self.resource_changes:
-            actions = change.get('change', {}).get('actions', [])
-            if actions and actions != ['no-op']:
-                total_changed += 1
-
-        summary['total'] = total_changed
-
-        return summary
+        Returns:
+            ChangeAggregate backing get_summary() and get_actions_by_provider()
+        """
+        if resource_changes is None:
+            resource_changes = self.resource_changes
+        return ChangeAggregate.from_resource_changes(resource_changes, self._extract_provider_from_resource_type)
 
     def get_resource_changes(self) -> List[Dict[str, Any]]:
         """Get list of all resource changes with normalized structure"""
@@ -90,22 +102,10 @@ class PlanParser:
             change_actions = change.get('change', {}).get('actions', [])
 
             # Skip no-op actions (unchanged resources)
-            if not change_actions or change_actions == ['no-op']:
+            action = primary_action(change_actions)
+            if action is None:
                 continue
 
-            # Normalize the action to a single primary action for display
-            if set(change_actions) == {'create', 'delete'}:
-                # This is a replacement
-                primary_action = 'replace'
-            elif 'delete' in change_actions:
-                primary_action = 'delete'
-            elif 'update' in change_actions:
-                primary_action = 'update'
-            elif 'create' in change_actions:
-                primary_action = 'create'
-            else:
-                primary_action = 'update'  # Default for unknown actions
-
             # Extract provider from resource type
             resource_type = change.get('type', '')
             provider = self._extract_provider_from_resource_type(resource_type)
@@ -114,7 +114,7 @@ class PlanParser:
                 'address': change.get('address', ''),
                 'type': resource_type,
                 'name': change.get('name', ''),
-                'action': primary_action,
+                'action': action,
                 'actions': change_actions,
                 'before': change.get('change', {}).get('before'),
                 'after': change.get('change', {}).get('after'),
@@ -183,26 +183,7 @@ class PlanParser:
 
     def get_actions_by_provider(self) -> Dict[str, Dict[str, int]]:
         """Get breakdown of actions by cloud provider"""
-        actions_by_provider = defaultdict(lambda: {'create': 0, 'update': 0, 'delete': 0, 'total': 0})
-
-        for change in self.resource_changes:
-            actions = change.get('change', {}).get('actions', [])
-            if not actions or actions == ['no-op']:
-                continue
-
-            resource_type = change.get('type', 'unknown')
-            provider = self._extract_provider_from_resource_type(resource_type)
-
-            actions_by_provider[provider]['total'] += 1
-
-            if 'create' in actions:
-                actions_by_provider[provider]['create'] += 1
-            elif 'update' in actions:
-                actions_by_provider[provider]['update'] += 1
-            elif 'delete' in actions:
-                actions_by_provider[provider]['delete'] += 1
-
-        return dict(actions_by_provider)
+        return self.get_change_aggregate().actions_by_provider()
 
     def get_sensitive_changes(self) -> List[Dict[str, Any]]:
         """Identify changes involving sensitive values"""
@@ -249,25 +230,42 @@ class PlanParser:
 
         return False
 
-    def create_detailed_dataframe(self, resource_changes: List[Dict[str, Any]]) -> pd.DataFrame:
+    def create_detailed_dataframe(self, resource_changes: List[Dict[str, Any]]) -> 'pd.DataFrame':
         """Create a detailed pandas DataFrame from resource changes with provider info"""
+        # Imported here so headless callers (CLI, workers) never pay for pandas
+        import pandas as pd
+
         rows = []
 
         for change in resource_changes:
+            has_before, has_after, is_sensitive = self.get_change_flags(change)
             rows.append({
                 'resource_address': change['address'],
                 'resource_type': change['type'],
-                'resource_name': change['name'] or change['address'].split('.')[-1],
+                'resource_name': change['name'] or resource_name_from_address(change['address']),
                 'action': change['action'],
                 'actions_list': ', '.join(change['actions']),
                 'provider': change.get('provider', 'unknown'),  # NEW: Provider column
-                'has_before': change['before'] is not None,
-                'has_after': change['after'] is not None,
-                'is_sensitive': self._has_sensitive_values(change['after']) if change['after'] else False
+                'has_before': has_before,
+                'has_after': has_after,
+                'is_sensitive': is_sensitive
             })
 
         return pd.DataFrame(rows)
 
+    def get_change_flags(self, change: Dict[str, Any]) -> Tuple[bool, bool, bool]:
+        """
+        Get the before/after presence and sensitivity flags of a normalized change.
+
+        Args:
+            change: Entry of get_resource_changes()
+
+        Returns:
+            Tuple of (has_before, has_after, is_sensitive)
+        """
+        after = change['after']
+        return change['before'] is not None, after is not None, self._has_sensitive_values(after) if after else False
+
     def get_plan_metadata(self) -> Dict[str, Any]:
         """Get metadata about the plan including multi-cloud info"""
         return {
@@ -284,21 +282,29 @@ class PlanParser:
             'has_prior_state': 'prior_state' in self.plan_data
         }
 
-    def get_dependency_info(self) -> Dict[str, List[str]]:
-        """Extract basic dependency information from configuration"""
-        dependencies = {}
+    def get_dependency_graph(self) -> DependencyGraph:
+        """Get the configuration dependency graph (built once per parser)"""
+        if self._dependency_graph is None:
+            self._dependency_graph = DependencyGraph.from_plan(self.plan_data)
+        return self._dependency_graph
 
-        # Try to extract from configuration if available
-        config = self.plan_data.get('configuration', {})
-        root_module = config.get('root_module', {})
-        resources = root_module.get('resources', [])
+    def get_instance_groups(self) -> InstanceGroups:
+        """Get the count/for_each instance groups of the resource changes (built once per parser)"""
+        if self._instance_groups is None:
+            self._instance_groups = InstanceGroups.build(self.get_resource_changes())
+        return self._instance_groups
 
-        for resource in resources:
-            address = resource.get('address', '')
-            depends_on = resource.get('depends_on', [])
+    def get_dependency_info(self) -> Dict[str, List[str]]:
+        """Get the resources each configured resource depends on, across all modules"""
+        graph = self.get_dependency_graph()
+        dependencies = {}
 
-            if depends_on:
-                dependencies[address] = depends_on
+        for address, kind in zip(graph.addresses, graph.kinds):
+            if kind not in (KIND_RESOURCE, KIND_DATA):
+                continue
+            resource_dependencies = graph.resource_dependencies(address)
+            if resource_dependencies:
+                dependencies[address] = resource_dependencies
 
         return dependencies
 
@@ -351,7 +357,8 @@ class PlanParser:
             'unique_resource_types': len(resource_types),
             'detected_providers': self.detected_providers,  # NEW
             'multi_cloud_complexity': multi_cloud_complexity,  # NEW
-            'actions_by_provider': actions_by_provider  # NEW
+            'actions_by_provider': actions_by_provider,  # NEW
+            'dependency_impact': rank_blast_radius(self.get_dependency_graph(), self.get_resource_changes())
         }
 
     def get_cross_provider_dependencies(self) -> List[Dict[str, Any]]:
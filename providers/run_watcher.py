@@ -0,0 +1,425 @@
+"""
+TFE Run Status Watcher
+
+Polls Terraform Cloud/Enterprise run status in background threads so the
+dashboard does not fail when a run is still planning. As soon as the plan is
+ready, the watcher downloads the plan JSON and pre-analyzes it so the
+dashboard is already warm when the reviewer opens it. Direct plan retrievals
+also run on watcher threads, so retry and rate-limit waits never block the
+Streamlit script thread.
+
+Watches are coalesced: every session watching the same run with the same
+credentials shares one polling thread and one prefetched result.
+"""
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from providers.tfe_client import TFEClient
+from utils.credential_manager import CredentialManager
+from utils.tfe_error_handler import TFEErrorHandler
+
+try:
+    from providers.standalone_tfe_client import StandaloneTFEClient
+except ImportError:
+    # Direct retrievals through TFEClient still work without the standalone client
+    StandaloneTFEClient = None
+
+
+# Run statuses where the plan has not been produced yet
+PENDING_RUN_STATUSES = {
+    'pending', 'fetching', 'fetching_completed', 'queuing', 'plan_queued',
+    'planning', 'pre_plan_running', 'pre_plan_completed'
+}
+
+# Run statuses where plan JSON output is available
+PLAN_READY_RUN_STATUSES = {
+    'planned', 'planned_and_finished', 'planned_and_saved', 'cost_estimating',
+    'cost_estimated', 'policy_checking', 'policy_checked', 'policy_override',
+    'policy_soft_failed', 'post_plan_running', 'post_plan_completed',
+    'confirmed', 'apply_queued', 'applying', 'applied'
+}
+
+# Run statuses that will never produce a plan
+FAILED_RUN_STATUSES = {'errored', 'canceled', 'force_canceled', 'discarded'}
+
+
+class WatchState(Enum):
+    """Lifecycle states of a run watch"""
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+    TIMED_OUT = "timed_out"
+    STOPPED = "stopped"
+
+
+@dataclass
+class RunWatch:
+    """Shared state of one watched run"""
+    key: Tuple[str, str, str]
+    run_id: str
+    state: WatchState = WatchState.PENDING
+    run_status: Optional[str] = None
+    plan_data: Optional[Dict[str, Any]] = None
+    analysis: Optional[Any] = None
+    error: Optional[str] = None
+    message: Optional[str] = None
+    polls: int = 0
+    subscribers: int = 0
+    started_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    _done: threading.Event = field(default_factory=threading.Event, repr=False)
+    _stop: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def is_done(self) -> bool:
+        """Whether the watch reached a final state."""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the watch reaches a final state.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the watch finished within the timeout
+        """
+        return self._done.wait(timeout)
+
+
+def _default_analyzer(plan_data: Dict[str, Any]) -> Any:
+    """Pre-analyze a plan with the same headless engine the dashboard uses."""
+    from utils.analysis_engine import analyze_plan
+
+    return analyze_plan(plan_data, include_security=False)
+
+
+class RunStatusWatcher:
+    """
+    Background watcher for TFE run status with adaptive polling.
+
+    Polling starts at ``min_interval`` and backs off by ``backoff`` up to
+    ``max_interval`` while the status is unchanged; any status transition
+    resets the interval so the final planning steps are picked up quickly.
+    """
+
+    def __init__(self, analyzer: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                 min_interval: float = 2.0, max_interval: float = 30.0,
+                 backoff: float = 1.5, max_wait: float = 3600.0, max_poll_errors: int = 3,
+                 result_ttl: float = 600.0):
+        """
+        Initialize the run watcher.
+
+        Args:
+            analyzer: Callable run on the plan as soon as it is downloaded
+            min_interval: Initial polling interval (seconds)
+            max_interval: Maximum polling interval (seconds)
+            backoff: Interval multiplier while status is unchanged
+            max_wait: Give up after this many seconds
+            max_poll_errors: Consecutive polling errors before giving up
+            result_ttl: Seconds a finished watch (and its plan) is kept for other sessions
+        """
+        self.analyzer = analyzer or _default_analyzer
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_wait = max_wait
+        self.max_poll_errors = max_poll_errors
+        self.result_ttl = result_ttl
+        self._watches: Dict[Tuple[str, str, str], RunWatch] = {}
+        self._lock = threading.Lock()
+
+    def watch(self, client: StandaloneTFEClient, run_status: Optional[str] = None) -> RunWatch:
+        """
+        Start watching the run configured on an authenticated client.
+
+        If another session already watches the same run with the same
+        credentials, its watch is shared instead of starting a new poller.
+
+        Args:
+            client: Authenticated StandaloneTFEClient with a loaded configuration
+            run_status: Run status the caller just checked; the first poll
+                then waits one interval instead of asking again
+
+        Returns:
+            Shared RunWatch for the run
+        """
+        key = self.watch_key(client.config)
+        return self._start(key, client.config['run_id'], self._poll_loop, client, run_status=run_status)
+
+    def fetch(self, credential_manager: CredentialManager, current: Optional[RunWatch] = None) -> RunWatch:
+        """
+        Retrieve the plan of the configured run on a watcher thread.
+
+        Connection validation, authentication and the plan download run in
+        the background; their retries wait on the watch's stop event, so
+        the calling script only reports progress.
+
+        Args:
+            credential_manager: CredentialManager holding the session's TFE configuration
+            current: Watch this session is already subscribed to, if any
+
+        Returns:
+            Shared RunWatch for the run
+        """
+        config = credential_manager.get_config()
+        key = self.watch_key({'tfe_server': config.tfe_server, 'run_id': config.run_id, 'token': config.token})
+        return self._start(key, config.run_id, self._fetch_plan, credential_manager, current=current)
+
+    def _start(self, key: Tuple[str, str, str], run_id: str, target: Callable[[RunWatch, Any], None],
+               source: Any, run_status: Optional[str] = None,
+               current: Optional[RunWatch] = None) -> RunWatch:
+        """Join the watch for a key, starting its background thread if needed."""
+        with self._lock:
+            self._evict_expired()
+            watch = self._watches.get(key)
+            if watch is not None and watch is current:
+                return watch
+            if watch is None or watch.state == WatchState.STOPPED:
+                watch = RunWatch(key=key, run_id=run_id, run_status=run_status)
+                self._watches[key] = watch
+                thread = threading.Thread(
+                    target=target,
+                    args=(watch, source),
+                    name=f"tfe-run-watch-{watch.run_id}",
+                    daemon=True
+                )
+                thread.start()
+            watch.subscribers += 1
+            return watch
+
+    def get_watch(self, config: Dict[str, Any]) -> Optional[RunWatch]:
+        """Get the existing watch for a configuration, if any."""
+        with self._lock:
+            self._evict_expired()
+            return self._watches.get(self.watch_key(config))
+
+    def subscribe(self, watch: RunWatch) -> RunWatch:
+        """
+        Add a subscription to an existing watch.
+
+        Args:
+            watch: Watch returned by get_watch()
+
+        Returns:
+            The watch
+        """
+        with self._lock:
+            watch.subscribers += 1
+            return watch
+
+    def unwatch(self, watch: RunWatch) -> None:
+        """
+        Release a subscription; polling stops when no session is left.
+
+        Args:
+            watch: Watch returned by watch()
+        """
+        with self._lock:
+            watch.subscribers = max(0, watch.subscribers - 1)
+            if watch.subscribers == 0:
+                watch._stop.set()
+                if self._watches.get(watch.key) is watch:
+                    del self._watches[watch.key]
+
+    def stop_all(self) -> None:
+        """Stop every active watch."""
+        with self._lock:
+            for watch in self._watches.values():
+                watch._stop.set()
+            self._watches.clear()
+
+    def _evict_expired(self) -> None:
+        """Drop finished watches older than the result TTL so plans do not linger in memory."""
+        now = time.time()
+        expired = [
+            key for key, watch in self._watches.items()
+            if watch.is_done and now - watch.updated_at > self.result_ttl
+        ]
+        for key in expired:
+            del self._watches[key]
+
+    def next_interval(self, current: float, status_changed: bool) -> float:
+        """
+        Compute the next polling interval.
+
+        Args:
+            current: Current interval (seconds)
+            status_changed: Whether the last poll observed a status transition
+
+        Returns:
+            Next interval (seconds)
+        """
+        if status_changed:
+            return self.min_interval
+        return min(self.max_interval, current * self.backoff)
+
+    @staticmethod
+    def watch_key(config: Dict[str, Any]) -> Tuple[str, str, str]:
+        """
+        Build the coalescing key for a configuration.
+
+        The token is part of the key (as a digest) so sessions only share
+        results fetched with the same credentials.
+        """
+        token_digest = hashlib.sha256(config['token'].encode('utf-8')).hexdigest()[:16]
+        return config['tfe_server'].lower().rstrip('/'), config['run_id'], token_digest
+
+    def _poll_loop(self, watch: RunWatch, client: StandaloneTFEClient) -> None:
+        """Poll run status until the plan is ready, the run fails, or the watch stops."""
+        interval = self.min_interval
+        consecutive_errors = 0
+        deadline = time.monotonic() + self.max_wait
+        if watch.run_status is not None:
+            # The status was just checked by the caller
+            watch._stop.wait(interval)
+
+        while not watch._stop.is_set():
+            status, error = client.get_run_status()
+            watch.polls += 1
+            watch.updated_at = time.time()
+
+            if error:
+                consecutive_errors += 1
+                if consecutive_errors >= self.max_poll_errors:
+                    self._finish(watch, WatchState.FAILED, error=error)
+                    return
+            else:
+                consecutive_errors = 0
+                status_changed = status != watch.run_status
+                watch.run_status = status
+
+                if status in PLAN_READY_RUN_STATUSES or status in FAILED_RUN_STATUSES:
+                    self._prefetch(watch, client)
+                    return
+
+                interval = self.next_interval(interval, status_changed)
+
+            if time.monotonic() + interval > deadline:
+                self._finish(watch, WatchState.TIMED_OUT,
+                             error=f"Run {watch.run_id} did not finish planning within {int(self.max_wait)} seconds")
+                return
+
+            # Interruptible wait so unwatch() stops the poller promptly
+            watch._stop.wait(interval)
+
+        self._finish(watch, WatchState.STOPPED)
+
+    def _prefetch(self, watch: RunWatch, client: StandaloneTFEClient) -> None:
+        """Download and pre-analyze the plan once the run has one."""
+        plan_data, error = client.get_plan_json()
+        if error or plan_data is None:
+            if watch.run_status in FAILED_RUN_STATUSES:
+                error = f"Run {watch.run_id} ended with status '{watch.run_status}': {error}"
+            self._finish(watch, WatchState.FAILED, error=error)
+            return
+
+        self._complete(watch, plan_data)
+
+    def _fetch_plan(self, watch: RunWatch, credential_manager: CredentialManager) -> None:
+        """Validate, authenticate and download the configured plan with interruptible retries."""
+        handler = TFEErrorHandler(wait=watch._stop.wait, notify=lambda message: self._report(watch, message))
+        client = TFEClient(credential_manager, error_handler=handler)
+        config = credential_manager.get_config()
+        plan_data = None
+        try:
+            self._report(watch, "Validating connection to TFE server...")
+            ok, error = client.validate_connection()
+            if ok:
+                self._report(watch, "Authenticating with TFE...")
+                ok, error = client.authenticate(config.tfe_server, config.token, config.organization)
+            if ok:
+                self._report(watch, "Downloading plan data from workspace run...")
+                plan_data, error = client.get_plan_json(config.workspace_id, config.run_id)
+        except Exception as e:
+            error = f"Plan retrieval failed: {e}"
+        finally:
+            client.close()
+
+        if watch._stop.is_set():
+            self._finish(watch, WatchState.STOPPED)
+        elif error or plan_data is None:
+            self._finish(watch, WatchState.FAILED, error=error)
+        else:
+            self._complete(watch, plan_data)
+
+    def _report(self, watch: RunWatch, message: str) -> None:
+        """Record a progress or retry message for sessions polling the watch."""
+        watch.message = message
+        watch.updated_at = time.time()
+
+    def _complete(self, watch: RunWatch, plan_data: Dict[str, Any]) -> None:
+        """Pre-analyze a downloaded plan and mark the watch ready."""
+        watch.plan_data = plan_data
+        try:
+            watch.analysis = self.analyzer(plan_data)
+        except Exception as e:
+            # The plan is still usable; the dashboard will analyze it itself
+            watch.error = f"Pre-analysis failed: {e}"
+        self._finish(watch, WatchState.READY, error=watch.error)
+
+    def _finish(self, watch: RunWatch, state: WatchState, error: Optional[str] = None) -> None:
+        """Record the final state and wake up waiters."""
+        watch.state = state
+        watch.error = error
+        watch.updated_at = time.time()
+        watch._done.set()
+
+
+_shared_watcher: Optional[RunStatusWatcher] = None
+_shared_watcher_lock = threading.Lock()
+
+
+def get_run_watcher() -> RunStatusWatcher:
+    """Get the process-wide watcher shared by all dashboard sessions."""
+    global _shared_watcher
+    with _shared_watcher_lock:
+        if _shared_watcher is None:
+            _shared_watcher = RunStatusWatcher()
+        return _shared_watcher
+
+
+def watch_tfe_yaml_upload(yaml_content: str,
+                          current: Optional[RunWatch] = None) -> Tuple[Optional[RunWatch], Optional[str]]:
+    """
+    Join or start a background watch for the run in a TFE YAML configuration.
+
+    The run status is checked once; a watch is only started while the run is
+    still planning. Runs that already finished need no watch and are
+    retrieved directly by the caller.
+
+    Args:
+        yaml_content: YAML configuration content
+        current: Watch this session is already subscribed to, if any
+
+    Returns:
+        Tuple of (watch, error_message); both are None when the run needs no watch
+    """
+    client = StandaloneTFEClient()
+
+    config_loaded, config_error = client.load_config_from_yaml(yaml_content)
+    if not config_loaded:
+        return None, f"Configuration error: {config_error}"
+
+    watcher = get_run_watcher()
+    existing = watcher.get_watch(client.config)
+    if existing is not None:
+        return (existing if existing is current else watcher.subscribe(existing)), None
+
+    authenticated, auth_error = client.authenticate()
+    if not authenticated:
+        return None, f"Authentication error: {auth_error}"
+
+    run_status, status_error = client.get_run_status()
+    if status_error:
+        return None, status_error
+    if run_status not in PENDING_RUN_STATUSES:
+        return None, None
+
+    return watcher.watch(client, run_status), None
@@ -166,6 +166,25 @@ class StandaloneTFEClient:
         except Exception as e:
             return None, f"Plan retrieval error: {e}"
     
+    def get_run_status(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Get the current status of the configured run.
+
+        Returns:
+            Tuple of (run_status, error_message)
+        """
+        if not self.config:
+            return None, "No configuration loaded"
+
+        run_info, error = self._get_run_info()
+        if error:
+            return None, error
+
+        try:
+            return run_info.get('data', {}).get('attributes', {}).get('status'), None
+        except (AttributeError, TypeError):
+            return None, "Could not determine run status"
+
     def _get_run_info(self) -> Tuple[Optional[Dict], Optional[str]]:
         """Get run information to check status."""
         server = self.config['tfe_server']
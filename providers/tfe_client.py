@@ -25,18 +25,21 @@ class TFEClient:
     with proper error handling and retry logic.
     """
     
-    def __init__(self, credential_manager: CredentialManager):
+    def __init__(self, credential_manager: CredentialManager,
+                 error_handler: Optional[TFEErrorHandler] = None):
         """
         Initialize TFE client with credential manager.
         
         Args:
             credential_manager: CredentialManager instance for secure credential access
+            error_handler: Retry scheduler for API calls; the run watcher passes
+                one that waits on its stop event
         """
         self.credential_manager = credential_manager
         self._session: Optional[requests.Session] = None
         self._config: Optional[TFEConfig] = None
         self._authenticated = False
-        self.error_handler = TFEErrorHandler()
+        self.error_handler = error_handler or TFEErrorHandler()
         self.plan_manager = SecurePlanManager()
     
     def authenticate(self, server: str, token: str, organization: str) -> Tuple[bool, Optional[str]]:
@@ -151,8 +154,10 @@ class TFEClient:
             run_id=run_id
         )
         
-        # Execute with retry logic
-        result, error_message = self.error_handler.retry_with_backoff(_get_plan_operation, context)
+        # Execute with retry logic; each attempt fetches the run's plan and downloads its JSON
+        result, error_message = self.error_handler.retry_with_backoff(
+            _get_plan_operation, context, requests_per_attempt=2
+        )
         
         if result:
             # Store plan data securely
@@ -230,13 +235,9 @@ class TFEClient:
         """Create HTTP session with retry strategy and enhanced security."""
         session = requests.Session()
         
-        # Configure retry strategy
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"]
-        )
+        # Disable transport-level retries; TFEErrorHandler.retry_with_backoff is the
+        # single retry scheduler so a 429 is not retried by both layers
+        retry_strategy = Retry(total=0, raise_on_status=False)
         
         adapter = HTTPAdapter(max_retries=retry_strategy)
         session.mount("http://", adapter)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Terraform Plan Analysis Service
+
+Local HTTP service for other tools that want the dashboard's risk and
+security analysis without the UI. POST a plan from ``terraform show -json``
+to /analyze and receive the analysis as JSON.
+
+Usage:
+    python service.py [--host 127.0.0.1] [--port 8765] [--workers 2]
+
+    curl -X POST --data-binary @plan.json http://127.0.0.1:8765/analyze
+    curl http://127.0.0.1:8765/metrics
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# Make the project packages importable when run from another directory
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from utils.analysis_service import (  # noqa: E402
+    DEFAULT_MAX_BODY_BYTES,
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_REQUEST_TIMEOUT,
+    AnalysisHTTPServer,
+    AnalysisService
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(description="Serve Terraform plan analysis over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument('--workers', type=int, default=2,
+                        help="Worker processes; 0 analyzes on a background thread (default: 2)")
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help=f"Requests allowed to wait for a worker (default: {DEFAULT_QUEUE_SIZE})")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_REQUEST_TIMEOUT,
+                        help=f"Seconds a request may take (default: {DEFAULT_REQUEST_TIMEOUT:g})")
+    parser.add_argument('--max-body-mb', type=float, default=DEFAULT_MAX_BODY_BYTES / (1024 * 1024),
+                        help="Largest accepted plan in MB (default: 50)")
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the analysis service until interrupted.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    args = build_parser().parse_args(argv)
+
+    service = AnalysisService(
+        max_workers=args.workers,
+        queue_size=args.queue_size,
+        request_timeout=args.timeout
+    )
+    server = AnalysisHTTPServer(
+        (args.host, args.port),
+        service,
+        max_body_bytes=int(args.max_body_mb * 1024 * 1024),
+        verbose=args.verbose
+    )
+
+    print(f"🚀 Analysis service listening on {server.url} ({args.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -45,11 +45,6 @@ class TestEndToEndSecurityWorkflow(unittest.TestCase):
         self.tfe_client.close()
         self.credential_manager.clear_credentials()
         self.tfe_component.cleanup()
-        
-        # Cancel any running timers
-        if CredentialManager._session_cleanup_timer:
-            CredentialManager._session_cleanup_timer.cancel()
-            CredentialManager._session_cleanup_timer = None
     
     def test_complete_security_lifecycle(self):
         """Test complete security lifecycle from input to cleanup"""
@@ -450,8 +445,8 @@ class TestSecurityComplianceValidation(unittest.TestCase):
         # Verify session is active
         self.assertTrue(credential_manager._session_active)
         
-        # Verify cleanup timer is running
-        self.assertIsNotNone(CredentialManager._session_cleanup_timer)
+        # Verify session expiry is scheduled
+        self.assertIsNotNone(credential_manager._expiry_handle)
         
         # Verify cleanup works
         credential_manager.clear_credentials()
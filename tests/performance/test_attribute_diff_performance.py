@@ -0,0 +1,56 @@
+"""
+Performance tests for attribute diffs of large resources
+
+Checks that diffing a large nested resource with a single changed leaf only
+costs about as much as hashing it, and that repeated lookups are served from
+the cache.
+"""
+
+import copy
+import time
+
+from utils.attribute_diff import AttributeDiffCache, diff_values
+
+
+def _large_value(width=40, depth=3):
+    """Nested value with width ** depth leaves"""
+    if depth == 0:
+        return "x" * 20
+    return {f"key_{i}": _large_value(width, depth - 1) for i in range(width)}
+
+
+class TestAttributeDiffPerformance:
+    """Benchmarks for the attribute diff engine"""
+
+    def test_single_leaf_change_in_large_resource(self):
+        """Test that a 64k-leaf resource diffs quickly and reports one path"""
+        before = _large_value()
+        after = copy.deepcopy(before)
+        after["key_7"]["key_3"]["key_11"] = "changed"
+
+        start = time.perf_counter()
+        changes = diff_values(before, after)
+        elapsed = time.perf_counter() - start
+
+        assert [change.path for change in changes] == [("key_7", "key_3", "key_11")]
+        assert elapsed < 2.0
+
+    def test_cached_lookups(self):
+        """Test that repeated diffs of the same resource are cache hits"""
+        before = _large_value(width=30)
+        after = copy.deepcopy(before)
+        after["key_1"]["key_1"]["key_1"] = "changed"
+        change = {"address": "x.y", "change": {"actions": ["update"], "before": before, "after": after}}
+        cache = AttributeDiffCache()
+
+        start = time.perf_counter()
+        cache.get_diff(change)
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(100):
+            cache.get_diff(change)
+        repeated = time.perf_counter() - start
+
+        assert cache.hits == 100
+        assert repeated < first
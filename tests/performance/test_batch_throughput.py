@@ -0,0 +1,77 @@
+"""
+Throughput benchmark for batch analysis
+
+Analyzes a portfolio of generated plan files with one worker and with one
+worker per core, and checks that throughput scales with the number of cores.
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from utils.batch_analysis import BatchAnalyzer
+
+
+PLAN_COUNT = 48
+RESOURCES_PER_PLAN = 1000
+
+# Minimum fraction of linear speedup expected from the process pool
+MIN_SCALING_EFFICIENCY = 0.5
+
+
+@pytest.fixture(scope="module")
+def portfolio(tmp_path_factory):
+    """Plan files of mixed sizes, one per workspace"""
+    directory = tmp_path_factory.mktemp("portfolio")
+    paths = []
+    for plan_index in range(PLAN_COUNT):
+        # Every sixth plan is four times larger to exercise the size ordering
+        count = RESOURCES_PER_PLAN * (4 if plan_index % 6 == 0 else 1)
+        resource_changes = [
+            {
+                "address": f"aws_instance.web_{i}",
+                "type": "aws_instance",
+                "name": f"web_{i}",
+                "change": {
+                    "actions": ["update"] if i % 3 else ["delete", "create"],
+                    "before": {"ami": "ami-1", "tags": {"index": i}},
+                    "after": {"ami": "ami-2", "tags": {"index": i}}
+                }
+            }
+            for i in range(count)
+        ]
+        path = directory / f"workspace_{plan_index:03d}.json"
+        path.write_text(json.dumps({"format_version": "1.2", "resource_changes": resource_changes}))
+        paths.append(str(path))
+    return paths
+
+
+def _measure(paths, workers):
+    """Analyze the portfolio and return (seconds, plans per second)"""
+    start = time.perf_counter()
+    report = BatchAnalyzer(max_workers=workers).analyze(paths)
+    duration = time.perf_counter() - start
+    assert len(report.plans) == len(paths)
+    return duration, len(paths) / duration
+
+
+class TestBatchThroughput:
+    """Scaling benchmarks for BatchAnalyzer"""
+    
+    def test_throughput_scales_with_cores(self, portfolio):
+        """Test near-linear scaling from one worker to one worker per core"""
+        cores = min(os.cpu_count() or 1, 8)
+        
+        serial_time, serial_rate = _measure(portfolio, 1)
+        print(f"\n1 worker: {serial_time:.2f}s ({serial_rate:.1f} plans/s)")
+        
+        if cores < 2:
+            pytest.skip("Scaling needs at least two CPU cores")
+        
+        parallel_time, parallel_rate = _measure(portfolio, cores)
+        speedup = serial_time / parallel_time
+        print(f"{cores} workers: {parallel_time:.2f}s ({parallel_rate:.1f} plans/s), speedup {speedup:.2f}x")
+        
+        assert speedup >= cores * MIN_SCALING_EFFICIENCY
@@ -0,0 +1,79 @@
+"""
+Startup benchmark for the CI gate command-line entry point
+
+Runs the CLI in a fresh interpreter, as a pipeline would, and checks that it
+loads none of the dashboard's heavy dependencies and that a cold start stays
+well under a second.
+"""
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Modules only the dashboard needs
+HEAVY_MODULES = ('streamlit', 'pandas', 'plotly', 'reportlab', 'jinja2', 'components', 'ui', 'visualizers')
+
+# Generous bound for a cold start on a shared CI runner
+MAX_COLD_START_SECONDS = 1.0
+
+
+@pytest.fixture
+def plan_file(tmp_path):
+    """Plan file with a mix of providers and actions"""
+    resource_changes = []
+    for i in range(200):
+        resource_changes.append({
+            "address": f"aws_instance.web_{i}",
+            "type": "aws_instance",
+            "name": f"web_{i}",
+            "change": {"actions": ["update"], "before": {"ami": "a"}, "after": {"ami": "b"}}
+        })
+    plan = {"format_version": "1.2", "terraform_version": "1.5.0", "resource_changes": resource_changes}
+    path = tmp_path / "plan.json"
+    path.write_text(json.dumps(plan))
+    return path
+
+
+class TestCliStartup:
+    """Cold start benchmarks for cli.py"""
+    
+    def test_no_heavy_imports(self, plan_file):
+        """Test that a full CLI run imports only core modules"""
+        script = (
+            "import sys, runpy\n"
+            f"sys.argv = ['cli.py', {str(plan_file)!r}, '--output', {str(plan_file.with_suffix('.out'))!r}]\n"
+            "try:\n"
+            "    runpy.run_path('cli.py', run_name='__main__')\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            f"heavy = {HEAVY_MODULES!r}\n"
+            "print(sorted({name.split('.')[0] for name in sys.modules} & set(heavy)))\n"
+        )
+        completed = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, cwd=REPO_ROOT
+        )
+        
+        assert completed.returncode == 0, completed.stderr
+        assert completed.stdout.strip() == "[]"
+    
+    def test_cold_start_time(self, plan_file):
+        """Test that the best of several cold starts stays under the bound"""
+        durations = []
+        for _ in range(3):
+            start = time.perf_counter()
+            completed = subprocess.run(
+                [sys.executable, "cli.py", str(plan_file), "--fail-on", "none"],
+                capture_output=True, text=True, cwd=REPO_ROOT
+            )
+            durations.append(time.perf_counter() - start)
+            assert completed.returncode == 0, completed.stderr
+        
+        print(f"\nCLI cold start: best {min(durations):.3f}s, worst {max(durations):.3f}s")
+        assert min(durations) < MAX_COLD_START_SECONDS
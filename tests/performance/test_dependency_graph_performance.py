@@ -0,0 +1,57 @@
+"""
+Performance tests for the dependency graph
+
+Builds a configuration with tens of thousands of resources spread over
+modules and checks that graph construction and blast radius ranking for
+every resource stay near-linear.
+"""
+
+import random
+import time
+
+from utils.dependency_graph import DependencyGraph, rank_blast_radius
+
+
+def _large_configuration(modules=50, resources_per_module=600, seed=7):
+    """Layered configuration: each resource references up to three earlier ones in its module"""
+    rng = random.Random(seed)
+    module_calls = {}
+    for m in range(modules):
+        resources = []
+        for r in range(resources_per_module):
+            references = [f"aws_instance.r{rng.randrange(r)}.id" for _ in range(min(r, 3))]
+            if r == 0:
+                references.append("var.shared")
+            resources.append({
+                "address": f"aws_instance.r{r}",
+                "mode": "managed",
+                "expressions": {"subnet_id": {"references": references}}
+            })
+        module_calls[f"m{m}"] = {
+            "expressions": {"shared": {"references": ["aws_vpc.main.id"]}},
+            "module": {"resources": resources}
+        }
+    return {"root_module": {"resources": [{"address": "aws_vpc.main", "mode": "managed"}],
+                            "module_calls": module_calls}}
+
+
+class TestDependencyGraphPerformance:
+    """Benchmarks for dependency graph analysis"""
+
+    def test_rank_thirty_thousand_changes(self):
+        """Test that ranking every change of a 30k-resource plan takes seconds, not minutes"""
+        configuration = _large_configuration()
+
+        start = time.perf_counter()
+        graph = DependencyGraph.from_configuration(configuration)
+        changes = [
+            {"address": address, "action": "update"}
+            for address, kind in zip(graph.addresses, graph.kinds) if kind == "resource"
+        ]
+        impact = rank_blast_radius(graph, changes)
+        elapsed = time.perf_counter() - start
+
+        assert len(changes) == 30001
+        assert impact["top_changes"][0]["address"] == "aws_vpc.main"
+        assert impact["top_changes"][0]["downstream_count"] == 30000
+        assert elapsed < 20.0
@@ -0,0 +1,63 @@
+"""
+Performance tests for filter bitmaps
+
+Builds the bitmaps of large resource tables once and checks that AND/OR
+filter selections and their counts are much faster than combining pandas
+``isin`` masks.
+"""
+
+import time
+
+import pandas as pd
+
+from utils.filter_bitmaps import FilterBitmaps
+
+
+def _resource_table(rows):
+    types = [f"aws_type_{i}" for i in range(200)]
+    return pd.DataFrame({
+        'action': [['create', 'update', 'delete', 'replace'][i % 4] for i in range(rows)],
+        'risk_level': [['Low', 'Medium', 'High'][i % 3] for i in range(rows)],
+        'provider': [['aws', 'azure', 'google'][i % 3] for i in range(rows)],
+        'resource_type': [types[i % len(types)] for i in range(rows)]
+    })
+
+
+class TestFilterBitmapsPerformance:
+    """Benchmarks for filter bitmaps"""
+
+    def test_selection_counts_on_large_plans(self):
+        """Test that filter selections on 50k and 200k rows beat pandas masks"""
+        for rows in (50000, 200000):
+            df = _resource_table(rows)
+
+            start = time.perf_counter()
+            bitmaps = FilterBitmaps.from_dataframe(df)
+            build_time = time.perf_counter() - start
+
+            selections = [
+                ({'action': ['create', 'update', 'delete', 'replace'], 'risk_level': ['High'], 'provider': None}, 'AND'),
+                ({'action': ['delete'], 'risk_level': ['Low', 'Medium', 'High'], 'provider': ['aws', 'azure']}, 'AND'),
+                ({'action': ['update', 'replace'], 'risk_level': ['High'], 'provider': ['google']}, 'OR')
+            ]
+            for selection, logic in selections:
+                start = time.perf_counter()
+                for _ in range(20):
+                    count = bitmaps.filter(selection, logic).count()
+                elapsed = (time.perf_counter() - start) / 20
+
+                start = time.perf_counter()
+                for _ in range(20):
+                    masks = [df[column].isin(values) for column, values in selection.items() if values is not None]
+                    expected = masks[0]
+                    for mask in masks[1:]:
+                        expected = expected & mask if logic == 'AND' else expected | mask
+                    expected_count = int(expected.sum())
+                pandas_elapsed = (time.perf_counter() - start) / 20
+
+                assert count == expected_count
+                assert elapsed * 5 < pandas_elapsed, (
+                    f"{rows} rows: selection took {elapsed * 1000:.2f}ms, pandas masks {pandas_elapsed * 1000:.2f}ms"
+                )
+
+            assert build_time < 2.0
@@ -0,0 +1,66 @@
+"""
+Performance tests for compiled filter expressions
+
+Evaluates saved-preset style expressions on a 50k-row resource table and
+checks that repeated evaluations stay well under a second.
+"""
+
+import time
+
+import pandas as pd
+
+from utils.filter_expression import compile_filter_expression
+
+
+def _resource_table(rows=50000):
+    types = ['aws_instance', 'aws_s3_bucket', 'azurerm_linux_virtual_machine', 'google_sql_database_instance']
+    return pd.DataFrame({
+        'action': [['create', 'update', 'delete', 'replace'][i % 4] for i in range(rows)],
+        'risk_level': [['Low', 'Medium', 'High'][i % 3] for i in range(rows)],
+        'provider': [['aws', 'azure', 'google'][i % 3] for i in range(rows)],
+        'resource_type': [types[i % len(types)] for i in range(rows)],
+        'resource_name': [f"r{i}" for i in range(rows)],
+        'resource_address': [f"module.m{i % 50}.{types[i % len(types)]}.r{i}" for i in range(rows)],
+        'is_sensitive': [i % 7 == 0 for i in range(rows)]
+    })
+
+
+class TestFilterExpressionPerformance:
+    """Benchmarks for compiled filter expressions"""
+
+    def test_preset_expressions_on_50k_rows(self):
+        """Test that repeated preset expressions stay well under a second on 50k rows"""
+        df = _resource_table()
+        presets = {
+            "action='create' AND risk='High'":
+                (df['action'] == 'create') & (df['risk_level'] == 'High'),
+            "(action='update' OR action='replace') AND risk='High'":
+                df['action'].isin(['update', 'replace']) & (df['risk_level'] == 'High'),
+            "risk IN ('Medium', 'High') AND provider IN ('aws', 'azure') AND NOT sensitive":
+                df['risk_level'].isin(['Medium', 'High']) & df['provider'].isin(['aws', 'azure']) & ~df['is_sensitive'],
+            "type LIKE 'aws_%' AND action != 'delete'":
+                df['resource_type'].str.startswith('aws_') & (df['action'] != 'delete')
+        }
+
+        for text, expected in presets.items():
+            expression = compile_filter_expression(text)
+
+            start = time.perf_counter()
+            for _ in range(10):
+                mask = compile_filter_expression(text).mask(df)
+            elapsed = (time.perf_counter() - start) / 10
+
+            assert compile_filter_expression(text) is expression
+            assert mask.tolist() == expected.tolist()
+            assert elapsed < 0.5, f"{text!r} took {elapsed * 1000:.1f}ms"
+
+    def test_module_expression_on_50k_rows(self):
+        """Test that the per-address module field stays well under a second on 50k rows"""
+        df = _resource_table()
+
+        start = time.perf_counter()
+        mask = compile_filter_expression("module = 'module.m7' AND sensitive").mask(df)
+        elapsed = time.perf_counter() - start
+
+        assert mask.sum() == sum(1 for i in range(50000) if i % 50 == 7 and i % 7 == 0)
+        assert elapsed < 0.5
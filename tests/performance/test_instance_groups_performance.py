@@ -0,0 +1,44 @@
+"""
+Performance tests for instance-group compression
+
+Scores a plan dominated by one large for_each fan-out with and without
+instance groups and checks that each group is assessed only once.
+"""
+
+import time
+from unittest.mock import patch
+
+from utils.instance_groups import InstanceGroups
+from utils.provider_factory import MultiCloudProviderFactory, MultiCloudRiskAssessment
+
+
+def _fan_out_plan(instances=20000):
+    """DNS records created by one for_each block"""
+    return {"resource_changes": [
+        {"address": f'aws_route53_record.x["host-{i}"]', "type": "aws_route53_record", "name": "x",
+         "change": {"actions": ["create"], "before": None,
+                    "after": {"name": f"host-{i}.example.com", "type": "A", "ttl": 300, "records": [f"10.0.{i % 250}.1"]}}}
+        for i in range(instances)
+    ]}
+
+
+class TestInstanceGroupsPerformance:
+    """Benchmarks for instance-group compression"""
+
+    def test_fan_out_is_scored_once(self):
+        """Test that 20k instances of one block cost one provider assessment"""
+        plan_data = _fan_out_plan()
+        factory = MultiCloudProviderFactory()
+        assessor = MultiCloudRiskAssessment(factory)
+
+        start = time.perf_counter()
+        groups = InstanceGroups.build(plan_data["resource_changes"])
+        elapsed = time.perf_counter() - start
+
+        with patch.object(assessor, "_assess_resource", wraps=assessor._assess_resource) as assess:
+            result = assessor.assess_multi_cloud_plan_risk(plan_data, groups)
+
+        assert len(groups) == 1
+        assert assess.call_count == 1
+        assert result["overall_risk"]["total_resources"] == 20000
+        assert elapsed < 10.0
@@ -0,0 +1,50 @@
+"""
+Performance tests for the policy document analyzer
+
+Runs the security analysis over thousands of resources that embed a
+handful of distinct policies and checks that each policy is parsed once.
+"""
+
+import json
+import time
+
+from utils.policy_analyzer import PolicyDocumentAnalyzer
+from utils.security_analyzer import SecurityAnalyzer
+
+
+def _policy_plan(resources=5000, distinct_policies=10):
+    """Bucket policies that repeat the same few documents"""
+    policies = [
+        json.dumps({"Version": "2012-10-17", "Statement": [
+            {"Sid": f"Read{i}", "Effect": "Allow", "Principal": "*", "Action": ["s3:GetObject", "s3:ListBucket"],
+             "Resource": [f"arn:aws:s3:::bucket-{i}/*"] * 20}
+        ] * 10})
+        for i in range(distinct_policies)
+    ]
+    return [
+        {"address": f"aws_s3_bucket_policy.b{i}", "type": "aws_s3_bucket_policy", "name": f"b{i}",
+         "change": {"actions": ["create"], "before": None,
+                    "after": {"bucket": f"bucket-{i}", "policy": policies[i % distinct_policies]}}}
+        for i in range(resources)
+    ]
+
+
+class TestPolicyAnalyzerPerformance:
+    """Benchmarks for the policy document analyzer"""
+
+    def test_repeated_policies_are_parsed_once(self):
+        """Test that 5k resources with 10 distinct policies cost 10 parses"""
+        analyzer = PolicyDocumentAnalyzer()
+        resource_changes = _policy_plan()
+
+        start = time.perf_counter()
+        result = SecurityAnalyzer(policy_analyzer=analyzer).analyze_security_resources(resource_changes)
+        elapsed = time.perf_counter() - start
+
+        assert result["total_security_resources"] == 5000
+        assert analyzer.misses == 10
+        assert all(
+            any(issue["type"] == "policy_missing_condition" for issue in resource["security_issues"])
+            for resource in result["security_resources"]
+        )
+        assert elapsed < 10.0
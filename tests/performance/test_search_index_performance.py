@@ -0,0 +1,50 @@
+"""
+Performance tests for the resource table search index
+
+Searches a 50k-row resource table and checks that queries answered from the
+trigram index and the match indicators stay within tens of milliseconds.
+"""
+
+import time
+
+import pandas as pd
+
+from utils.search_index import ResourceSearchIndex
+
+
+def _resource_table(rows=50000):
+    """Resource table with a realistic mix of repeated types and unique names"""
+    types = ['aws_instance', 'aws_s3_bucket', 'aws_security_group', 'azurerm_virtual_machine',
+             'google_compute_instance', 'aws_iam_role', 'aws_lambda_function', 'aws_route53_record']
+    names = [f"{['web', 'api', 'worker', 'db', 'cache'][i % 5]}_{i}" for i in range(rows)]
+    resource_types = [types[i % len(types)] for i in range(rows)]
+    return pd.DataFrame({
+        'resource_name': names,
+        'resource_type': resource_types,
+        'resource_address': [f"module.app_{i % 40}.{t}.{n}" for i, (t, n) in enumerate(zip(resource_types, names))],
+        'provider': [t.split('_')[0] for t in resource_types]
+    })
+
+
+class TestSearchIndexPerformance:
+    """Benchmarks for the resource table search index"""
+
+    def test_queries_on_50k_rows(self):
+        """Test that queries and indicators on 50k rows stay within tens of milliseconds"""
+        df = _resource_table()
+        index = ResourceSearchIndex.from_dataframe(df)
+        subset = df.iloc[::2]
+
+        for query in ['worker_4999', 'app_17.aws_s3', 'lambda', 'nomatch', 'db']:
+            start = time.perf_counter()
+            matches = index.search(query)
+            mask = matches.mask(subset)
+            indicators = matches.indicators(subset[mask])
+            elapsed = time.perf_counter() - start
+
+            reference = subset['resource_address'].str.lower().str.contains(query, regex=False)
+            for column in ('resource_name', 'resource_type', 'provider'):
+                reference |= subset[column].str.lower().str.contains(query, regex=False)
+            assert mask.tolist() == reference.tolist()
+            assert all(indicator.startswith('🔍 ') for indicator in indicators)
+            assert elapsed < 0.1, f"Query {query!r} took {elapsed * 1000:.1f}ms"
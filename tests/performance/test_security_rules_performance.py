@@ -0,0 +1,56 @@
+"""
+Performance tests for declarative security rule packs
+
+Checks a large plan against the built-in rules plus a large user rule pack
+and verifies that rules for other resource types do not slow the scan.
+"""
+
+import time
+
+from config.security_rule_packs import DEFAULT_SECURITY_RULE_PACK
+from utils.security_rules import SecurityRuleSet
+
+
+def _security_groups(count=20000):
+    """Security groups with a few ingress blocks each"""
+    return [
+        {"address": f"aws_security_group.sg{i}", "type": "aws_security_group", "name": f"sg{i}",
+         "change": {"actions": ["create"], "before": None, "after": {
+             "name": f"sg{i}", "description": "x" * 200, "tags": {f"tag{k}": "value" for k in range(20)},
+             "ingress": [{"from_port": port, "to_port": port, "cidr_blocks": ["10.0.0.0/8", "0.0.0.0/0"][: 1 + i % 2]}
+                         for port in (22, 443, 8080)]
+         }}}
+        for i in range(count)
+    ]
+
+
+def _user_pack(rule_count=1000):
+    """Rules for resource types that are not in the plan"""
+    return {"name": "user", "rules": [
+        {"id": f"user_{i}", "resource_types": [f"aws_custom_{i}"], "when": [f"settings[*].option_{i} == true"]}
+        for i in range(rule_count)
+    ]}
+
+
+def _scan(rule_set, resource_changes):
+    start = time.perf_counter()
+    issues = [rule_set.evaluate(change) for change in resource_changes]
+    return issues, time.perf_counter() - start
+
+
+class TestSecurityRulesPerformance:
+    """Benchmarks for the security rule engine"""
+
+    def test_user_packs_do_not_slow_the_scan(self):
+        """Test that 1000 rules for other types leave a 20k-resource scan unchanged"""
+        resource_changes = _security_groups()
+        builtin = SecurityRuleSet.from_packs([DEFAULT_SECURITY_RULE_PACK])
+        extended = SecurityRuleSet.from_packs([DEFAULT_SECURITY_RULE_PACK, _user_pack()])
+
+        builtin_issues, builtin_elapsed = _scan(builtin, resource_changes)
+        extended_issues, extended_elapsed = _scan(extended, resource_changes)
+
+        assert extended_issues == builtin_issues
+        assert sum(1 for issues in builtin_issues if any(i["type"] == "open_to_world" for i in issues)) == 10000
+        assert builtin_elapsed < 5.0
+        assert extended_elapsed < builtin_elapsed * 2 + 0.5
@@ -0,0 +1,147 @@
+"""
+Load test for the HTTP analysis service
+
+Starts the service locally with a process-pool backend and fires concurrent
+POST /analyze requests at it. Also runnable as a script:
+
+    python -m tests.performance.test_service_load --requests 200 --concurrency 16
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+import pytest
+
+from utils.analysis_service import AnalysisHTTPServer, AnalysisService
+
+
+def build_plan(resource_count: int = 300) -> bytes:
+    """Generate a plan body with mixed actions"""
+    resource_changes = [
+        {
+            "address": f"aws_instance.web_{i}",
+            "type": "aws_instance",
+            "name": f"web_{i}",
+            "change": {
+                "actions": ["update"] if i % 4 else ["delete"],
+                "before": {"ami": "ami-1"},
+                "after": {"ami": "ami-2"} if i % 4 else None
+            }
+        }
+        for i in range(resource_count)
+    ]
+    return json.dumps({"format_version": "1.2", "resource_changes": resource_changes}).encode('utf-8')
+
+
+def _post(url: str, body: bytes) -> int:
+    """POST a plan and return the HTTP status"""
+    request = urllib.request.Request(url, data=body, method='POST')
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def run_load_test(base_url: str, body: bytes, requests: int, concurrency: int) -> Dict[str, Any]:
+    """
+    Send concurrent analysis requests.
+
+    Args:
+        base_url: Service URL
+        body: Plan JSON to post
+        requests: Total number of requests
+        concurrency: Requests in flight at once
+
+    Returns:
+        Status counts, duration and client-side throughput
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        statuses = list(pool.map(lambda _: _post(base_url + '/analyze', body), range(requests)))
+    duration = time.perf_counter() - start
+
+    counts: Dict[int, int] = {}
+    for status in statuses:
+        counts[status] = counts.get(status, 0) + 1
+    return {'statuses': counts, 'duration': duration, 'throughput_rps': requests / duration}
+
+
+def _start_server(workers: int, queue_size: int) -> AnalysisHTTPServer:
+    """Start the service on a free local port"""
+    server = AnalysisHTTPServer(('127.0.0.1', 0), AnalysisService(max_workers=workers, queue_size=queue_size))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _metrics(server: AnalysisHTTPServer) -> Dict[str, Any]:
+    """Fetch the service metrics"""
+    with urllib.request.urlopen(server.url + '/metrics', timeout=10) as response:
+        return json.loads(response.read())
+
+
+class TestServiceLoad:
+    """Load tests against a local service with worker processes"""
+    
+    def test_sustained_load(self):
+        """Test that every request within the queue bound succeeds"""
+        server = _start_server(workers=2, queue_size=32)
+        try:
+            result = run_load_test(server.url, build_plan(), requests=40, concurrency=8)
+            metrics = _metrics(server)['endpoints']['/analyze']
+        finally:
+            server.shutdown()
+            server.server_close()
+        
+        print(f"\n40 requests: {result['duration']:.2f}s, {result['throughput_rps']:.1f} req/s, "
+              f"p95 {metrics['latency_ms']['p95']}ms")
+        assert result['statuses'] == {200: 40}
+        assert metrics['requests'] == 40
+    
+    def test_overload_is_rejected(self):
+        """Test that bursts beyond the queue bound get 503 instead of piling up"""
+        server = _start_server(workers=1, queue_size=0)
+        try:
+            result = run_load_test(server.url, build_plan(2000), requests=24, concurrency=12)
+        finally:
+            server.shutdown()
+            server.server_close()
+        
+        assert set(result['statuses']) <= {200, 503}
+        assert result['statuses'].get(200, 0) >= 1
+        assert result['statuses'].get(503, 0) >= 1
+
+
+def main() -> None:
+    """Run a load test from the command line"""
+    parser = argparse.ArgumentParser(description="Load test the analysis service")
+    parser.add_argument('--url', default=None, help="Existing service URL (default: start one locally)")
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--resources', type=int, default=300, help="Resources per generated plan")
+    args = parser.parse_args()
+
+    server = None if args.url else _start_server(args.workers, queue_size=args.concurrency * 2)
+    base_url = args.url or server.url
+    try:
+        result = run_load_test(base_url, build_plan(args.resources), args.requests, args.concurrency)
+        with urllib.request.urlopen(base_url + '/metrics', timeout=10) as response:
+            metrics = json.loads(response.read())
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    print(json.dumps({'client': result, 'service': metrics}, indent=2, default=str))
+
+
+if __name__ == '__main__':
+    main()
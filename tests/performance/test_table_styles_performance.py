@@ -0,0 +1,60 @@
+"""
+Performance tests for table styles
+
+Styles the visible page of large resource tables with vectorized CSS and
+checks that it is much cheaper than a row-wise Styler apply of the table.
+"""
+
+import time
+
+import pandas as pd
+
+from utils.table_styles import PageStyleCache, page_styles, style_page
+from utils.table_view import paginate
+
+
+def _resource_table(rows):
+    return pd.DataFrame({
+        'resource_name': [f"resource_{i}" for i in range(rows)],
+        'resource_type': [f"aws_type_{i % 150}" for i in range(rows)],
+        'action': [['create', 'update', 'delete', 'replace'][i % 4] for i in range(rows)],
+        'risk_level': [['Low', 'Medium', 'High'][i % 3] for i in range(rows)]
+    })
+
+
+def _row_css(row):
+    colors = {'High': '#fff3e0', 'Medium': '#fffde7', 'Low': '#e8f5e8'}
+    return [f"background-color: {colors[row['risk_level']]}"] * len(row)
+
+
+class TestTableStylesPerformance:
+    """Benchmarks for table styles"""
+
+    def test_page_styling_of_large_plans(self):
+        """Test that styling a page of a 50k-row table beats the row-wise apply of the table"""
+        df = _resource_table(50000)
+
+        start = time.perf_counter()
+        df.style.apply(_row_css, axis=1)._compute()
+        row_wise_time = time.perf_counter() - start
+
+        cache = PageStyleCache()
+        start = time.perf_counter()
+        for page in range(1, 21):
+            rows = paginate(df, page, 100, 'resource_name').rows
+            style_page(rows, cache.get(page, rows, lambda p: page_styles(p, 'risk_level')))._compute()
+        page_time = (time.perf_counter() - start) / 20
+
+        rows = paginate(df, 5, 100, 'resource_name').rows
+        start = time.perf_counter()
+        for _ in range(20):
+            cache.get(5, rows, lambda p: page_styles(p, 'risk_level'))
+        cached_time = (time.perf_counter() - start) / 20
+
+        assert cache.hits == 20
+        assert page_time * 20 < row_wise_time, (
+            f"page styling took {page_time * 1000:.1f}ms, row-wise apply {row_wise_time * 1000:.1f}ms"
+        )
+        assert cached_time * 10 < page_time, (
+            f"cached page took {cached_time * 1000:.3f}ms, styled page {page_time * 1000:.1f}ms"
+        )
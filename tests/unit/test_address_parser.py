@@ -0,0 +1,61 @@
+"""
+Unit tests for the Terraform resource address parser
+
+Tests module paths, data sources and instance keys (including keys that
+contain dots and escaped quotes), round-tripping to strings and the
+display-name fallback used by the resource table.
+"""
+
+import pytest
+
+from parsers.address_parser import (
+    AddressParseError,
+    ModuleInstance,
+    parse_address,
+    resource_name_from_address
+)
+
+
+class TestParseAddress:
+    """Test parsing of resource instance addresses"""
+
+    def test_root_resource(self):
+        address = parse_address("aws_instance.web")
+        assert address.module_path == ()
+        assert (address.mode, address.type, address.name, address.key) == ("managed", "aws_instance", "web", None)
+        assert address.module_address == ""
+
+    def test_nested_modules_with_keys(self):
+        address = parse_address('module.net.module.vpc["eu"].aws_subnet.private[3]')
+        assert address.module_path == (ModuleInstance("net"), ModuleInstance("vpc", "eu"))
+        assert address.module_address == 'module.net.module.vpc["eu"]'
+        assert (address.type, address.name, address.key) == ("aws_subnet", "private", 3)
+
+    def test_keys_containing_dots_and_quotes(self):
+        address = parse_address('module.eks["prod.eu"].data.aws_iam_policy_document.p["a.b\\"c"]')
+        assert address.module_path == (ModuleInstance("eks", "prod.eu"),)
+        assert address.mode == "data"
+        assert address.key == 'a.b"c'
+
+    @pytest.mark.parametrize("text", [
+        'module.net.module.vpc["eu"].aws_subnet.private[3]',
+        'data.aws_ami.ubuntu',
+        'module.a[0].aws_s3_bucket.logs["kubernetes.io/role"]'
+    ])
+    def test_round_trip(self, text):
+        assert str(parse_address(text)) == text
+
+    @pytest.mark.parametrize("text", ["aws_instance", "module.vpc", 'aws_instance.web["x]', "aws_instance.web[x]", ""])
+    def test_invalid_addresses(self, text):
+        with pytest.raises(AddressParseError):
+            parse_address(text)
+
+
+class TestResourceNameFromAddress:
+    """Test the display name of resources"""
+
+    def test_name_with_instance_key(self):
+        assert resource_name_from_address('module.app.aws_instance.web["a.b"]') == 'web["a.b"]'
+
+    def test_unparseable_address_falls_back(self):
+        assert resource_name_from_address("not an address") == "not an address"
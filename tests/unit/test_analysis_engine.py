@@ -0,0 +1,136 @@
+"""
+Unit tests for the headless analysis engine
+
+Tests plan loading from different sources, stage reporting through the
+progress and metrics sinks, risk assessment fallback, and that the engine
+runs without importing Streamlit.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from parsers.plan_parser import PlanParser
+from utils.analysis_engine import TimingMetrics, analyze_plan, load_plan
+
+
+@pytest.fixture
+def plan_data():
+    """Small AWS plan with a security-relevant resource"""
+    return {
+        "format_version": "1.2",
+        "terraform_version": "1.5.0",
+        "resource_changes": [
+            {
+                "address": "aws_iam_role.app",
+                "type": "aws_iam_role",
+                "name": "app",
+                "change": {"actions": ["create"], "before": None, "after": {"name": "app"}}
+            },
+            {
+                "address": "aws_instance.web",
+                "type": "aws_instance",
+                "name": "web",
+                "change": {"actions": ["update"], "before": {"ami": "a"}, "after": {"ami": "b"}}
+            }
+        ]
+    }
+
+
+class TestLoadPlan:
+    """Test cases for load_plan"""
+    
+    def test_load_from_sources(self, plan_data, tmp_path):
+        """Test loading from dict, JSON text, bytes and file path"""
+        plan_file = tmp_path / "plan.json"
+        plan_file.write_text(json.dumps(plan_data))
+        
+        assert load_plan(plan_data) is plan_data
+        assert load_plan(json.dumps(plan_data)) == plan_data
+        assert load_plan(json.dumps(plan_data).encode("utf-8")) == plan_data
+        assert load_plan(str(plan_file)) == plan_data
+    
+    def test_rejects_non_object(self):
+        """Test that non-object JSON is rejected"""
+        with pytest.raises(ValueError):
+            load_plan("[]".encode("utf-8"))
+
+
+class TestAnalyzePlan:
+    """Test cases for analyze_plan"""
+    
+    def test_matches_parser_output(self, plan_data):
+        """Test that the engine returns the same data as the parser"""
+        result = analyze_plan(plan_data)
+        parser = PlanParser(plan_data)
+        
+        assert result.summary == parser.get_summary()
+        assert result.resource_types == parser.get_resource_types()
+        assert result.resource_changes == parser.get_resource_changes()
+        assert result.providers == {"aws": 2}
+        assert result.enhanced is True
+        assert result.risk_result["detailed_assessments"]
+        assert result.security["security_analysis"]["total_security_resources"] == 1
+    
+    def test_progress_and_metrics_sinks(self, plan_data):
+        """Test that stages are reported to the sinks"""
+        progress = Mock()
+        metrics = TimingMetrics()
+        
+        result = analyze_plan(plan_data, progress=progress, metrics=metrics)
+        
+        stages = [call.args for call in progress.call_args_list]
+        assert stages == [("parse", 0, 4), ("extract", 1, 4), ("risk", 2, 4), ("security", 3, 4)]
+        assert set(metrics.durations) == {
+            "plan_parser_init", "data_extraction", "risk_assessment", "security_analysis"
+        }
+        assert result.timings == metrics.durations
+    
+    def test_security_can_be_skipped(self, plan_data):
+        """Test that security analysis is optional"""
+        result = analyze_plan(plan_data, include_security=False)
+        
+        assert result.security is None
+        assert "security_analysis" not in result.timings
+    
+    def test_enhanced_failure_falls_back_to_basic(self, plan_data):
+        """Test fallback to basic risk assessment when enhanced assessment fails"""
+        failing_assessor = Mock()
+        failing_assessor.assess_plan_risk.side_effect = RuntimeError("boom")
+        
+        result = analyze_plan(plan_data, risk_assessor=failing_assessor)
+        
+        assert result.enhanced is False
+        assert isinstance(result.risk_error, RuntimeError)
+        assert "level" in result.risk_result
+        assert "detailed_assessments" not in result.risk_result
+    
+    def test_to_dict_is_json_serializable(self, plan_data):
+        """Test that the result view can be emitted as JSON"""
+        payload = json.loads(json.dumps(analyze_plan(plan_data).to_dict()))
+        
+        assert payload["summary"]["total"] == 2
+        assert payload["risk"]["level"] in ("Low", "Medium", "High")
+    
+    def test_runs_without_streamlit(self, plan_data, tmp_path):
+        """Test that the engine never imports Streamlit or UI modules"""
+        plan_file = tmp_path / "plan.json"
+        plan_file.write_text(json.dumps(plan_data))
+        script = (
+            "import sys\n"
+            "from utils.analysis_engine import analyze_plan\n"
+            f"analyze_plan({str(plan_file)!r})\n"
+            "loaded = [m for m in sys.modules if m.split('.')[0] in ('streamlit', 'ui', 'components')]\n"
+            "assert not loaded, loaded\n"
+        )
+        
+        repo_root = Path(__file__).resolve().parents[2]
+        completed = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, cwd=repo_root
+        )
+        
+        assert completed.returncode == 0, completed.stderr
@@ -0,0 +1,194 @@
+"""
+Unit tests for the HTTP analysis service
+
+Tests the endpoints, request validation, the bounded queue, request
+timeouts and per-endpoint metrics using an in-process thread backend.
+"""
+
+import http.client
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import Future
+
+import pytest
+
+from utils.analysis_service import (
+    AnalysisHTTPServer,
+    AnalysisService,
+    EndpointMetrics,
+    ServiceBusyError
+)
+
+
+PLAN = {
+    "format_version": "1.2",
+    "terraform_version": "1.5.0",
+    "resource_changes": [
+        {
+            "address": "aws_iam_role.app",
+            "type": "aws_iam_role",
+            "name": "app",
+            "change": {"actions": ["delete"], "before": {"name": "app"}, "after": None}
+        }
+    ]
+}
+
+
+class _PendingExecutor:
+    """Executor whose futures never complete until released"""
+    
+    def __init__(self):
+        self.futures = []
+    
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        self.futures.append(future)
+        return future
+    
+    def release(self):
+        for future in self.futures:
+            if not future.done():
+                future.set_result({})
+    
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.release()
+
+
+@pytest.fixture
+def server():
+    """Service on a free local port with a thread backend"""
+    http_server = AnalysisHTTPServer(('127.0.0.1', 0), AnalysisService(max_workers=0, queue_size=2))
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield http_server
+    http_server.shutdown()
+    http_server.server_close()
+
+
+def _request(url, data=None):
+    """Send a request and return (status, decoded JSON body)"""
+    request = urllib.request.Request(url, data=data, method='POST' if data is not None else 'GET')
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+class TestHTTPEndpoints:
+    """Test cases for the HTTP endpoints"""
+    
+    def test_analyze(self, server):
+        """Test that a posted plan returns the analysis JSON"""
+        status, body = _request(server.url + '/analyze', json.dumps(PLAN).encode())
+        
+        assert status == 200
+        assert body['summary']['delete'] == 1
+        assert body['risk']['level'] in ('Low', 'Medium', 'High')
+        assert 'compliance_results' in body['security']
+        assert 'detailed_assessments' not in body['risk']
+    
+    def test_analyze_flags(self, server):
+        """Test the query flags controlling the analysis"""
+        status, body = _request(server.url + '/analyze?security=0&assessments=1', json.dumps(PLAN).encode())
+        
+        assert status == 200
+        assert body['security'] is None
+        assert len(body['risk']['detailed_assessments']) == 1
+    
+    def test_invalid_requests(self, server):
+        """Test rejection of invalid bodies, oversized plans and unknown paths"""
+        assert _request(server.url + '/analyze', b'not json')[0] == 400
+        assert _request(server.url + '/analyze', b'[]')[0] == 400
+        assert _request(server.url + '/analyze', b' {"resource_changes": [')[0] == 400
+        assert _request(server.url + '/unknown')[0] == 404
+        
+        server.max_body_bytes = 10
+        assert _request(server.url + '/analyze', json.dumps(PLAN).encode())[0] == 413
+    
+    def test_negative_content_length(self, server):
+        """Test that a negative Content-Length cannot bypass the body limit"""
+        host, port = server.server_address[:2]
+        connection = http.client.HTTPConnection(host, port, timeout=30)
+        connection.putrequest('POST', '/analyze')
+        connection.putheader('Content-Length', '-1')
+        connection.endheaders()
+        response = connection.getresponse()
+        
+        assert response.status == 400
+        connection.close()
+    
+    def test_unknown_paths_share_one_metrics_entry(self, server):
+        """Test that arbitrary URLs do not add metrics entries"""
+        for path in ('/a', '/b', '/c?x=1'):
+            _request(server.url + path)
+        _request(server.url + '/d', b'{}')
+        
+        endpoints = _request(server.url + '/metrics')[1]['endpoints']
+        assert set(endpoints) == {'other'}
+        assert endpoints['other']['status_counts'] == {'404': 4}
+    
+    def test_health_and_metrics(self, server):
+        """Test that metrics count requests per endpoint"""
+        _request(server.url + '/analyze', json.dumps(PLAN).encode())
+        _request(server.url + '/analyze', b'not json')
+        
+        status, health = _request(server.url + '/health')
+        assert status == 200
+        assert health['capacity'] == 3
+        
+        status, metrics = _request(server.url + '/metrics')
+        analyze = metrics['endpoints']['/analyze']
+        assert analyze['requests'] == 2
+        assert analyze['errors'] == 1
+        assert analyze['status_counts'] == {'200': 1, '400': 1}
+        assert analyze['latency_ms']['max'] >= analyze['latency_ms']['p50'] > 0
+
+
+class TestAnalysisService:
+    """Test cases for queueing and timeouts"""
+    
+    def test_queue_is_bounded(self):
+        """Test that requests beyond the capacity are rejected until slots free up"""
+        executor = _PendingExecutor()
+        service = AnalysisService(max_workers=1, queue_size=1, executor=executor)
+        
+        service.submit(b'{}')
+        service.submit(b'{}')
+        with pytest.raises(ServiceBusyError):
+            service.submit(b'{}')
+        assert service.in_flight == 2
+        
+        executor.release()
+        assert service.in_flight == 0
+        service.submit(b'{}')
+    
+    def test_request_timeout(self):
+        """Test that waiting is limited and the job is cancelled"""
+        executor = _PendingExecutor()
+        service = AnalysisService(max_workers=1, queue_size=0, request_timeout=0.05, executor=executor)
+        
+        with pytest.raises(TimeoutError):
+            service.analyze(b'{}')
+        
+        assert executor.futures[0].cancelled()
+        assert service.in_flight == 0
+
+
+class TestEndpointMetrics:
+    """Test cases for latency percentiles"""
+    
+    def test_percentiles(self):
+        """Test percentiles and throughput over recorded latencies"""
+        metrics = EndpointMetrics()
+        for i in range(1, 101):
+            metrics.record(200, i / 1000)
+        
+        snapshot = metrics.snapshot(elapsed=10.0)
+        
+        assert snapshot['throughput_rps'] == 10.0
+        assert snapshot['latency_ms']['p50'] == pytest.approx(50.0, abs=1)
+        assert snapshot['latency_ms']['p99'] == pytest.approx(99.0, abs=1)
+        assert snapshot['latency_ms']['max'] == 100.0
@@ -0,0 +1,276 @@
+"""
+Unit tests for the attribute diff engine
+
+Tests attribute-path-level diffs of nested values, the handling of
+Terraform's unknown, sensitive and replace_paths markers, lazy cached diffs,
+display rows and the report and data table views of the diffs.
+"""
+
+import copy
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from utils.attribute_diff import (
+    CHANGE_ADDED,
+    CHANGE_MODIFIED,
+    CHANGE_REMOVED,
+    CHANGE_UNKNOWN,
+    SENSITIVE_VALUE,
+    AttributeDiffCache,
+    diff_resource_change,
+    diff_rows,
+    diff_values,
+    format_path,
+    format_value
+)
+from utils.structural_hash import LARGE_STRING_BYTES, hash_tree, hash_value
+
+
+def _update(before, after, actions=None, **markers):
+    """Build an update resource change"""
+    change = {"actions": actions or ["update"], "before": before, "after": after}
+    change.update(markers)
+    return {"address": "aws_security_group.web", "type": "aws_security_group", "name": "web", "change": change}
+
+
+@pytest.fixture
+def security_group():
+    """Nested resource value"""
+    return {
+        "name": "web",
+        "tags": {"env": "prod", "team": "platform"},
+        "ingress": [
+            {"from_port": 443, "cidr_blocks": ["10.0.0.0/8"]},
+            {"from_port": 80, "cidr_blocks": ["0.0.0.0/0"]}
+        ]
+    }
+
+
+class TestHashTree:
+    """Test subtree digests"""
+
+    def test_digest_matches_hash_value(self, security_group):
+        assert hash_tree(security_group).digest == hash_value(security_group)
+        assert hash_tree(security_group).children["tags"].digest == hash_value(security_group["tags"])
+
+    def test_long_strings_are_hashed(self):
+        policy = "x" * (LARGE_STRING_BYTES * 10)
+        node = hash_tree(policy)
+        assert len(node.token) < LARGE_STRING_BYTES
+        assert node.token != hash_tree(policy[:-1] + "y").token
+
+
+class TestDiffValues:
+    """Test attribute-path diffs of plain values"""
+
+    def test_equal_values(self, security_group):
+        assert diff_values(security_group, copy.deepcopy(security_group)) == []
+
+    def test_nested_changes(self, security_group):
+        after = copy.deepcopy(security_group)
+        after["tags"]["env"] = "staging"
+        del after["tags"]["team"]
+        after["tags"]["owner"] = "ops"
+        after["ingress"][1]["cidr_blocks"].append("192.168.0.0/16")
+
+        changes = {format_path(item.path): item for item in diff_values(security_group, after)}
+
+        assert set(changes) == {"tags.env", "tags.team", "tags.owner", "ingress[1].cidr_blocks[1]"}
+        assert changes["tags.env"].kind == CHANGE_MODIFIED
+        assert (changes["tags.env"].before, changes["tags.env"].after) == ("prod", "staging")
+        assert changes["tags.team"].kind == CHANGE_REMOVED
+        assert changes["tags.owner"].kind == CHANGE_ADDED
+        assert changes["ingress[1].cidr_blocks[1]"].kind == CHANGE_ADDED
+
+    def test_null_is_not_set(self):
+        changes = diff_values({"description": None}, {"description": "web"})
+        assert [(item.path, item.kind) for item in changes] == [(("description",), CHANGE_ADDED)]
+
+    def test_format_path_quotes_unusual_keys(self):
+        assert format_path(("tags", "kubernetes.io/role")) == 'tags["kubernetes.io/role"]'
+        assert format_path(("rule", 0, "name")) == "rule[0].name"
+
+
+class TestDiffResourceChange:
+    """Test diffs of plan resource changes"""
+
+    def test_create_and_delete_are_not_diffed(self, security_group):
+        assert diff_resource_change(_update(None, security_group, actions=["create"])) == []
+        assert diff_resource_change(_update(security_group, None, actions=["delete"])) == []
+
+    def test_unknown_values(self):
+        change = _update({"arn": "arn:1", "name": "a"}, {"name": "b"}, after_unknown={"arn": True})
+        changes = {format_path(item.path): item for item in diff_resource_change(change)}
+
+        assert changes["arn"].kind == CHANGE_UNKNOWN
+        assert changes["arn"].before == "arn:1"
+        assert changes["name"].kind == CHANGE_MODIFIED
+
+    def test_sensitive_values_are_masked(self):
+        change = _update({"password": "old", "name": "a"}, {"password": "new", "name": "a"},
+                         before_sensitive={"password": True}, after_sensitive={"password": True})
+        [item] = diff_resource_change(change)
+
+        assert item.path == ("password",)
+        assert item.before == SENSITIVE_VALUE
+        assert item.after == SENSITIVE_VALUE
+
+    def test_replace_paths(self, security_group):
+        after = copy.deepcopy(security_group)
+        after["name"] = "web-v2"
+        after["tags"]["env"] = "staging"
+        change = _update(security_group, after, actions=["delete", "create"], replace_paths=[["name"]])
+
+        changes = {format_path(item.path): item for item in diff_resource_change(change)}
+        assert changes["name"].forces_replacement
+        assert not changes["tags.env"].forces_replacement
+        assert changes["name"].describe() == "name modified (forces replacement)"
+
+
+class TestAttributeDiffCache:
+    """Test lazy cached diffs"""
+
+    def test_diff_is_computed_once_per_change(self, security_group):
+        after = copy.deepcopy(security_group)
+        after["name"] = "web-v2"
+        change = _update(security_group, after)
+        cache = AttributeDiffCache()
+
+        first = cache.get_diff(change)
+        second = cache.get_diff(change)
+
+        assert first is second
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_equal_but_distinct_changes_are_separate_entries(self, security_group):
+        change = _update(security_group, security_group)
+        cache = AttributeDiffCache(max_entries=1)
+
+        cache.get_diff(change)
+        cache.get_diff(copy.deepcopy(change))
+
+        assert len(cache) == 1
+        assert cache.misses == 2
+
+    def test_content_hash_survives_reparsing(self, security_group):
+        change = _update(security_group, security_group)
+        cache = AttributeDiffCache()
+
+        first = cache.get_diff(change, content_hash="abc")
+        second = cache.get_diff(copy.deepcopy(change), content_hash="abc")
+
+        assert first is second
+        assert cache.hits == 1
+
+
+class TestDiffRows:
+    """Test display rows of attribute diffs"""
+
+    def test_long_values_are_shortened(self):
+        policy = '{"Statement": [' + ", ".join(['{"Effect": "Allow"}'] * 200) + ']}'
+        text = format_value(policy, max_chars=40)
+
+        assert text.startswith(policy[:40])
+        assert f"{len(policy):,} chars" in text
+        assert format_value(policy + " ", max_chars=40) != text
+
+    def test_values_are_rendered(self):
+        assert format_value(None) == ""
+        assert format_value({"b": 1, "a": [1, 2]}) == '{"a": [1, 2], "b": 1}'
+        assert format_value("line1\nline2") == "line1\\nline2"
+
+    def test_rows_are_bounded(self):
+        before = {f"key_{i}": i for i in range(50)}
+        after = {f"key_{i}": i + 1 for i in range(50)}
+        rows, omitted = diff_rows(diff_values(before, after), max_rows=10)
+
+        assert len(rows) == 10
+        assert omitted == 40
+        assert rows[0] == {"Attribute": "key_0", "Change": "modified", "Before": "0", "After": "1"}
+
+
+class TestReportKeyChanges:
+    """Test the detailed changes section of reports"""
+
+    def test_nested_attribute_changes_are_reported(self, security_group):
+        from components.report_generator import ReportGeneratorComponent
+
+        after = copy.deepcopy(security_group)
+        after["ingress"][0]["from_port"] = 8443
+        report_html = ReportGeneratorComponent().generate_detailed_changes(
+            [_update(security_group, after)], {"aws_security_group": 1}
+        )
+
+        assert "ingress[0].from_port modified" in report_html
+
+    def test_report_diffs_use_the_session_cache(self, security_group):
+        from unittest.mock import patch
+
+        from components.report_generator import ReportGeneratorComponent
+
+        after = copy.deepcopy(security_group)
+        after["ingress"][0]["from_port"] = 8443
+        with patch("components.base_component.st") as mock_st:
+            mock_st.session_state = {}
+            report = ReportGeneratorComponent()
+            report.generate_detailed_changes([_update(security_group, after)], {"aws_security_group": 1})
+            cache = mock_st.session_state["attribute_diff_cache"]
+
+        assert isinstance(cache, AttributeDiffCache)
+        assert len(cache) == 1
+
+
+class TestDataTableDiffs:
+    """Test on-demand attribute diffs of selected table rows"""
+
+    @pytest.fixture
+    def resource_changes(self, security_group):
+        after = copy.deepcopy(security_group)
+        after["tags"]["env"] = "staging"
+        update = _update(security_group, after)
+        update["action"] = "update"
+        create = {"address": "aws_instance.new", "action": "create",
+                  "change": {"actions": ["create"], "before": None, "after": {"ami": "a"}}}
+        return [update, create]
+
+    @pytest.fixture
+    def display_df(self):
+        return pd.DataFrame([
+            {"resource_address": "aws_security_group.web", "action": "update"},
+            {"resource_address": "aws_instance.new", "action": "create"}
+        ])
+
+    def test_diffs_are_only_computed_for_selected_rows(self, resource_changes, display_df):
+        from components.data_table import DataTableComponent
+
+        component = DataTableComponent()
+        event = SimpleNamespace(selection=SimpleNamespace(rows=[]))
+        with patch("components.data_table.st") as mock_st, \
+                patch("components.data_table.diff_rows") as mock_rows:
+            mock_st.session_state = {}
+            component._display_attribute_diffs(display_df, event, resource_changes)
+
+        mock_rows.assert_not_called()
+
+    def test_selected_update_shows_attribute_changes(self, resource_changes, display_df):
+        from components.data_table import DataTableComponent
+
+        component = DataTableComponent()
+        event = SimpleNamespace(selection=SimpleNamespace(rows=[0, 1]))
+        with patch("components.data_table.st") as mock_st:
+            mock_st.session_state = {}
+            mock_st.expander.return_value = MagicMock()
+            component._display_attribute_diffs(display_df, event, resource_changes)
+            component._display_attribute_diffs(display_df, event, resource_changes)
+
+            shown = mock_st.dataframe.call_args_list[0][0][0]
+            cache = mock_st.session_state["attribute_diff_cache"]
+
+        assert shown.to_dict("records") == [
+            {"Attribute": "tags.env", "Change": "modified", "Before": "prod", "After": "staging"}
+        ]
+        assert mock_st.expander.call_count == 4
+        assert (cache.hits, cache.misses) == (1, 1)
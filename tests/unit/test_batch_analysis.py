@@ -0,0 +1,132 @@
+"""
+Unit tests for batch analysis of many plan files
+
+Tests per-file summaries, size ordering, portfolio merging and that the
+process pool produces the same report as in-process analysis.
+"""
+
+import json
+
+import pytest
+
+from utils.batch_analysis import BatchAnalyzer, PortfolioReport, order_by_size, summarize_plan_file
+
+
+def _write_plan(path, resource_changes):
+    """Write a plan file with the given resource changes"""
+    path.write_text(json.dumps({
+        "format_version": "1.2",
+        "terraform_version": "1.5.0",
+        "resource_changes": resource_changes
+    }))
+    return str(path)
+
+
+def _change(address, actions):
+    """Build one resource change"""
+    resource_type, name = address.split('.')
+    return {
+        "address": address,
+        "type": resource_type,
+        "name": name,
+        "change": {"actions": actions, "before": None if actions == ["create"] else {"id": name}, "after": {}}
+    }
+
+
+@pytest.fixture
+def plan_files(tmp_path):
+    """Three plan files of different sizes and risk"""
+    return [
+        _write_plan(tmp_path / "logs.json", [_change("aws_cloudwatch_log_group.app", ["create"])]),
+        _write_plan(tmp_path / "db.json", [
+            _change("aws_db_instance.main", ["delete"]),
+            _change("aws_iam_role.admin", ["delete"])
+        ]),
+        _write_plan(tmp_path / "web.json", [_change(f"aws_instance.web_{i}", ["update"]) for i in range(5)])
+    ]
+
+
+class TestSummarizePlanFile:
+    """Test cases for summarize_plan_file"""
+    
+    def test_compact_summary(self, plan_files):
+        """Test that the summary holds totals and scores but no per-resource data"""
+        summary = summarize_plan_file(plan_files[1])
+        
+        assert summary['summary']['delete'] == 2
+        assert summary['providers'] == {'aws': 2}
+        assert summary['risk']['level'] == 'High'
+        assert 'detailed_assessments' not in summary['risk']
+        assert set(summary['security']['compliance_scores']) >= {'SOC2', 'PCI_DSS'}
+    
+    def test_error_is_returned(self, tmp_path):
+        """Test that an unreadable file yields an error summary"""
+        summary = summarize_plan_file(str(tmp_path / "missing.json"))
+        
+        assert summary['file'].endswith("missing.json")
+        assert 'error' in summary
+
+
+class TestPortfolio:
+    """Test cases for ordering and merging"""
+    
+    def test_order_by_size(self, plan_files, tmp_path):
+        """Test that files are ordered largest first with missing files last"""
+        missing = str(tmp_path / "missing.json")
+        
+        ordered = order_by_size(plan_files + [missing])
+        
+        assert ordered[0].endswith("web.json")
+        assert ordered[-1] == missing
+    
+    def test_merge_totals(self, plan_files, tmp_path):
+        """Test portfolio totals, risk distribution and top plans"""
+        report = PortfolioReport()
+        for path in plan_files + [str(tmp_path / "missing.json")]:
+            report.add(summarize_plan_file(path))
+        
+        result = report.to_dict()
+        
+        assert result['plan_count'] == 3
+        assert result['error_count'] == 1
+        assert result['summary'] == {'create': 1, 'update': 5, 'delete': 2, 'total': 8}
+        assert result['providers'] == {'aws': 8}
+        assert sum(result['risk_levels'].values()) == 3
+        assert result['top_risk_plans'][0]['file'].endswith("db.json")
+        assert result['max_risk_score'] == result['top_risk_plans'][0]['score']
+    
+    def test_reports_of_several_nodes_merge_exactly(self, plan_files):
+        """Test that reports built and serialized separately merge into the single-batch report"""
+        summaries = [summarize_plan_file(path) for path in plan_files]
+        whole = PortfolioReport()
+        for summary in summaries:
+            whole.add(summary)
+        
+        node_reports = []
+        for node_summaries in (summaries[:1], summaries[1:]):
+            report = PortfolioReport()
+            for summary in reversed(node_summaries):
+                report.add(summary)
+            node_reports.append(PortfolioReport.from_dict(json.loads(json.dumps(report.to_dict()))))
+        merged = node_reports[1].merge(node_reports[0]).to_dict()
+        
+        expected = json.loads(json.dumps(whole.to_dict()))
+        assert merged == expected
+        assert merged['aggregates']['changes']['summary'] == [1, 5, 2, 8]
+        assert sum(merged['resource_risk']['levels'].values()) == 8
+        assert merged['resource_risk']['providers']['aws']['total_resources'] == 8
+    
+    def test_pool_matches_in_process(self, plan_files):
+        """Test that worker processes produce the same report as in-process analysis"""
+        inline = BatchAnalyzer(max_workers=1).analyze(plan_files).to_dict()
+        
+        progress = []
+        pooled = BatchAnalyzer(max_workers=2).analyze(
+            plan_files, progress=lambda done, total: progress.append((done, total))
+        ).to_dict()
+        
+        for report in (inline, pooled):
+            for plan in report['plans']:
+                plan.pop('duration')
+        assert pooled == inline
+        assert progress[-1] == (3, 3)
@@ -0,0 +1,145 @@
+"""
+Unit tests for the CI gate command-line entry point
+
+Tests threshold evaluation, the JSON report and the exit codes for passing,
+failing and unreadable plans.
+"""
+
+import json
+
+import pytest
+
+import cli
+
+
+@pytest.fixture
+def low_risk_plan(tmp_path):
+    """Plan file that only creates a log group"""
+    plan = {
+        "format_version": "1.2",
+        "terraform_version": "1.5.0",
+        "resource_changes": [
+            {
+                "address": "aws_cloudwatch_log_group.app",
+                "type": "aws_cloudwatch_log_group",
+                "name": "app",
+                "change": {"actions": ["create"], "before": None, "after": {"name": "app"}}
+            }
+        ]
+    }
+    path = tmp_path / "low.json"
+    path.write_text(json.dumps(plan))
+    return str(path)
+
+
+@pytest.fixture
+def high_risk_plan(tmp_path):
+    """Plan file that deletes a database and an IAM role"""
+    plan = {
+        "format_version": "1.2",
+        "terraform_version": "1.5.0",
+        "resource_changes": [
+            {
+                "address": "aws_db_instance.main",
+                "type": "aws_db_instance",
+                "name": "main",
+                "change": {"actions": ["delete"], "before": {"engine": "postgres"}, "after": None}
+            },
+            {
+                "address": "aws_iam_role.admin",
+                "type": "aws_iam_role",
+                "name": "admin",
+                "change": {"actions": ["delete"], "before": {"name": "admin"}, "after": None}
+            }
+        ]
+    }
+    path = tmp_path / "high.json"
+    path.write_text(json.dumps(plan))
+    return str(path)
+
+
+class TestEvaluateThresholds:
+    """Test cases for evaluate_thresholds"""
+    
+    def test_level_threshold(self):
+        """Test that levels at or above fail_on are violations"""
+        report = {'risk': {'level': 'Medium', 'score': 45}}
+        
+        assert cli.evaluate_thresholds(report, fail_on='High') == []
+        assert len(cli.evaluate_thresholds(report, fail_on='Medium')) == 1
+        assert len(cli.evaluate_thresholds(report, fail_on='Low')) == 1
+        assert cli.evaluate_thresholds(report, fail_on=None) == []
+    
+    def test_score_thresholds(self):
+        """Test the risk and security score thresholds"""
+        report = {'risk': {'level': 'Low', 'score': 30}, 'security': {'overall_security_score': 40.0}}
+        
+        assert cli.evaluate_thresholds(report, max_score=30) == []
+        assert len(cli.evaluate_thresholds(report, max_score=29)) == 1
+        assert len(cli.evaluate_thresholds(report, min_security_score=50)) == 1
+        assert cli.evaluate_thresholds(report, min_security_score=40) == []
+
+
+class TestMain:
+    """Test cases for the CLI entry point"""
+    
+    def test_passing_plan(self, low_risk_plan, capsys):
+        """Test report contents and exit code for a plan within thresholds"""
+        exit_code = cli.main([low_risk_plan])
+        output = json.loads(capsys.readouterr().out)
+        
+        assert exit_code == cli.EXIT_PASS
+        assert output['passed'] is True
+        report = output['plans'][0]
+        assert report['file'] == low_risk_plan
+        assert report['summary']['create'] == 1
+        assert 'compliance_results' in report['security']
+        assert 'detailed_assessments' not in report['risk']
+    
+    def test_failing_plan(self, low_risk_plan, high_risk_plan, capsys):
+        """Test that one failing plan fails the whole gate"""
+        exit_code = cli.main([low_risk_plan, high_risk_plan, '--fail-on', 'High'])
+        output = json.loads(capsys.readouterr().out)
+        
+        assert exit_code == cli.EXIT_FAIL
+        assert [report['passed'] for report in output['plans']] == [True, False]
+        assert output['plans'][1]['violations']
+    
+    def test_fail_on_none_passes(self, high_risk_plan, capsys):
+        """Test that --fail-on none disables the level threshold"""
+        assert cli.main([high_risk_plan, '--fail-on', 'none', '--no-security']) == cli.EXIT_PASS
+        output = json.loads(capsys.readouterr().out)
+        assert output['plans'][0]['security'] is None
+    
+    def test_unreadable_plan(self, tmp_path, low_risk_plan, capsys):
+        """Test that missing or invalid files produce exit code 2"""
+        invalid = tmp_path / "invalid.json"
+        invalid.write_text("not json")
+        
+        exit_code = cli.main([low_risk_plan, str(invalid), str(tmp_path / "missing.json")])
+        output = json.loads(capsys.readouterr().out)
+        
+        assert exit_code == cli.EXIT_ERROR
+        assert 'error' in output['plans'][1]
+        assert 'error' in output['plans'][2]
+    
+    def test_output_file(self, low_risk_plan, tmp_path, capsys):
+        """Test writing the report to a file with per-resource assessments"""
+        output_path = tmp_path / "report.json"
+        
+        cli.main([low_risk_plan, '--output', str(output_path), '--include-assessments'])
+        
+        assert capsys.readouterr().out == ''
+        output = json.loads(output_path.read_text())
+        assert len(output['plans'][0]['risk']['detailed_assessments']) == 1
+    
+    def test_portfolio_mode(self, low_risk_plan, high_risk_plan, capsys):
+        """Test the merged portfolio report and its threshold results"""
+        exit_code = cli.main([low_risk_plan, high_risk_plan, '--portfolio', '--workers', '1'])
+        output = json.loads(capsys.readouterr().out)
+        
+        assert exit_code == cli.EXIT_FAIL
+        portfolio = output['portfolio']
+        assert portfolio['plan_count'] == 2
+        assert portfolio['top_risk_plans'][0]['file'] == high_risk_plan
+        assert sum(plan['passed'] for plan in portfolio['plans']) == 1
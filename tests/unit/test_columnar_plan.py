@@ -0,0 +1,166 @@
+"""
+Unit tests for the columnar plan parser
+
+Tests that the parser view built from a worker's change table answers like
+PlanParser, and that plan entries are only decoded when read.
+"""
+
+import json
+import pickle
+
+import pytest
+
+from parsers.columnar_plan import ColumnarPlanParser, LazyRecord
+from parsers.plan_parser import PlanParser
+from utils.plan_aggregates import ChangeAggregate
+from utils.plan_comparison import PlanIndex
+from utils.plan_worker_pool import _collect_result, _share_bytes, analyze_shared_plan
+
+
+@pytest.fixture
+def plan_data():
+    """Plan with a count fan-out, a replacement and a no-op"""
+    return {
+        "format_version": "1.2",
+        "terraform_version": "1.5.0",
+        "configuration": {"root_module": {}},
+        "planned_values": {"root_module": {}},
+        "resource_changes": [
+            {
+                "address": f"aws_instance.web[{index}]",
+                "type": "aws_instance",
+                "name": "web",
+                "index": index,
+                "change": {"actions": ["create"], "before": None, "after": {"instance_type": "t3.micro"}}
+            }
+            for index in range(3)
+        ] + [
+            {
+                "address": "aws_db_instance.main",
+                "type": "aws_db_instance",
+                "name": "main",
+                "change": {"actions": ["delete", "create"], "before": {}, "after": {"password": "(sensitive)"}}
+            },
+            {
+                "address": "random_id.suffix",
+                "type": "random_id",
+                "name": "suffix",
+                "change": {"actions": ["no-op"], "before": {}, "after": {}}
+            }
+        ]
+    }
+
+
+def _columnar_parser(plan_data):
+    """Run the worker entry point in-process and build the parser view"""
+    block, source = _share_bytes(json.dumps(plan_data).encode('utf-8'))
+    try:
+        result = _collect_result(analyze_shared_plan(source, enhanced=True))
+    finally:
+        block.close()
+        block.unlink()
+    return ColumnarPlanParser(
+        result['table'],
+        result['sections'],
+        ChangeAggregate.from_dict(result['change_aggregate']),
+        result['resource_types'],
+        result['debug_info'],
+        result['detected_providers']
+    )
+
+
+class TestColumnarPlanParser:
+    """Test cases for the parser view of a worker analysis"""
+
+    def test_matches_plan_parser(self, plan_data):
+        """Test that the view answers the dashboard's queries like PlanParser"""
+        view = _columnar_parser(plan_data)
+        parser = PlanParser(plan_data)
+
+        assert view.get_resource_changes() == parser.get_resource_changes()
+        assert view.get_summary() == parser.get_summary()
+        assert view.get_resource_types() == parser.get_resource_types()
+        assert view.get_debug_info() == parser.get_debug_info()
+        assert view.get_plan_metadata() == parser.get_plan_metadata()
+        assert view.get_sensitive_changes() == parser.get_sensitive_changes()
+        assert view.create_detailed_dataframe(view.get_resource_changes()).equals(
+            parser.create_detailed_dataframe(parser.get_resource_changes())
+        )
+
+    def test_instance_groups_use_worker_keys(self, plan_data):
+        """Test that the instance groups match those built from the plan"""
+        view = _columnar_parser(plan_data)
+        expected = PlanParser(plan_data).get_instance_groups()
+
+        groups = view.get_instance_groups()
+
+        assert [group.key for group in groups] == [group.key for group in expected]
+        assert [group.addresses for group in groups] == [group.addresses for group in expected]
+
+    def test_plan_index_matches_plan_hashes(self, plan_data):
+        """Test that the index rebuilt from the table equals PlanIndex.from_plan()"""
+        expected = PlanIndex.from_plan(plan_data)
+
+        index = _columnar_parser(plan_data).get_plan_index()
+
+        assert index.hashes == expected.hashes
+        assert index.actions == expected.actions
+
+    def test_state_sections_stay_in_the_worker(self, plan_data):
+        """Test that large state sections are not shipped to the dashboard"""
+        view = _columnar_parser(plan_data)
+
+        assert 'planned_values' not in view.plan_data
+        assert view.plan_data['configuration'] == plan_data['configuration']
+        assert view.plan_data['resource_changes'] == plan_data['resource_changes']
+
+    def test_entries_are_decoded_on_read(self, plan_data):
+        """Test that listing changes does not decode their before/after values"""
+        view = _columnar_parser(plan_data)
+
+        changes = view.get_resource_changes()
+        addresses = [(change['address'], change['action'], change.get('provider')) for change in changes]
+
+        assert addresses[0] == ('aws_instance.web[0]', 'create', 'aws')
+        assert not any(change.loaded for change in changes)
+        assert changes[0]['after'] == {'instance_type': 't3.micro'}
+        assert changes[0].loaded
+
+
+class TestLazyRecord:
+    """Test cases for records loaded on first use"""
+
+    def _record(self, calls):
+        def load(record):
+            calls.append(record)
+            return {'address': 'a', 'before': None, 'after': {'x': 1}}
+        return LazyRecord({'address': 'a'}, load)
+
+    def test_present_keys_do_not_load(self):
+        """Test that lookups of the initial keys skip the loader"""
+        calls = []
+        record = self._record(calls)
+
+        assert record['address'] == 'a'
+        assert record.get('address') == 'a'
+        assert 'address' in record
+        assert calls == []
+
+    def test_other_access_loads_once(self):
+        """Test that the loader runs once and keeps the complete key order"""
+        calls = []
+        record = self._record(calls)
+
+        assert record.get('after') == {'x': 1}
+        assert list(record) == ['address', 'before', 'after']
+        assert len(calls) == 1
+
+    def test_copies_are_plain_dictionaries(self):
+        """Test serialization of records"""
+        record = self._record([])
+        expected = {'address': 'a', 'before': None, 'after': {'x': 1}}
+
+        assert dict(record) == expected
+        assert json.loads(json.dumps(self._record([]))) == expected
+        restored = pickle.loads(pickle.dumps(self._record([])))
+        assert type(restored) is dict and restored == expected
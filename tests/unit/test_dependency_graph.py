@@ -0,0 +1,156 @@
+"""
+Unit tests for the configuration dependency graph
+
+Tests that references, depends_on, count/for_each and module boundaries
+become graph edges, that downstream reachability is transitive (also
+through cycles), and that changed resources are ranked by blast radius.
+"""
+
+import pytest
+
+from parsers.plan_parser import PlanParser
+from utils.dependency_graph import DependencyGraph, config_address, rank_blast_radius
+
+
+def _resource(address, *references, depends_on=None, **extra):
+    """Build one configuration resource"""
+    resource = {
+        "address": address,
+        "mode": "data" if address.startswith("data.") else "managed",
+        "expressions": {"value": {"references": list(references)}} if references else {},
+        **extra
+    }
+    if depends_on:
+        resource["depends_on"] = depends_on
+    return resource
+
+
+@pytest.fixture
+def configuration():
+    """Root module calling a network module that nests a subnet module"""
+    return {
+        "root_module": {
+            "resources": [
+                _resource("aws_vpc.main"),
+                _resource("aws_kms_key.main"),
+                _resource("data.aws_ami.ubuntu"),
+                _resource("aws_instance.web", "module.net.subnet_ids", "data.aws_ami.ubuntu.id",
+                          count_expression={"references": ["var.instance_count"]}),
+                _resource("aws_lb.web", "aws_instance.web[0].id", "aws_instance.web"),
+                _resource("aws_cloudwatch_log_group.app", depends_on=["aws_kms_key.main"])
+            ],
+            "module_calls": {
+                "net": {
+                    "expressions": {"vpc_id": {"references": ["aws_vpc.main.id", "aws_vpc.main"]}},
+                    "module": {
+                        "resources": [_resource("aws_route_table.private", "var.vpc_id")],
+                        "outputs": {"subnet_ids": {"expression": {"references": ["module.subnets"]}}},
+                        "module_calls": {
+                            "subnets": {
+                                "expressions": {"route_table_id": {"references": ["aws_route_table.private.id"]}},
+                                "module": {
+                                    "resources": [_resource('aws_subnet.private', "var.route_table_id",
+                                                            for_each_expression={"references": ["local.zones"]})],
+                                    "outputs": {"ids": {"expression": {"references": ["aws_subnet.private"]}}}
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+
+@pytest.fixture
+def graph(configuration):
+    return DependencyGraph.from_configuration(configuration)
+
+
+class TestDependencyGraph:
+    """Test graph construction"""
+
+    def test_direct_dependencies(self, graph):
+        assert graph.dependencies("aws_lb.web") == ["aws_instance.web"]
+        assert graph.dependencies("aws_cloudwatch_log_group.app") == ["aws_kms_key.main"]
+
+    def test_resource_dependencies_cross_module_boundaries(self, graph):
+        assert graph.resource_dependencies("aws_instance.web") == [
+            "data.aws_ami.ubuntu", "module.net.module.subnets.aws_subnet.private"
+        ]
+        assert graph.resource_dependencies("module.net.module.subnets.aws_subnet.private") == [
+            "module.net.aws_route_table.private"
+        ]
+        assert graph.resource_dependencies("module.net.aws_route_table.private") == ["aws_vpc.main"]
+
+    def test_adjacency_arrays(self, graph):
+        assert len(graph.dependency_targets) == len(graph.dependent_targets) == graph.edge_count
+        assert len(graph.dependency_offsets) == len(graph) + 1
+
+    def test_empty_configuration(self):
+        graph = DependencyGraph.from_configuration({})
+        assert len(graph) == 0
+        assert graph.blast_radius(["aws_vpc.main"]) == {}
+
+    def test_config_address(self):
+        assert config_address('module.net["eu"].module.subnets.aws_subnet.private["a.b"]') == \
+            "module.net.module.subnets.aws_subnet.private"
+        assert config_address("data.aws_ami.ubuntu") == "data.aws_ami.ubuntu"
+
+
+class TestBlastRadius:
+    """Test transitive downstream reachability"""
+
+    def test_transitive_downstream(self, graph):
+        radius = graph.blast_radius(["aws_vpc.main", "aws_kms_key.main", "aws_lb.web"])
+
+        assert radius["aws_vpc.main"]["downstream"] == [
+            "aws_instance.web", "aws_lb.web",
+            "module.net.aws_route_table.private", "module.net.module.subnets.aws_subnet.private"
+        ]
+        assert radius["aws_kms_key.main"]["downstream_count"] == 1
+        assert radius["aws_lb.web"]["downstream_count"] == 0
+
+    def test_cycles(self):
+        graph = DependencyGraph.from_configuration({"root_module": {"resources": [
+            _resource("a.one", "a.two"), _resource("a.two", "a.one"), _resource("a.three", "a.one")
+        ]}})
+        radius = graph.blast_radius(["a.one", "a.three"])
+
+        assert radius["a.one"]["downstream"] == ["a.one", "a.three", "a.two"]
+        assert radius["a.three"]["downstream_count"] == 0
+
+    def test_rank_changes(self, graph):
+        changes = [
+            {"address": "aws_vpc.main", "action": "replace"},
+            {"address": 'module.net.module.subnets.aws_subnet.private["a"]', "action": "update"},
+            {"address": "aws_lb.web", "action": "update"}
+        ]
+        impact = rank_blast_radius(graph, changes)
+
+        assert [item["address"] for item in impact["top_changes"]] == [
+            "aws_vpc.main", 'module.net.module.subnets.aws_subnet.private["a"]'
+        ]
+        assert impact["top_changes"][0]["downstream_changed"] == 2
+        assert impact["affected_resources"] == 4
+        assert impact["changes_with_dependents"] == 2
+
+
+class TestPlanParserDependencies:
+    """Test the parser's dependency views"""
+
+    def test_dependency_info_and_blast_radius(self, configuration):
+        plan_data = {
+            "configuration": configuration,
+            "resource_changes": [
+                {"address": "aws_vpc.main", "type": "aws_vpc", "name": "main",
+                 "change": {"actions": ["delete", "create"], "before": {}, "after": {}}}
+            ]
+        }
+        parser = PlanParser(plan_data)
+
+        assert parser.get_dependency_info()["aws_lb.web"] == ["aws_instance.web"]
+        impact = parser.analyze_blast_radius()["dependency_impact"]
+        assert impact["top_changes"][0]["address"] == "aws_vpc.main"
+        assert impact["top_changes"][0]["downstream_count"] == 4
+        assert parser.get_dependency_graph() is parser.get_dependency_graph()
@@ -0,0 +1,147 @@
+"""
+Unit tests for the deployment schedule simulation
+
+Tests that resources wait for their dependencies (across unchanged
+resources and module boundaries), that at most ``parallelism`` resources
+run at once, the critical path, and how the schedule feeds the deployment
+time estimates and the timeline chart.
+"""
+
+import pytest
+
+from utils.dependency_graph import DependencyGraph
+from utils.deployment_schedule import provider_timeline, resource_duration, schedule_deployment
+
+
+def _resource(address, *references):
+    """Build one configuration resource"""
+    return {"address": address, "mode": "managed",
+            "expressions": {"value": {"references": list(references)}} if references else {}}
+
+
+@pytest.fixture
+def graph():
+    """vpc -> subnet (unchanged) -> instance -> module.dns record"""
+    return DependencyGraph.from_configuration({"root_module": {
+        "resources": [
+            _resource("aws_vpc.main"),
+            _resource("aws_subnet.private", "aws_vpc.main.id"),
+            _resource("aws_instance.web", "aws_subnet.private.id")
+        ],
+        "module_calls": {"dns": {
+            "expressions": {"target": {"references": ["aws_instance.web.private_ip"]}},
+            "module": {"resources": [_resource("google_dns_record_set.web", "var.target")]}
+        }}
+    }})
+
+
+def _assessment(address, level="Low", provider="aws"):
+    return {"address": address, "level": level, "provider": provider}
+
+
+class TestScheduleDeployment:
+    """Test the simulated apply"""
+
+    def test_dependencies_are_respected(self, graph):
+        schedule = schedule_deployment([
+            _assessment("module.dns.google_dns_record_set.web", provider="google"),
+            _assessment("aws_instance.web[0]", "Medium"),
+            _assessment("aws_instance.web[1]", "Medium"),
+            _assessment("aws_vpc.main", "High")
+        ], graph)
+        starts = {task.address: (task.start, task.finish) for task in schedule.tasks}
+
+        assert starts["aws_vpc.main"] == (0, 60)
+        assert starts["aws_instance.web[0]"] == starts["aws_instance.web[1]"] == (60, 105)
+        assert starts["module.dns.google_dns_record_set.web"] == (105, 135)
+        assert schedule.makespan_seconds == schedule.critical_path_seconds == 135
+        assert schedule.critical_path == ["aws_vpc.main", "aws_instance.web", "module.dns.google_dns_record_set.web"]
+
+    def test_parallelism_limits_concurrency(self):
+        assessments = [_assessment(f"aws_s3_bucket.b{i}") for i in range(25)]
+
+        schedule = schedule_deployment(assessments, parallelism=10)
+
+        assert schedule.peak_concurrency == 10
+        assert schedule.makespan_seconds == 90
+        assert schedule.critical_path_seconds == 30
+        assert schedule.sequential_seconds == 750
+        assert schedule_deployment(assessments, parallelism=1).makespan_seconds == 750
+
+    def test_provider_multipliers(self):
+        assessment = _assessment("azurerm_vm.a", "Medium", "azure")
+        assert resource_duration(assessment, {"azure": 1.2}) == pytest.approx(54)
+        assert resource_duration({"address": "x.y"}) == 30
+
+    def test_resources_outside_the_graph_have_no_dependencies(self, graph):
+        schedule = schedule_deployment([_assessment("aws_vpc.main"), _assessment("aws_eip.removed")], graph)
+        assert [task.start for task in schedule.tasks] == [0, 0]
+
+    def test_dependency_cycles_do_not_stall(self):
+        graph = DependencyGraph.from_configuration({"root_module": {"resources": [
+            _resource("a.one", "a.two"), _resource("a.two", "a.one")
+        ]}})
+        schedule = schedule_deployment([_assessment("a.one"), _assessment("a.two")], graph)
+
+        assert schedule.dependency_cycles
+        assert len(schedule.tasks) == 2
+
+    def test_provider_timeline(self, graph):
+        schedule = schedule_deployment([
+            _assessment("aws_vpc.main", "High"),
+            _assessment("module.dns.google_dns_record_set.web", provider="google")
+        ], graph).to_dict()
+
+        assert provider_timeline(schedule) == {
+            "aws": {"resource_count": 1, "estimated_time": "< 5 minutes", "start_minutes": 0.0, "finish_minutes": 1.0},
+            "google": {"resource_count": 1, "estimated_time": "< 5 minutes", "start_minutes": 1.0,
+                       "finish_minutes": 1.5}
+        }
+
+
+class TestDeploymentEstimates:
+    """Test the schedule in risk assessment results"""
+
+    @pytest.fixture
+    def plan_data(self):
+        configuration = {"root_module": {"resources": [
+            _resource(f"aws_instance.r{i}", f"aws_instance.r{i - 1}.id") if i else _resource("aws_instance.r0")
+            for i in range(12)
+        ]}}
+        resource_changes = [
+            {"address": f"aws_instance.r{i}", "type": "aws_instance", "name": f"r{i}",
+             "provider_name": "registry.terraform.io/hashicorp/aws",
+             "change": {"actions": ["create"], "before": None, "after": {}}}
+            for i in range(12)
+        ]
+        return {"configuration": configuration, "resource_changes": resource_changes}
+
+    def test_chain_is_not_parallelized(self, plan_data):
+        from utils.enhanced_risk_assessment import EnhancedRiskAssessment
+
+        timeline = EnhancedRiskAssessment().get_deployment_timeline_estimate(plan_data["resource_changes"], plan_data)
+
+        assert timeline["makespan_seconds"] == timeline["sequential_seconds"] == timeline["critical_path_seconds"]
+        assert not timeline["parallel_execution_possible"]
+        assert timeline["sequential_dependencies"][0] == "aws_instance.r0"
+        assert len(timeline["sequential_dependencies"]) == 12
+
+    def test_independent_resources_run_in_parallel(self, plan_data):
+        from utils.enhanced_risk_assessment import EnhancedRiskAssessment
+
+        del plan_data["configuration"]
+        result = EnhancedRiskAssessment(parallelism=4).assess_plan_risk(plan_data["resource_changes"], plan_data)
+        schedule = result["deployment_schedule"]
+
+        assert schedule["peak_concurrency"] == 4
+        assert schedule["makespan_seconds"] == schedule["sequential_seconds"] / 4
+
+    def test_gantt_chart_uses_simulated_start_times(self):
+        from visualizers.charts import ChartGenerator
+
+        fig = ChartGenerator().create_deployment_timeline_gantt({"provider_specific_times": {
+            "aws": {"resource_count": 3, "start_minutes": 0.0, "finish_minutes": 2.5},
+            "google": {"resource_count": 1, "start_minutes": 2.5, "finish_minutes": 3.0}
+        }})
+
+        assert [(bar.base[0], bar.x[0]) for bar in fig.data] == [(0.0, 2.5), (2.5, 0.5)]
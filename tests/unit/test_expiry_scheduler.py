@@ -0,0 +1,91 @@
+"""
+Unit tests for the expiry scheduler
+
+Tests the shared heap-based scheduler used for credential and plan data
+session expiry.
+"""
+
+import threading
+
+from utils.expiry_scheduler import ExpiryScheduler, get_expiry_scheduler
+
+
+class TestExpiryScheduler:
+    """Test cases for ExpiryScheduler"""
+    
+    def setup_method(self):
+        """Set up a private scheduler for each test"""
+        self.scheduler = ExpiryScheduler()
+    
+    def teardown_method(self):
+        """Stop the scheduler thread"""
+        self.scheduler.shutdown()
+    
+    def test_callbacks_run_in_due_order(self):
+        """Test that callbacks run in order of their due time"""
+        order = []
+        done = threading.Event()
+        
+        self.scheduler.schedule(0.06, lambda: (order.append('late'), done.set()))
+        self.scheduler.schedule(0.02, lambda: order.append('early'))
+        self.scheduler.schedule(0.04, lambda: order.append('middle'))
+        
+        assert done.wait(timeout=2.0)
+        assert order == ['early', 'middle', 'late']
+    
+    def test_cancelled_callback_does_not_run(self):
+        """Test that cancelled callbacks are skipped"""
+        ran = []
+        done = threading.Event()
+        
+        handle = self.scheduler.schedule(0.01, lambda: ran.append('cancelled'))
+        self.scheduler.schedule(0.03, done.set)
+        handle.cancel()
+        
+        assert done.wait(timeout=2.0)
+        assert ran == []
+        assert not handle.active
+    
+    def test_single_thread_for_many_expirations(self):
+        """Test that scheduling many expirations does not create threads"""
+        self.scheduler.schedule(60, lambda: None)
+        threads_before = threading.active_count()
+        
+        handles = [self.scheduler.schedule(60, lambda: None) for _ in range(500)]
+        
+        assert threading.active_count() == threads_before
+        assert self.scheduler.pending_count() == 501
+        for handle in handles:
+            handle.cancel()
+        assert self.scheduler.pending_count() == 1
+    
+    def test_cancelled_entries_are_compacted(self):
+        """Test that the heap drops cancelled entries once they dominate"""
+        handles = [self.scheduler.schedule(60, lambda: None) for _ in range(200)]
+        
+        for handle in handles[:150]:
+            handle.cancel()
+        
+        assert len(self.scheduler._heap) < 200
+        assert self.scheduler.pending_count() == 50
+    
+    def test_failing_callback_does_not_stop_scheduler(self):
+        """Test that an exception in one callback does not affect the others"""
+        done = threading.Event()
+        
+        self.scheduler.schedule(0.01, lambda: 1 / 0)
+        self.scheduler.schedule(0.02, done.set)
+        
+        assert done.wait(timeout=2.0)
+    
+    def test_callback_can_reschedule(self):
+        """Test that callbacks can schedule new expirations"""
+        done = threading.Event()
+        
+        self.scheduler.schedule(0.01, lambda: self.scheduler.schedule(0.01, done.set))
+        
+        assert done.wait(timeout=2.0)
+    
+    def test_shared_scheduler_is_singleton(self):
+        """Test that the process-wide scheduler is shared"""
+        assert get_expiry_scheduler() is get_expiry_scheduler()
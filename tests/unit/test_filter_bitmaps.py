@@ -0,0 +1,115 @@
+"""
+Unit tests for filter bitmaps
+
+Tests packed bitset operations, per-value bitmaps, AND/OR selections and the
+data table's basic filters built on them.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.filter_bitmaps import Bitset, FilterBitmaps
+
+
+def _table():
+    return pd.DataFrame({
+        "resource_name": ["web", "db", "vm", "logs", "role", "cdn", "queue", "dns", "key", "sg"],
+        "action": ["create", "delete", "update", "replace", "create", "update", "create", "delete", "update", "create"],
+        "risk_level": ["High", "Low", "Medium", "High", "Low", "Low", "Medium", "High", "Low", "High"],
+        "provider": ["aws", "google", "azure", "aws", "aws", "aws", "azure", "google", "aws", "aws"],
+        "resource_type": ["aws_instance", "google_sql", "azurerm_vm", "aws_s3_bucket", "aws_iam_role",
+                          "aws_cloudfront", "azurerm_queue", "google_dns", "aws_kms_key", "aws_security_group"]
+    }, index=range(100, 110))
+
+
+class TestBitset:
+    """Test packed bitset operations"""
+
+    @pytest.mark.parametrize("size", [1, 7, 8, 13, 64])
+    def test_operations_match_boolean_masks(self, size):
+        rng = np.random.default_rng(size)
+        a, b = rng.random(size) < 0.5, rng.random(size) < 0.5
+        left, right = Bitset.from_mask(a), Bitset.from_mask(b)
+
+        assert (left & right).to_mask().tolist() == (a & b).tolist()
+        assert (left | right).to_mask().tolist() == (a | b).tolist()
+        assert (~left).to_mask().tolist() == (~a).tolist()
+        assert (~left).count() == int((~a).sum())
+        assert Bitset.full(size).count() == size
+        assert Bitset.empty(size).count() == 0
+
+
+class TestFilterBitmaps:
+    """Test per-value bitmaps and selections"""
+
+    def test_value_counts(self):
+        bitmaps = FilterBitmaps.from_dataframe(_table())
+
+        assert len(bitmaps) == 10
+        assert bitmaps.dimensions == ["action", "risk_level", "provider", "resource_type"]
+        assert bitmaps.value_counts("action") == {"create": 4, "delete": 2, "update": 3, "replace": 1}
+        assert bitmaps.value_counts("missing") == {}
+
+    @pytest.mark.parametrize("logic", ["AND", "OR"])
+    def test_filter_matches_isin(self, logic):
+        df = _table()
+        bitmaps = FilterBitmaps.from_dataframe(df)
+        actions, risks, providers = ["create", "replace"], ["High"], ["aws", "unknown"]
+
+        selection = bitmaps.filter({"action": actions, "risk_level": risks, "provider": providers}, logic)
+
+        masks = [df["action"].isin(actions), df["risk_level"].isin(risks), df["provider"].isin(providers)]
+        expected = (masks[0] & masks[1] & masks[2]) if logic == "AND" else (masks[0] | masks[1] | masks[2])
+        assert selection.to_mask().tolist() == expected.tolist()
+        assert selection.count() == int(expected.sum())
+
+    def test_skipped_dimensions(self):
+        bitmaps = FilterBitmaps.from_dataframe(_table().drop(columns=["provider"]))
+
+        assert bitmaps.filter({"action": ["delete"], "provider": ["aws"]}).count() == 2
+        assert bitmaps.filter({"action": ["delete"], "risk_level": None}, "OR").count() == 2
+        assert bitmaps.filter({}, "OR").count() == 0
+
+    def test_covers(self):
+        df = _table()
+        bitmaps = FilterBitmaps.from_dataframe(df)
+
+        assert bitmaps.covers(df)
+        assert not bitmaps.covers(df.iloc[:5])
+        assert not bitmaps.covers(df.reset_index(drop=True))
+
+
+class TestDataTableBasicFilters:
+    """Test the data table's basic filters"""
+
+    def test_basic_filters_use_bitmaps(self):
+        from components.data_table import DataTableComponent
+
+        df = _table()
+        component = DataTableComponent()
+        bitmaps = FilterBitmaps.from_dataframe(df)
+
+        filtered = component._apply_basic_filters(df, ["delete"], ["High"], ["google"], "AND", bitmaps)
+        subset = df.iloc[2:6]
+        filtered_subset = component._apply_basic_filters(subset, ["create"], [], None, "OR", bitmaps)
+
+        assert filtered["resource_name"].tolist() == ["dns"]
+        assert filtered_subset["resource_name"].tolist() == ["role"]
+        assert component._select_basic_filters(bitmaps, ["create"], ["High"], None, "OR").count() == 6
+
+    def test_risk_table_is_built_once_per_plan(self):
+        from unittest.mock import patch
+
+        from components.data_table import DataTableComponent
+
+        component = DataTableComponent()
+        with patch("components.data_table.st") as mock_st, \
+                patch.object(component, "_build_risk_table", return_value=_table()) as build:
+            mock_st.session_state = {"plan_change_tracking": {"current_index": object()}}
+            tables = [component._get_risk_table([], None, {}, None, False) for _ in range(3)]
+            mock_st.session_state["plan_change_tracking"] = {"current_index": object()}
+            component._get_risk_table([], None, {}, None, False)
+
+        assert build.call_count == 2
+        assert tables[0] is tables[1] is tables[2]
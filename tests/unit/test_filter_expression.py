@@ -0,0 +1,129 @@
+"""
+Unit tests for advanced filter expressions
+
+Tests parsing, operator precedence, typed fields, vectorized evaluation and
+the data table and sidebar's use of compiled expressions.
+"""
+
+import pandas as pd
+import pytest
+
+from parsers.address_parser import module_address_from_address
+from utils.filter_expression import FilterExpressionError, compile_filter_expression
+
+
+def _table():
+    return pd.DataFrame({
+        "action": ["create", "delete", "update", "replace", "create"],
+        "risk_level": ["High", "Low", "Medium", "High", None],
+        "provider": ["aws", "google", "azure", "aws", "aws"],
+        "resource_type": ["aws_instance", "google_sql_database_instance", "azurerm_linux_virtual_machine",
+                          "aws_s3_bucket", "aws_iam_role"],
+        "resource_name": ["web", "db", "vm", "logs", "deploy"],
+        "resource_address": ["module.app.aws_instance.web", "google_sql_database_instance.db",
+                             'module.net.module.vpc["eu.west"].azurerm_linux_virtual_machine.vm',
+                             "aws_s3_bucket.logs", "module.app.aws_iam_role.deploy"],
+        "is_sensitive": [True, False, False, True, False]
+    })
+
+
+def _matches(expression, df=None):
+    df = _table() if df is None else df
+    return df["resource_name"][compile_filter_expression(expression).mask(df)].tolist()
+
+
+class TestParsing:
+    """Test parsing and formatting of expressions"""
+
+    def test_precedence_and_formatting(self):
+        expression = compile_filter_expression("action='create' or action = 'delete' and NOT (risk='low' OR sensitive)")
+
+        assert str(expression) == "action='create' OR action='delete' AND NOT (risk='low' OR sensitive=true)"
+        assert expression.fields == ["action", "risk", "sensitive"]
+
+    def test_values(self):
+        expression = compile_filter_expression("name IN (web, \"d\\\"b\", 42) AND sensitive != false")
+
+        assert str(expression) == "name IN ('web', 'd\"b', '42') AND sensitive!=false"
+
+    def test_compiled_expressions_are_cached(self):
+        assert compile_filter_expression("action='create'") is compile_filter_expression("action='create'")
+
+    @pytest.mark.parametrize("expression, message", [
+        ("(action='create'", r"Expected '\)'"),
+        ("action='create' AND", "Expected a field name"),
+        ("owner='me'", "Unknown field 'owner'"),
+        ("action", "Expected an operator"),
+        ("action='create' risk='High'", "Expected AND, OR"),
+        ("sensitive LIKE 'x'", "not supported for boolean field"),
+        ("sensitive = 'yes'", "expects true or false"),
+        ("risk IN 'High'", r"Expected '\('"),
+        ("action ~ 'create'", "Unexpected '~'"),
+        ("   ", "empty")
+    ])
+    def test_invalid_expressions(self, expression, message):
+        with pytest.raises(FilterExpressionError, match=message):
+            compile_filter_expression(expression)
+
+
+class TestEvaluation:
+    """Test evaluation against the resource table"""
+
+    def test_or_is_not_triggered_by_values(self):
+        assert _matches("provider='google'") == ["db"]
+
+    def test_logic(self):
+        assert _matches("(action='delete' OR action='replace') AND provider='aws'") == ["logs"]
+        assert _matches("action='create' AND risk='high'") == ["web"]
+        assert _matches("NOT action IN ('create', 'delete')") == ["vm", "logs"]
+
+    def test_string_operators(self):
+        assert _matches("risk NOT IN ('Low', 'Medium')") == ["web", "logs", "deploy"]
+        assert _matches("type LIKE 'aws_%'") == ["web", "logs", "deploy"]
+        assert _matches("name NOT LIKE '_b'") == ["web", "vm", "logs", "deploy"]
+        assert _matches("risk = ''") == ["deploy"]
+
+    def test_module_and_sensitive_fields(self):
+        assert _matches("module = 'module.app'") == ["web", "deploy"]
+        assert _matches("module = ''") == ["db", "logs"]
+        assert _matches("module LIKE 'module.net.%'") == ["vm"]
+        assert _matches("sensitive") == ["web", "logs"]
+        assert _matches("sensitive = false AND provider = 'aws'") == ["deploy"]
+
+    def test_missing_columns(self):
+        df = _table().drop(columns=["is_sensitive"])
+
+        assert _matches("action='create'", df) == ["web", "deploy"]
+        with pytest.raises(FilterExpressionError, match="not available"):
+            compile_filter_expression("sensitive").mask(df)
+
+    def test_module_address_from_address(self):
+        assert module_address_from_address('module.a["x.y"].module.b[0].data.aws_ami.x') == 'module.a["x.y"].module.b[0]'
+        assert module_address_from_address("aws_instance.module") == ""
+
+
+class TestComponents:
+    """Test the data table and sidebar's use of compiled expressions"""
+
+    def test_data_table_filters_with_expression(self):
+        from components.data_table import DataTableComponent
+
+        df = _table()
+        component = DataTableComponent()
+
+        filtered = component._apply_advanced_filter_expression(df, "provider='aws' AND NOT sensitive")
+
+        assert filtered["resource_name"].tolist() == ["deploy"]
+        assert component._evaluate_filter_expression(df, "risk='high'").index.equals(df.index)
+        with pytest.raises(FilterExpressionError):
+            component._apply_advanced_filter_expression(df, "action=")
+
+    def test_sidebar_validation_reports_parse_errors(self):
+        from components.sidebar import SidebarComponent
+
+        component = SidebarComponent()
+
+        assert component._validate_filter_expression("module LIKE 'module.app%' AND sensitive")["valid"]
+        result = component._validate_filter_expression("action='create' AND AND risk='High'")
+        assert not result["valid"]
+        assert "Expected a field name" in result["error"]
@@ -0,0 +1,171 @@
+"""
+Unit tests for instance-group compression
+
+Tests the shape hash, grouping of count/for_each fan-outs, shared risk
+assessments and security scans per group, and the collapsed table and
+report views.
+"""
+
+import copy
+
+import pandas as pd
+import pytest
+
+from utils.instance_groups import InstanceGroups, diff_shape_hash, group_label
+from utils.structural_hash import hash_shape
+
+
+def _record(key, actions=None, **after):
+    """Build a for_each instance of a DNS record"""
+    values = {"name": f"{key}.example.com", "type": "A", "ttl": 300, "records": ["10.0.0.1"]}
+    values.update(after)
+    actions = actions or ["create"]
+    before = None if actions == ["create"] else dict(values, ttl=60)
+    return {
+        "address": f'module.dns["eu"].aws_route53_record.x["{key}"]',
+        "type": "aws_route53_record",
+        "name": "x",
+        "change": {"actions": actions, "before": before, "after": values}
+    }
+
+
+@pytest.fixture
+def fan_out():
+    """4000 for_each instances created with the same attributes"""
+    return [_record(f"host-{i}") for i in range(4000)]
+
+
+class TestHashShape:
+    """Test value-independent shape digests"""
+
+    def test_values_are_ignored(self):
+        assert hash_shape({"a": 1, "b": ["x"]}) == hash_shape({"b": ["y"], "a": 2})
+
+    def test_keys_lengths_and_types_matter(self):
+        base = hash_shape({"a": 1, "b": ["x"]})
+        assert hash_shape({"a": 1, "c": ["x"]}) != base
+        assert hash_shape({"a": 1, "b": ["x", "y"]}) != base
+        assert hash_shape({"a": "1", "b": ["x"]}) != base
+
+    def test_kept_scalars_are_part_of_the_shape(self):
+        kept = frozenset({"(sensitive)"})
+        assert hash_shape({"p": "(sensitive)"}, kept) != hash_shape({"p": "secret"}, kept)
+        assert hash_shape({"p": "one"}, kept) == hash_shape({"p": "two"}, kept)
+
+
+class TestInstanceGroups:
+    """Test grouping of resource changes"""
+
+    def test_fan_out_forms_one_group(self, fan_out):
+        groups = InstanceGroups.build(fan_out)
+
+        assert len(groups) == 1
+        assert groups.instance_count == 4000
+        assert groups.compressed_instances == 3999
+        [group] = groups
+        assert group.config_address == "module.dns.aws_route53_record.x"
+        assert group.actions == ("create",)
+        assert group.label == "module.dns[*].aws_route53_record.x[*]"
+        assert groups.group_of(fan_out[123]["address"]) is group
+
+    def test_groups_split_on_actions_and_shape(self):
+        changes = [
+            _record("a"),
+            _record("b"),
+            _record("c", actions=["update"]),
+            _record("d", ttl="300"),
+            _record("e", records=["10.0.0.1", "10.0.0.2"]),
+            _record("f", name="(sensitive)")
+        ]
+        groups = InstanceGroups.build(changes)
+
+        assert [group.count for group in groups] == [2, 1, 1, 1, 1]
+        assert groups.group_ids()[changes[1]["address"]] == 0
+
+    def test_updates_split_on_changed_attributes(self):
+        ttl_change = _record("a", actions=["update"])
+        name_change = copy.deepcopy(ttl_change)
+        name_change["address"] = name_change["address"].replace('"a"', '"b"')
+        name_change["change"]["before"]["ttl"] = 300
+        name_change["change"]["before"]["name"] = "old.example.com"
+
+        assert diff_shape_hash(ttl_change) != diff_shape_hash(name_change)
+
+    def test_single_instance_keeps_its_address(self):
+        [group] = InstanceGroups.build([_record("only")])
+        assert group.label == 'module.dns["eu"].aws_route53_record.x["only"]'
+
+    def test_group_label(self):
+        assert group_label("aws_instance.web[3]") == "aws_instance.web[*]"
+        assert group_label("data.aws_ami.ubuntu") == "data.aws_ami.ubuntu"
+        assert group_label("not an address") == "not an address"
+
+
+class TestSharedAssessments:
+    """Test that groups are scored once without changing the results"""
+
+    def test_assessments_match_ungrouped(self, fan_out):
+        from utils.provider_factory import MultiCloudProviderFactory, MultiCloudRiskAssessment
+
+        changes = fan_out[:50] + [_record("z", actions=["delete", "create"])]
+        plan_data = {"resource_changes": changes}
+        factory = MultiCloudProviderFactory()
+        assessor = MultiCloudRiskAssessment(factory)
+        provider_info = factory.detect_and_create_providers(plan_data)
+
+        plain = assessor.assess_resources(changes, provider_info)
+        grouped = assessor.assess_resources(changes, provider_info, InstanceGroups.build(changes))
+
+        assert grouped == plain
+        assert grouped[0]["risk_factors"] is not grouped[1]["risk_factors"]
+
+    def test_security_scan_matches_per_resource_scan(self):
+        from utils.security_analyzer import SecurityAnalyzer
+
+        rules = [
+            {"address": f"aws_security_group_rule.r[{i}]", "type": "aws_security_group_rule", "name": "r",
+             "change": {"actions": ["create"], "before": None,
+                        "after": {"cidr_blocks": ["0.0.0.0/0"], "from_port": 22}}}
+            for i in range(20)
+        ]
+        analyzer = SecurityAnalyzer()
+        result = analyzer.analyze_security_resources(rules)
+
+        expected_issues = analyzer._identify_security_issues(rules[0])
+        assert expected_issues
+        assert [resource["security_issues"] for resource in result["security_resources"]] == [expected_issues] * 20
+        assert result["security_resources"][0]["security_issues"] is not result["security_resources"][1]["security_issues"]
+        assert result["security_resources"][0]["risk_score"] == analyzer._calculate_security_risk_score(rules[0], 9)
+
+
+class TestGroupViews:
+    """Test the collapsed table and report views"""
+
+    def test_table_rows_are_collapsed(self, fan_out):
+        from components.data_table import DataTableComponent
+
+        changes = fan_out[:3] + [_record("z", actions=["update"])]
+        df = pd.DataFrame([
+            {"resource_address": change["address"], "resource_name": change["address"].rsplit(".", 1)[-1]}
+            for change in changes
+        ] + [{"resource_address": "aws_instance.unplanned", "resource_name": "unplanned"}])
+
+        collapsed = DataTableComponent()._collapse_instance_groups(df, InstanceGroups.build(changes))
+
+        assert collapsed["instances"].tolist() == [3, 1, 1]
+        assert collapsed["resource_address"].tolist() == [
+            changes[0]["address"], changes[3]["address"], "aws_instance.unplanned"
+        ]
+        assert collapsed["resource_name"].tolist() == ["x[*]", 'x["z"]', "unplanned"]
+
+    def test_report_lists_group_members(self, fan_out):
+        from components.report_generator import ReportGeneratorComponent
+
+        report_html = ReportGeneratorComponent().generate_detailed_changes(
+            fan_out[:30], {"aws_route53_record": 30}
+        )
+
+        assert "module.dns[*].aws_route53_record.x[*]" in report_html
+        assert '<details class="instance-group">' in report_html
+        assert "host-19" in report_html
+        assert "host-25" not in report_html
@@ -0,0 +1,122 @@
+"""
+Unit tests for the module hierarchy trie
+
+Tests that per-module aggregates cover each module's whole subtree, that
+drill-down and chart hierarchies are read from the nodes, and that the
+plan processor builds the trie once per plan.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from utils.module_trie import ROOT_LABEL, ModuleTrie
+
+
+def _change(address, action, provider="aws"):
+    """Build one normalized resource change"""
+    return {"address": address, "action": action, "provider": provider}
+
+
+@pytest.fixture
+def resource_changes():
+    """Resources spread over nested module instances"""
+    return [
+        _change("aws_vpc.main", "create"),
+        _change("module.net.aws_route_table.rt", "update"),
+        _change('module.net.module.vpc["eu"].aws_subnet.private[0]', "create"),
+        _change('module.net.module.vpc["eu"].aws_subnet.private[1]', "delete"),
+        _change('module.net.module.vpc["us.east"].aws_subnet.private[0]', "replace"),
+        _change("module.gke.google_container_cluster.main", "update", provider="google")
+    ]
+
+
+@pytest.fixture
+def risk_levels():
+    return {
+        'module.net.module.vpc["eu"].aws_subnet.private[1]': "High",
+        'module.net.module.vpc["us.east"].aws_subnet.private[0]': "High",
+        "module.net.aws_route_table.rt": "Medium"
+    }
+
+
+class TestModuleTrie:
+    """Test aggregates of the module trie"""
+
+    def test_aggregates_cover_subtrees(self, resource_changes, risk_levels):
+        trie = ModuleTrie.build(resource_changes, risk_levels)
+
+        assert len(trie) == 5
+        assert trie.root.total_count == 6
+        assert trie.root.direct_count == 1
+
+        net = trie.get("module.net")
+        assert (net.total_count, net.direct_count) == (4, 1)
+        assert net.actions == {"update": 1, "create": 1, "delete": 1, "replace": 1}
+        assert net.risk_levels == {"Medium": 1, "High": 2}
+
+        eu = trie.get('module.net.module.vpc["eu"]')
+        assert eu.total_count == 2
+        assert eu.parent_address == "module.net"
+        assert trie.get("module.gke").providers == {"google": 1}
+        assert trie.get("module.missing") is None
+
+    def test_unparseable_addresses_count_in_root(self):
+        trie = ModuleTrie.build([_change("???", "create")])
+        assert trie.root.direct_count == 1
+        assert trie.unparsed_addresses == ["???"]
+
+    def test_drill_down(self, resource_changes, risk_levels):
+        rows = ModuleTrie.build(resource_changes, risk_levels).drill_down("module.net")
+
+        assert [row["module"] for row in rows] == [
+            "module.net", 'module.net.module.vpc["eu"]', 'module.net.module.vpc["us.east"]'
+        ]
+        assert rows[0]["resources"] == 4
+        assert rows[0]["High"] == 2
+
+    def test_hierarchy(self, resource_changes, risk_levels):
+        hierarchy = ModuleTrie.build(resource_changes, risk_levels).to_hierarchy()
+
+        position = {node_id: index for index, node_id in enumerate(hierarchy["ids"])}
+        assert hierarchy["parents"][position[ROOT_LABEL]] == ""
+        assert hierarchy["parents"][position["module.net"]] == ROOT_LABEL
+        assert hierarchy["parents"][position['module.net.module.vpc["us.east"]']] == "module.net"
+        assert sum(hierarchy["values"]) == 6
+        assert hierarchy["high_risk_shares"][position["module.net"]] == 0.5
+
+    def test_depth_limited_hierarchy_keeps_totals(self, resource_changes):
+        hierarchy = ModuleTrie.build(resource_changes).to_hierarchy(max_depth=1)
+
+        assert set(hierarchy["ids"]) == {ROOT_LABEL, "module.net", "module.gke"}
+        assert sum(hierarchy["values"]) == 6
+
+    def test_charts(self, resource_changes, risk_levels):
+        from visualizers.charts import ChartGenerator
+
+        hierarchy = ModuleTrie.build(resource_changes, risk_levels).to_hierarchy()
+        chart_gen = ChartGenerator()
+
+        assert list(chart_gen.create_module_treemap(hierarchy).data[0].ids) == hierarchy["ids"]
+        assert list(chart_gen.create_module_sunburst(hierarchy).data[0].parents) == hierarchy["parents"]
+
+
+class TestPlanProcessorModuleTrie:
+    """Test that the trie is built once per plan"""
+
+    def test_reruns_reuse_the_trie(self, resource_changes):
+        from utils.plan_processor import PlanProcessor
+
+        plan_data = {"resource_changes": [
+            {"address": change["address"], "change": {"actions": ["create"]}} for change in resource_changes
+        ]}
+        processor = PlanProcessor()
+        with patch("utils.plan_processor.st") as mock_st:
+            mock_st.session_state = {}
+            processor._track_plan_changes(plan_data)
+            first = processor._get_module_trie(resource_changes, {"detailed_assessments": []})
+            processor._track_plan_changes(plan_data)
+            second = processor._get_module_trie(resource_changes, {"detailed_assessments": []})
+
+        assert first is second
+        assert first.root.total_count == 6
@@ -0,0 +1,128 @@
+"""
+Unit tests for mergeable plan aggregates
+
+Tests that aggregates of shards merge associatively into exactly the
+whole-plan result, that the compact serialized form round-trips, and that
+the parser and multi-cloud risk assessment produce the same output through
+the aggregates.
+"""
+
+import json
+
+import pytest
+
+from parsers.plan_parser import PlanParser
+from utils.plan_aggregates import ChangeAggregate, RiskAggregate, merge_aggregates
+from utils.provider_factory import MultiCloudProviderFactory, MultiCloudRiskAssessment
+
+
+def _change(address, actions):
+    """Build one resource change"""
+    resource_type, name = address.split('.')
+    return {
+        "address": address,
+        "type": resource_type,
+        "name": name,
+        "change": {"actions": actions, "before": {}, "after": {}}
+    }
+
+
+@pytest.fixture
+def plan_data():
+    """Multi-cloud plan with every action combination"""
+    return {
+        "resource_changes": [
+            _change("aws_instance.web", ["create"]),
+            _change("aws_db_instance.main", ["delete", "create"]),
+            _change("aws_iam_role.app", ["update"]),
+            _change("azurerm_storage_account.logs", ["delete"]),
+            _change("google_compute_instance.vm", ["create", "delete"]),
+            _change("kubernetes_deployment.api", ["update"]),
+            _change("random_id.suffix", ["create"]),
+            _change("aws_s3_bucket.assets", ["no-op"]),
+            _change("aws_s3_bucket.backup", ["delete"])
+        ]
+    }
+
+
+def _shards(items, size):
+    """Split a list into consecutive shards"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class TestChangeAggregate:
+    """Test cases for ChangeAggregate"""
+    
+    def test_parser_output(self, plan_data):
+        """Test the parser summary and provider breakdown built from the aggregate"""
+        parser = PlanParser(plan_data)
+        
+        assert parser.get_summary() == {'create': 4, 'update': 2, 'delete': 4, 'total': 8}
+        assert parser.get_actions_by_provider() == {
+            'aws': {'create': 2, 'update': 1, 'delete': 1, 'total': 4},
+            'azure': {'create': 0, 'update': 0, 'delete': 1, 'total': 1},
+            'google': {'create': 1, 'update': 0, 'delete': 0, 'total': 1},
+            'kubernetes': {'create': 0, 'update': 1, 'delete': 0, 'total': 1},
+            'unknown': {'create': 1, 'update': 0, 'delete': 0, 'total': 1}
+        }
+    
+    def test_shards_merge_to_whole(self, plan_data):
+        """Test that shard aggregates merge into the whole-plan aggregate in any grouping"""
+        parser = PlanParser(plan_data)
+        whole = parser.get_change_aggregate()
+        a, b, c = [parser.get_change_aggregate(shard) for shard in _shards(plan_data['resource_changes'], 3)]
+        
+        assert (a + b) + c == whole
+        assert a + (b + c) == whole
+        assert merge_aggregates([a, b, c]).actions_by_provider() == parser.get_actions_by_provider()
+    
+    def test_serialized_round_trip(self, plan_data):
+        """Test the compact JSON form"""
+        aggregate = PlanParser(plan_data).get_change_aggregate()
+        
+        restored = ChangeAggregate.from_dict(json.loads(json.dumps(aggregate.to_dict())))
+        
+        assert restored == aggregate
+        assert restored.summary() == aggregate.summary()
+    
+    def test_rejects_unknown_version(self):
+        """Test that serialized aggregates of another format version are rejected"""
+        with pytest.raises(ValueError):
+            ChangeAggregate.from_dict({'v': 99, 'summary': [0, 0, 0, 0], 'providers': {}})
+
+
+class TestRiskAggregate:
+    """Test cases for RiskAggregate"""
+    
+    def test_sharded_risk_matches_whole_plan(self, plan_data):
+        """Test that merged shard risk equals the whole-plan assessment"""
+        factory = MultiCloudProviderFactory()
+        assessment = MultiCloudRiskAssessment(factory)
+        expected = assessment.assess_multi_cloud_plan_risk(plan_data)
+        
+        provider_info = factory.detect_and_create_providers(plan_data)
+        serialized = [
+            assessment.aggregate_shard(shard, provider_info).to_dict()
+            for shard in _shards(plan_data['resource_changes'], 2)
+        ]
+        merged = merge_aggregates(RiskAggregate.from_dict(data) for data in serialized)
+        
+        deployment_seconds = expected['deployment_schedule']['makespan_seconds']
+        assert assessment.finalize_overall_risk(merged, provider_info, deployment_seconds) == expected['overall_risk']
+        assert merged.provider_risk_summary() == expected['provider_risk_summary']
+    
+    def test_scores_sum_exactly(self):
+        """Test that score sums do not depend on the merge grouping"""
+        assessments = [{'level': 'Low', 'score': 0.1, 'provider': 'aws'} for _ in range(3)]
+        parts = [RiskAggregate.from_assessments([assessment]) for assessment in assessments]
+        
+        assert ((parts[0] + parts[1]) + parts[2]).total_score == 0.3
+        assert (parts[0] + (parts[1] + parts[2])).total_score == 0.3
+    
+    def test_empty_aggregate(self):
+        """Test the overall risk of an aggregate without resources"""
+        overall = RiskAggregate().overall_risk(is_multi_cloud=False)
+        
+        assert overall['level'] == 'Low'
+        assert overall['score'] == 0
+        assert overall['estimated_time'] == '< 5 minutes'
@@ -0,0 +1,96 @@
+"""
+Unit tests for arena-backed plan storage
+
+Tests the offset index, section and resource change access, and in-place
+secure wipe of the arena buffer.
+"""
+
+import pytest
+
+from utils.plan_arena import PlanArena
+
+
+@pytest.fixture
+def plan_data():
+    """Small plan with non-ASCII content"""
+    return {
+        "format_version": "1.2",
+        "terraform_version": "1.5.0",
+        "resource_changes": [
+            {
+                "address": "aws_instance.web",
+                "type": "aws_instance",
+                "change": {"actions": ["create"], "after": {"tags": {"Name": "wéb-ü"}}}
+            },
+            {
+                "address": "aws_db_instance.main",
+                "type": "aws_db_instance",
+                "change": {"actions": ["delete"], "before": {"password": "super_secret"}}
+            }
+        ],
+        "configuration": {"provider_config": {"aws": {"name": "aws"}}}
+    }
+
+
+class TestPlanArena:
+    """Test cases for PlanArena"""
+    
+    def test_round_trip(self, plan_data):
+        """Test that the full plan decodes back unchanged"""
+        arena = PlanArena(plan_data)
+        
+        assert arena.to_dict() == plan_data
+        assert arena.keys() == list(plan_data)
+    
+    def test_section_access(self, plan_data):
+        """Test decoding a single top-level section"""
+        arena = PlanArena(plan_data)
+        
+        assert arena.get_section("terraform_version") == "1.5.0"
+        assert arena.get_section("configuration") == plan_data["configuration"]
+        assert arena.get_section("missing", default={}) == {}
+    
+    def test_resource_change_access(self, plan_data):
+        """Test indexed access to individual resource changes"""
+        arena = PlanArena(plan_data)
+        
+        assert arena.resource_change_count == 2
+        assert arena.get_resource_change(1) == plan_data["resource_changes"][1]
+        assert list(arena.iter_resource_changes()) == plan_data["resource_changes"]
+    
+    def test_decoded_values_are_independent(self, plan_data):
+        """Test that modifying a decoded copy does not affect the arena"""
+        arena = PlanArena(plan_data)
+        
+        copy = arena.to_dict()
+        copy["resource_changes"].clear()
+        
+        assert arena.resource_change_count == 2
+        assert arena.to_dict() == plan_data
+    
+    def test_wipe_zeroes_buffer_in_place(self, plan_data):
+        """Test that wiping zeroes the original buffer"""
+        arena = PlanArena(plan_data)
+        buffer = arena._buffer
+        assert b"super_secret" in buffer
+        
+        arena.wipe()
+        
+        assert buffer == bytearray(len(buffer))
+        assert arena.wiped
+        assert arena.nbytes == 0
+        with pytest.raises(ValueError):
+            arena.to_dict()
+    
+    def test_from_json_bytes(self, plan_data):
+        """Test building an arena from raw JSON bytes"""
+        import json
+        
+        arena = PlanArena.from_json_bytes(json.dumps(plan_data).encode("utf-8"))
+        
+        assert arena.to_dict() == plan_data
+    
+    def test_rejects_non_object_plan(self):
+        """Test that non-object plans are rejected"""
+        with pytest.raises(TypeError):
+            PlanArena(["not", "a", "plan"])
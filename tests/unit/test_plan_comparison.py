@@ -0,0 +1,198 @@
+"""
+Unit tests for structural hashing and plan-to-plan comparison
+
+Tests that structural hashes ignore key order but detect any value change,
+that consecutive plans are compared per resource, and that the assessment
+cache returns identical risk results while skipping unchanged resources.
+"""
+
+import copy
+
+import pytest
+
+from utils.enhanced_risk_assessment import EnhancedRiskAssessment
+from utils.plan_comparison import AssessmentCache, PlanIndex, compare_plans
+from utils.structural_hash import hash_value, resource_hash, resource_hashes
+
+
+def _change(address, actions, before=None, after=None):
+    """Build one resource change"""
+    resource_type, name = address.split('.')
+    return {
+        "address": address,
+        "type": resource_type,
+        "name": name,
+        "change": {"actions": actions, "before": before, "after": after}
+    }
+
+
+@pytest.fixture
+def plan_data():
+    """Plan with a mix of providers and actions"""
+    return {
+        "resource_changes": [
+            _change("aws_instance.web", ["create"], after={"ami": "ami-1", "tags": {"env": "prod"}}),
+            _change("aws_db_instance.main", ["delete", "create"],
+                    before={"engine": "postgres", "size": 20}, after={"engine": "postgres", "size": 50}),
+            _change("aws_iam_role.app", ["update"], before={"name": "app"}, after={"name": "app-v2"}),
+            _change("azurerm_storage_account.logs", ["delete"], before={"tier": "Standard"}),
+            _change("aws_s3_bucket.assets", ["no-op"], before={"bucket": "assets"}, after={"bucket": "assets"})
+        ]
+    }
+
+
+class TestStructuralHash:
+    """Test Merkle hashes of JSON values and resource changes"""
+
+    def test_key_order_does_not_matter(self):
+        first = {"a": 1, "b": {"x": [1, 2], "y": None}}
+        second = {"b": {"y": None, "x": [1, 2]}, "a": 1}
+        assert hash_value(first) == hash_value(second)
+
+    def test_value_types_are_distinguished(self):
+        digests = {hash_value(value) for value in (1, "1", 1.0, True, None, [1], {"1": 1})}
+        assert len(digests) == 7
+
+    def test_nesting_is_distinguished(self):
+        assert hash_value(["a", "b"]) != hash_value([["a", "b"]])
+        assert hash_value({"a": "bc"}) != hash_value({"ab": "c"})
+
+    def test_resource_hashes_identify_changed_side(self):
+        original = _change("aws_instance.web", ["update"], before={"size": 1}, after={"size": 2})
+        changed = copy.deepcopy(original)
+        changed["change"]["after"]["size"] = 3
+
+        old, new = resource_hashes(original), resource_hashes(changed)
+        assert old.before == new.before
+        assert old.meta == new.meta
+        assert old.after != new.after
+        assert old.root != new.root
+
+    def test_resource_hash_covers_metadata(self):
+        original = _change("aws_instance.web", ["update"], before={}, after={})
+        replaced = copy.deepcopy(original)
+        replaced["change"]["actions"] = ["delete", "create"]
+        assert resource_hash(original) != resource_hash(replaced)
+
+
+class TestComparePlans:
+    """Test per-resource comparison of consecutive plans"""
+
+    def test_identical_plans(self, plan_data):
+        comparison = compare_plans(plan_data, copy.deepcopy(plan_data))
+        assert not comparison.has_changes
+        assert comparison.unchanged == len(plan_data["resource_changes"])
+
+    def test_added_removed_and_altered(self, plan_data):
+        current = copy.deepcopy(plan_data)
+        current["resource_changes"] = [
+            change for change in current["resource_changes"] if change["address"] != "azurerm_storage_account.logs"
+        ]
+        current["resource_changes"].append(_change("aws_sqs_queue.jobs", ["create"], after={"name": "jobs"}))
+        current["resource_changes"][2]["change"]["after"]["name"] = "app-v3"
+        current["resource_changes"][0]["change"]["actions"] = ["update"]
+
+        comparison = compare_plans(PlanIndex.from_plan(plan_data), current)
+
+        assert comparison.added == ["aws_sqs_queue.jobs"]
+        assert comparison.removed == ["azurerm_storage_account.logs"]
+        assert comparison.unchanged == 2
+        altered = {entry["address"]: entry for entry in comparison.altered}
+        assert set(altered) == {"aws_instance.web", "aws_iam_role.app"}
+        assert altered["aws_iam_role.app"]["after_changed"]
+        assert not altered["aws_iam_role.app"]["before_changed"]
+        assert not altered["aws_iam_role.app"]["metadata_changed"]
+        assert altered["aws_instance.web"]["previous_actions"] == ["create"]
+        assert altered["aws_instance.web"]["actions"] == ["update"]
+        assert altered["aws_instance.web"]["metadata_changed"]
+
+        assert comparison.to_dict()["added"] == ["aws_sqs_queue.jobs"]
+
+
+class TestAssessmentCache:
+    """Test the per-resource assessment cache"""
+
+    def test_hit_and_miss(self):
+        cache = AssessmentCache()
+        assert cache.get("h1", ("aws",)) is None
+        cache.put("h1", ("aws",), {"level": "Low", "risk_factors": []})
+
+        assert cache.get("h1", ("aws",)) == {"level": "Low", "risk_factors": []}
+        assert cache.get("h1", ("aws", "azure")) is None
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 2
+
+    def test_entries_are_copied(self):
+        cache = AssessmentCache()
+        assessment = {"level": "Low", "risk_factors": ["a"]}
+        cache.put("h1", (), assessment)
+        assessment["risk_factors"].append("b")
+
+        cached = cache.get("h1", ())
+        cached["risk_factors"].append("c")
+        assert cache.get("h1", ()) == {"level": "Low", "risk_factors": ["a"]}
+
+    def test_least_recently_used_is_evicted(self):
+        cache = AssessmentCache(max_entries=2)
+        cache.put("h1", (), {"level": "Low"})
+        cache.put("h2", (), {"level": "Low"})
+        cache.get("h1", ())
+        cache.put("h3", (), {"level": "Low"})
+
+        assert len(cache) == 2
+        assert cache.get("h2", ()) is None
+        assert cache.get("h1", ()) is not None
+
+
+class TestCachedRiskAssessment:
+    """Test that cached assessments give the same plan risk"""
+
+    def test_second_plan_reuses_unchanged_resources(self, plan_data):
+        cache = AssessmentCache()
+        cached_assessor = EnhancedRiskAssessment(assessment_cache=cache)
+        cached_assessor.assess_plan_risk(plan_data["resource_changes"], plan_data,
+                                         content_hashes=PlanIndex.from_plan(plan_data).root_hashes())
+
+        current = copy.deepcopy(plan_data)
+        current["resource_changes"][2]["change"]["after"]["name"] = "app-v3"
+        misses_before = cache.misses
+
+        cached_result = cached_assessor.assess_plan_risk(current["resource_changes"], current,
+                                                         content_hashes=PlanIndex.from_plan(current).root_hashes())
+        uncached_result = EnhancedRiskAssessment().assess_plan_risk(current["resource_changes"], current)
+
+        assert cache.misses - misses_before == 1
+        assert cache.hits == 3
+        assert cached_result == uncached_result
+
+    def test_cache_needs_content_hashes(self, plan_data):
+        cache = AssessmentCache()
+        EnhancedRiskAssessment(assessment_cache=cache).assess_plan_risk(plan_data["resource_changes"], plan_data)
+
+        assert len(cache) == 0
+        assert cache.get_stats()["misses"] == 0
+
+
+class TestPlanProcessorTracking:
+    """Test that reruns of the same plan reuse its index"""
+
+    def test_reruns_are_recognized_by_plan_key(self, plan_data):
+        from unittest.mock import patch
+
+        from utils.plan_processor import PlanProcessor
+
+        processor = PlanProcessor()
+        with patch("utils.plan_processor.st") as mock_st:
+            mock_st.session_state = {}
+            index, comparison = processor._track_plan_changes(plan_data, "key-1")
+            with patch("utils.plan_processor.PlanIndex.from_plan") as from_plan:
+                rerun_index, _ = processor._track_plan_changes(plan_data, "key-1")
+            from_plan.assert_not_called()
+
+            current = copy.deepcopy(plan_data)
+            current["resource_changes"].pop()
+            _, next_comparison = processor._track_plan_changes(current, "key-2")
+
+        assert comparison is None
+        assert rerun_index is index
+        assert next_comparison.removed == ["aws_s3_bucket.assets"]
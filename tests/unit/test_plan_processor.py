@@ -196,4 +196,132 @@ class TestPlanProcessor:
         assert 'enhanced_risk_assessor' in result
         assert 'enhanced_risk_result' in result
         assert result['enhanced_risk_assessor'] is not None
-        mock_enhanced_risk_instance.assess_plan_risk.assert_called_once()
\ No newline at end of file
+        mock_enhanced_risk_instance.assess_plan_risk.assert_called_once()    
+    def _in_process_worker_pool(self):
+        """Worker pool mock running the worker entry point in this process."""
+        from utils.plan_worker_pool import _collect_result, _share_bytes, analyze_shared_plan
+        
+        def analyze(plan_bytes, enhanced=True):
+            block, source = _share_bytes(plan_bytes)
+            try:
+                return _collect_result(analyze_shared_plan(source, enhanced))
+            finally:
+                block.close()
+                block.unlink()
+        
+        worker_pool = Mock()
+        worker_pool.should_offload.return_value = True
+        worker_pool.analyze.side_effect = analyze
+        return worker_pool
+    
+    @patch('utils.plan_processor.ENHANCED_FEATURES_AVAILABLE', True)
+    @patch('utils.plan_processor.EnhancedRiskAssessment')
+    @patch('utils.plan_processor.ChartGenerator')
+    def test_process_plan_data_offloads_to_worker_pool(self, mock_chart_gen, mock_enhanced_risk):
+        """Test that large uploads are parsed, indexed and analyzed by the worker pool."""
+        from utils.plan_comparison import PlanIndex
+        
+        plan_bytes = json.dumps(self.sample_plan_data).encode('utf-8')
+        self.mock_uploaded_file.getvalue.return_value = plan_bytes
+        worker_pool = self._in_process_worker_pool()
+        self.plan_processor.worker_pool = worker_pool
+        self._setup_context_manager_mocks()
+        
+        with patch('utils.plan_processor.st') as mock_st, \
+                patch('utils.plan_processor.PlanParser') as local_parser, \
+                patch('utils.plan_processor.PlanIndex') as local_index:
+            mock_st.session_state = {}
+            result = self.plan_processor.process_plan_data(
+                self.mock_uploaded_file,
+                self.mock_upload_component,
+                self.mock_error_handler,
+                show_debug=False,
+                enable_multi_cloud=True
+            )
+        
+        assert result is not None
+        worker_pool.analyze.assert_called_once_with(plan_bytes, enhanced=True)
+        self.mock_upload_component.validate_and_parse_file.assert_not_called()
+        local_parser.assert_not_called()
+        local_index.from_plan.assert_not_called()
+        assert result['resource_changes'][0]['address'] == 'aws_instance.example'
+        assert result['enhanced_risk_result']['detailed_assessments'][0]['address'] == 'aws_instance.example'
+        assert result['plan_data']['terraform_version'] == '1.0.0'
+        assert result['plan_comparison'] is None
+        tracked = mock_st.session_state['plan_change_tracking']['current_index']
+        assert tracked.hashes == PlanIndex.from_plan(self.sample_plan_data).hashes
+        mock_enhanced_risk.return_value.assess_plan_risk.assert_not_called()
+    
+    @patch('utils.plan_processor.ChartGenerator')
+    def test_reruns_reuse_worker_analysis(self, mock_chart_gen):
+        """Test that Streamlit reruns of an offloaded plan do not submit it again."""
+        self.mock_uploaded_file.getvalue.return_value = json.dumps(self.sample_plan_data).encode('utf-8')
+        worker_pool = self._in_process_worker_pool()
+        self.plan_processor.worker_pool = worker_pool
+        self._setup_context_manager_mocks()
+        
+        with patch('utils.plan_processor.st') as mock_st:
+            mock_st.session_state = {}
+            results = [
+                self.plan_processor.process_plan_data(
+                    self.mock_uploaded_file,
+                    self.mock_upload_component,
+                    self.mock_error_handler,
+                    show_debug=False,
+                    enable_multi_cloud=True
+                )
+                for _ in range(2)
+            ]
+        
+        assert worker_pool.analyze.call_count == 1
+        assert results[1]['parser'] is results[0]['parser']
+        assert results[1]['module_trie'] is results[0]['module_trie']
+    
+    @patch('utils.plan_processor.ChartGenerator')
+    def test_worker_validation_errors_are_reported(self, mock_chart_gen):
+        """Test that an invalid upload rejected by the worker is reported without parsing it locally."""
+        self.mock_uploaded_file.getvalue.return_value = b'{"resource_changes": ['
+        self.plan_processor.worker_pool = self._in_process_worker_pool()
+        self._setup_context_manager_mocks()
+        
+        with patch('utils.plan_processor.st') as mock_st:
+            mock_st.session_state = {}
+            result = self.plan_processor.process_plan_data(
+                self.mock_uploaded_file,
+                self.mock_upload_component,
+                self.mock_error_handler,
+                show_debug=False,
+                enable_multi_cloud=True
+            )
+        
+        assert result is None
+        self.mock_upload_component.validate_and_parse_file.assert_not_called()
+        error, context = self.mock_error_handler.handle_processing_error.call_args[0]
+        assert str(error) == "Invalid JSON format"
+        assert context == "plan data validation"
+    
+    @patch('utils.plan_processor.ChartGenerator')
+    def test_reruns_reuse_instance_groups(self, mock_chart_gen):
+        """Test that the instance groups of a plan are built once across reruns."""
+        from utils.instance_groups import InstanceGroups
+        
+        self.mock_upload_component.validate_and_parse_file.return_value = (self.sample_plan_data, None)
+        self._setup_context_manager_mocks()
+        
+        with patch('utils.plan_processor.st') as mock_st, \
+                patch.object(InstanceGroups, 'build', wraps=InstanceGroups.build) as build:
+            mock_st.session_state = {}
+            results = [
+                self.plan_processor.process_plan_data(
+                    self.mock_uploaded_file,
+                    self.mock_upload_component,
+                    self.mock_error_handler,
+                    show_debug=False,
+                    enable_multi_cloud=True
+                )
+                for _ in range(2)
+            ]
+        
+        assert build.call_count == 1
+        assert results[1]['parser'] is not results[0]['parser']
+        assert results[1]['parser'].get_instance_groups() is results[0]['parser'].get_instance_groups()
@@ -0,0 +1,137 @@
+"""
+Unit tests for the plan directory watcher
+
+Tests change detection by mtime and content hash, reuse of unchanged
+resource assessments, removal handling and that incremental results match a
+full analysis.
+"""
+
+import json
+import os
+
+import pytest
+
+from utils.batch_analysis import summarize_plan_file
+from utils.plan_watcher import (
+    CHANGE_ADDED,
+    CHANGE_MODIFIED,
+    CHANGE_REMOVED,
+    PlanDirectoryWatcher
+)
+
+
+def _resource_changes(count=20):
+    """Resource changes across providers and actions"""
+    types = ['aws_instance', 'azurerm_storage_account', 'google_compute_instance', 'aws_iam_role']
+    actions = [['create'], ['update'], ['delete'], ['delete', 'create']]
+    return [
+        {
+            "address": f"{types[i % 4]}.r{i}",
+            "type": types[i % 4],
+            "name": f"r{i}",
+            "change": {"actions": actions[i % 4], "before": {"size": 1}, "after": {"size": i}}
+        }
+        for i in range(count)
+    ]
+
+
+def _write(path, resource_changes, mtime_ns=None):
+    """Write a plan file, optionally forcing its mtime"""
+    path.write_text(json.dumps({"terraform_version": "1.5.0", "resource_changes": resource_changes}))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    """Watcher on an empty temporary directory"""
+    return PlanDirectoryWatcher(str(tmp_path))
+
+
+class TestPlanDirectoryWatcher:
+    """Test cases for PlanDirectoryWatcher"""
+    
+    def test_added_file_matches_full_analysis(self, watcher, tmp_path):
+        """Test that a new file is analyzed with the same result as batch analysis"""
+        path = _write(tmp_path / "a.json", _resource_changes())
+        (tmp_path / "notes.txt").write_text("ignored")
+        
+        events = watcher.scan()
+        
+        assert [event['change'] for event in events] == [CHANGE_ADDED]
+        incremental = dict(events[0]['summary'])
+        full = summarize_plan_file(path)
+        incremental.pop('duration')
+        full.pop('duration')
+        assert incremental == full
+    
+    def test_unchanged_files_are_skipped(self, watcher, tmp_path):
+        """Test that unchanged or touched-but-identical files are not re-analyzed"""
+        path = tmp_path / "a.json"
+        _write(path, _resource_changes(), mtime_ns=1_000_000_000)
+        watcher.scan()
+        
+        assert watcher.scan() == []
+        assert watcher.stats.files_read == 1
+        
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        assert watcher.scan() == []
+        assert watcher.stats.files_read == 2
+        assert watcher.stats.files_analyzed == 1
+    
+    def test_only_changed_resources_are_reassessed(self, watcher, tmp_path):
+        """Test reuse of assessments by address and content hash"""
+        resource_changes = _resource_changes()
+        path = tmp_path / "a.json"
+        _write(path, resource_changes, mtime_ns=1_000_000_000)
+        watcher.scan()
+        assert watcher.stats.resources_assessed == 20
+        
+        resource_changes[5]['change']['after'] = {"size": 100}
+        resource_changes.append({
+            "address": "aws_instance.extra",
+            "type": "aws_instance",
+            "name": "extra",
+            "change": {"actions": ["create"], "before": None, "after": {}}
+        })
+        _write(path, resource_changes, mtime_ns=2_000_000_000)
+        events = watcher.scan()
+        
+        assert [event['change'] for event in events] == [CHANGE_MODIFIED]
+        assert events[0]['summary']['summary']['total'] == 21
+        assert watcher.stats.resources_assessed == 22
+        assert watcher.stats.resources_reused == 19
+    
+    def test_no_op_resources_are_not_assessed(self, watcher, tmp_path):
+        """Test that only actionable changes are assessed"""
+        resource_changes = _resource_changes(4)
+        resource_changes[0]['change']['actions'] = ['no-op']
+        resource_changes[1]['change']['actions'] = []
+        _write(tmp_path / "a.json", resource_changes)
+        
+        watcher.scan()
+        
+        assert watcher.stats.resources_assessed == 2
+        assert watcher.analyzer.risk_assessment.is_actionable_change(resource_changes[2]) is True
+        assert watcher.analyzer.risk_assessment.is_actionable_change(resource_changes[1]) is False
+    
+    def test_removed_and_invalid_files(self, watcher, tmp_path):
+        """Test removal events and error summaries for unreadable plans"""
+        good = tmp_path / "good.json"
+        _write(good, _resource_changes(4))
+        (tmp_path / "bad.json").write_text("{ not json")
+        
+        events = watcher.scan()
+        assert {event['file']: 'error' in event for event in events} == {
+            str(tmp_path / "bad.json"): True,
+            str(good): False
+        }
+        assert watcher.portfolio().to_dict()['error_count'] == 1
+        
+        good.unlink()
+        events = watcher.scan()
+        
+        assert events == [{'change': CHANGE_REMOVED, 'file': str(good)}]
+        assert watcher.portfolio().to_dict()['plan_count'] == 0
+
@@ -0,0 +1,177 @@
+"""
+Unit tests for the plan worker pool
+
+Tests the columnar shared-memory handoff of risk assessments and the parsing,
+validation and analysis of plans in worker processes.
+"""
+
+import json
+
+import pytest
+
+from parsers.plan_parser import PlanParser
+from utils.enhanced_risk_assessment import EnhancedRiskAssessment
+from utils.plan_worker_pool import (
+    ColumnarAssessments,
+    PlanWorkerPool,
+    analyze_shared_plan,
+    _share_bytes,
+)
+
+
+@pytest.fixture
+def plan_data():
+    """Multi-provider plan with a mix of actions"""
+    return {
+        "format_version": "1.2",
+        "terraform_version": "1.5.0",
+        "resource_changes": [
+            {
+                "address": "aws_instance.web",
+                "type": "aws_instance",
+                "name": "web",
+                "change": {"actions": ["create"], "before": None, "after": {"instance_type": "t3.micro"}}
+            },
+            {
+                "address": "aws_db_instance.main",
+                "type": "aws_db_instance",
+                "name": "main",
+                "change": {"actions": ["delete", "create"], "before": {}, "after": {"password": "(sensitive)"}}
+            },
+            {
+                "address": "azurerm_resource_group.rg",
+                "type": "azurerm_resource_group",
+                "name": "rg",
+                "change": {"actions": ["update"], "before": {"name": "a"}, "after": {"name": "b"}}
+            },
+            {
+                "address": "random_id.suffix",
+                "type": "random_id",
+                "name": "suffix",
+                "change": {"actions": ["no-op"], "before": {}, "after": {}}
+            }
+        ]
+    }
+
+
+def _local_risk(plan_data):
+    """Risk assessment computed in-process for comparison"""
+    parser = PlanParser(plan_data)
+    return EnhancedRiskAssessment().assess_plan_risk(parser.get_resource_changes(), plan_data)
+
+
+class TestColumnarAssessments:
+    """Test cases for the columnar assessment layout"""
+    
+    def test_records_round_trip(self, plan_data):
+        """Test that records survive conversion to columns and back"""
+        records = _local_risk(plan_data)['detailed_assessments']
+        
+        columns = ColumnarAssessments.from_records(records)
+        
+        assert columns.rows == len(records)
+        assert columns.to_records() == records
+    
+    def test_shared_memory_round_trip(self, plan_data):
+        """Test that columns survive a shared memory handoff"""
+        records = _local_risk(plan_data)['detailed_assessments']
+        
+        layout = ColumnarAssessments.from_records(records).to_shared_memory()
+        restored = ColumnarAssessments.from_shared_memory(layout)
+        
+        assert restored.to_records() == records
+        assert list(restored.to_records()[0]) == list(records[0])
+    
+    def test_empty_assessments(self):
+        """Test handoff of an empty assessment list"""
+        layout = ColumnarAssessments.from_records([]).to_shared_memory()
+        
+        assert ColumnarAssessments.from_shared_memory(layout).to_records() == []
+    
+    def test_additional_keys_are_kept(self, plan_data):
+        """Test that keys beyond the usual assessment fields survive the handoff"""
+        records = _local_risk(plan_data)['detailed_assessments']
+        for position, record in enumerate(records):
+            record['instance_count'] = position + 1
+            record['module'] = f"module.m{position}"
+        
+        layout = ColumnarAssessments.from_records(records).to_shared_memory()
+        
+        assert ColumnarAssessments.from_shared_memory(layout).to_records() == records
+    
+    @pytest.mark.parametrize("value", [None, {"nested": 1}, True])
+    def test_values_without_a_column_kind_are_rejected(self, plan_data, value):
+        """Test that assessments are never silently truncated"""
+        records = _local_risk(plan_data)['detailed_assessments']
+        records[0]['extra'] = value
+        
+        with pytest.raises(ValueError, match="extra"):
+            ColumnarAssessments.from_records(records)
+
+
+class TestWorkerAnalysis:
+    """Test cases for plan analysis in worker processes"""
+    
+    def test_analyze_shared_plan_matches_local_analysis(self, plan_data):
+        """Test the worker entry point in-process against the local pipeline"""
+        block, source = _share_bytes(json.dumps(plan_data).encode('utf-8'))
+        try:
+            result = analyze_shared_plan(source, enhanced=True)
+        finally:
+            block.close()
+            block.unlink()
+        
+        parser = PlanParser(plan_data)
+        expected_risk = _local_risk(plan_data)
+        restored = ColumnarAssessments.from_shared_memory(result['assessments_layout']).to_records()
+        table = ColumnarAssessments.from_shared_memory(result['table_layout'])
+        
+        assert result['error'] is None
+        assert table.columns['address'] == [change['address'] for change in plan_data['resource_changes']]
+        assert 'resource_changes' not in result['sections']
+        assert result['summary'] == parser.get_summary()
+        assert result['resource_types'] == parser.get_resource_types()
+        assert result['debug_info'] == parser.get_debug_info()
+        assert restored == expected_risk.pop('detailed_assessments')
+        assert result['risk_result'] == expected_risk
+    
+    @pytest.mark.parametrize("payload, error", [
+        (b'{"resource_changes": [', "Invalid JSON format"),
+        (b'[]', "Plan JSON must be an object"),
+        (b'{"format_version": "1.2"}', "File structure is incompatible with analysis"),
+    ])
+    def test_analyze_shared_plan_rejects_invalid_plans(self, payload, error):
+        """Test that the worker validates the upload instead of the Streamlit process"""
+        block, source = _share_bytes(payload)
+        try:
+            result = analyze_shared_plan(source, enhanced=True)
+        finally:
+            block.close()
+            block.unlink()
+        
+        assert result['error'] == error
+        assert 'table_layout' not in result
+    
+    def test_pool_analysis_matches_local_analysis(self, plan_data):
+        """Test a full round trip through a worker process"""
+        pool = PlanWorkerPool(max_workers=1)
+        try:
+            result = pool.analyze(json.dumps(plan_data), enhanced=True)
+        finally:
+            pool.shutdown()
+        
+        expected_risk = _local_risk(plan_data)
+        # Provider detection lists come from sets, so their order differs between processes
+        for key in ('level', 'score', 'high_risk_count', 'medium_risk_count', 'low_risk_count',
+                    'estimated_time', 'provider_risk_summary', 'detailed_assessments'):
+            assert result['risk_result'][key] == expected_risk[key]
+        assert result['summary'] == PlanParser(plan_data).get_summary()
+        assert result['table'].rows == len(plan_data['resource_changes'])
+        assert result['enhanced'] is True
+    
+    def test_should_offload_threshold(self):
+        """Test that only large plans are offloaded"""
+        pool = PlanWorkerPool(offload_threshold=1024)
+        
+        assert not pool.should_offload(1023)
+        assert pool.should_offload(1024)
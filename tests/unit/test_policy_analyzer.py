@@ -0,0 +1,175 @@
+"""
+Unit tests for the policy document analyzer
+
+Tests the structured checks of AWS and GCP policy documents, the cache of
+parsed policies and its use by the security analysis, the risk assessment
+and the instance groups.
+"""
+
+import json
+
+import pytest
+
+from utils.policy_analyzer import (
+    CHECK_MISSING_CONDITION,
+    CHECK_NOT_ACTION,
+    CHECK_PUBLIC_PRINCIPAL,
+    CHECK_WILDCARD_ACTION,
+    CHECK_WILDCARD_RESOURCE,
+    PolicyDocumentAnalyzer,
+    analyze_policy_document,
+    find_policy_documents
+)
+
+
+def _policy(*statements):
+    return json.dumps({"Version": "2012-10-17", "Statement": list(statements)})
+
+
+def _change(address, after, resource_type="aws_iam_policy"):
+    return {"address": address, "type": resource_type, "name": address.split(".")[-1],
+            "change": {"actions": ["create"], "before": None, "after": after}}
+
+
+ADMIN = {"Sid": "Admin", "Effect": "Allow", "Action": "*", "Resource": "*"}
+READ_ONLY = {"Effect": "Allow", "Action": ["s3:GetObject"], "Resource": "arn:aws:s3:::bucket/*"}
+PUBLIC_READ = {"Effect": "Allow", "Principal": "*", "Action": "s3:GetObject", "Resource": "arn:aws:s3:::bucket/*"}
+
+
+def _checks(text):
+    return {(finding.check, finding.severity) for finding in analyze_policy_document(text).findings}
+
+
+class TestPolicyChecks:
+    """Test the checks of single policy documents"""
+
+    def test_wildcard_action_and_resource(self):
+        analysis = analyze_policy_document(_policy(ADMIN))
+
+        assert analysis.valid
+        assert analysis.statement_count == 1
+        assert {(f.check, f.severity) for f in analysis.findings} == {
+            (CHECK_WILDCARD_ACTION, "critical"), (CHECK_WILDCARD_RESOURCE, "medium")
+        }
+        assert analysis.findings[0].statement == "statement 'Admin'"
+
+    def test_service_wildcard_and_not_action(self):
+        checks = _checks(_policy({"Effect": "Allow", "Action": ["s3:*", "ec2:Describe*"], "Resource": "arn:x"},
+                                 {"Effect": "Allow", "NotAction": "iam:*", "Resource": "arn:x"}))
+        assert checks == {(CHECK_WILDCARD_ACTION, "high"), (CHECK_NOT_ACTION, "high")}
+
+    def test_least_privilege_and_deny_statements_are_clean(self):
+        deny_all = dict(ADMIN, Effect="Deny")
+        assert _checks(_policy(READ_ONLY, deny_all)) == set()
+
+    def test_public_principal_with_and_without_condition(self):
+        assert _checks(_policy(PUBLIC_READ)) == {
+            (CHECK_PUBLIC_PRINCIPAL, "high"), (CHECK_MISSING_CONDITION, "critical")
+        }
+        conditioned = dict(PUBLIC_READ, Principal={"AWS": ["*"]},
+                           Condition={"StringEquals": {"aws:SourceVpce": "vpce-1"}})
+        assert _checks(_policy(conditioned)) == {(CHECK_PUBLIC_PRINCIPAL, "high")}
+
+    def test_federated_trust_without_condition(self):
+        trust = {"Effect": "Allow", "Principal": {"Federated": "arn:aws:iam::1:oidc-provider/x"},
+                 "Action": "sts:AssumeRoleWithWebIdentity"}
+        assert _checks(_policy(trust)) == {(CHECK_MISSING_CONDITION, "high")}
+        assert _checks(_policy(dict(trust, Condition={"StringEquals": {"x:sub": "repo"}}))) == set()
+
+    def test_gcp_bindings(self):
+        policy = json.dumps({"bindings": [
+            {"role": "roles/owner", "members": ["user:a@example.com"]},
+            {"role": "roles/storage.objectViewer", "members": ["allUsers"]}
+        ]})
+        assert _checks(policy) == {
+            (CHECK_WILDCARD_ACTION, "high"), (CHECK_PUBLIC_PRINCIPAL, "high"), (CHECK_MISSING_CONDITION, "critical")
+        }
+
+    def test_invalid_documents(self):
+        assert not analyze_policy_document('{"Statement": [').valid
+        assert not analyze_policy_document('{"Other": 1}').valid
+
+    def test_find_policy_documents(self):
+        after = {"name": "role", "assume_role_policy": _policy(READ_ONLY),
+                 "inline_policy": [{"name": "x", "policy": " " + _policy(ADMIN)}], "description": "{not a policy}"}
+
+        assert [path for path, _ in find_policy_documents(after)] == ["assume_role_policy", "inline_policy[0].policy"]
+
+
+class TestPolicyDocumentAnalyzer:
+    """Test the cache of parsed policy documents"""
+
+    def test_each_distinct_policy_is_parsed_once(self):
+        analyzer = PolicyDocumentAnalyzer()
+        text = _policy(ADMIN)
+        changes = [_change(f"aws_iam_policy.p{i}", {"policy": text}) for i in range(100)]
+
+        findings = [analyzer.change_findings(change) for change in changes]
+
+        assert (analyzer.misses, analyzer.hits) == (1, 99)
+        assert len(analyzer) == 1
+        assert findings[0] == findings[99]
+
+    def test_cache_is_bounded(self):
+        analyzer = PolicyDocumentAnalyzer(max_entries=2)
+        for resource in ("a", "b", "c"):
+            analyzer.analyze(_policy(dict(READ_ONLY, Resource=resource)))
+
+        assert len(analyzer) == 2
+        analyzer.clear()
+        assert len(analyzer) == 0
+
+    def test_risk_factors_and_signature(self):
+        analyzer = PolicyDocumentAnalyzer()
+        change = _change("aws_s3_bucket_policy.b", {"policy": _policy(PUBLIC_READ, ADMIN)}, "aws_s3_bucket_policy")
+
+        assert analyzer.risk_factors(change) == [
+            "Policy allows wildcard actions", "Policy grants public access", "Policy grant has no conditions"
+        ]
+        assert (CHECK_WILDCARD_RESOURCE, "medium") in analyzer.signature(change)
+        assert analyzer.risk_factors(_change("aws_iam_policy.r", {"policy": _policy(READ_ONLY)})) == []
+
+
+class TestPolicyConsumers:
+    """Test the security analysis, risk assessment and instance groups"""
+
+    def test_security_issues_include_policy_findings(self):
+        from utils.security_analyzer import SecurityAnalyzer
+
+        analyzer = PolicyDocumentAnalyzer()
+        security = SecurityAnalyzer(policy_analyzer=analyzer)
+        change = _change("aws_iam_policy.admin", {"policy": _policy(ADMIN, dict(ADMIN, Sid="Again"))})
+
+        issues = {issue["type"]: issue for issue in security._identify_security_issues(change)}
+
+        assert issues["policy_wildcard_action"]["severity"] == "critical"
+        assert issues["policy_wildcard_action"]["description"] == \
+            "Allows every action (policy, statement 'Admin') and 1 more"
+        assert "policy_wildcard_resource" in issues
+
+    def test_risk_factors_share_the_security_cache(self):
+        from utils.provider_factory import MultiCloudProviderFactory, MultiCloudRiskAssessment
+        from utils.security_analyzer import SecurityAnalyzer
+
+        analyzer = PolicyDocumentAnalyzer()
+        change = _change("aws_iam_policy.admin", {"policy": _policy(ADMIN)})
+        plan_data = {"resource_changes": [change]}
+        factory = MultiCloudProviderFactory()
+
+        SecurityAnalyzer(policy_analyzer=analyzer).analyze_security_resources([change])
+        [assessment] = MultiCloudRiskAssessment(factory, policy_analyzer=analyzer).assess_resources(
+            [change], factory.detect_and_create_providers(plan_data)
+        )
+
+        assert "Policy allows wildcard actions" in assessment["risk_factors"]
+        assert analyzer.misses == 1
+
+    def test_groups_split_on_policy_findings(self):
+        from utils.instance_groups import InstanceGroups
+
+        changes = [
+            _change('aws_iam_policy.p["a"]', {"policy": _policy(dict(READ_ONLY, Resource="arn:a"))}),
+            _change('aws_iam_policy.p["b"]', {"policy": _policy(dict(READ_ONLY, Resource="arn:b"))}),
+            _change('aws_iam_policy.p["c"]', {"policy": _policy(dict(ADMIN, Resource="arn:c"))})
+        ]
+        assert [group.count for group in InstanceGroups.build(changes)] == [2, 1]
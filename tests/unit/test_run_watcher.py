@@ -0,0 +1,274 @@
+"""
+Unit tests for the TFE run status watcher
+
+Tests adaptive polling, plan prefetching, failure handling and coalescing of
+watches for the same run.
+"""
+
+import threading
+
+import pytest
+from unittest.mock import Mock, patch
+
+from providers.run_watcher import RunStatusWatcher, WatchState, watch_tfe_yaml_upload
+
+
+def _make_client(statuses, plan_data=None, plan_error=None, run_id='run-abc123456'):
+    """Create a mock authenticated client returning the given status sequence."""
+    client = Mock()
+    client.config = {
+        'tfe_server': 'app.terraform.io',
+        'organization': 'my-org',
+        'token': 'secret-token-value',
+        'workspace_id': 'ws-abc123456',
+        'run_id': run_id
+    }
+    client.get_run_status.side_effect = [(status, None) for status in statuses]
+    client.get_plan_json.return_value = (plan_data, plan_error)
+    return client
+
+
+class TestRunStatusWatcher:
+    """Test cases for RunStatusWatcher"""
+
+    @pytest.fixture
+    def watcher(self):
+        """Create a fast-polling watcher with a trivial analyzer"""
+        watcher = RunStatusWatcher(
+            analyzer=lambda plan: {'plan_data': plan, 'analyzed': True},
+            min_interval=0.01,
+            max_interval=0.05
+        )
+        yield watcher
+        watcher.stop_all()
+
+    def test_prefetches_plan_when_run_finishes_planning(self, watcher):
+        """Test that the plan is downloaded and analyzed once the run is planned"""
+        plan = {'resource_changes': []}
+        client = _make_client(['plan_queued', 'planning', 'planned'], plan_data=plan)
+
+        watch = watcher.watch(client)
+
+        assert watch.wait(timeout=2.0)
+        assert watch.state == WatchState.READY
+        assert watch.plan_data is plan
+        assert watch.analysis == {'plan_data': plan, 'analyzed': True}
+        assert watch.polls == 3
+        client.get_plan_json.assert_called_once()
+
+    def test_failed_run_reports_error(self, watcher):
+        """Test that a run that errored ends the watch as failed"""
+        client = _make_client(['planning', 'errored'], plan_error='No structured JSON output')
+
+        watch = watcher.watch(client)
+
+        assert watch.wait(timeout=2.0)
+        assert watch.state == WatchState.FAILED
+        assert 'errored' in watch.error
+
+    def test_analyzer_failure_keeps_plan(self, watcher):
+        """Test that the plan is still delivered when pre-analysis fails"""
+        watcher.analyzer = Mock(side_effect=ValueError("boom"))
+        plan = {'resource_changes': []}
+        client = _make_client(['planned'], plan_data=plan)
+
+        watch = watcher.watch(client)
+
+        assert watch.wait(timeout=2.0)
+        assert watch.state == WatchState.READY
+        assert watch.plan_data is plan
+        assert watch.analysis is None
+        assert 'Pre-analysis failed' in watch.error
+
+    def test_same_run_is_coalesced(self, watcher):
+        """Test that sessions watching the same run share one watch"""
+        statuses = ['planning'] * 50
+        first = watcher.watch(_make_client(statuses))
+        second = watcher.watch(_make_client(statuses))
+
+        assert first is second
+        assert first.subscribers == 2
+
+    def test_different_token_is_not_coalesced(self, watcher):
+        """Test that watches are not shared across credentials"""
+        statuses = ['planning'] * 50
+        other_client = _make_client(statuses)
+        other_client.config['token'] = 'another-token-value'
+
+        first = watcher.watch(_make_client(statuses))
+        second = watcher.watch(other_client)
+
+        assert first is not second
+
+    def test_unwatch_stops_polling(self, watcher):
+        """Test that the poller stops when the last subscriber leaves"""
+        watch = watcher.watch(_make_client(['planning'] * 500))
+
+        watcher.unwatch(watch)
+
+        assert watch.wait(timeout=2.0)
+        assert watch.state == WatchState.STOPPED
+        assert watcher.get_watch(watch_config()) is None
+
+    def test_times_out_when_run_never_finishes(self):
+        """Test that the watch gives up after max_wait"""
+        watcher = RunStatusWatcher(min_interval=0.01, max_interval=0.01, max_wait=0.05)
+
+        watch = watcher.watch(_make_client(['planning'] * 500))
+
+        assert watch.wait(timeout=2.0)
+        assert watch.state == WatchState.TIMED_OUT
+
+    def test_finished_watches_expire(self, watcher):
+        """Test that finished watches are dropped after the result TTL"""
+        watcher.result_ttl = 0.0
+        watch = watcher.watch(_make_client(['planned'], plan_data={'resource_changes': []}))
+        assert watch.wait(timeout=2.0)
+        watch.updated_at -= 1.0
+
+        assert watcher.get_watch(watch_config()) is None
+
+    def test_checked_status_delays_first_poll(self, watcher):
+        """Test that a status the caller already checked is shown without polling again"""
+        watcher.min_interval = 5.0
+        client = _make_client(['planning'])
+
+        watch = watcher.watch(client, run_status='plan_queued')
+
+        assert watch.run_status == 'plan_queued'
+        assert not watch.wait(timeout=0.05)
+        client.get_run_status.assert_not_called()
+
+    def test_next_interval_backs_off_and_resets(self):
+        """Test adaptive polling interval"""
+        watcher = RunStatusWatcher(min_interval=2.0, max_interval=10.0, backoff=2.0)
+
+        assert watcher.next_interval(2.0, status_changed=False) == 4.0
+        assert watcher.next_interval(8.0, status_changed=False) == 10.0
+        assert watcher.next_interval(8.0, status_changed=True) == 2.0
+
+
+def watch_config():
+    """Configuration matching the mock clients"""
+    return _make_client([]).config
+
+
+class TestWatchTFEYamlUpload:
+    """Test cases for starting watches from an uploaded configuration"""
+
+    @pytest.fixture
+    def watcher(self):
+        """Shared watcher replaced by a fast-polling one"""
+        watcher = RunStatusWatcher(analyzer=lambda plan: None, min_interval=5.0, max_interval=5.0)
+        with patch('providers.run_watcher.get_run_watcher', return_value=watcher):
+            yield watcher
+        watcher.stop_all()
+
+    def _upload(self, statuses, current=None):
+        client = _make_client(statuses)
+        client.load_config_from_yaml.return_value = (True, None)
+        client.authenticate.return_value = (True, None)
+        with patch('providers.run_watcher.StandaloneTFEClient', return_value=client):
+            return watch_tfe_yaml_upload('run_id: run-abc123456', current), client
+
+    def test_finished_run_is_not_watched(self, watcher):
+        """Test that a run that already has a plan is retrieved directly"""
+        (watch, error), client = self._upload(['planned'])
+
+        assert (watch, error) == (None, None)
+        assert watcher.get_watch(watch_config()) is None
+        client.get_run_status.assert_called_once()
+
+    def test_pending_run_is_watched_with_its_status(self, watcher):
+        """Test that a planning run starts a watch showing the checked status"""
+        (watch, error), _ = self._upload(['planning'])
+
+        assert error is None
+        assert watch.run_status == 'planning'
+        assert watch.subscribers == 1
+
+    def test_session_subscribes_once(self, watcher):
+        """Test that reruns of the subscribed session do not add subscriptions"""
+        (watch, _), _ = self._upload(['planning'])
+        (rerun, _), _ = self._upload(['planning'], current=watch)
+        (other, _), _ = self._upload(['planning'])
+
+        assert rerun is watch and other is watch
+        assert watch.subscribers == 2
+
+        watcher.unwatch(watch)
+        watcher.unwatch(watch)
+        assert watcher.get_watch(watch_config()) is None
+
+
+class TestBackgroundPlanFetch:
+    """Test cases for direct plan retrievals on watcher threads"""
+
+    @pytest.fixture
+    def watcher(self):
+        """Watcher with a trivial analyzer"""
+        watcher = RunStatusWatcher(analyzer=lambda plan: {'analyzed': True})
+        yield watcher
+        watcher.stop_all()
+
+    @pytest.fixture
+    def credential_manager(self):
+        """Credential manager holding the configuration of the mock clients"""
+        config = watch_config()
+        manager = Mock()
+        manager.get_config.return_value = Mock(
+            tfe_server=config['tfe_server'], organization=config['organization'],
+            token=config['token'], workspace_id=config['workspace_id'], run_id=config['run_id']
+        )
+        return manager
+
+    def _tfe_client(self, plan_data=None, plan_error=None):
+        client = Mock()
+        client.validate_connection.return_value = (True, "Connection successful")
+        client.authenticate.return_value = (True, None)
+        client.get_plan_json.return_value = (plan_data, plan_error)
+        return client
+
+    def test_plan_is_retrieved_off_the_calling_thread(self, watcher, credential_manager):
+        """Test that the TFE client runs on the watcher thread with the watch's stop event"""
+        plan = {'resource_changes': []}
+        client = self._tfe_client(plan_data=plan)
+        threads = []
+        client.get_plan_json.side_effect = lambda *args: threads.append(threading.current_thread()) or (plan, None)
+
+        with patch('providers.run_watcher.TFEClient', return_value=client) as client_class:
+            watch = watcher.fetch(credential_manager)
+            assert watch.wait(timeout=2.0)
+
+        assert watch.state == WatchState.READY
+        assert watch.plan_data is plan
+        assert watch.analysis == {'analyzed': True}
+        assert threads and threads[0] is not threading.current_thread()
+        handler = client_class.call_args[1]['error_handler']
+        assert handler._wait_for == watch._stop.wait
+        client.get_plan_json.assert_called_once_with('ws-abc123456', 'run-abc123456')
+        client.close.assert_called_once()
+
+    def test_failed_retrieval_reports_error(self, watcher, credential_manager):
+        """Test that a failed download ends the fetch as failed"""
+        client = self._tfe_client(plan_error="Plan JSON output not found or expired.")
+
+        with patch('providers.run_watcher.TFEClient', return_value=client):
+            watch = watcher.fetch(credential_manager)
+            assert watch.wait(timeout=2.0)
+
+        assert watch.state == WatchState.FAILED
+        assert watch.error == "Plan JSON output not found or expired."
+
+    def test_session_subscribes_once(self, watcher, credential_manager):
+        """Test that reruns of the subscribed session reuse their fetch"""
+        client = self._tfe_client(plan_data={'resource_changes': []})
+
+        with patch('providers.run_watcher.TFEClient', return_value=client):
+            watch = watcher.fetch(credential_manager)
+            rerun = watcher.fetch(credential_manager, current=watch)
+            watch.wait(timeout=2.0)
+
+        assert rerun is watch
+        assert watch.subscribers == 1
+        client.get_plan_json.assert_called_once()
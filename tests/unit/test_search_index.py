@@ -0,0 +1,114 @@
+"""
+Unit tests for the resource table search index
+
+Tests trigram posting-list lookups against a plain substring scan, row masks
+and match indicators for filtered subsets, and the data table's use of the
+index for filtering and highlighting.
+"""
+
+import pandas as pd
+import pytest
+
+from utils.search_index import ResourceSearchIndex, trigrams
+
+
+def _table():
+    return pd.DataFrame({
+        "resource_name": ["web", "web_backup", "db", "logs", "Web-Edge"],
+        "resource_type": ["aws_instance", "aws_instance", "aws_db_instance", "aws_s3_bucket", "aws_cloudfront"],
+        "resource_address": ["aws_instance.web", "aws_instance.web_backup", "aws_db_instance.db",
+                             "aws_s3_bucket.logs", "module.cdn.aws_cloudfront.edge"],
+        "provider": ["aws"] * 5,
+        "action": ["create", "update", "delete", "create", "update"]
+    })
+
+
+def _reference_mask(df, query):
+    query = query.strip().lower()
+    mask = pd.Series(False, index=df.index)
+    for column in ("resource_name", "resource_type", "resource_address", "provider"):
+        mask |= df[column].astype(str).str.lower().str.contains(query, regex=False)
+    return mask.to_numpy()
+
+
+class TestResourceSearchIndex:
+    """Test index lookups"""
+
+    def test_trigrams(self):
+        assert trigrams("abcd") == {"abc", "bcd"}
+        assert trigrams("ab") == set()
+
+    @pytest.mark.parametrize("query", ["web", "WEB", " db ", "w", "_i", "instance.web", "aws", "3_b", "cdn.aws",
+                                       "s3 b", "nomatch", "web_edge"])
+    def test_matches_substring_scan(self, query):
+        df = _table()
+        index = ResourceSearchIndex.from_dataframe(df)
+
+        assert index.search(query).mask(df).tolist() == _reference_mask(df, query).tolist()
+
+    def test_missing_values_do_not_match(self):
+        df = _table()
+        df.loc[1, "provider"] = None
+        df.loc[2, "resource_name"] = float("nan")
+        index = ResourceSearchIndex.from_dataframe(df)
+
+        assert index.search("aws").mask(df).tolist() == [True] * 5
+        assert index.search("nan").mask(df).tolist() == [False] * 5
+        assert index.search("none").mask(df).tolist() == [False] * 5
+
+    def test_strings_are_interned(self):
+        index = ResourceSearchIndex.from_dataframe(_table())
+
+        assert len(index) == 5
+        assert index.columns == ["resource_name", "resource_type", "resource_address", "provider"]
+        assert index.strings.count("aws_instance") == 1
+        assert index.strings.count("aws") == 1
+
+    def test_query_results_are_cached(self):
+        index = ResourceSearchIndex.from_dataframe(_table())
+        index.query_cache_entries = 1
+
+        matches = index.search("web")
+        assert index.search(" Web ") is matches
+        index.search("db")
+        assert index.search("web") is not matches
+
+    def test_subset_mask_and_indicators(self):
+        df = _table()
+        index = ResourceSearchIndex.from_dataframe(df)
+        subset = df.iloc[[4, 1, 2]]
+
+        matches = index.search("web")
+
+        assert matches.count == 3
+        assert matches.mask(subset).tolist() == [True, True, False]
+        assert matches.indicators(subset).tolist() == ["🔍 NAME", "🔍 NAME+ADDR", ""]
+        assert index.search("aws_db").indicators(subset).tolist() == ["", "", "🔍 TYPE+ADDR"]
+
+    def test_rows_outside_the_index_do_not_match(self):
+        df = _table()
+        index = ResourceSearchIndex.from_dataframe(df.iloc[:2])
+
+        assert index.search("web").mask(df).tolist() == [True, True, False, False, False]
+        assert not index.covers(df)
+        assert index.covers(df.iloc[:2])
+
+
+class TestDataTableSearch:
+    """Test the data table's search filter and highlighting"""
+
+    def test_filter_and_highlighting_use_the_index(self):
+        from components.data_table import DataTableComponent
+
+        df = _table()
+        component = DataTableComponent()
+        index = ResourceSearchIndex.from_dataframe(df)
+        subset = df[df["action"] != "delete"]
+
+        filtered = component._apply_search_filter(subset, "web", index)
+        highlighted = component._add_search_highlighting(filtered, "web", index)
+
+        assert filtered["resource_name"].tolist() == ["web", "web_backup", "Web-Edge"]
+        assert highlighted["search_indicator"].tolist() == ["🔍 NAME+ADDR", "🔍 NAME+ADDR", "🔍 NAME"]
+        assert component._apply_search_filter(df, "  ", index) is df
+        assert component._apply_search_filter(df, "s3")["resource_name"].tolist() == ["logs"]
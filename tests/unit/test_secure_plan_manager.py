@@ -294,6 +294,68 @@ class TestSecurePlanManager:
         assert metadata.resource_count == 1
         # Should handle missing actions gracefully
         assert isinstance(metadata.action_summary, dict)
+    
+    def test_no_expiry_by_default(self):
+        """Test that plan data is kept until cleared when no retention timeout is set"""
+        self.plan_manager.store_plan_data(self.sample_plan_data, "file_upload")
+        
+        assert self.plan_manager._expiry_handle is None
+        assert self.plan_manager.has_plan_data()
+    
+    def test_retention_timeout_clears_idle_plan(self):
+        """Test that idle plan data is cleared by the retention timeout"""
+        plan_manager = SecurePlanManager(retention_timeout=60)
+        plan_manager.store_plan_data(self.sample_plan_data, "file_upload")
+        assert plan_manager._expiry_handle.active
+        
+        # Simulate idle time beyond the timeout
+        plan_manager._last_access_time -= 120
+        plan_manager._expire_if_idle()
+        
+        assert not plan_manager.has_plan_data()
+        assert plan_manager._expiry_handle is None
+    
+    def test_retention_timeout_rearms_after_access(self):
+        """Test that recently accessed plan data is kept and expiry re-armed"""
+        plan_manager = SecurePlanManager(retention_timeout=60)
+        plan_manager.store_plan_data(self.sample_plan_data, "file_upload")
+        initial_handle = plan_manager._expiry_handle
+        
+        plan_manager.get_plan_data()
+        plan_manager._expire_if_idle()
+        
+        assert plan_manager.has_plan_data()
+        assert plan_manager._expiry_handle is not initial_handle
+        assert not initial_handle.active
+        plan_manager.clear_plan_data()
+    
+    def test_arena_storage_mode(self):
+        """Test that arena storage keeps the plan in one buffer and round-trips it"""
+        plan_manager = SecurePlanManager(storage_mode="arena")
+        plan_manager.store_plan_data(self.sample_plan_data, "file_upload")
+        
+        assert plan_manager._plan_data is None
+        assert plan_manager.has_plan_data()
+        assert plan_manager.get_plan_data() == self.sample_plan_data
+        assert plan_manager.get_plan_section("resource_changes") == self.sample_plan_data["resource_changes"]
+        assert plan_manager.get_plan_metadata().resource_count == len(self.sample_plan_data["resource_changes"])
+    
+    def test_arena_clear_zeroes_buffer(self):
+        """Test that clearing an arena-backed plan zeroes its buffer"""
+        plan_manager = SecurePlanManager(storage_mode="arena")
+        plan_manager.store_plan_data(self.sample_plan_data, "file_upload")
+        buffer = plan_manager._plan_arena._buffer
+        
+        plan_manager.clear_plan_data()
+        
+        assert buffer == bytearray(len(buffer))
+        assert not plan_manager.has_plan_data()
+        assert plan_manager.get_plan_data() is None
+    
+    def test_invalid_storage_mode(self):
+        """Test that unknown storage modes are rejected"""
+        with pytest.raises(ValueError):
+            SecurePlanManager(storage_mode="disk")
 
 
 class TestSecurePlanManagerIntegration:
@@ -38,10 +38,6 @@ class TestCredentialManagerSecurityHardening(unittest.TestCase):
     def tearDown(self):
         """Clean up after each test"""
         self.manager.clear_credentials()
-        # Cancel any running timers
-        if CredentialManager._session_cleanup_timer:
-            CredentialManager._session_cleanup_timer.cancel()
-            CredentialManager._session_cleanup_timer = None
     
     def test_session_timeout_initialization(self):
         """Test that session timeout is properly initialized"""
@@ -56,7 +52,7 @@ class TestCredentialManagerSecurityHardening(unittest.TestCase):
         self.manager.store_credentials(self.valid_config)
         
         self.assertTrue(self.manager._session_active)
-        self.assertIsNotNone(CredentialManager._session_cleanup_timer)
+        self.assertIsNotNone(self.manager._expiry_handle)
     
     def test_session_timeout_configuration(self):
         """Test session timeout configuration"""
@@ -116,20 +112,23 @@ class TestCredentialManagerSecurityHardening(unittest.TestCase):
         self.assertGreater(self.manager._last_access_time, initial_time)
     
     @patch('threading.Timer')
-    def test_session_cleanup_timer_management(self, mock_timer):
-        """Test session cleanup timer creation and cancellation"""
-        mock_timer_instance = Mock()
-        mock_timer.return_value = mock_timer_instance
-        
-        # Store credentials should start timer
+    def test_session_expiry_scheduling(self, mock_timer):
+        """Test session expiry scheduling and cancellation without per-access timers"""
+        # Store credentials should schedule expiry on the shared scheduler
         self.manager.store_credentials(self.valid_config)
+        handle = self.manager._expiry_handle
+        self.assertTrue(handle.active)
         
-        mock_timer.assert_called_once()
-        mock_timer_instance.start.assert_called_once()
+        # Access only updates the timestamp
+        self.manager.get_credentials()
+        self.manager.get_config()
+        self.assertIs(self.manager._expiry_handle, handle)
+        mock_timer.assert_not_called()
         
-        # Clear credentials should cancel timer
+        # Clear credentials should cancel the scheduled expiry
         self.manager.clear_credentials()
-        mock_timer_instance.cancel.assert_called_once()
+        self.assertFalse(handle.active)
+        self.assertIsNone(self.manager._expiry_handle)
     
     def test_session_timeout_cleanup_logic(self):
         """Test session timeout cleanup logic"""
@@ -148,26 +147,24 @@ class TestCredentialManagerSecurityHardening(unittest.TestCase):
         self.assertFalse(self.manager._session_active)
     
     def test_session_timeout_restart_on_recent_access(self):
-        """Test that timer restarts if session was accessed recently"""
-        with patch('threading.Timer') as mock_timer:
-            mock_timer_instance = Mock()
-            mock_timer.return_value = mock_timer_instance
-            
-            self.manager.set_session_timeout(60)
-            self.manager.store_credentials(self.valid_config)
-            
-            # Simulate recent access (within timeout)
-            self.manager._last_access_time = time.time() - 30  # 30 seconds ago
-            
-            # Trigger timeout cleanup
-            self.manager._session_timeout_cleanup()
-            
-            # Credentials should still exist
-            self.assertIsNotNone(self.manager.get_credentials())
-            self.assertTrue(self.manager._session_active)
-            
-            # Timer should be restarted
-            self.assertGreaterEqual(mock_timer.call_count, 2)
+        """Test that expiry is re-armed if session was accessed recently"""
+        self.manager.set_session_timeout(60)
+        self.manager.store_credentials(self.valid_config)
+        initial_handle = self.manager._expiry_handle
+        
+        # Simulate recent access (within timeout)
+        self.manager._last_access_time = time.time() - 30  # 30 seconds ago
+        
+        # Trigger timeout cleanup
+        self.manager._session_timeout_cleanup()
+        
+        # Credentials should still exist
+        self.assertIsNotNone(self.manager.get_credentials())
+        self.assertTrue(self.manager._session_active)
+        
+        # Expiry should be re-armed for the remaining time
+        self.assertIsNot(self.manager._expiry_handle, initial_handle)
+        self.assertTrue(self.manager._expiry_handle.active)
     
     def test_credential_overwrite_security(self):
         """Test that credentials are securely overwritten before clearing"""
@@ -189,27 +186,24 @@ class TestCredentialManagerSecurityHardening(unittest.TestCase):
         self.assertIsNone(self.manager._config)
     
     def test_global_cleanup_cancels_timers(self):
-        """Test that global cleanup cancels all timers"""
-        with patch('threading.Timer') as mock_timer:
-            mock_timer_instance = Mock()
-            mock_timer.return_value = mock_timer_instance
-            
-            # Create multiple managers with active sessions
-            manager1 = CredentialManager()
-            manager2 = CredentialManager()
-            
-            manager1.store_credentials(self.valid_config)
-            manager2.store_credentials(self.valid_config)
-            
-            # Global cleanup
-            CredentialManager.cleanup_all_instances()
-            
-            # Timer should be cancelled
-            mock_timer_instance.cancel.assert_called()
-            
-            # All credentials should be cleared
-            self.assertIsNone(manager1.get_credentials())
-            self.assertIsNone(manager2.get_credentials())
+        """Test that global cleanup cancels all scheduled expirations"""
+        # Create multiple managers with active sessions
+        manager1 = CredentialManager()
+        manager2 = CredentialManager()
+        
+        manager1.store_credentials(self.valid_config)
+        manager2.store_credentials(self.valid_config)
+        handles = [manager1._expiry_handle, manager2._expiry_handle]
+        
+        # Global cleanup
+        CredentialManager.cleanup_all_instances()
+        
+        # Scheduled expirations should be cancelled
+        self.assertFalse(any(handle.active for handle in handles))
+        
+        # All credentials should be cleared
+        self.assertIsNone(manager1.get_credentials())
+        self.assertIsNone(manager2.get_credentials())
 
 
 class TestTFEClientSecurityHardening(unittest.TestCase):
@@ -0,0 +1,261 @@
+"""
+Unit tests for declarative security rule packs
+
+Tests condition and path parsing, rule evaluation on planned values,
+dispatch by resource type, user rule packs and the security analyzer's use
+of the compiled rules.
+"""
+
+import json
+import os
+
+import pytest
+
+from utils.security_rules import (
+    WILDCARD,
+    SecurityRuleError,
+    SecurityRuleSet,
+    get_security_rules,
+    load_rule_pack,
+    parse_condition,
+    parse_path
+)
+
+
+def _change(resource_type, after, after_unknown=None, address=None):
+    change = {"actions": ["create"], "before": None, "after": after}
+    if after_unknown is not None:
+        change["after_unknown"] = after_unknown
+    return {"address": address or f"{resource_type}.this", "type": resource_type, "name": "this", "change": change}
+
+
+def _rule_set(*rules):
+    return SecurityRuleSet.from_packs([{"name": "test", "rules": list(rules)}])
+
+
+def _rule(rule_id, resource_types, *when, **fields):
+    return dict({"id": rule_id, "resource_types": resource_types, "when": list(when), "severity": "high"}, **fields)
+
+
+def _issue_rules(rule_set, change):
+    return [issue["rule"] for issue in rule_set.evaluate(change)]
+
+
+class TestParsing:
+    """Test parsing of paths and conditions"""
+
+    def test_paths(self):
+        assert parse_path("ingress[*].cidr_blocks") == ("ingress", WILDCARD, "cidr_blocks")
+        assert parse_path('tags["kubernetes.io/role"]') == ("tags", "kubernetes.io/role")
+        assert parse_path("rule[0].name") == ("rule", 0, "name")
+        assert parse_path("$") == ()
+
+    @pytest.mark.parametrize("path", [".name", "a..b", "a[x]", "a[0]b", ""])
+    def test_invalid_paths(self, path):
+        with pytest.raises(SecurityRuleError):
+            parse_path(path)
+
+    def test_conditions(self):
+        condition = parse_condition("ingress[*].cidr_blocks contains 0.0.0.0/0")
+        assert (condition.operator, condition.value) == ("contains", "0.0.0.0/0")
+        assert parse_condition("from_port in [22, 3389]").value == [22, 3389]
+        assert parse_condition("encrypted != true").value is True
+        assert parse_condition("kms_key_id   missing").operator == "missing"
+        assert parse_condition("acl not  in [\"private\"]").operator == "not in"
+
+    @pytest.mark.parametrize("text", [
+        "name", "name missing extra", "port in 22", "port > high", "name matches \"(\"", "name =~ x",
+        "ingress[*] exposes 22", "ingress[*] exposes [\"ssh\"]"
+    ])
+    def test_invalid_conditions(self, text):
+        with pytest.raises(SecurityRuleError):
+            parse_condition(text)
+
+
+class TestEvaluation:
+    """Test rule evaluation on planned values"""
+
+    def test_wildcard_paths_and_contains(self):
+        rules = _rule_set(_rule("open", "aws_security_group", 'ingress[*].cidr_blocks contains "0.0.0.0/0"'))
+        open_group = _change("aws_security_group", {"ingress": [
+            {"cidr_blocks": ["10.0.0.0/8"]}, {"cidr_blocks": ["0.0.0.0/0"]}
+        ]})
+        private_group = _change("aws_security_group", {"ingress": [{"cidr_blocks": ["10.0.0.0/8"]}]})
+
+        assert _issue_rules(rules, open_group) == ["open"]
+        assert _issue_rules(rules, private_group) == []
+
+    def test_numbers_are_not_matched_as_text(self):
+        rules = _rule_set(_rule("ssh", "aws_security_group_rule", "from_port in [22]"))
+
+        assert _issue_rules(rules, _change("aws_security_group_rule", {"from_port": 22})) == ["ssh"]
+        assert _issue_rules(rules, _change("aws_security_group_rule", {"from_port": 2222, "description": "22"})) == []
+
+    def test_missing_respects_unknown_values(self):
+        rules = _rule_set(_rule("sse", "aws_s3_bucket", "server_side_encryption_configuration missing"))
+
+        assert _issue_rules(rules, _change("aws_s3_bucket", {"bucket": "b", "server_side_encryption_configuration": []})) == ["sse"]
+        assert _issue_rules(rules, _change("aws_s3_bucket", {"bucket": "b"},
+                                           {"server_side_encryption_configuration": True})) == []
+        assert _issue_rules(rules, _change("aws_s3_bucket", {
+            "server_side_encryption_configuration": [{"rule": []}]
+        })) == []
+
+    def test_booleans_and_comparisons(self):
+        rules = _rule_set(
+            _rule("unencrypted", "aws_ebs_volume", "encrypted != true"),
+            _rule("large", "aws_ebs_volume", "size >= 1000"),
+            _rule("named", "aws_ebs_volume", 'tags.Name matches "^prod-"')
+        )
+
+        assert _issue_rules(rules, _change("aws_ebs_volume", {"encrypted": 1, "size": 1000})) == ["unencrypted", "large"]
+        assert _issue_rules(rules, _change("aws_ebs_volume", {"encrypted": True, "size": "2000",
+                                                              "tags": {"Name": "prod-db"}})) == ["named"]
+
+    def test_all_conditions_must_hold(self):
+        rules = _rule_set(_rule("inbound", "azurerm_network_security_rule",
+                                'direction == "Inbound"', 'source_address_prefix == "*"'))
+
+        assert _issue_rules(rules, _change("azurerm_network_security_rule",
+                                           {"direction": "Inbound", "source_address_prefix": "*"})) == ["inbound"]
+        assert _issue_rules(rules, _change("azurerm_network_security_rule",
+                                           {"direction": "Outbound", "source_address_prefix": "*"})) == []
+
+    def test_deleted_resources_are_not_checked(self):
+        rules = _rule_set(_rule("sse", "aws_s3_bucket", "server_side_encryption_configuration missing"))
+        change = _change("aws_s3_bucket", None)
+        change["change"]["actions"] = ["delete"]
+
+        assert rules.evaluate(change) == []
+
+    def test_issue_format(self):
+        rules = _rule_set(_rule("sse", "aws_s3_bucket", "versioning missing", issue="unencrypted",
+                                severity="Medium", description="No versioning"))
+
+        assert rules.evaluate(_change("aws_s3_bucket", {})) == [
+            {"type": "unencrypted", "severity": "medium", "description": "No versioning", "rule": "sse"}
+        ]
+
+
+class TestDispatch:
+    """Test the per-type dispatch table"""
+
+    def test_rules_are_selected_by_type_and_pattern(self):
+        rules = _rule_set(
+            _rule("exact", "aws_iam_role_policy_attachment", "policy_arn present"),
+            _rule("pattern", ["aws_iam_*_policy_attachment"], "policy_arn present"),
+            _rule("other", "aws_s3_bucket", "acl present")
+        )
+
+        assert [rule.id for rule in rules.rules_for("aws_iam_role_policy_attachment")] == ["exact", "pattern"]
+        assert [rule.id for rule in rules.rules_for("aws_iam_user_policy_attachment")] == ["pattern"]
+        assert rules.rules_for("aws_instance") == []
+
+    def test_paths_are_shared_between_rules(self):
+        rules = _rule_set(
+            _rule("a", "aws_db_instance", "storage_encrypted != true"),
+            _rule("b", "aws_db_instance", "storage_encrypted missing", "publicly_accessible == true")
+        )
+        table = rules._table("aws_db_instance")
+
+        assert table.slot_count == 2
+        assert _issue_rules(rules, _change("aws_db_instance", {"publicly_accessible": True})) == ["a", "b"]
+
+    def test_later_packs_replace_and_disable_rules(self):
+        base = {"name": "base", "rules": [_rule("a", "aws_s3_bucket", "acl present"),
+                                          _rule("b", "aws_s3_bucket", "policy present")]}
+        override = {"name": "user", "rules": [_rule("a", "aws_s3_bucket", "acl == \"public-read\"", severity="low"),
+                                              {"id": "b", "enabled": False}]}
+        rules = SecurityRuleSet.from_packs([base, override])
+
+        [rule] = rules.rules
+        assert (rule.id, rule.severity, rule.pack) == ("a", "low", "user")
+
+    def test_invalid_packs(self):
+        with pytest.raises(SecurityRuleError):
+            SecurityRuleSet.from_packs([{"rules": "nope"}])
+        with pytest.raises(SecurityRuleError):
+            _rule_set(_rule("bad", "aws_s3_bucket", "acl present", severity="urgent"))
+        with pytest.raises(SecurityRuleError):
+            _rule_set({"id": "no_types", "when": ["acl present"]})
+
+
+class TestRulePacks:
+    """Test the built-in pack and user rule pack files"""
+
+    def test_builtin_pack_compiles(self):
+        assert len(get_security_rules()) > 20
+
+    def test_user_packs_from_environment(self, tmp_path, monkeypatch):
+        yaml_pack = tmp_path / "team.yaml"
+        yaml_pack.write_text(
+            "rules:\n"
+            "  - id: require_owner_tag\n"
+            "    resource_types: ['aws_*']\n"
+            "    when: ['tags.owner missing']\n"
+            "    severity: low\n"
+        )
+        json_pack = tmp_path / "broken.json"
+        json_pack.write_text(json.dumps({"rules": [{"id": "x", "resource_types": "aws_s3_bucket", "when": "acl ~ 1"}]}))
+        monkeypatch.setenv("TERRAFORM_DASHBOARD_SECURITY_RULE_PACKS", os.pathsep.join([str(yaml_pack), str(json_pack)]))
+
+        rules = get_security_rules()
+
+        assert get_security_rules() is rules
+        assert "require_owner_tag" in _issue_rules(rules, _change("aws_kms_key", {"enable_key_rotation": True}))
+        assert load_rule_pack(str(yaml_pack))["name"] == "team.yaml"
+        with pytest.raises(SecurityRuleError):
+            load_rule_pack(str(json_pack) + ".missing")
+
+    @pytest.mark.parametrize("ingress, flagged", [
+        ({"from_port": 22, "to_port": 22, "protocol": "tcp"}, True),
+        ({"from_port": 0, "to_port": 65535, "protocol": "tcp"}, True),
+        ({"from_port": 20, "to_port": 25, "protocol": "tcp"}, True),
+        ({"from_port": 0, "to_port": 0, "protocol": "-1"}, True),
+        ({"from_port": 80, "to_port": 443, "protocol": "tcp"}, False),
+        ({"from_port": 3390, "to_port": 3390, "protocol": "tcp"}, False)
+    ])
+    def test_sensitive_port_ranges(self, ingress, flagged):
+        rules = get_security_rules()
+        group = _change("aws_security_group", {"ingress": [ingress]})
+        group_rule = _change("aws_security_group_rule", dict(ingress, type="ingress"))
+        egress_rule = _change("aws_security_group_rule", dict(ingress, type="egress"))
+
+        assert ("aws_security_group_sensitive_ports" in _issue_rules(rules, group)) is flagged
+        assert ("aws_security_group_rule_sensitive_ports" in _issue_rules(rules, group_rule)) is flagged
+        assert "aws_security_group_rule_sensitive_ports" not in _issue_rules(rules, egress_rule)
+
+    @pytest.mark.parametrize("after, expected", [
+        ({"cidr_ipv4": "0.0.0.0/0", "ip_protocol": "tcp", "from_port": 20, "to_port": 25},
+         ["aws_vpc_security_group_ingress_rule_open", "aws_vpc_security_group_ingress_rule_sensitive_ports"]),
+        ({"cidr_ipv4": "0.0.0.0/0", "ip_protocol": "-1"},
+         ["aws_vpc_security_group_ingress_rule_open", "aws_vpc_security_group_ingress_rule_sensitive_ports"]),
+        ({"cidr_ipv4": "0.0.0.0/0", "ip_protocol": "tcp", "from_port": 443, "to_port": 443},
+         ["aws_vpc_security_group_ingress_rule_open"]),
+        ({"cidr_ipv4": "10.0.0.0/8", "ip_protocol": "tcp", "from_port": 22, "to_port": 22}, [])
+    ])
+    def test_vpc_ingress_rules(self, after, expected):
+        change = _change("aws_vpc_security_group_ingress_rule", after)
+
+        assert sorted(_issue_rules(get_security_rules(), change)) == expected
+
+    def test_kms_rotation_has_its_own_issue_type(self):
+        issues = get_security_rules().evaluate(_change("aws_kms_key", {"enable_key_rotation": False}))
+
+        assert [issue["type"] for issue in issues if issue["rule"] == "aws_kms_key_rotation_disabled"] == [
+            "key_rotation_disabled"
+        ]
+
+    def test_security_analyzer_uses_rules(self):
+        from utils.security_analyzer import SecurityAnalyzer
+
+        analyzer = SecurityAnalyzer(security_rules=_rule_set(
+            _rule("open", "aws_security_group", 'ingress[*].cidr_blocks contains "0.0.0.0/0"', issue="open_to_world")
+        ))
+        result = analyzer.analyze_security_resources([
+            _change("aws_security_group", {"name": "port-22-admin", "ingress": [{"cidr_blocks": ["0.0.0.0/0"]}]}),
+            _change("aws_security_group", {"name": "port-22-admin", "ingress": []}, address="aws_security_group.b")
+        ])
+
+        assert [[issue["type"] for issue in resource["security_issues"]]
+                for resource in result["security_resources"]] == [["open_to_world"], []]
@@ -347,6 +347,22 @@ class TestSessionStateManager:
         cleared_settings = self.session_manager.get_advanced_filter_settings()
         assert cleared_settings['use_advanced_filters'] == False
         assert cleared_settings['filter_expression'] == ''
+    
+    def test_plan_manager_uses_environment_settings(self, monkeypatch):
+        """Test that the session's plan manager uses the configured storage mode and retention"""
+        from utils.secure_plan_manager import STORAGE_MODE_ARENA, STORAGE_MODE_OBJECTS
+        
+        assert self.mock_session_state['plan_manager']._storage_mode == STORAGE_MODE_OBJECTS
+        assert self.mock_session_state['plan_manager']._retention_timeout is None
+        
+        monkeypatch.setenv('TERRAFORM_DASHBOARD_PLAN_STORAGE', 'arena')
+        monkeypatch.setenv('TERRAFORM_DASHBOARD_PLAN_RETENTION_SECONDS', '900')
+        del self.mock_session_state['plan_manager']
+        with patch('streamlit.session_state', self.mock_session_state):
+            plan_manager = self.session_manager.get_plan_manager()
+        
+        assert plan_manager._storage_mode == STORAGE_MODE_ARENA
+        assert plan_manager._retention_timeout == 900.0
 
 
 if __name__ == '__main__':
@@ -0,0 +1,94 @@
+"""
+Unit tests for table styles
+
+Tests risk levels from scores, vectorized CSS of a page, attaching the CSS to
+a Styler and the per-page style cache.
+"""
+
+import pandas as pd
+
+from utils.table_styles import (
+    PageStyleCache, background_css, page_styles, risk_levels_from_scores, style_page
+)
+
+
+def _page():
+    return pd.DataFrame({
+        "resource_name": ["a", "b", "c", "d"],
+        "risk_level": ["High", "Low", None, "Medium"]
+    }, index=[7, 3, 5, 1])
+
+
+class TestRiskLevels:
+    """Test score thresholds"""
+
+    def test_levels_from_scores(self):
+        scores = pd.Series([10, 8, 7.9, 6, 4, 3.9, 0])
+
+        assert risk_levels_from_scores(scores).tolist() == ["Critical", "Critical", "High", "High", "Medium", "Low", "Low"]
+
+
+class TestPageStyles:
+    """Test vectorized page CSS"""
+
+    def test_background_css(self):
+        css = background_css(_page()["risk_level"])
+
+        assert css.tolist() == ["background-color: #fff3e0", "background-color: #e8f5e8", "", "background-color: #fffde7"]
+
+    def test_rows_are_colored_by_column(self):
+        page = _page()
+        styles = page_styles(page, "risk_level")
+
+        assert styles.index.equals(page.index)
+        assert list(styles.columns) == ["resource_name", "risk_level"]
+        assert styles.loc[7].tolist() == ["background-color: #fff3e0"] * 2
+
+    def test_selected_columns_only(self):
+        styles = page_styles(_page(), "risk_level", columns=["risk_level", "missing"])
+
+        assert list(styles.columns) == ["risk_level"]
+
+    def test_styler_matches_row_wise_apply(self):
+        page = _page()
+
+        def row_css(row):
+            return [background_css(pd.Series([row["risk_level"]]))[0]] * len(row)
+
+        expected = page.style.apply(row_css, axis=1)
+        expected._compute()
+        styled = style_page(page, page_styles(page, "risk_level"))
+        styled._compute()
+
+        assert dict(styled.ctx) == dict(expected.ctx)
+
+
+class TestPageStyleCache:
+    """Test the per-page cache"""
+
+    def test_hits_reuse_the_frame(self):
+        cache = PageStyleCache()
+        page = _page()
+        first = cache.get(0, page, lambda rows: page_styles(rows, "risk_level"))
+
+        assert cache.get(0, page.copy(), lambda rows: None) is first
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_other_rows_rebuild(self):
+        cache = PageStyleCache()
+        page = _page()
+        cache.get(0, page, lambda rows: page_styles(rows, "risk_level"))
+        styles = cache.get(0, page.iloc[:2], lambda rows: page_styles(rows, "risk_level"))
+
+        assert len(styles) == 2
+        assert cache.misses == 2
+
+    def test_least_recently_used_pages_are_evicted(self):
+        cache = PageStyleCache(max_pages=2)
+        page = _page()
+        for key in (0, 1, 0, 2):
+            cache.get(key, page, lambda rows: page_styles(rows, "risk_level"))
+
+        assert len(cache) == 2
+        assert cache.get(0, page, lambda rows: None) is not None
+        assert cache.misses == 3
@@ -0,0 +1,94 @@
+"""
+Unit tests for the paginated table view
+
+Tests cached sort permutations, sorting of filtered subsets, page clamping
+and locating the page of a row.
+"""
+
+import pandas as pd
+import pytest
+
+from utils.table_view import SortPermutations, page_count, page_of_row, paginate
+
+
+def _table(rows=10):
+    return pd.DataFrame({
+        "resource_name": [f"r{i}" for i in range(rows)],
+        "risk_level": [["High", "Low", "Medium"][i % 3] for i in range(rows)],
+        "resource_type": [None if i == 4 else f"type_{(rows - i) % 4}" for i in range(rows)]
+    }, index=range(100, 100 + rows))
+
+
+def _names(page):
+    return page.rows["resource_name"].tolist()
+
+
+class TestPagination:
+    """Test page slicing"""
+
+    @pytest.mark.parametrize("rows, size, pages", [(0, 25, 1), (25, 25, 1), (26, 25, 2), (1000, 100, 10)])
+    def test_page_count(self, rows, size, pages):
+        assert page_count(rows, size) == pages
+
+    def test_pages_are_clamped(self):
+        df = _table()
+
+        assert _names(paginate(df, 2, 4)) == ["r4", "r5", "r6", "r7"]
+        last = paginate(df, 9, 4)
+        assert (last.page, last.page_count, last.start, _names(last)) == (3, 3, 8, ["r8", "r9"])
+        assert paginate(df, 0, 4).page == 1
+        assert paginate(df.iloc[:0], 3, 4).rows.empty
+
+
+class TestSorting:
+    """Test sorting with cached permutations"""
+
+    def test_risk_levels_sort_by_severity(self):
+        page = paginate(_table(), 1, 4, "risk_level")
+
+        assert page.rows["risk_level"].tolist() == ["Low", "Low", "Low", "Medium"]
+        assert _names(page) == ["r1", "r4", "r7", "r2"]
+
+    def test_descending_keeps_missing_values_last(self):
+        page = paginate(_table(), 3, 4, "resource_type", ascending=False)
+
+        assert pd.isna(page.rows["resource_type"].iloc[-1])
+
+    def test_subsets_use_the_full_table_permutation(self):
+        df = _table()
+        permutations = SortPermutations(df)
+        subset = df[df["risk_level"] != "Medium"]
+
+        for ascending in (True, False):
+            expected = subset.sort_values("resource_type", ascending=ascending, kind="stable", na_position="last")
+            page = paginate(subset, 1, 10, "resource_type", ascending, permutations)
+            assert _names(page) == expected["resource_name"].tolist()
+
+        assert set(permutations._permutations) == {("resource_type", True), ("resource_type", False)}
+        assert permutations.permutation("resource_type") is permutations.permutation("resource_type")
+
+    def test_unknown_rows_and_columns_fall_back_to_direct_sort(self):
+        df = _table()
+        permutations = SortPermutations(df.iloc[:5])
+        derived = df.assign(instances=range(10, 0, -1))
+
+        assert permutations.order(df.index, "resource_name") is None
+        assert _names(paginate(derived, 1, 3, "instances", True, SortPermutations(df))) == ["r9", "r8", "r7"]
+        assert _names(paginate(df, 1, 3, "resource_name", False, permutations)) == ["r9", "r8", "r7"]
+
+    def test_page_of_row(self):
+        df = _table()
+        permutations = SortPermutations(df)
+
+        assert page_of_row(df, 109, 4) == 3
+        assert page_of_row(df, 101, 4, "risk_level", True, permutations) == 1
+        assert page_of_row(df, 100, 4, "risk_level", True, permutations) == 2
+        assert page_of_row(df, 109, 4, "risk_level", True, permutations) == 3
+        assert page_of_row(df, 999, 4) is None
+
+    def test_covers(self):
+        df = _table()
+        permutations = SortPermutations(df)
+
+        assert permutations.covers(df.copy())
+        assert not permutations.covers(df.iloc[:3])
@@ -275,6 +275,27 @@ class TestTFEClient:
         assert result is None
         assert error is not None  # The error handling will provide appropriate message
     
+    def test_get_plan_json_reserves_a_token_per_request(self):
+        """Test that plan retrieval reserves bucket tokens for both of its requests."""
+        self.client._authenticated = True
+        self.client._session = Mock()
+        self.client.error_handler = Mock()
+        self.client.error_handler.validate_workspace_id.return_value = (True, None)
+        self.client.error_handler.validate_run_id.return_value = (True, None)
+        self.client.error_handler.retry_with_backoff.return_value = (None, "failed")
+        
+        self.client.get_plan_json("ws-ABC123456", "run-XYZ987654321")
+        
+        assert self.client.error_handler.retry_with_backoff.call_args[1]['requests_per_attempt'] == 2
+    
+    def test_uses_supplied_error_handler(self):
+        """Test that a caller-supplied retry scheduler replaces the default one."""
+        handler = Mock()
+        
+        client = TFEClient(self.credential_manager, error_handler=handler)
+        
+        assert client.error_handler is handler
+    
     def test_validate_connection_no_config(self):
         """Test connection validation with no configuration."""
         self.credential_manager.get_config.return_value = None
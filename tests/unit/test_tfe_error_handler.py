@@ -7,12 +7,14 @@ troubleshooting guidance.
 """
 
 import pytest
+import threading
 import time
 from unittest.mock import Mock, patch, MagicMock
 import requests
 from requests.exceptions import ConnectionError, Timeout, SSLError, HTTPError
 
 from utils.tfe_error_handler import TFEErrorHandler, TFEErrorType, TFEErrorContext
+from utils.tfe_rate_limiter import RateLimitRegistry
 
 
 class TestTFEErrorHandler:
@@ -20,7 +22,8 @@ class TestTFEErrorHandler:
     
     def setup_method(self):
         """Set up test fixtures"""
-        self.error_handler = TFEErrorHandler(max_retries=3, base_delay=0.1)
+        self.wait = Mock(return_value=False)
+        self.error_handler = TFEErrorHandler(max_retries=3, base_delay=0.1, wait=self.wait)
     
     def test_error_handler_initialization(self):
         """Test error handler initialization with custom parameters"""
@@ -320,8 +323,7 @@ class TestTFEErrorHandler:
         assert should_retry is True
         assert "Unexpected error occurred" in error_message
     
-    @patch('time.sleep')
-    def test_retry_with_backoff_success_on_retry(self, mock_sleep):
+    def test_retry_with_backoff_success_on_retry(self):
         """Test retry with backoff succeeds on retry"""
         # Mock operation that fails once then succeeds
         call_count = 0
@@ -343,10 +345,9 @@ class TestTFEErrorHandler:
         assert result == "success"
         assert error is None
         assert call_count == 2  # Failed once, succeeded on retry
-        mock_sleep.assert_called_once()  # Should have slept before retry
+        self.wait.assert_called_once()  # Should have slept before retry
     
-    @patch('time.sleep')
-    def test_retry_with_backoff_exhausted_retries(self, mock_sleep):
+    def test_retry_with_backoff_exhausted_retries(self):
         """Test retry with backoff exhausts all retries"""
         # Mock operation that always fails
         def mock_operation():
@@ -364,10 +365,9 @@ class TestTFEErrorHandler:
         assert error is not None
         # The error handler returns formatted error messages, so check for key content
         assert "TFE Server Unreachable" in error or "failed after" in error
-        assert mock_sleep.call_count == 3  # Should have slept before each retry
+        assert self.wait.call_count == 3  # Should have slept before each retry
     
-    @patch('time.sleep')
-    def test_retry_with_backoff_exponential_delay(self, mock_sleep):
+    def test_retry_with_backoff_exponential_delay(self):
         """Test that retry uses exponential backoff delay"""
         # Mock operation that always fails
         def mock_operation():
@@ -382,20 +382,19 @@ class TestTFEErrorHandler:
         self.error_handler.retry_with_backoff(mock_operation, context)
         
         # Verify exponential backoff (with jitter, so check ranges)
-        sleep_calls = mock_sleep.call_args_list
-        assert len(sleep_calls) == 3
+        wait_calls = self.wait.call_args_list
+        assert len(wait_calls) == 3
         
         # First retry: base_delay * 2^0 + jitter = 0.1 + jitter
-        assert 0.1 <= sleep_calls[0][0][0] <= 0.13
+        assert 0.1 <= wait_calls[0][0][0] <= 0.13
         
         # Second retry: base_delay * 2^1 + jitter = 0.2 + jitter
-        assert 0.2 <= sleep_calls[1][0][0] <= 0.26
+        assert 0.2 <= wait_calls[1][0][0] <= 0.26
         
         # Third retry: base_delay * 2^2 + jitter = 0.4 + jitter
-        assert 0.4 <= sleep_calls[2][0][0] <= 0.52
+        assert 0.4 <= wait_calls[2][0][0] <= 0.52
     
-    @patch('time.sleep')
-    def test_retry_with_backoff_no_retry_for_auth_error(self, mock_sleep):
+    def test_retry_with_backoff_no_retry_for_auth_error(self):
         """Test that authentication errors are not retried"""
         def mock_operation():
             raise Exception("Authentication failed")
@@ -412,7 +411,119 @@ class TestTFEErrorHandler:
         
         assert result is None
         assert error == "Auth failed"
-        mock_sleep.assert_not_called()  # Should not sleep/retry for auth errors
+        self.wait.assert_not_called()  # Should not sleep/retry for auth errors
+    
+    def test_retry_with_backoff_honors_retry_after(self):
+        """Test that a server Retry-After header overrides exponential backoff"""
+        RateLimitRegistry.reset()
+        mock_response = Mock()
+        mock_response.status_code = 429
+        mock_response.headers = {'Retry-After': '2'}
+        
+        call_count = 0
+        def mock_operation():
+            nonlocal call_count
+            call_count += 1
+            if call_count == 1:
+                raise HTTPError("Too Many Requests", response=mock_response)
+            return "success"
+        
+        context = TFEErrorContext(
+            error_type=TFEErrorType.UNKNOWN,
+            original_error=None,
+            operation="plan_retrieval",
+            server_url="retry-after.example.com"
+        )
+        
+        result, error = self.error_handler.retry_with_backoff(mock_operation, context)
+        
+        assert result == "success"
+        assert error is None
+        # Server asked for 2 seconds; the shared bucket makes the next attempt wait too
+        waits = [call[0][0] for call in self.wait.call_args_list]
+        assert waits[0] == 2.0
+        assert all(wait <= 2.0 for wait in waits)
+    
+    def test_retry_with_backoff_respects_deadline(self):
+        """Test that retries stop once the operation deadline would be exceeded"""
+        handler = TFEErrorHandler(max_retries=5, base_delay=0.1, operation_deadline=10.0, wait=self.wait)
+        mock_response = Mock()
+        mock_response.status_code = 429
+        mock_response.headers = {'X-RateLimit-Reset': '30'}
+        
+        def mock_operation():
+            raise HTTPError("Too Many Requests", response=mock_response)
+        
+        context = TFEErrorContext(
+            error_type=TFEErrorType.UNKNOWN,
+            original_error=None,
+            operation="plan_retrieval"
+        )
+        
+        result, error = handler.retry_with_backoff(mock_operation, context)
+        
+        assert result is None
+        assert "Operation Timed Out" in error
+        self.wait.assert_not_called()
+    
+    def test_retry_with_backoff_stops_when_wait_is_interrupted(self):
+        """Test that an interrupted wait cancels the remaining retries"""
+        stop = threading.Event()
+        stop.set()
+        handler = TFEErrorHandler(max_retries=3, base_delay=0.1, wait=stop.wait)
+        call_count = 0
+        def mock_operation():
+            nonlocal call_count
+            call_count += 1
+            raise ConnectionError("Network error")
+        
+        context = TFEErrorContext(
+            error_type=TFEErrorType.UNKNOWN,
+            original_error=None,
+            operation="test_operation"
+        )
+        
+        result, error = handler.retry_with_backoff(mock_operation, context)
+        
+        assert result is None
+        assert "cancelled" in error
+        assert call_count == 1
+    
+    def test_retry_with_backoff_reports_retries_to_notify(self):
+        """Test that retry messages go to the supplied notify function"""
+        messages = []
+        handler = TFEErrorHandler(max_retries=2, base_delay=0.1, wait=self.wait, notify=messages.append)
+        
+        def mock_operation():
+            raise ConnectionError("Network error")
+        
+        context = TFEErrorContext(
+            error_type=TFEErrorType.UNKNOWN,
+            original_error=None,
+            operation="test_operation"
+        )
+        
+        handler.retry_with_backoff(mock_operation, context)
+        
+        assert len(messages) == 2
+        assert self.wait.call_count == 2
+    
+    def test_retry_with_backoff_reserves_a_token_per_request(self):
+        """Test that every HTTP request of an attempt draws a bucket token"""
+        RateLimitRegistry.reset()
+        bucket = RateLimitRegistry.get_bucket("tokens.example.com")
+        context = TFEErrorContext(
+            error_type=TFEErrorType.UNKNOWN,
+            original_error=None,
+            operation="plan_retrieval",
+            server_url="tokens.example.com"
+        )
+        
+        with patch.object(bucket, 'reserve', wraps=bucket.reserve) as reserve:
+            self.error_handler.retry_with_backoff(lambda: "ok", context, requests_per_attempt=2)
+        
+        reserve.assert_called_once_with(2)
+        assert bucket._tokens == pytest.approx(bucket.capacity - 2, abs=0.5)
     
     @patch('streamlit.error')
     @patch('streamlit.expander')
@@ -0,0 +1,100 @@
+"""
+Unit tests for the TFE rate limiter
+
+Tests the shared per-server token bucket, Retry-After and TFE rate-limit
+header parsing, and the per-operation retry budget.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from utils.tfe_rate_limiter import (
+    TokenBucket,
+    RateLimitRegistry,
+    RetryBudget,
+    parse_retry_delay,
+)
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket"""
+    
+    def test_reserve_within_capacity_does_not_wait(self):
+        """Test that requests within the burst capacity are not delayed"""
+        bucket = TokenBucket(rate=10.0, capacity=5)
+        
+        waits = [bucket.reserve() for _ in range(5)]
+        
+        assert waits == [0.0] * 5
+    
+    def test_reserve_beyond_capacity_waits(self):
+        """Test that requests beyond the burst capacity are spaced by the rate"""
+        bucket = TokenBucket(rate=10.0, capacity=2)
+        bucket.reserve()
+        bucket.reserve()
+        
+        wait = bucket.reserve()
+        
+        assert wait == pytest.approx(0.1, abs=0.02)
+    
+    def test_penalize_blocks_all_callers(self):
+        """Test that a server cool-down applies to every reservation"""
+        bucket = TokenBucket(rate=10.0, capacity=10)
+        bucket.penalize(5.0)
+        
+        assert bucket.reserve() == pytest.approx(5.0, abs=0.1)
+        assert bucket.reserve() == pytest.approx(5.0, abs=0.2)
+
+
+class TestRateLimitRegistry:
+    """Test cases for RateLimitRegistry"""
+    
+    def setup_method(self):
+        """Reset shared buckets"""
+        RateLimitRegistry.reset()
+    
+    def test_bucket_shared_per_server(self):
+        """Test that URL variants of the same server share one bucket"""
+        bucket1 = RateLimitRegistry.get_bucket("app.terraform.io")
+        bucket2 = RateLimitRegistry.get_bucket("https://APP.terraform.io/")
+        bucket3 = RateLimitRegistry.get_bucket("tfe.example.com")
+        
+        assert bucket1 is bucket2
+        assert bucket1 is not bucket3
+
+
+class TestParseRetryDelay:
+    """Test cases for parse_retry_delay"""
+    
+    def test_retry_after_seconds(self):
+        assert parse_retry_delay({'Retry-After': '3'}) == 3.0
+    
+    def test_retry_after_http_date(self):
+        with patch('utils.tfe_rate_limiter.time.time', return_value=1445412470.0):
+            delay = parse_retry_delay({'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'})
+        
+        assert delay == pytest.approx(10.0)
+    
+    def test_tfe_rate_limit_reset(self):
+        assert parse_retry_delay({'X-RateLimit-Reset': '0.25'}) == 0.25
+    
+    def test_retry_after_takes_precedence(self):
+        assert parse_retry_delay({'Retry-After': '1', 'X-RateLimit-Reset': '5'}) == 1.0
+    
+    def test_no_hint(self):
+        assert parse_retry_delay({}) is None
+        assert parse_retry_delay(None) is None
+        assert parse_retry_delay({'Retry-After': 'soon'}) is None
+
+
+class TestRetryBudget:
+    """Test cases for RetryBudget"""
+    
+    def test_budget_tracks_waits(self):
+        budget = RetryBudget(deadline=10.0)
+        
+        assert budget.can_wait(9.0)
+        budget.record_wait(9.0)
+        
+        assert not budget.can_wait(2.0)
+        assert budget.remaining() <= 1.0
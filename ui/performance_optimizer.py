@@ -14,6 +14,8 @@ from functools import lru_cache
 import time
 from contextlib import contextmanager
 
+from parsers.address_parser import resource_name_from_address
+
 
 class PerformanceOptimizer:
     """Handles performance optimizations for large dataset processing"""
@@ -144,7 +146,7 @@ class PerformanceOptimizer:
             rows.append({
                 'resource_address': change['address'],
                 'resource_type': change['type'],
-                'resource_name': change['name'] or change['address'].split('.')[-1],
+                'resource_name': change['name'] or resource_name_from_address(change['address']),
                 'action': change['action'],
                 'actions_list': ', '.join(change['actions']),
                 'provider': change.get('provider', 'unknown'),
@@ -347,16 +349,24 @@ class PerformanceOptimizer:
             yield
         finally:
             end_time = time.time()
-            duration = end_time - start_time
-            
-            # Store performance metrics in session state for debugging
-            if 'performance_metrics' not in st.session_state:
-                st.session_state.performance_metrics = {}
-            
-            st.session_state.performance_metrics[operation_name] = {
-                'duration': round(duration, 3),
-                'timestamp': time.time()
-            }
+            self.record_metric(operation_name, end_time - start_time)
+    
+    def record_metric(self, operation_name: str, duration: float) -> None:
+        """
+        Record the duration of an operation (metrics sink for the analysis engine)
+        
+        Args:
+            operation_name: Name of the operation
+            duration: Duration in seconds
+        """
+        # Store performance metrics in session state for debugging
+        if 'performance_metrics' not in st.session_state:
+            st.session_state.performance_metrics = {}
+        
+        st.session_state.performance_metrics[operation_name] = {
+            'duration': round(duration, 3),
+            'timestamp': time.time()
+        }
     
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Get performance metrics for debugging"""
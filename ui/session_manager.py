@@ -11,6 +11,16 @@ import streamlit as st
 import atexit
 
 
+def _create_plan_manager():
+    """Create a session's plan manager with the configured storage mode and retention timeout."""
+    from config.provider_settings import get_environment_settings
+    from utils.secure_plan_manager import SecurePlanManager
+
+    settings = get_environment_settings()
+    return SecurePlanManager(retention_timeout=settings['plan_retention_seconds'],
+                             storage_mode=settings['plan_storage_mode'])
+
+
 class SessionStateManager:
     """Manages session state for the dashboard application"""
     
@@ -105,8 +115,7 @@ class SessionStateManager:
         
         # Plan manager for secure plan data handling
         if not hasattr(st.session_state, 'plan_manager'):
-            from utils.secure_plan_manager import SecurePlanManager
-            st.session_state.plan_manager = SecurePlanManager()
+            st.session_state.plan_manager = _create_plan_manager()
     
     def get_filter_state(self) -> Dict[str, Any]:
         """
@@ -851,6 +860,5 @@ class SessionStateManager:
             SecurePlanManager instance
         """
         if not hasattr(st.session_state, 'plan_manager'):
-            from utils.secure_plan_manager import SecurePlanManager
-            st.session_state.plan_manager = SecurePlanManager()
+            st.session_state.plan_manager = _create_plan_manager()
         return st.session_state.plan_manager
\ No newline at end of file
@@ -0,0 +1,283 @@
+"""
+Analysis Engine
+
+Headless entry point for Terraform plan analysis. Wraps the plan parser,
+provider detection, risk assessment and security analysis behind a single
+call without importing Streamlit or any UI module, so the same pipeline runs
+in the dashboard, CI jobs, batch workers and benchmarks.
+
+Progress and timing information is reported through optional sinks:
+
+- ``progress(stage, index, total)`` is called when each stage starts;
+- ``metrics.record_metric(operation, duration)`` receives stage durations.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, Union
+
+
+PlanSource = Union[Dict[str, Any], str, bytes]
+ProgressSink = Callable[[str, int, int], None]
+
+# Stages reported to the progress sink, in order
+STAGE_PARSE = 'parse'
+STAGE_EXTRACT = 'extract'
+STAGE_RISK = 'risk'
+STAGE_SECURITY = 'security'
+
+
+class MetricsSink(Protocol):
+    """Receiver for per-stage timings"""
+
+    def record_metric(self, operation_name: str, duration: float) -> None:
+        """Record the duration (seconds) of one operation."""
+
+
+class TimingMetrics:
+    """Metrics sink collecting stage durations in a dictionary"""
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+
+    def record_metric(self, operation_name: str, duration: float) -> None:
+        """Record the duration (seconds) of one operation."""
+        self.durations[operation_name] = duration
+
+
+@dataclass
+class AnalysisResult:
+    """Result of analyzing one plan"""
+    plan_data: Dict[str, Any]
+    parser: Any
+    summary: Dict[str, int]
+    resource_changes: List[Dict[str, Any]]
+    resource_types: Dict[str, int]
+    debug_info: Dict[str, Any]
+    risk_result: Dict[str, Any]
+    enhanced: bool
+    security: Optional[Dict[str, Any]] = None
+    risk_error: Optional[Exception] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def providers(self) -> Dict[str, int]:
+        """Resource counts per detected provider."""
+        return dict(self.parser.detected_providers)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Build a JSON-serializable view of the result (without the plan itself).
+
+        Returns:
+            Dictionary with summary, providers, risk and security results
+        """
+        return {
+            'terraform_version': self.plan_data.get('terraform_version', 'Unknown'),
+            'summary': self.summary,
+            'resource_types': self.resource_types,
+            'providers': self.providers,
+            'risk': self.risk_result,
+            'enhanced_risk': self.enhanced,
+            'security': self.security,
+            'timings': {name: round(duration, 4) for name, duration in self.timings.items()}
+        }
+
+
+def load_plan(source: PlanSource) -> Dict[str, Any]:
+    """
+    Load plan JSON from a dictionary, file path, JSON text or bytes.
+
+    Args:
+        source: Parsed plan, path to a plan file, or raw JSON
+
+    Returns:
+        Parsed plan dictionary
+
+    Raises:
+        ValueError: If the source is not a JSON object
+    """
+    if isinstance(source, dict):
+        return source
+
+    if isinstance(source, bytes):
+        plan_data = json.loads(source)
+    elif isinstance(source, str) and source.lstrip().startswith('{'):
+        plan_data = json.loads(source)
+    else:
+        with open(source, 'rb') as plan_file:
+            plan_data = json.load(plan_file)
+
+    if not isinstance(plan_data, dict):
+        raise ValueError("Plan JSON must be an object")
+    return plan_data
+
+
+def plan_structure_issues(plan_data: Dict[str, Any]) -> List[str]:
+    """
+    Check the structure of a Terraform plan.
+
+    Args:
+        plan_data: Parsed plan data
+
+    Returns:
+        List of validation issues found (empty for a well-formed plan)
+    """
+    issues = []
+
+    # Check for required fields
+    if 'terraform_version' not in plan_data:
+        issues.append("Missing 'terraform_version' field")
+
+    if 'resource_changes' not in plan_data:
+        issues.append("Missing 'resource_changes' array - this is required for analysis")
+    elif not isinstance(plan_data['resource_changes'], list):
+        issues.append("'resource_changes' should be an array")
+    elif len(plan_data['resource_changes']) == 0:
+        issues.append("No resource changes found - plan may be up-to-date")
+
+    # Check resource changes structure
+    if 'resource_changes' in plan_data and isinstance(plan_data['resource_changes'], list):
+        for i, change in enumerate(plan_data['resource_changes'][:5]):  # Check first 5
+            if not isinstance(change, dict):
+                issues.append(f"Resource change {i} is not a valid object")
+                continue
+
+            if 'change' not in change:
+                issues.append(f"Resource change {i} missing 'change' field")
+            elif 'actions' not in change.get('change', {}):
+                issues.append(f"Resource change {i} missing 'actions' field")
+
+    # Check for common format issues
+    if 'format_version' not in plan_data:
+        issues.append("Missing 'format_version' - may indicate old Terraform version")
+
+    return issues
+
+
+def has_minimal_plan_structure(plan_data: Dict[str, Any]) -> bool:
+    """
+    Check if a plan has the minimal structure required for analysis.
+
+    Args:
+        plan_data: Parsed plan data
+
+    Returns:
+        True if the plan can be analyzed despite structure issues
+    """
+    return (
+        isinstance(plan_data, dict) and
+        'resource_changes' in plan_data and
+        isinstance(plan_data['resource_changes'], list)
+    )
+
+
+@contextmanager
+def _stage(name: str, timings: Dict[str, float], metrics: Optional[MetricsSink]) -> Iterator[None]:
+    """Time a stage and forward the duration to the metrics sink."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        timings[name] = duration
+        if metrics is not None:
+            metrics.record_metric(name, duration)
+
+
+def analyze_plan(source: PlanSource,
+                 enhanced: bool = True,
+                 include_security: bool = True,
+                 progress: Optional[ProgressSink] = None,
+                 metrics: Optional[MetricsSink] = None,
+                 parser_factory: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                 risk_assessor: Optional[Any] = None,
+                 content_hashes: Optional[Dict[str, str]] = None) -> AnalysisResult:
+    """
+    Analyze a Terraform plan without any UI dependencies.
+
+    Args:
+        source: Parsed plan, path to a plan file, or raw JSON
+        enhanced: Use the multi-cloud risk assessment (falls back to the basic
+            assessment if it fails; the error is kept in ``risk_error``)
+        include_security: Run security and compliance analysis
+        progress: Optional callable receiving (stage, index, total)
+        metrics: Optional sink receiving stage durations
+        parser_factory: Optional parser class/factory (defaults to PlanParser)
+        risk_assessor: Optional pre-built EnhancedRiskAssessment (or an object with its
+            assess_plan_risk signature)
+        content_hashes: Optional structural hashes of the resources by address
+            (PlanIndex.root_hashes()) so the assessor's cache can be used
+
+    Returns:
+        AnalysisResult for the plan
+    """
+    stages = [STAGE_PARSE, STAGE_EXTRACT, STAGE_RISK]
+    if include_security:
+        stages.append(STAGE_SECURITY)
+    timings: Dict[str, float] = {}
+
+    def start(stage: str) -> None:
+        if progress is not None:
+            progress(stage, stages.index(stage), len(stages))
+
+    start(STAGE_PARSE)
+    with _stage('plan_parser_init', timings, metrics):
+        plan_data = load_plan(source)
+        if parser_factory is None:
+            from parsers.plan_parser import PlanParser
+            parser_factory = PlanParser
+        parser = parser_factory(plan_data)
+
+    start(STAGE_EXTRACT)
+    with _stage('data_extraction', timings, metrics):
+        summary = parser.get_summary()
+        resource_changes = parser.get_resource_changes()
+        resource_types = parser.get_resource_types()
+        debug_info = parser.get_debug_info()
+        # count/for_each fan-outs are scored once per group of identical-shape instances
+        get_instance_groups = getattr(parser, 'get_instance_groups', None)
+        instance_groups = get_instance_groups() if callable(get_instance_groups) else None
+
+    start(STAGE_RISK)
+    risk_error = None
+    used_enhanced = False
+    with _stage('risk_assessment', timings, metrics):
+        risk_result = None
+        if enhanced:
+            try:
+                if risk_assessor is None:
+                    from utils.enhanced_risk_assessment import EnhancedRiskAssessment
+                    risk_assessor = EnhancedRiskAssessment()
+                risk_result = risk_assessor.assess_plan_risk(
+                    resource_changes, plan_data, instance_groups=instance_groups, content_hashes=content_hashes
+                )
+                used_enhanced = True
+            except Exception as e:
+                risk_error = e
+        if risk_result is None:
+            from utils.risk_assessment import RiskAssessment
+            risk_result = RiskAssessment().assess_plan_risk(resource_changes)
+
+    security = None
+    if include_security:
+        start(STAGE_SECURITY)
+        with _stage('security_analysis', timings, metrics):
+            from utils.security_analyzer import SecurityAnalyzer
+            security = SecurityAnalyzer().get_security_dashboard_data(resource_changes)
+
+    return AnalysisResult(
+        plan_data=plan_data,
+        parser=parser,
+        summary=summary,
+        resource_changes=resource_changes,
+        resource_types=resource_types,
+        debug_info=debug_info,
+        risk_result=risk_result,
+        enhanced=used_enhanced,
+        security=security,
+        risk_error=risk_error,
+        timings=timings
+    )
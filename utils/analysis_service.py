@@ -0,0 +1,400 @@
+"""
+Analysis Service
+
+Lightweight HTTP service in front of the headless analysis engine, so other
+internal tools can POST a plan and get back the same risk and security JSON
+the dashboard computes. Built on the standard library only.
+
+- Plans are analyzed on a process pool (or a single thread when no worker
+  processes are configured).
+- Admission is bounded: once ``max_workers + queue_size`` requests are in
+  flight, further requests are rejected with 503 instead of queueing without
+  limit.
+- Each request waits at most ``request_timeout`` seconds (504 afterwards).
+- Latency and throughput are recorded per endpoint and served at /metrics.
+
+Endpoints:
+    POST /analyze   plan JSON body; query flags enhanced, security, assessments
+    GET  /health    liveness and queue occupancy
+    GET  /metrics   per-endpoint request counts, latency percentiles, throughput
+"""
+
+import json
+import multiprocessing
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+DEFAULT_QUEUE_SIZE = 16
+DEFAULT_REQUEST_TIMEOUT = 60.0
+DEFAULT_MAX_BODY_BYTES = 50 * 1024 * 1024
+# Latency samples kept per endpoint for percentiles
+LATENCY_WINDOW = 1024
+# Metrics key shared by all unknown paths, so arbitrary URLs cannot grow the metrics
+OTHER_ENDPOINT = 'other'
+_JSON_OBJECT_START = re.compile(rb'\s*\{')
+
+
+class ServiceBusyError(Exception):
+    """Raised when the request queue is full"""
+
+
+class InvalidPlanError(ValueError):
+    """Raised when a posted plan is not a JSON object"""
+
+
+def analyze_request(plan_json: bytes, enhanced: bool = True, include_security: bool = True,
+                    include_assessments: bool = False) -> Dict[str, Any]:
+    """
+    Analyze one posted plan (runs in a worker process).
+
+    Args:
+        plan_json: Raw plan JSON body
+        enhanced: Use the multi-cloud risk assessment
+        include_security: Run security and compliance analysis
+        include_assessments: Keep per-resource risk assessments in the result
+
+    Returns:
+        JSON-serializable analysis result (see AnalysisResult.to_dict())
+
+    Raises:
+        InvalidPlanError: If the body is not a JSON object
+    """
+    from utils.analysis_engine import analyze_plan, load_plan
+
+    # The body is only parsed here, in the worker, not in the request thread
+    try:
+        plan_data = load_plan(plan_json)
+    except ValueError as e:
+        raise InvalidPlanError(f"Invalid JSON: {e}") from None
+
+    result = analyze_plan(plan_data, enhanced=enhanced, include_security=include_security).to_dict()
+    if not include_assessments:
+        result['risk'].pop('detailed_assessments', None)
+    return result
+
+
+class EndpointMetrics:
+    """Request counters and a window of latencies for one endpoint"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.count = 0
+        self.errors = 0
+        self.status_counts: Dict[int, int] = {}
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+    def record(self, status: int, duration: float) -> None:
+        """Record one finished request."""
+        self.count += 1
+        if status >= 400:
+            self.errors += 1
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        self.latencies.append(duration)
+
+    def snapshot(self, elapsed: float) -> Dict[str, Any]:
+        """
+        Summarize the endpoint.
+
+        Args:
+            elapsed: Seconds since the service started
+
+        Returns:
+            Counts, throughput and latency percentiles in milliseconds
+        """
+        latencies = sorted(self.latencies)
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            index = min(len(latencies) - 1, int(round(fraction * (len(latencies) - 1))))
+            return round(latencies[index] * 1000, 2)
+
+        return {
+            'requests': self.count,
+            'errors': self.errors,
+            'status_counts': {str(status): count for status, count in sorted(self.status_counts.items())},
+            'throughput_rps': round(self.count / elapsed, 3) if elapsed > 0 else 0.0,
+            'latency_ms': {
+                'mean': round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+                'p50': percentile(0.5),
+                'p95': percentile(0.95),
+                'p99': percentile(0.99),
+                'max': round(latencies[-1] * 1000, 2) if latencies else 0.0
+            }
+        }
+
+
+class ServiceMetrics:
+    """Thread-safe per-endpoint metrics"""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._started = clock()
+        self._endpoints: Dict[str, EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, status: int, duration: float) -> None:
+        """
+        Record one finished request.
+
+        Args:
+            endpoint: Request path (OTHER_ENDPOINT for unknown paths)
+            status: HTTP status code returned
+            duration: Seconds spent handling the request
+        """
+        with self._lock:
+            metrics = self._endpoints.get(endpoint)
+            if metrics is None:
+                metrics = self._endpoints[endpoint] = EndpointMetrics()
+            metrics.record(status, duration)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Metrics of every endpoint seen so far."""
+        with self._lock:
+            elapsed = self._clock() - self._started
+            return {
+                'uptime_seconds': round(elapsed, 1),
+                'endpoints': {name: metrics.snapshot(elapsed) for name, metrics in sorted(self._endpoints.items())}
+            }
+
+
+class AnalysisService:
+    """
+    Bounded job queue in front of an analysis executor.
+
+    Args and results stay small: the plan body goes to the worker as bytes
+    and the worker returns the JSON-ready result dictionary.
+    """
+
+    def __init__(self, max_workers: int = 2, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+                 executor: Optional[Executor] = None):
+        """
+        Initialize the service backend.
+
+        Args:
+            max_workers: Worker processes (0 analyzes on one background thread)
+            queue_size: Requests allowed to wait beyond the busy workers
+            request_timeout: Seconds a request may wait for its result
+            executor: Optional pre-built executor (used instead of a pool)
+        """
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.request_timeout = request_timeout
+        self.capacity = max(1, max_workers) + queue_size
+        self.metrics = ServiceMetrics()
+
+        if executor is None:
+            if max_workers > 0:
+                executor = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            else:
+                executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='analysis')
+        self._executor = executor
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        """Requests currently running or queued."""
+        with self._lock:
+            return self._in_flight
+
+    def submit(self, plan_json: bytes, **options: bool) -> Future:
+        """
+        Queue a plan for analysis.
+
+        Args:
+            plan_json: Raw plan JSON body
+            **options: Flags passed to analyze_request()
+
+        Returns:
+            Future resolving to the analysis result
+
+        Raises:
+            ServiceBusyError: If the queue is full
+        """
+        if not self._slots.acquire(blocking=False):
+            raise ServiceBusyError("Analysis queue is full")
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(analyze_request, plan_json, **options)
+        except Exception:
+            self._release()
+            raise
+        # The slot is held until the work really finishes, even if the
+        # caller gave up waiting, so the queue bound stays honest
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def analyze(self, plan_json: bytes, **options: bool) -> Dict[str, Any]:
+        """
+        Analyze a plan and wait for the result.
+
+        Args:
+            plan_json: Raw plan JSON body
+            **options: Flags passed to analyze_request()
+
+        Returns:
+            Analysis result dictionary
+
+        Raises:
+            ServiceBusyError: If the queue is full
+            TimeoutError: If the result is not ready within request_timeout
+        """
+        future = self.submit(plan_json, **options)
+        try:
+            return future.result(timeout=self.request_timeout)
+        except FutureTimeoutError:
+            # Drop the job if it has not started yet
+            future.cancel()
+            raise TimeoutError(f"Analysis did not finish within {self.request_timeout:g} seconds")
+
+    def health(self) -> Dict[str, Any]:
+        """Liveness and queue occupancy."""
+        return {
+            'status': 'ok',
+            'workers': self.max_workers,
+            'in_flight': self.in_flight,
+            'capacity': self.capacity
+        }
+
+    def shutdown(self) -> None:
+        """Stop the executor."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self) -> None:
+        """Free one queue slot."""
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+
+def _flag(query: Dict[str, list], name: str, default: bool) -> bool:
+    """Read a boolean query parameter (1/true/yes or 0/false/no)."""
+    values = query.get(name)
+    if not values:
+        return default
+    return values[-1].lower() in ('1', 'true', 'yes', 'on')
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler routing requests to the AnalysisService"""
+
+    server: 'AnalysisHTTPServer'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        path = urlparse(self.path).path
+        if path == '/health':
+            self._timed(path, lambda: (200, self.server.service.health()))
+        elif path == '/metrics':
+            self._timed(path, lambda: (200, self.server.service.metrics.snapshot()))
+        else:
+            self._timed(OTHER_ENDPOINT, lambda: (404, {'error': f"Unknown endpoint: {path}"}))
+
+    def do_POST(self) -> None:
+        parsed = urlparse(self.path)
+        if parsed.path != '/analyze':
+            self._timed(OTHER_ENDPOINT, lambda: (404, {'error': f"Unknown endpoint: {parsed.path}"}))
+            return
+        self._timed(parsed.path, lambda: self._analyze(parse_qs(parsed.query)))
+
+    def _analyze(self, query: Dict[str, list]) -> Tuple[int, Dict[str, Any]]:
+        """Read the plan body and run the analysis."""
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            return 411, {'error': "Content-Length header is required"}
+        if length < 0:
+            return 400, {'error': "Content-Length must not be negative"}
+        if length > self.server.max_body_bytes:
+            return 413, {'error': f"Plan exceeds {self.server.max_body_bytes} bytes"}
+
+        body = self.rfile.read(length)
+        # Cheap shape check; the worker parses the body
+        if _JSON_OBJECT_START.match(body) is None:
+            return 400, {'error': "Plan JSON must be an object"}
+
+        service = self.server.service
+        try:
+            result = service.analyze(
+                body,
+                enhanced=_flag(query, 'enhanced', True),
+                include_security=_flag(query, 'security', True),
+                include_assessments=_flag(query, 'assessments', False)
+            )
+        except InvalidPlanError as e:
+            return 400, {'error': str(e)}
+        except ServiceBusyError as e:
+            return 503, {'error': str(e)}
+        except TimeoutError as e:
+            return 504, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f"Analysis failed: {e}"}
+        return 200, result
+
+    def _timed(self, endpoint: str, handler) -> None:
+        """Run a route handler, send its JSON response and record metrics."""
+        start = time.perf_counter()
+        status, payload = handler()
+        body = json.dumps(payload, default=str).encode('utf-8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if status == 503:
+            self.send_header('Retry-After', '1')
+        self.end_headers()
+        self.wfile.write(body)
+
+        self.server.service.metrics.record(endpoint, status, time.perf_counter() - start)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep request logging off stderr unless the server asks for it."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class AnalysisHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server bound to one AnalysisService"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: AnalysisService,
+                 max_body_bytes: int = DEFAULT_MAX_BODY_BYTES, verbose: bool = False):
+        """
+        Initialize the server.
+
+        Args:
+            address: (host, port) to bind; port 0 picks a free port
+            service: Backend running the analyses
+            max_body_bytes: Largest accepted plan body
+            verbose: Log every request to stderr
+        """
+        super().__init__(address, AnalysisRequestHandler)
+        self.service = service
+        self.max_body_bytes = max_body_bytes
+        self.verbose = verbose
+
+    @property
+    def url(self) -> str:
+        """Base URL the server is listening on."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.service.shutdown()
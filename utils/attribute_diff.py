@@ -0,0 +1,364 @@
+"""
+Attribute Diff
+
+Attribute-path-level diffs of update and replace actions.
+
+``change.before`` and ``change.after`` are hashed bottom-up into hash trees
+(see utils.structural_hash); the diff then walks both trees together and
+skips every subtree whose digest is equal with a single comparison, so the
+cost is proportional to the size of the resource plus the size of what
+changed, never to pairwise deep comparisons of large nested values.
+
+Terraform's ``after_unknown``, ``before_sensitive``/``after_sensitive`` and
+``replace_paths`` markers are applied to the result: values only known after
+apply are reported as such, sensitive values are masked and attributes that
+force a replacement are flagged.
+
+Diffs are computed lazily, on first request for a resource, and cached in
+an AttributeDiffCache owned by the caller (the dashboard keeps one per
+session), so cached plan data never outlives its session.
+Long strings (policies, user_data) are compared by digest and shortened
+for display.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from utils.structural_hash import HashNode, hash_tree
+
+
+# Kinds of attribute change
+CHANGE_ADDED = 'added'
+CHANGE_REMOVED = 'removed'
+CHANGE_MODIFIED = 'modified'
+CHANGE_UNKNOWN = 'unknown'
+
+SENSITIVE_VALUE = '(sensitive value)'
+UNKNOWN_VALUE = '(known after apply)'
+
+DEFAULT_DIFF_CACHE_ENTRIES = 2000
+
+# Display limits for diff rows
+DEFAULT_MAX_VALUE_CHARS = 120
+DEFAULT_MAX_DIFF_ROWS = 200
+
+AttributePath = Tuple[Any, ...]
+
+
+class AttributeChange(NamedTuple):
+    """Change of one attribute path between before and after"""
+    path: AttributePath
+    kind: str
+    before: Any = None
+    after: Any = None
+    forces_replacement: bool = False
+
+    @property
+    def path_str(self) -> str:
+        """Path in Terraform notation, e.g. ``ingress[0].cidr_blocks``."""
+        return format_path(self.path)
+
+    def describe(self) -> str:
+        """Short human-readable description, e.g. ``tags.env modified``."""
+        label = {CHANGE_UNKNOWN: 'known after apply'}.get(self.kind, self.kind)
+        description = f"{self.path_str or '(resource)'} {label}"
+        if self.forces_replacement:
+            description += " (forces replacement)"
+        return description
+
+
+def format_path(path: Iterable[Any]) -> str:
+    """
+    Render an attribute path in Terraform notation.
+
+    Args:
+        path: Sequence of map keys and list indices
+
+    Returns:
+        Path string such as ``tags["kubernetes.io/role"]`` or ``rule[0].name``
+    """
+    parts = []
+    for step in path:
+        if isinstance(step, int):
+            parts.append(f"[{step}]")
+        elif isinstance(step, str) and step.replace('_', '').replace('-', '').isalnum():
+            parts.append(f".{step}" if parts else step)
+        else:
+            parts.append(f'["{step}"]')
+    return ''.join(parts)
+
+
+def diff_values(before: Any, after: Any) -> List[AttributeChange]:
+    """
+    Diff two JSON values by attribute path.
+
+    Args:
+        before: Previous value
+        after: New value
+
+    Returns:
+        Attribute changes, in path order of the walk
+    """
+    changes: List[AttributeChange] = []
+    _diff_nodes(hash_tree(before), hash_tree(after), (), changes)
+    return changes
+
+
+def _diff_nodes(before: HashNode, after: HashNode, path: AttributePath, changes: List[AttributeChange]) -> None:
+    """Append the changes between two hash trees, pruning equal subtrees."""
+    if before.token == after.token:
+        return
+
+    if isinstance(before.children, dict) and isinstance(after.children, dict):
+        for key, before_child in before.children.items():
+            after_child = after.children.get(key)
+            if after_child is None:
+                changes.append(AttributeChange(path + (key,), CHANGE_REMOVED, before=before_child.value))
+            else:
+                _diff_nodes(before_child, after_child, path + (key,), changes)
+        for key, after_child in after.children.items():
+            if key not in before.children:
+                changes.append(AttributeChange(path + (key,), CHANGE_ADDED, after=after_child.value))
+        return
+
+    if isinstance(before.children, list) and isinstance(after.children, list):
+        common = min(len(before.children), len(after.children))
+        for index in range(common):
+            _diff_nodes(before.children[index], after.children[index], path + (index,), changes)
+        for index in range(common, len(before.children)):
+            changes.append(AttributeChange(path + (index,), CHANGE_REMOVED, before=before.children[index].value))
+        for index in range(common, len(after.children)):
+            changes.append(AttributeChange(path + (index,), CHANGE_ADDED, after=after.children[index].value))
+        return
+
+    # Null means "not set" in plan JSON
+    if before.value is None:
+        changes.append(AttributeChange(path, CHANGE_ADDED, after=after.value))
+    elif after.value is None:
+        changes.append(AttributeChange(path, CHANGE_REMOVED, before=before.value))
+    else:
+        changes.append(AttributeChange(path, CHANGE_MODIFIED, before=before.value, after=after.value))
+
+
+def _marked_paths(markers: Any, path: AttributePath = ()) -> Set[AttributePath]:
+    """Paths set to ``true`` in an after_unknown/sensitive marker structure."""
+    if markers is True:
+        return {path}
+    marked: Set[AttributePath] = set()
+    if isinstance(markers, dict):
+        for key, value in markers.items():
+            marked |= _marked_paths(value, path + (key,))
+    elif isinstance(markers, list):
+        for index, value in enumerate(markers):
+            marked |= _marked_paths(value, path + (index,))
+    return marked
+
+
+def _has_marked_prefix(path: AttributePath, marked: Set[AttributePath]) -> bool:
+    """Whether the path or any of its ancestors is marked."""
+    return any(path[:length] in marked for length in range(len(path) + 1))
+
+
+def _contains_marked(path: AttributePath, marked: Set[AttributePath]) -> bool:
+    """Whether the path, an ancestor or a descendant of it is marked."""
+    if _has_marked_prefix(path, marked):
+        return True
+    return any(len(mark) > len(path) and mark[:len(path)] == path for mark in marked)
+
+
+def _value_at(value: Any, path: AttributePath) -> Any:
+    """Value at an attribute path, or None if the path does not exist."""
+    for step in path:
+        if isinstance(value, dict):
+            value = value.get(step)
+        elif isinstance(value, list) and isinstance(step, int) and 0 <= step < len(value):
+            value = value[step]
+        else:
+            return None
+    return value
+
+
+def is_diffable(change: Dict[str, Any]) -> bool:
+    """
+    Whether a resource change is an update or a replacement.
+
+    Args:
+        change: Entry of the plan's resource_changes
+
+    Returns:
+        True if attribute diffs apply to the change
+    """
+    actions = (change.get('change') or {}).get('actions', [])
+    return 'update' in actions or ('create' in actions and 'delete' in actions)
+
+
+def diff_resource_change(change: Dict[str, Any]) -> List[AttributeChange]:
+    """
+    Diff an update or replace action by attribute path.
+
+    Args:
+        change: Entry of the plan's resource_changes
+
+    Returns:
+        Attribute changes (empty for creates, deletes and no-ops)
+    """
+    if not is_diffable(change):
+        return []
+
+    change_data = change.get('change') or {}
+    before = change_data.get('before')
+    after = change_data.get('after')
+    changes = diff_values(before, after)
+
+    unknown = _marked_paths(change_data.get('after_unknown'))
+    if unknown:
+        # Unknown values are absent (or null) in ``after``; report them as
+        # known after apply instead of removed
+        changes = [item for item in changes if not _has_marked_prefix(item.path, unknown)]
+        for path in sorted(unknown, key=format_path):
+            changes.append(AttributeChange(path, CHANGE_UNKNOWN, before=_value_at(before, path), after=UNKNOWN_VALUE))
+
+    sensitive = _marked_paths(change_data.get('before_sensitive')) | _marked_paths(change_data.get('after_sensitive'))
+    replace_paths = {tuple(path) for path in change_data.get('replace_paths') or [] if isinstance(path, list)}
+
+    if sensitive or replace_paths:
+        changes = [_apply_markers(item, sensitive, replace_paths) for item in changes]
+    return changes
+
+
+def _apply_markers(item: AttributeChange, sensitive: Set[AttributePath],
+                   replace_paths: Set[AttributePath]) -> AttributeChange:
+    """Mask sensitive values and flag replacement-forcing attributes."""
+    if sensitive and _contains_marked(item.path, sensitive):
+        item = item._replace(
+            before=SENSITIVE_VALUE if item.before is not None else None,
+            after=item.after if item.kind == CHANGE_UNKNOWN or item.after is None else SENSITIVE_VALUE
+        )
+    if replace_paths and _contains_marked(item.path, replace_paths):
+        item = item._replace(forces_replacement=True)
+    return item
+
+
+def format_value(value: Any, max_chars: int = DEFAULT_MAX_VALUE_CHARS) -> str:
+    """
+    Render an attribute value for display, shortening long values.
+
+    Shortened values end with their length and a short digest, so two long
+    values that differ only past the cut can still be told apart.
+
+    Args:
+        value: Attribute value
+        max_chars: Maximum number of characters shown
+
+    Returns:
+        Display string ('' for null)
+    """
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        text = value
+    else:
+        text = json.dumps(value, sort_keys=True, default=str)
+    text = text.replace('\n', '\\n')
+
+    if len(text) <= max_chars:
+        return text
+    digest = hashlib.blake2b(text.encode('utf-8'), digest_size=4).hexdigest()
+    return f"{text[:max_chars]}… ({len(text):,} chars, #{digest})"
+
+
+def diff_rows(changes: List[AttributeChange], max_rows: int = DEFAULT_MAX_DIFF_ROWS,
+              max_chars: int = DEFAULT_MAX_VALUE_CHARS) -> Tuple[List[Dict[str, str]], int]:
+    """
+    Convert attribute changes into display rows.
+
+    Args:
+        changes: Attribute changes of one resource
+        max_rows: Maximum number of rows returned
+        max_chars: Maximum characters per value
+
+    Returns:
+        Tuple of (rows with Attribute/Change/Before/After, number of omitted changes)
+    """
+    rows = []
+    for item in changes[:max_rows]:
+        kind = {CHANGE_UNKNOWN: 'known after apply'}.get(item.kind, item.kind)
+        if item.forces_replacement:
+            kind += ' (forces replacement)'
+        rows.append({
+            'Attribute': item.path_str or '(resource)',
+            'Change': kind,
+            'Before': format_value(item.before, max_chars),
+            'After': format_value(item.after, max_chars)
+        })
+    return rows, max(len(changes) - max_rows, 0)
+
+
+class AttributeDiffCache:
+    """
+    Bounded LRU cache of attribute diffs, one per resource change.
+
+    Entries are keyed by the resource's structural hash when the caller
+    knows it, which survives re-parsing the same plan. Otherwise they are
+    keyed by the identity of the change's ``change`` dictionary (shared by
+    the raw and the parser-normalized entry) and keep a reference to it, so
+    a lookup is O(1) and can never return the diff of a different change.
+    Plan data is treated as immutable once parsed, as everywhere else in the
+    dashboard.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_DIFF_CACHE_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached diffs
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Any, Tuple[Dict[str, Any], List[AttributeChange]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_diff(self, change: Dict[str, Any], content_hash: Optional[str] = None) -> List[AttributeChange]:
+        """
+        Get the attribute diff of a resource change, computing it on first use.
+
+        Args:
+            change: Entry of the plan's resource_changes
+            content_hash: Structural hash of the entry, if already known
+
+        Returns:
+            Attribute changes of the resource (shared; do not modify)
+        """
+        change_data = change.get('change') or {}
+        key = content_hash if content_hash is not None else id(change_data)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (content_hash is not None or entry[0] is change_data):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        changes = diff_resource_change(change)
+
+        with self._lock:
+            self._entries[key] = (change_data, changes)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return changes
+
+    def clear(self) -> None:
+        """Drop all cached diffs."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
@@ -0,0 +1,360 @@
+"""
+Batch Analysis
+
+Analyzes many plan files (e.g. one per workspace) across CPU cores and merges
+the results into a portfolio report.
+
+Each worker process runs the headless analysis engine on one file and
+returns only a compact summary, so nothing large is pickled back to the
+parent. Files are submitted largest first and workers pull the next file
+from the pool's shared queue as soon as they finish one; a single huge plan
+therefore starts early instead of stalling the tail of the batch, and the
+remaining small plans are spread over whichever workers are free.
+
+Each summary carries the plan's mergeable change and risk aggregates (see
+utils.plan_aggregates) in serialized form. Portfolio resource totals are
+merged from those, so reports built on different machines combine exactly
+with PortfolioReport.merge() or from their to_dict() form.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from utils.plan_aggregates import ChangeAggregate, RiskAggregate, merge_aggregates
+
+
+# Number of riskiest plans listed in the portfolio report
+DEFAULT_TOP_PLANS = 10
+
+RISK_LEVELS = ('Low', 'Medium', 'High')
+
+
+def summarize_plan_file(path: str, enhanced: bool = True, include_security: bool = True) -> Dict[str, Any]:
+    """
+    Analyze one plan file and reduce the result to a compact summary.
+
+    Runs in a worker process; errors are returned rather than raised so one
+    broken file does not abort the batch.
+
+    Args:
+        path: Path to the plan JSON file
+        enhanced: Use the multi-cloud risk assessment
+        include_security: Run security and compliance analysis
+
+    Returns:
+        Summary dictionary for the file (with 'error' set if analysis failed)
+    """
+    from utils.analysis_engine import analyze_plan
+
+    try:
+        result = analyze_plan(path, enhanced=enhanced, include_security=include_security)
+    except Exception as e:
+        return {'file': path, 'error': str(e)}
+
+    return build_plan_summary(
+        path,
+        terraform_version=result.plan_data.get('terraform_version', 'Unknown'),
+        changes=result.parser.get_change_aggregate(),
+        providers=result.providers,
+        risk_result=result.risk_result,
+        risk=_risk_aggregate(result.risk_result, result.resource_changes),
+        security=result.security,
+        duration=sum(result.timings.values())
+    )
+
+
+def _risk_aggregate(risk_result: Dict[str, Any], resource_changes: List[Dict[str, Any]]) -> RiskAggregate:
+    """Aggregate the per-resource assessments of a plan (re-scored with the basic assessor if there are none)."""
+    assessments = risk_result.get('detailed_assessments')
+    if assessments is None:
+        from utils.risk_assessment import RiskAssessment
+
+        basic_assessor = RiskAssessment()
+        assessments = (
+            dict(basic_assessor.assess_resource_risk(change), provider=change.get('provider', 'unknown'))
+            for change in resource_changes
+        )
+    return RiskAggregate.from_assessments(assessments)
+
+
+def build_plan_summary(path: str, terraform_version: str, changes: ChangeAggregate,
+                       providers: Dict[str, int], risk_result: Dict[str, Any], risk: RiskAggregate,
+                       security: Optional[Dict[str, Any]], duration: float) -> Dict[str, Any]:
+    """
+    Reduce full analysis results to the compact per-plan summary.
+
+    Args:
+        path: Path of the plan file
+        terraform_version: Terraform version recorded in the plan
+        changes: Action counts of the plan
+        providers: Resource counts per detected provider
+        risk_result: Plan risk assessment
+        risk: Risk totals of the plan's assessed resources
+        security: Security dashboard data, or None if not analyzed
+        duration: Seconds spent analyzing
+
+    Returns:
+        Summary dictionary as merged by PortfolioReport
+    """
+    plan_summary = {
+        'file': path,
+        'terraform_version': terraform_version,
+        'summary': changes.summary(),
+        'providers': providers,
+        'risk': {
+            'level': risk_result.get('level', 'Low'),
+            'score': risk_result.get('score', 0),
+            'high_risk_count': risk_result.get('high_risk_count', 0),
+            'medium_risk_count': risk_result.get('medium_risk_count', 0),
+            'low_risk_count': risk_result.get('low_risk_count', 0)
+        },
+        'security': None,
+        'aggregates': {'changes': changes.to_dict(), 'risk': risk.to_dict()},
+        'duration': round(duration, 4)
+    }
+
+    if security is not None:
+        plan_summary['security'] = {
+            'overall_security_score': security.get('overall_security_score', 0),
+            'overall_security_level': security.get('overall_security_level', 'Unknown'),
+            'compliance_scores': {
+                framework: framework_result.get('score', 0)
+                for framework, framework_result in security.get('compliance_results', {}).items()
+            }
+        }
+
+    return plan_summary
+
+
+@dataclass
+class PortfolioReport:
+    """
+    Portfolio-wide totals merged from per-plan summaries.
+
+    Only the summaries are kept; totals are derived from them when the report
+    is built, resource totals by merging the plans' serialized aggregates.
+    """
+    plans: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def add(self, plan_summary: Dict[str, Any]) -> None:
+        """
+        Merge one plan summary into the report.
+
+        Args:
+            plan_summary: Dictionary returned by summarize_plan_file()
+        """
+        if 'error' in plan_summary:
+            self.errors.append(plan_summary)
+        else:
+            self.plans.append(plan_summary)
+
+    def merge(self, other: 'PortfolioReport') -> 'PortfolioReport':
+        """
+        Combine with the report of another batch (e.g. from another machine).
+
+        Args:
+            other: Report of a disjoint set of plan files
+
+        Returns:
+            New report covering both batches
+        """
+        return PortfolioReport(plans=self.plans + other.plans, errors=self.errors + other.errors)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PortfolioReport':
+        """
+        Restore a report from its to_dict() form.
+
+        Args:
+            data: Dictionary returned by to_dict()
+
+        Returns:
+            PortfolioReport with the same plans and errors
+        """
+        return cls(plans=list(data['plans']), errors=list(data['errors']))
+
+    def change_aggregate(self) -> ChangeAggregate:
+        """Action counts of all plans."""
+        return merge_aggregates([ChangeAggregate()] + [
+            ChangeAggregate.from_dict(plan['aggregates']['changes']) for plan in self._ordered_plans()
+        ])
+
+    def risk_aggregate(self) -> RiskAggregate:
+        """Risk totals of all assessed resources."""
+        return merge_aggregates([RiskAggregate()] + [
+            RiskAggregate.from_dict(plan['aggregates']['risk']) for plan in self._ordered_plans()
+        ])
+
+    def top_plans(self, limit: int = DEFAULT_TOP_PLANS) -> List[Dict[str, Any]]:
+        """
+        Get the riskiest plans.
+
+        Args:
+            limit: Maximum number of plans returned
+
+        Returns:
+            Plan summaries ordered by descending risk score
+        """
+        return sorted(self.plans, key=lambda plan: (-plan['risk']['score'], plan['file']))[:limit]
+
+    def to_dict(self, top_limit: int = DEFAULT_TOP_PLANS) -> Dict[str, Any]:
+        """
+        Build a JSON-serializable portfolio report.
+
+        Args:
+            top_limit: Number of riskiest plans to list
+
+        Returns:
+            Dictionary with totals, risk distribution, averages and plan list
+        """
+        plans = self._ordered_plans()
+        changes = self.change_aggregate()
+        risk = self.risk_aggregate()
+
+        risk_levels = {level: 0 for level in RISK_LEVELS}
+        for plan in plans:
+            risk_levels[plan['risk']['level']] = risk_levels.get(plan['risk']['level'], 0) + 1
+        plan_scores = [plan['risk']['score'] for plan in plans]
+
+        # Security scores carry one decimal; they are summed as integer tenths
+        security = [plan['security'] for plan in plans if plan.get('security')]
+        compliance_tenths: Dict[str, int] = {}
+        for plan_security in security:
+            for framework, score in plan_security['compliance_scores'].items():
+                compliance_tenths[framework] = compliance_tenths.get(framework, 0) + _tenths(score)
+
+        return {
+            'plan_count': len(plans),
+            'error_count': len(self.errors),
+            'summary': changes.summary(),
+            'providers': dict(sorted(
+                ((provider, counts['total']) for provider, counts in changes.actions_by_provider().items()),
+                key=lambda item: -item[1]
+            )),
+            'risk_levels': risk_levels,
+            'average_risk_score': round(sum(plan_scores) / len(plans), 1) if plans else 0,
+            'max_risk_score': max(plan_scores, default=0.0),
+            'resource_risk': {
+                'levels': risk.level_counts(),
+                'average_risk_score': round(risk.total_score / risk.count, 1) if risk.count else 0,
+                'providers': risk.provider_risk_summary()
+            },
+            'average_security_score': round(
+                sum(_tenths(plan_security['overall_security_score']) for plan_security in security)
+                / len(security) / 10, 1
+            ) if security else None,
+            'average_compliance_scores': {
+                framework: round(total / len(security) / 10, 1) for framework, total in compliance_tenths.items()
+            },
+            'aggregates': {'changes': changes.to_dict(), 'risk': risk.to_dict()},
+            'top_risk_plans': [
+                {'file': plan['file'], 'level': plan['risk']['level'], 'score': plan['risk']['score']}
+                for plan in self.top_plans(top_limit)
+            ],
+            'plans': plans,
+            'errors': sorted(self.errors, key=lambda plan: plan['file'])
+        }
+
+    def _ordered_plans(self) -> List[Dict[str, Any]]:
+        """Plans by file, so totals do not depend on the order summaries arrived in."""
+        return sorted(self.plans, key=lambda plan: plan['file'])
+
+
+def _tenths(score: float) -> int:
+    """Convert a one-decimal score into exact integer tenths."""
+    return int(round(score * 10))
+
+
+class BatchAnalyzer:
+    """
+    Fans plan files out over a process pool and merges the summaries.
+
+    With a single worker the files are analyzed in-process, which avoids the
+    process start-up cost for small batches.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, enhanced: bool = True,
+                 include_security: bool = True):
+        """
+        Initialize the batch analyzer.
+
+        Args:
+            max_workers: Number of worker processes (defaults to CPU count)
+            enhanced: Use the multi-cloud risk assessment
+            include_security: Run security and compliance analysis
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.enhanced = enhanced
+        self.include_security = include_security
+
+    def iter_summaries(self, paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze plan files, yielding summaries in completion order.
+
+        Args:
+            paths: Plan file paths
+
+        Returns:
+            Iterator of per-plan summaries
+        """
+        ordered = order_by_size(paths)
+        workers = min(self.max_workers, len(ordered))
+
+        if workers <= 1:
+            for path in ordered:
+                yield summarize_plan_file(path, self.enhanced, self.include_security)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(summarize_plan_file, path, self.enhanced, self.include_security): path
+                for path in ordered
+            }
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    # The worker process itself died (e.g. out of memory)
+                    yield {'file': futures[future], 'error': f"Worker failed: {e}"}
+
+    def analyze(self, paths: Iterable[str],
+                progress: Optional[Callable[[int, int], None]] = None) -> PortfolioReport:
+        """
+        Analyze plan files and merge them into a portfolio report.
+
+        Args:
+            paths: Plan file paths
+            progress: Optional callable receiving (completed, total)
+
+        Returns:
+            PortfolioReport for all files
+        """
+        paths = list(paths)
+        report = PortfolioReport()
+        for completed, plan_summary in enumerate(self.iter_summaries(paths), start=1):
+            report.add(plan_summary)
+            if progress is not None:
+                progress(completed, len(paths))
+        return report
+
+
+def order_by_size(paths: Iterable[str]) -> List[str]:
+    """
+    Order plan files largest first (longest-processing-time-first scheduling).
+
+    Args:
+        paths: Plan file paths
+
+    Returns:
+        Paths sorted by descending file size; unreadable files come last
+    """
+    def size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return -1
+
+    return sorted(paths, key=lambda path: (-size(path), path))
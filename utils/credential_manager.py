@@ -11,9 +11,10 @@ import weakref
 from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 import atexit
-import threading
 import time
 
+from utils.expiry_scheduler import ExpiryHandle, get_expiry_scheduler
+
 
 @dataclass
 class TFEConfig:
@@ -69,7 +70,6 @@ class CredentialManager:
     # Class-level registry to track all instances for cleanup
     _instances = weakref.WeakSet()
     # Session cleanup tracking
-    _session_cleanup_timer: Optional[threading.Timer] = None
     _session_timeout = 3600  # 1 hour default session timeout
     
     def __init__(self):
@@ -78,6 +78,7 @@ class CredentialManager:
         self._config: Optional[TFEConfig] = None
         self._last_access_time = time.time()
         self._session_active = False
+        self._expiry_handle: Optional[ExpiryHandle] = None
         
         # Register this instance for cleanup
         CredentialManager._instances.add(self)
@@ -119,8 +120,8 @@ class CredentialManager:
         self._last_access_time = time.time()
         self._session_active = True
         
-        # Start session cleanup timer
-        self._start_session_cleanup_timer()
+        # Schedule session expiry
+        self._schedule_session_expiry(self._session_timeout)
     
     def get_credentials(self) -> Optional[Dict[str, Any]]:
         """
@@ -189,8 +190,8 @@ class CredentialManager:
         self._config = None
         self._session_active = False
         
-        # Cancel session cleanup timer
-        self._cancel_session_cleanup_timer()
+        # Cancel scheduled session expiry
+        self._cancel_session_expiry()
     
     def validate_config(self, config: Dict[str, Any]) -> Tuple[bool, List[str]]:
         """
@@ -265,48 +266,53 @@ class CredentialManager:
         return f"{value[:2]}{'*' * (len(value) - 4)}{value[-2:]}"
     
     def _update_last_access(self) -> None:
-        """Update last access time for session management."""
-        self._last_access_time = time.time()
+        """
+        Update last access time for session management.
         
-        # Restart session cleanup timer if session is active
-        if self._session_active:
-            self._start_session_cleanup_timer()
+        Only the timestamp changes here; the scheduled expiry re-checks it
+        when it fires and re-arms itself for the remaining time.
+        """
+        self._last_access_time = time.time()
     
-    def _start_session_cleanup_timer(self) -> None:
-        """Start or restart the session cleanup timer."""
-        # Cancel existing timer
-        self._cancel_session_cleanup_timer()
-        
-        # Start new timer
-        CredentialManager._session_cleanup_timer = threading.Timer(
-            self._session_timeout, 
-            self._session_timeout_cleanup
-        )
-        CredentialManager._session_cleanup_timer.daemon = True
-        CredentialManager._session_cleanup_timer.start()
+    def _schedule_session_expiry(self, delay: float) -> None:
+        """
+        Schedule (or reschedule) the session expiry check.
+        
+        Args:
+            delay: Seconds until the check runs
+        """
+        self._cancel_session_expiry()
+        
+        # Hold only a weak reference so the scheduler never keeps a manager alive
+        manager_ref = weakref.ref(self)
+        
+        def expire() -> None:
+            manager = manager_ref()
+            if manager is not None:
+                manager._session_timeout_cleanup()
+        
+        self._expiry_handle = get_expiry_scheduler().schedule(delay, expire)
     
-    def _cancel_session_cleanup_timer(self) -> None:
-        """Cancel the session cleanup timer."""
-        if CredentialManager._session_cleanup_timer:
-            CredentialManager._session_cleanup_timer.cancel()
-            CredentialManager._session_cleanup_timer = None
+    def _cancel_session_expiry(self) -> None:
+        """Cancel the scheduled session expiry check."""
+        if self._expiry_handle is not None:
+            self._expiry_handle.cancel()
+            self._expiry_handle = None
     
     def _session_timeout_cleanup(self) -> None:
         """Cleanup credentials when session times out."""
+        if not self._session_active:
+            return
+        
         current_time = time.time()
         
         # Check if session has actually timed out
         if current_time - self._last_access_time >= self._session_timeout:
             self.clear_credentials()
         else:
-            # Session was accessed recently, restart timer
+            # Session was accessed recently, re-arm for the remaining time
             remaining_time = self._session_timeout - (current_time - self._last_access_time)
-            CredentialManager._session_cleanup_timer = threading.Timer(
-                remaining_time, 
-                self._session_timeout_cleanup
-            )
-            CredentialManager._session_cleanup_timer.daemon = True
-            CredentialManager._session_cleanup_timer.start()
+            self._schedule_session_expiry(remaining_time)
     
     def set_session_timeout(self, timeout_seconds: int) -> None:
         """
@@ -320,9 +326,10 @@ class CredentialManager:
         
         self._session_timeout = timeout_seconds
         
-        # Restart timer with new timeout if session is active
+        # Re-check expiry with the new timeout if session is active
         if self._session_active:
-            self._start_session_cleanup_timer()
+            remaining_time = timeout_seconds - (time.time() - self._last_access_time)
+            self._schedule_session_expiry(remaining_time)
     
     def get_session_info(self) -> Dict[str, Any]:
         """
@@ -361,11 +368,6 @@ class CredentialManager:
     @classmethod
     def cleanup_all_instances(cls) -> None:
         """Clean up all credential manager instances."""
-        # Cancel global session timer
-        if cls._session_cleanup_timer:
-            cls._session_cleanup_timer.cancel()
-            cls._session_cleanup_timer = None
-        
         for instance in cls._instances:
             try:
                 instance.clear_credentials()
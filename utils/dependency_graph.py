@@ -0,0 +1,490 @@
+"""
+Dependency Graph
+
+Resource dependency graph of a plan's configuration with transitive blast
+radius.
+
+The graph is built from ``configuration.root_module`` and all nested
+``module_calls``: expression ``references``, ``depends_on``, ``count`` and
+``for_each`` expressions of resources and module calls. Module boundaries
+are modeled with variable and output nodes, so a resource that reads
+``var.vpc_id`` depends on whatever the calling module passes in, and a
+reference to ``module.net.subnet_id`` depends on what that output reads.
+
+Nodes are numbered and edges are stored as integer adjacency arrays (CSR)
+in both directions. Downstream reachability is computed in one pass over
+the strongly connected components in dependency order, carrying a bitset
+(a Python int) of downstream resources per component. Bitsets are
+released as soon as no further component needs them, so only the bitsets
+of the requested resources and of the current frontier are kept.
+"""
+
+import re
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from parsers.address_parser import AddressParseError, parse_address
+
+
+# Node kinds
+KIND_RESOURCE = 'resource'
+KIND_DATA = 'data'
+KIND_VARIABLE = 'variable'
+KIND_OUTPUT = 'output'
+KIND_MODULE = 'module'
+KIND_UNRESOLVED = 'unresolved'
+
+# Reference prefixes that do not point at another graph node
+_IGNORED_REFERENCE_ROOTS = {'local', 'count', 'each', 'self', 'path', 'terraform'}
+
+_INDEX_PATTERN = re.compile(r'\[(?:"(?:[^"\\]|\\.)*"|[^\]]*)\]')
+
+DEFAULT_TOP_IMPACT = 10
+
+
+def _popcount(bits: int) -> int:
+    """Number of set bits."""
+    return bin(bits).count('1')
+
+
+def _iter_references(expressions: Any) -> Iterable[str]:
+    """All reference strings in an expressions structure, at any depth."""
+    if isinstance(expressions, dict):
+        references = expressions.get('references')
+        if isinstance(references, list):
+            for reference in references:
+                if isinstance(reference, str):
+                    yield reference
+        for key, value in expressions.items():
+            if key != 'references' and isinstance(value, (dict, list)):
+                yield from _iter_references(value)
+    elif isinstance(expressions, list):
+        for item in expressions:
+            yield from _iter_references(item)
+
+
+def config_address(address: str) -> str:
+    """
+    Map a resource instance address to its configuration address.
+
+    Args:
+        address: Instance address, e.g. ``module.net["eu"].aws_subnet.a[0]``
+
+    Returns:
+        Configuration address without instance keys, e.g. ``module.net.aws_subnet.a``
+    """
+    try:
+        parsed = parse_address(address)
+    except AddressParseError:
+        return _INDEX_PATTERN.sub('', address)
+    modules = ''.join(f"module.{step.name}." for step in parsed.module_path)
+    mode = 'data.' if parsed.mode == 'data' else ''
+    return f"{modules}{mode}{parsed.type}.{parsed.name}"
+
+
+class _GraphBuilder:
+    """Collects nodes and edges while walking the configuration"""
+
+    def __init__(self):
+        self.addresses: List[str] = []
+        self.kinds: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.edges: Set[Tuple[int, int]] = set()
+
+    def node(self, address: str, kind: Optional[str] = None) -> int:
+        node_id = self.index.get(address)
+        if node_id is None:
+            node_id = len(self.addresses)
+            self.index[address] = node_id
+            self.addresses.append(address)
+            self.kinds.append(kind or KIND_UNRESOLVED)
+        elif kind is not None and self.kinds[node_id] == KIND_UNRESOLVED:
+            self.kinds[node_id] = kind
+        return node_id
+
+    def depend(self, node_id: int, targets: Iterable[int]) -> None:
+        for target in targets:
+            if target != node_id:
+                self.edges.add((node_id, target))
+
+    def resolve(self, reference: str, prefix: str) -> Optional[int]:
+        """Node referenced by an expression inside the module at ``prefix``."""
+        parts = _INDEX_PATTERN.sub('', reference).split('.')
+        root = parts[0]
+        if root in _IGNORED_REFERENCE_ROOTS or not root:
+            return None
+        if root == 'var':
+            return self.node(f"{prefix}var.{parts[1]}") if len(parts) >= 2 else None
+        if root == 'module':
+            if len(parts) >= 3:
+                return self.node(f"{prefix}module.{parts[1]}.output.{parts[2]}")
+            return self.node(f"{prefix}module.{parts[1]}") if len(parts) == 2 else None
+        if root == 'data':
+            return self.node(f"{prefix}data.{parts[1]}.{parts[2]}") if len(parts) >= 3 else None
+        return self.node(f"{prefix}{parts[0]}.{parts[1]}") if len(parts) >= 2 else None
+
+    def resolve_all(self, references: Iterable[str], prefix: str) -> List[int]:
+        resolved = []
+        for reference in references:
+            node_id = self.resolve(reference, prefix)
+            if node_id is not None:
+                resolved.append(node_id)
+        return resolved
+
+    def walk_module(self, module: Dict[str, Any], prefix: str, inherited: List[int]) -> None:
+        """Add the resources, outputs and module calls of one module."""
+        for resource in module.get('resources', []) or []:
+            address = resource.get('address', '')
+            kind = KIND_DATA if resource.get('mode') == 'data' or address.startswith('data.') else KIND_RESOURCE
+            node_id = self.node(f"{prefix}{address}", kind)
+            references = list(_iter_references(resource.get('expressions', {})))
+            references.extend(_iter_references(resource.get('count_expression', {})))
+            references.extend(_iter_references(resource.get('for_each_expression', {})))
+            references.extend(resource.get('depends_on', []) or [])
+            self.depend(node_id, self.resolve_all(references, prefix))
+            self.depend(node_id, inherited)
+
+        for name, output in (module.get('outputs', {}) or {}).items():
+            node_id = self.node(f"{prefix}output.{name}", KIND_OUTPUT)
+            references = list(_iter_references(output.get('expression', {})))
+            references.extend(output.get('depends_on', []) or [])
+            self.depend(node_id, self.resolve_all(references, prefix))
+
+        for name, call in (module.get('module_calls', {}) or {}).items():
+            child_prefix = f"{prefix}module.{name}."
+            call_references = list(_iter_references(call.get('count_expression', {})))
+            call_references.extend(_iter_references(call.get('for_each_expression', {})))
+            call_references.extend(call.get('depends_on', []) or [])
+            child_inherited = list(inherited) + self.resolve_all(call_references, prefix)
+
+            for variable, expression in (call.get('expressions', {}) or {}).items():
+                node_id = self.node(f"{child_prefix}var.{variable}", KIND_VARIABLE)
+                self.depend(node_id, self.resolve_all(_iter_references(expression), prefix))
+
+            child_module = call.get('module', {}) or {}
+            self.walk_module(child_module, child_prefix, child_inherited)
+
+            # A reference to the whole module depends on all of its outputs
+            module_node = self.node(f"{prefix}module.{name}", KIND_MODULE)
+            self.depend(module_node, [
+                self.node(f"{child_prefix}output.{output}", KIND_OUTPUT)
+                for output in (child_module.get('outputs', {}) or {})
+            ])
+
+
+def _csr(node_count: int, edges: Iterable[Tuple[int, int]]) -> Tuple[array, array]:
+    """Compressed sparse row arrays (offsets, targets) for an edge list."""
+    edges = sorted(edges)
+    offsets = array('l', [0] * (node_count + 1))
+    for source, _ in edges:
+        offsets[source + 1] += 1
+    for node_id in range(node_count):
+        offsets[node_id + 1] += offsets[node_id]
+    targets = array('l', (target for _, target in edges))
+    return offsets, targets
+
+
+class DependencyGraph:
+    """Configuration dependency graph with integer adjacency arrays"""
+
+    def __init__(self, addresses: List[str], kinds: List[str], edges: Iterable[Tuple[int, int]]):
+        """
+        Initialize the graph.
+
+        Args:
+            addresses: Node addresses, indexed by node id
+            kinds: Node kinds, indexed by node id
+            edges: (node, dependency) pairs
+        """
+        edges = list(edges)
+        self.addresses = addresses
+        self.kinds = kinds
+        self.index = {address: node_id for node_id, address in enumerate(addresses)}
+        self.dependency_offsets, self.dependency_targets = _csr(len(addresses), edges)
+        self.dependent_offsets, self.dependent_targets = _csr(
+            len(addresses), ((target, source) for source, target in edges)
+        )
+        self._downstream_cache: Dict[int, int] = {}
+
+    @classmethod
+    def from_configuration(cls, configuration: Dict[str, Any]) -> 'DependencyGraph':
+        """
+        Build the graph from a plan's ``configuration`` block.
+
+        Args:
+            configuration: Plan configuration (may be empty)
+
+        Returns:
+            DependencyGraph
+        """
+        builder = _GraphBuilder()
+        builder.walk_module((configuration or {}).get('root_module', {}) or {}, '', [])
+        return cls(builder.addresses, builder.kinds, builder.edges)
+
+    @classmethod
+    def from_plan(cls, plan_data: Dict[str, Any]) -> 'DependencyGraph':
+        """
+        Build the graph for a plan.
+
+        Args:
+            plan_data: Parsed plan JSON
+
+        Returns:
+            DependencyGraph
+        """
+        return cls.from_configuration(plan_data.get('configuration', {}))
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    @property
+    def edge_count(self) -> int:
+        """Number of dependency edges."""
+        return len(self.dependency_targets)
+
+    def _neighbors(self, offsets: array, targets: array, node_id: int) -> array:
+        return targets[offsets[node_id]:offsets[node_id + 1]]
+
+    def dependencies(self, address: str) -> List[str]:
+        """
+        Direct dependencies of a node.
+
+        Args:
+            address: Configuration address of the node
+
+        Returns:
+            Addresses the node references
+        """
+        node_id = self.index.get(address)
+        if node_id is None:
+            return []
+        return [self.addresses[target] for target in
+                self._neighbors(self.dependency_offsets, self.dependency_targets, node_id)]
+
+    def resource_dependencies(self, address: str) -> List[str]:
+        """
+        Resources a node depends on, looking through variables, outputs and module references.
+
+        Args:
+            address: Configuration address of the node
+
+        Returns:
+            Sorted resource and data source addresses
+        """
+        node_id = self.index.get(address)
+        if node_id is None:
+            return []
+        found: Set[int] = set()
+        visited = {node_id}
+        stack = [node_id]
+        while stack:
+            for target in self._neighbors(self.dependency_offsets, self.dependency_targets, stack.pop()):
+                if target in visited:
+                    continue
+                visited.add(target)
+                if self.kinds[target] in (KIND_RESOURCE, KIND_DATA):
+                    found.add(target)
+                else:
+                    stack.append(target)
+        return sorted(self.addresses[target] for target in found)
+
+    def _strongly_connected_components(self) -> List[List[int]]:
+        """
+        Iterative Tarjan over the dependents direction.
+
+        Components are returned so that every component comes after all
+        components that (transitively) depend on it.
+        """
+        node_count = len(self.addresses)
+        offsets, targets = self.dependent_offsets, self.dependent_targets
+        indices = [-1] * node_count
+        lowlinks = [0] * node_count
+        on_stack = [False] * node_count
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+
+        for start in range(node_count):
+            if indices[start] != -1:
+                continue
+            work = [(start, offsets[start])]
+            indices[start] = lowlinks[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack[start] = True
+
+            while work:
+                node_id, position = work[-1]
+                if position < offsets[node_id + 1]:
+                    work[-1] = (node_id, position + 1)
+                    target = targets[position]
+                    if indices[target] == -1:
+                        indices[target] = lowlinks[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack[target] = True
+                        work.append((target, offsets[target]))
+                    elif on_stack[target]:
+                        lowlinks[node_id] = min(lowlinks[node_id], indices[target])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[node_id])
+                if lowlinks[node_id] == indices[node_id]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node_id:
+                            break
+                    components.append(component)
+
+        return components
+
+    def downstream_bitsets(self, addresses: Iterable[str]) -> Dict[str, int]:
+        """
+        Bitsets of the resources that transitively depend on each given node.
+
+        Bit ``i`` stands for node id ``i``; only resource nodes are set.
+        Results are cached per node.
+
+        Args:
+            addresses: Configuration addresses to compute
+
+        Returns:
+            Mapping of address to bitset (unknown addresses are omitted)
+        """
+        requested = {self.index[address] for address in addresses if address in self.index}
+        missing = requested - set(self._downstream_cache)
+        if missing:
+            self._compute_downstream(missing)
+        return {self.addresses[node_id]: self._downstream_cache[node_id] for node_id in requested}
+
+    def _compute_downstream(self, requested: Set[int]) -> None:
+        """Propagate downstream bitsets over the components in dependency order."""
+        components = self._strongly_connected_components()
+        component_of = [0] * len(self.addresses)
+        for component_id, members in enumerate(components):
+            for member in members:
+                component_of[member] = component_id
+
+        dependencies_of: List[Set[int]] = []
+        for component_id, members in enumerate(components):
+            upstream = set()
+            for member in members:
+                for target in self._neighbors(self.dependency_offsets, self.dependency_targets, member):
+                    if component_of[target] != component_id:
+                        upstream.add(component_of[target])
+            dependencies_of.append(upstream)
+
+        own_bits = [0] * len(components)
+        for component_id, members in enumerate(components):
+            for member in members:
+                if self.kinds[member] == KIND_RESOURCE:
+                    own_bits[component_id] |= 1 << member
+
+        # Accumulated bitsets of components not yet processed; each is
+        # dropped once its component has been processed
+        downstream: Dict[int, int] = {}
+        for component_id, members in enumerate(components):
+            # Every dependent component has already been processed
+            bits = downstream.pop(component_id, 0)
+            if len(members) > 1:
+                bits |= own_bits[component_id]
+            for member in members:
+                if member in requested:
+                    self._downstream_cache[member] = bits
+            carried = bits | own_bits[component_id]
+            for target in dependencies_of[component_id]:
+                downstream[target] = downstream.get(target, 0) | carried
+
+    def blast_radius(self, addresses: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Downstream impact of the given nodes.
+
+        Args:
+            addresses: Configuration addresses
+
+        Returns:
+            Mapping of address to {'downstream_count', 'downstream'} where
+            'downstream' lists the dependent resource addresses
+        """
+        result = {}
+        for address, bits in self.downstream_bitsets(addresses).items():
+            result[address] = {
+                'downstream_count': _popcount(bits),
+                'downstream': self.addresses_of(bits)
+            }
+        return result
+
+    def addresses_of(self, bits: int) -> List[str]:
+        """
+        Addresses of the nodes in a bitset.
+
+        Args:
+            bits: Node bitset
+
+        Returns:
+            Sorted addresses
+        """
+        found = []
+        while bits:
+            low_bit = bits & -bits
+            found.append(self.addresses[low_bit.bit_length() - 1])
+            bits ^= low_bit
+        return sorted(found)
+
+
+def rank_blast_radius(graph: DependencyGraph, resource_changes: List[Dict[str, Any]],
+                      limit: int = DEFAULT_TOP_IMPACT) -> Dict[str, Any]:
+    """
+    Rank changed resources by how many resources transitively depend on them.
+
+    Instance addresses are mapped to configuration addresses, so all
+    instances of a ``count``/``for_each`` resource share one graph node.
+
+    Args:
+        graph: Dependency graph of the plan
+        resource_changes: Resource changes with 'address' and 'action'
+        limit: Maximum number of ranked changes returned
+
+    Returns:
+        Dictionary with 'top_changes' (ranked), 'affected_resources' (number
+        of distinct resources downstream of any change) and
+        'changes_with_dependents'
+    """
+    changes_by_node: Dict[str, List[Dict[str, Any]]] = {}
+    for change in resource_changes:
+        changes_by_node.setdefault(config_address(change.get('address', '')), []).append(change)
+
+    bitsets = graph.downstream_bitsets(changes_by_node)
+    changed_bits = 0
+    for address in changes_by_node:
+        node_id = graph.index.get(address)
+        if node_id is not None:
+            changed_bits |= 1 << node_id
+
+    ranked = []
+    affected = 0
+    for address, bits in bitsets.items():
+        affected |= bits
+        count = _popcount(bits)
+        if count == 0:
+            continue
+        for change in changes_by_node[address]:
+            ranked.append({
+                'address': change.get('address', ''),
+                'action': change.get('action', 'unknown'),
+                'downstream_count': count,
+                'downstream_changed': _popcount(bits & changed_bits)
+            })
+
+    ranked.sort(key=lambda item: (-item['downstream_count'], item['address']))
+    return {
+        'top_changes': ranked[:limit],
+        'affected_resources': _popcount(affected),
+        'changes_with_dependents': len(ranked)
+    }
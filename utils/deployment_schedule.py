@@ -0,0 +1,339 @@
+"""
+Deployment Schedule
+
+Apply-time estimate from a simulation of Terraform's graph walk.
+
+Each changed resource takes a number of seconds that depends on its risk
+level and its provider's deployment time multiplier. Resources start once
+every resource they depend on (per the configuration dependency graph, see
+utils.dependency_graph) has finished, and at most ``parallelism``
+resources are applied at once, like ``terraform apply -parallelism=N``
+(default 10).
+
+Dependencies are tracked per configuration address: all instances of
+``aws_subnet.private`` must finish before any instance of a resource that
+references it starts. Variable, output and module nodes and unchanged
+resources take no time and only pass readiness on, so the walk is
+O(V + E) over the graph plus O(n log parallelism) for the running set.
+The critical path (the estimate with unlimited parallelism) is computed
+the same way.
+"""
+
+import heapq
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from utils.dependency_graph import DependencyGraph, config_address
+from utils.plan_aggregates import SECONDS_PER_LEVEL, UNKNOWN_PROVIDER, format_deployment_time
+
+
+TERRAFORM_DEFAULT_PARALLELISM = 10
+
+# Seconds assumed for a resource without an assessed risk level
+DEFAULT_RESOURCE_SECONDS = SECONDS_PER_LEVEL['Low']
+
+
+class ScheduledResource(NamedTuple):
+    """One resource change placed on the simulated timeline"""
+    address: str
+    provider: str
+    start: float
+    finish: float
+
+    @property
+    def duration(self) -> float:
+        return self.finish - self.start
+
+
+def resource_duration(assessment: Dict[str, Any], provider_multipliers: Optional[Dict[str, float]] = None) -> float:
+    """
+    Estimated apply time of one resource change.
+
+    Args:
+        assessment: Per-resource risk assessment (level and provider)
+        provider_multipliers: Deployment time multiplier per provider
+
+    Returns:
+        Duration in seconds
+    """
+    seconds = SECONDS_PER_LEVEL.get(assessment.get('level'), DEFAULT_RESOURCE_SECONDS)
+    return seconds * (provider_multipliers or {}).get(assessment.get('provider', UNKNOWN_PROVIDER), 1.0)
+
+
+class DeploymentSchedule:
+    """Simulated apply timeline of a plan"""
+
+    def __init__(self, tasks: List[ScheduledResource], parallelism: int, critical_path_seconds: float,
+                 critical_path: List[str], peak_concurrency: int, dependency_cycles: bool = False):
+        """
+        Initialize the schedule.
+
+        Args:
+            tasks: Scheduled resource changes in start order
+            parallelism: Maximum number of concurrent operations simulated
+            critical_path_seconds: Duration with unlimited parallelism
+            critical_path: Configuration addresses along the critical path
+            peak_concurrency: Highest number of operations running at once
+            dependency_cycles: Whether cyclic dependencies had to be ignored
+        """
+        self.tasks = tasks
+        self.parallelism = parallelism
+        self.critical_path_seconds = critical_path_seconds
+        self.critical_path = critical_path
+        self.peak_concurrency = peak_concurrency
+        self.dependency_cycles = dependency_cycles
+
+    @property
+    def makespan_seconds(self) -> float:
+        """Time until the last resource finishes."""
+        return max((task.finish for task in self.tasks), default=0.0)
+
+    @property
+    def sequential_seconds(self) -> float:
+        """Time if every resource was applied one after another."""
+        return sum((task.duration for task in self.tasks), 0.0)
+
+    def provider_lanes(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize the timeline per provider.
+
+        Returns:
+            Dictionary of provider -> resource_count, start_seconds,
+            finish_seconds and busy_seconds
+        """
+        lanes: Dict[str, Dict[str, Any]] = {}
+        for task in self.tasks:
+            lane = lanes.get(task.provider)
+            if lane is None:
+                lanes[task.provider] = {'resource_count': 1, 'start_seconds': task.start,
+                                        'finish_seconds': task.finish, 'busy_seconds': task.duration}
+            else:
+                lane['resource_count'] += 1
+                lane['start_seconds'] = min(lane['start_seconds'], task.start)
+                lane['finish_seconds'] = max(lane['finish_seconds'], task.finish)
+                lane['busy_seconds'] += task.duration
+        return lanes
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Summarize the schedule.
+
+        Returns:
+            Dictionary with timing totals, critical path and provider lanes
+        """
+        return {
+            'parallelism': self.parallelism,
+            'resource_count': len(self.tasks),
+            'makespan_seconds': round(self.makespan_seconds, 1),
+            'critical_path_seconds': round(self.critical_path_seconds, 1),
+            'sequential_seconds': round(self.sequential_seconds, 1),
+            'peak_concurrency': self.peak_concurrency,
+            'critical_path': list(self.critical_path),
+            'dependency_cycles': self.dependency_cycles,
+            'provider_lanes': self.provider_lanes()
+        }
+
+
+def provider_timeline(schedule: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-provider timeline rows of a schedule, as used by the deployment Gantt chart.
+
+    Args:
+        schedule: Result of DeploymentSchedule.to_dict()
+
+    Returns:
+        Dictionary of provider -> resource_count, estimated_time,
+        start_minutes and finish_minutes
+    """
+    return {
+        provider: {
+            'resource_count': lane['resource_count'],
+            'estimated_time': format_deployment_time(lane['finish_seconds'] - lane['start_seconds']),
+            'start_minutes': round(lane['start_seconds'] / 60, 1),
+            'finish_minutes': round(lane['finish_seconds'] / 60, 1)
+        }
+        for provider, lane in schedule.get('provider_lanes', {}).items()
+    }
+
+
+def schedule_deployment(assessments: Iterable[Dict[str, Any]], graph: Optional[DependencyGraph] = None,
+                        parallelism: int = TERRAFORM_DEFAULT_PARALLELISM,
+                        provider_multipliers: Optional[Dict[str, float]] = None) -> DeploymentSchedule:
+    """
+    Simulate applying a plan.
+
+    Resources that are not in the dependency graph (e.g. deletions of
+    resources removed from the configuration) have no dependencies.
+
+    Args:
+        assessments: Per-resource risk assessments (address, level, provider)
+        graph: Configuration dependency graph of the plan
+        parallelism: Maximum number of concurrent operations
+        provider_multipliers: Deployment time multiplier per provider
+
+    Returns:
+        DeploymentSchedule
+    """
+    parallelism = max(1, int(parallelism))
+    if graph is None:
+        graph = DependencyGraph([], [], [])
+    node_count = len(graph)
+
+    addresses: List[str] = []
+    providers: List[str] = []
+    durations: List[float] = []
+    task_group: List[int] = []
+    # Tasks grouped by graph node; resources outside the graph get their own group
+    group_tasks: List[List[int]] = [[] for _ in range(node_count)]
+    group_names: List[str] = list(graph.addresses)
+    outside_graph: Dict[str, int] = {}
+    for assessment in assessments:
+        address = assessment.get('address', '')
+        name = config_address(address)
+        group = graph.index.get(name, outside_graph.get(name))
+        if group is None:
+            group = outside_graph[name] = len(group_tasks)
+            group_tasks.append([])
+            group_names.append(name)
+
+        group_tasks[group].append(len(addresses))
+        task_group.append(group)
+        addresses.append(address)
+        providers.append(assessment.get('provider', UNKNOWN_PROVIDER))
+        durations.append(resource_duration(assessment, provider_multipliers))
+
+    group_count = len(group_tasks)
+    dependency_offsets = graph.dependency_offsets
+    dependent_offsets, dependent_targets = graph.dependent_offsets, graph.dependent_targets
+
+    def dependents(group: int) -> Iterable[int]:
+        if group >= node_count:
+            return ()
+        return dependent_targets[dependent_offsets[group]:dependent_offsets[group + 1]]
+
+    def initial_indegrees() -> List[int]:
+        return [dependency_offsets[group + 1] - dependency_offsets[group] if group < node_count else 0
+                for group in range(group_count)]
+
+    critical_path_seconds, critical_path = _critical_path(
+        group_tasks, group_names, durations, initial_indegrees(), dependents
+    )
+
+    # List scheduling: ready tasks start in release order whenever a slot is free
+    indegree = initial_indegrees()
+    released = [False] * group_count
+    remaining = [len(tasks) for tasks in group_tasks]
+    ready: deque = deque()
+    running: List[Any] = []
+    starts = [0.0] * len(addresses)
+    finishes = [0.0] * len(addresses)
+    start_order: List[int] = []
+    unreleased = group_count
+    peak_concurrency = 0
+    dependency_cycles = False
+
+    def complete(groups: List[int]) -> None:
+        """Mark groups as done and release dependents whose dependencies are all done."""
+        stack = groups
+        while stack:
+            group = stack.pop()
+            for dependent in dependents(group):
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0 and not released[dependent]:
+                    stack.extend(release(dependent))
+
+    def release(group: int) -> List[int]:
+        """Queue the tasks of a ready group; returns the group if it has nothing to apply."""
+        nonlocal unreleased
+        released[group] = True
+        unreleased -= 1
+        if remaining[group]:
+            ready.extend(group_tasks[group])
+            return []
+        # Variables, outputs and unchanged resources are complete as soon as they are ready
+        return [group]
+
+    empty_groups: List[int] = []
+    for group in range(group_count):
+        if indegree[group] == 0:
+            empty_groups.extend(release(group))
+    complete(empty_groups)
+
+    now = 0.0
+    while ready or running or unreleased:
+        while ready and len(running) < parallelism:
+            task_id = ready.popleft()
+            starts[task_id] = now
+            start_order.append(task_id)
+            heapq.heappush(running, (now + durations[task_id], task_id))
+        peak_concurrency = max(peak_concurrency, len(running))
+
+        if not running:
+            # Only nodes on a dependency cycle are left; release them regardless
+            dependency_cycles = True
+            empty_groups = []
+            for group in range(group_count):
+                if not released[group]:
+                    empty_groups.extend(release(group))
+            complete(empty_groups)
+            continue
+
+        now, task_id = heapq.heappop(running)
+        completed = [task_id]
+        while running and running[0][0] == now:
+            completed.append(heapq.heappop(running)[1])
+
+        done_groups = []
+        for task_id in completed:
+            finishes[task_id] = now
+            group = task_group[task_id]
+            remaining[group] -= 1
+            if remaining[group] == 0:
+                done_groups.append(group)
+        complete(done_groups)
+
+    tasks = [ScheduledResource(addresses[task_id], providers[task_id], starts[task_id], finishes[task_id])
+             for task_id in start_order]
+    return DeploymentSchedule(tasks, parallelism, critical_path_seconds, critical_path, peak_concurrency,
+                              dependency_cycles)
+
+
+def _critical_path(group_tasks: List[List[int]], group_names: List[str], durations: List[float],
+                   indegree: List[int], dependents: Callable[[int], Iterable[int]]) -> Tuple[float, List[str]]:
+    """
+    Longest dependency chain with unlimited parallelism.
+
+    Groups are visited in topological order (Kahn); each group finishes its
+    longest instance after its latest dependency. Groups on dependency
+    cycles are never visited.
+
+    Returns:
+        Tuple of (duration in seconds, configuration addresses along the path)
+    """
+    group_count = len(group_tasks)
+    earliest_start = [0.0] * group_count
+    predecessor = [-1] * group_count
+    finish = [0.0] * group_count
+    stack = [group for group in range(group_count) if indegree[group] == 0]
+    while stack:
+        group = stack.pop()
+        finish[group] = earliest_start[group] + max((durations[task] for task in group_tasks[group]), default=0.0)
+        for dependent in dependents(group):
+            if finish[group] > earliest_start[dependent]:
+                earliest_start[dependent] = finish[group]
+                predecessor[dependent] = group
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                stack.append(dependent)
+
+    group = max(range(group_count), key=finish.__getitem__, default=-1)
+    if group == -1 or not finish[group]:
+        return 0.0, []
+    total = finish[group]
+    path = []
+    while group != -1:
+        if group_tasks[group]:
+            path.append(group_names[group])
+        group = predecessor[group]
+    path.reverse()
+    return total, path
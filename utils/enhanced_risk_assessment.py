@@ -1,14 +1,26 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from collections import defaultdict
+from .deployment_schedule import TERRAFORM_DEFAULT_PARALLELISM, provider_timeline
+from .instance_groups import InstanceGroups
 from .provider_factory import MultiCloudProviderFactory, MultiCloudRiskAssessment
 
 
 class EnhancedRiskAssessment:
     """Enhanced risk assessment that replaces the original RiskAssessment class"""
 
-    def __init__(self):
+    def __init__(self, assessment_cache=None, parallelism: int = TERRAFORM_DEFAULT_PARALLELISM):
+        """
+        Initialize the assessment.
+
+        Args:
+            assessment_cache: Optional AssessmentCache so resources unchanged
+                since a previous plan reuse their assessment (used when
+                assess_plan_risk is given the plan's content hashes)
+            parallelism: Concurrent operations assumed for deployment time
+                estimates (terraform apply -parallelism, default 10)
+        """
         self.provider_factory = MultiCloudProviderFactory()
-        self.multi_cloud_assessment = MultiCloudRiskAssessment(self.provider_factory)
+        self.multi_cloud_assessment = MultiCloudRiskAssessment(self.provider_factory, assessment_cache, parallelism)
 
     def assess_resource_risk(self, resource_change: Dict[str, Any], plan_data: Dict[str, Any] = None) -> Dict[str, Any]:
         """Assess risk for a single resource change (compatibility method)"""
@@ -26,15 +38,23 @@ class EnhancedRiskAssessment:
         # Fallback to unknown resource assessment
         return self.multi_cloud_assessment._assess_unknown_resource(resource_change)
 
-    def assess_plan_risk(self, resource_changes: List[Dict[str, Any]], plan_data: Dict[str, Any] = None) -> Dict[
-        str, Any]:
-        """Assess overall risk for the entire plan"""
+    def assess_plan_risk(self, resource_changes: List[Dict[str, Any]], plan_data: Dict[str, Any] = None,
+                         instance_groups: Optional[InstanceGroups] = None,
+                         content_hashes: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Assess overall risk for the entire plan (once per instance group if the plan's groups are given).
+
+        ``content_hashes`` (address -> structural hash, see PlanIndex.root_hashes())
+        enables the assessment cache for the plan's resources.
+        """
         if plan_data is None:
             # Create minimal plan data from resource changes
             plan_data = {'resource_changes': resource_changes}
 
         # Use multi-cloud assessment
-        multi_cloud_result = self.multi_cloud_assessment.assess_multi_cloud_plan_risk(plan_data)
+        multi_cloud_result = self.multi_cloud_assessment.assess_multi_cloud_plan_risk(
+            plan_data, instance_groups, content_hashes
+        )
 
         # Transform to match original interface
         return {
@@ -51,6 +71,7 @@ class EnhancedRiskAssessment:
             'provider_risk_summary': multi_cloud_result['provider_risk_summary'],
             'is_multi_cloud': multi_cloud_result['is_multi_cloud'],
             'primary_provider': multi_cloud_result['primary_provider'],
+            'deployment_schedule': multi_cloud_result['deployment_schedule'],
             'detailed_assessments': multi_cloud_result['resource_assessments']
         }
 
@@ -215,15 +236,19 @@ class EnhancedRiskAssessment:
 
     def get_deployment_timeline_estimate(self, resource_changes: List[Dict[str, Any]],
                                          plan_data: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Get detailed deployment timeline estimate"""
+        """Get detailed deployment timeline estimate from a simulated apply over the dependency graph"""
         full_assessment = self.assess_plan_risk(resource_changes, plan_data)
-        provider_breakdown = self.get_provider_breakdown(resource_changes, plan_data)
+        schedule = full_assessment['deployment_schedule']
 
         timeline = {
             'total_estimated_time': full_assessment['estimated_time'],
-            'parallel_execution_possible': True,
-            'sequential_dependencies': [],
-            'provider_specific_times': {},
+            'parallel_execution_possible': schedule['peak_concurrency'] > 1,
+            'sequential_dependencies': schedule['critical_path'],
+            'parallelism': schedule['parallelism'],
+            'makespan_seconds': schedule['makespan_seconds'],
+            'critical_path_seconds': schedule['critical_path_seconds'],
+            'sequential_seconds': schedule['sequential_seconds'],
+            'provider_specific_times': provider_timeline(schedule),
             'risk_based_phases': {
                 'low_risk_phase': [],
                 'medium_risk_phase': [],
@@ -231,13 +256,6 @@ class EnhancedRiskAssessment:
             }
         }
 
-        # Provider-specific timing
-        for provider, summary in provider_breakdown['provider_risk_summary'].items():
-            timeline['provider_specific_times'][provider] = {
-                'resource_count': summary['total_resources'],
-                'estimated_time': f"{summary['total_resources'] * 0.5}-{summary['total_resources'] * 2} minutes"
-            }
-
         # Risk-based phasing
         if 'detailed_assessments' in full_assessment:
             for assessment in full_assessment['detailed_assessments']:
@@ -0,0 +1,178 @@
+"""
+Expiry Scheduler
+
+Process-wide scheduler for session expirations of credentials and plan data.
+All expirations share one daemon thread and a heap ordered by due time, so
+scheduling and cancelling cost O(log n) and no OS thread is created per
+session or per access.
+
+Cancelled entries are invalidated lazily: they stay in the heap until they
+reach the top (or until enough accumulate to compact the heap) instead of
+being searched for and removed.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+class ExpiryHandle:
+    """Handle for one scheduled expiry callback"""
+
+    __slots__ = ('due', 'callback', 'cancelled', '_scheduler')
+
+    def __init__(self, due: float, callback: Callable[[], None], scheduler: 'ExpiryScheduler'):
+        self.due = due
+        self.callback = callback
+        self.cancelled = False
+        self._scheduler = scheduler
+
+    def cancel(self) -> None:
+        """Cancel the callback if it has not run yet."""
+        self._scheduler.cancel(self)
+
+    @property
+    def active(self) -> bool:
+        """Whether the callback is still pending."""
+        return not self.cancelled and self.callback is not None
+
+
+class ExpiryScheduler:
+    """
+    Heap-based scheduler running expiry callbacks on a single daemon thread.
+
+    Callbacks run on the scheduler thread and must be short; they may
+    schedule new expirations (e.g. to re-arm a session that was accessed
+    since it was scheduled).
+    """
+
+    # Compact the heap once cancelled entries outnumber live ones
+    _COMPACT_MIN_SIZE = 64
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the scheduler.
+
+        Args:
+            clock: Monotonic clock used for due times
+        """
+        self._clock = clock
+        self._heap: List[Tuple[float, int, ExpiryHandle]] = []
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._shutdown = False
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> ExpiryHandle:
+        """
+        Run a callback after a delay.
+
+        Args:
+            delay: Seconds from now
+            callback: Function called without arguments on the scheduler thread
+
+        Returns:
+            ExpiryHandle that can be used to cancel the callback
+        """
+        with self._condition:
+            handle = ExpiryHandle(self._clock() + max(0.0, delay), callback, self)
+            heapq.heappush(self._heap, (handle.due, next(self._counter), handle))
+            self._ensure_thread()
+            # Only wake the thread when the new entry is the earliest one
+            if self._heap[0][2] is handle:
+                self._condition.notify()
+            return handle
+
+    def cancel(self, handle: ExpiryHandle) -> None:
+        """
+        Cancel a scheduled callback.
+
+        Args:
+            handle: Handle returned by schedule()
+        """
+        with self._condition:
+            if not handle.active:
+                return
+            handle.cancelled = True
+            handle.callback = None
+            self._cancelled += 1
+            if len(self._heap) >= self._COMPACT_MIN_SIZE and self._cancelled * 2 > len(self._heap):
+                self._compact()
+
+    def pending_count(self) -> int:
+        """Number of callbacks still waiting to run."""
+        with self._condition:
+            return len(self._heap) - self._cancelled
+
+    def shutdown(self) -> None:
+        """Stop the scheduler thread and drop all pending callbacks."""
+        with self._condition:
+            self._shutdown = True
+            for _, _, handle in self._heap:
+                handle.cancelled = True
+                handle.callback = None
+            self._heap.clear()
+            self._cancelled = 0
+            self._condition.notify()
+
+    def _compact(self) -> None:
+        """Remove cancelled entries from the heap (lock must be held)."""
+        self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+        heapq.heapify(self._heap)
+        self._cancelled = 0
+
+    def _ensure_thread(self) -> None:
+        """Start the scheduler thread on first use (lock must be held)."""
+        self._shutdown = False
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="expiry-scheduler", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Scheduler loop: sleep until the earliest due entry and run it."""
+        while True:
+            with self._condition:
+                callback = None
+                while callback is None:
+                    if self._shutdown:
+                        return
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+
+                    due, _, handle = self._heap[0]
+                    if handle.cancelled:
+                        heapq.heappop(self._heap)
+                        self._cancelled -= 1
+                        continue
+
+                    wait = due - self._clock()
+                    if wait > 0:
+                        self._condition.wait(wait)
+                        continue
+
+                    heapq.heappop(self._heap)
+                    callback = handle.callback
+                    handle.callback = None
+
+            try:
+                callback()
+            except Exception:
+                # A failing expiry must never stop the other expirations
+                pass
+
+
+_shared_scheduler: Optional[ExpiryScheduler] = None
+_shared_scheduler_lock = threading.Lock()
+
+
+def get_expiry_scheduler() -> ExpiryScheduler:
+    """Get the process-wide expiry scheduler."""
+    global _shared_scheduler
+    with _shared_scheduler_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = ExpiryScheduler()
+        return _shared_scheduler
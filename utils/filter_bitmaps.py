@@ -0,0 +1,196 @@
+"""
+Filter Bitmaps
+
+Precomputed per-value bitmaps of the resource table's categorical filter
+columns (action, risk level, provider, resource type).
+
+The bitmaps are built once per plan. A filter selection then costs one
+bitwise OR per selected value and one AND/OR per dimension over packed
+bitsets of ``rows / 8`` bytes, independent of how the rows are laid out in
+the dataframe. Counts come from a popcount of the packed bytes, so the size
+of a selection is known without materializing its rows.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+FILTER_DIMENSIONS = ('action', 'risk_level', 'provider', 'resource_type')
+
+# Number of set bits of every byte value
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+class Bitset:
+    """Fixed-size set of row positions packed eight rows per byte"""
+
+    __slots__ = ('bits', 'size')
+
+    def __init__(self, bits: np.ndarray, size: int):
+        self.bits = bits
+        self.size = size
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> 'Bitset':
+        """
+        Pack a boolean row mask.
+
+        Args:
+            mask: Boolean array with one flag per row
+
+        Returns:
+            Bitset of the rows whose flag is set
+        """
+        return cls(np.packbits(mask), len(mask))
+
+    @classmethod
+    def empty(cls, size: int) -> 'Bitset':
+        """Bitset of ``size`` rows with no row set."""
+        return cls(np.zeros((size + 7) // 8, dtype=np.uint8), size)
+
+    @classmethod
+    def full(cls, size: int) -> 'Bitset':
+        """Bitset of ``size`` rows with every row set."""
+        return ~cls.empty(size)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __and__(self, other: 'Bitset') -> 'Bitset':
+        return Bitset(self.bits & other.bits, self.size)
+
+    def __or__(self, other: 'Bitset') -> 'Bitset':
+        return Bitset(self.bits | other.bits, self.size)
+
+    def __invert__(self) -> 'Bitset':
+        bits = ~self.bits
+        tail = self.size % 8
+        if tail:
+            # Keep the padding bits of the last byte clear so counts stay exact
+            bits[-1] &= (0xFF << (8 - tail)) & 0xFF
+        return Bitset(bits, self.size)
+
+    def count(self) -> int:
+        """Number of rows in the set."""
+        return int(_POPCOUNT[self.bits].sum(dtype=np.int64))
+
+    def to_mask(self) -> np.ndarray:
+        """Boolean row mask of the set."""
+        return np.unpackbits(self.bits, count=self.size).astype(bool)
+
+
+class FilterBitmaps:
+    """Per-value row bitmaps of the categorical filter columns of one table"""
+
+    def __init__(self, labels: Iterable, bitmaps: Dict[str, Dict[Any, Bitset]]):
+        """
+        Initialize the bitmaps.
+
+        Args:
+            labels: Row labels of the indexed dataframe
+            bitmaps: Column name -> value -> Bitset of the rows with that value
+        """
+        self.labels = pd.Index(labels)
+        self.bitmaps = bitmaps
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, columns: Sequence[str] = FILTER_DIMENSIONS) -> 'FilterBitmaps':
+        """
+        Build the bitmaps of a resource table.
+
+        Args:
+            df: Resource table
+            columns: Filter columns to index (missing ones are skipped)
+
+        Returns:
+            FilterBitmaps over the rows of ``df``
+        """
+        bitmaps = {}
+        for column in columns:
+            if column not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[column])
+            # Group row positions by value with one sort instead of a scan per value
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            values = {}
+            for code, value in enumerate(uniques):
+                mask = np.zeros(len(df), dtype=bool)
+                mask[order[bounds[code]:bounds[code + 1]]] = True
+                values[value] = Bitset.from_mask(mask)
+            bitmaps[column] = values
+        return cls(df.index, bitmaps)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def dimensions(self) -> List[str]:
+        """Indexed column names."""
+        return list(self.bitmaps)
+
+    def value_counts(self, column: str) -> Dict[Any, int]:
+        """
+        Count the rows of every value of a column.
+
+        Args:
+            column: Indexed column name
+
+        Returns:
+            Dictionary of value -> row count
+        """
+        return {value: bits.count() for value, bits in self.bitmaps.get(column, {}).items()}
+
+    def select(self, column: str, values: Iterable) -> Bitset:
+        """
+        Select the rows whose column value is one of ``values``.
+
+        Args:
+            column: Indexed column name
+            values: Accepted values
+
+        Returns:
+            Bitset of the matching rows
+        """
+        column_bitmaps = self.bitmaps.get(column, {})
+        selection = Bitset.empty(len(self))
+        for value in values:
+            bits = column_bitmaps.get(value)
+            if bits is not None:
+                selection = selection | bits
+        return selection
+
+    def filter(self, selections: Mapping[str, Optional[Iterable]], logic: str = 'AND') -> Bitset:
+        """
+        Combine per-column selections with AND or OR logic.
+
+        Args:
+            selections: Column name -> accepted values; None or a column that
+                is not indexed leaves that dimension out
+            logic: 'AND' (rows must match every dimension) or 'OR' (any dimension)
+
+        Returns:
+            Bitset of the matching rows
+        """
+        use_and = logic == 'AND'
+        result = Bitset.full(len(self)) if use_and else Bitset.empty(len(self))
+        for column, values in selections.items():
+            if values is None or column not in self.bitmaps:
+                continue
+            selection = self.select(column, values)
+            result = result & selection if use_and else result | selection
+        return result
+
+    def covers(self, df: pd.DataFrame) -> bool:
+        """
+        Check whether the bitmaps were built for a dataframe's rows.
+
+        Args:
+            df: Resource table
+
+        Returns:
+            True if the bitmaps have the same row labels as ``df``
+        """
+        return len(df) == len(self.labels) and df.index.equals(self.labels)
@@ -0,0 +1,429 @@
+"""
+Filter Expressions
+
+Parser and compiler for the advanced filter expressions of the resource
+table, e.g. ``(action='delete' OR action='replace') AND provider='aws'``.
+
+Grammar (keywords are case-insensitive)::
+
+    expression := term (OR term)*
+    term       := factor (AND factor)*
+    factor     := NOT factor | '(' expression ')' | comparison | field
+    comparison := field ('=' | '==' | '!=' | '<>') value
+                | field [NOT] IN '(' value (',' value)* ')'
+                | field [NOT] LIKE value
+
+Values are quoted strings, numbers, ``true``/``false`` or bare words. A bare
+boolean field (``sensitive``) is short for ``sensitive = true``. String
+comparisons are case-insensitive and LIKE uses the SQL wildcards ``%`` and
+``_``.
+
+Expressions are compiled once per text into an AST of typed comparisons.
+A string comparison is evaluated on the distinct values of its column only;
+the result is spread over the rows with one take on the factorized codes, so
+evaluation costs a hash pass per column instead of a Python call per row.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from parsers.address_parser import module_address_from_address
+
+
+class FilterExpressionError(ValueError):
+    """Raised when a filter expression cannot be parsed or evaluated"""
+
+
+class FilterField(NamedTuple):
+    """Field that expressions can refer to"""
+    name: str
+    column: str
+    kind: str  # 'string' or 'boolean'
+    description: str
+
+
+FILTER_FIELDS: Dict[str, FilterField] = {field.name: field for field in [
+    FilterField('action', 'action', 'string', "Planned action: 'create', 'update', 'delete', 'replace'"),
+    FilterField('risk', 'risk_level', 'string', "Risk level: 'Low', 'Medium', 'High'"),
+    FilterField('provider', 'provider', 'string', "Cloud provider: 'aws', 'azure', 'google'"),
+    FilterField('type', 'resource_type', 'string', "Resource type, e.g. 'aws_instance'"),
+    FilterField('name', 'resource_name', 'string', 'Resource name'),
+    FilterField('module', 'resource_address', 'string', "Module address, e.g. 'module.vpc' ('' for the root module)"),
+    FilterField('sensitive', 'is_sensitive', 'boolean', 'Whether the planned values contain sensitive data'),
+]}
+
+STRING_OPERATORS = ('=', '!=', 'in', 'not in', 'like', 'not like')
+BOOLEAN_OPERATORS = ('=', '!=', 'in', 'not in')
+
+DEFAULT_COMPILED_EXPRESSIONS = 128
+
+Value = Union[str, bool]
+
+
+class Comparison(NamedTuple):
+    """``field <operator> values``; ``=`` and ``!=`` have a single value"""
+    field: FilterField
+    operator: str
+    values: Tuple[Value, ...]
+
+    def __str__(self) -> str:
+        values = [_format_value(value) for value in self.values]
+        operator = self.operator.upper()
+        if self.operator in ('in', 'not in'):
+            return f"{self.field.name} {operator} ({', '.join(values)})"
+        if self.operator in ('like', 'not like'):
+            return f"{self.field.name} {operator} {values[0]}"
+        return f"{self.field.name}{self.operator}{values[0]}"
+
+
+class Not(NamedTuple):
+    operand: Any
+
+    def __str__(self) -> str:
+        return f"NOT {_format_operand(self.operand, Not)}"
+
+
+class And(NamedTuple):
+    operands: Tuple[Any, ...]
+
+    def __str__(self) -> str:
+        return ' AND '.join(_format_operand(operand, And) for operand in self.operands)
+
+
+class Or(NamedTuple):
+    operands: Tuple[Any, ...]
+
+    def __str__(self) -> str:
+        return ' OR '.join(_format_operand(operand, Or) for operand in self.operands)
+
+
+Node = Union[Comparison, Not, And, Or]
+
+# Binding strength, used to parenthesize only where needed when formatting
+_PRECEDENCE = {Or: 0, And: 1, Not: 2, Comparison: 3}
+
+
+def _format_operand(operand: Node, parent: type) -> str:
+    text = str(operand)
+    return f"({text})" if _PRECEDENCE[type(operand)] < _PRECEDENCE[parent] else text
+
+
+def _format_value(value: Value) -> str:
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+
+# Tokenizer
+
+_TOKEN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+  | (?P<number>-?\d+(?:\.\d+)?(?![\w.]))
+  | (?P<symbol>!=|<>|==|=|\(|\)|,)
+  | (?P<word>[A-Za-z_][\w.\-]*)
+""", re.VERBOSE)
+
+_KEYWORDS = {'and', 'or', 'not', 'in', 'like', 'true', 'false'}
+_ESCAPE = re.compile(r'\\(.)')
+
+
+class _Token(NamedTuple):
+    kind: str  # 'string', 'number', 'symbol', 'word', 'keyword' or 'end'
+    text: str
+    position: int
+
+
+def _tokenize(expression: str) -> List[_Token]:
+    tokens = []
+    position = 0
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if match is None:
+            raise FilterExpressionError(f"Unexpected {expression[position]!r} at position {position}")
+        kind = match.lastgroup
+        text = match.group()
+        if kind == 'word' and text.lower() in _KEYWORDS:
+            kind, text = 'keyword', text.lower()
+        if kind != 'space':
+            tokens.append(_Token(kind, text, position))
+        position = match.end()
+    tokens.append(_Token('end', '', position))
+    return tokens
+
+
+# Parser
+
+class _Parser:
+    """Recursive-descent parser over the token list"""
+
+    def __init__(self, expression: str):
+        self.tokens = _tokenize(expression)
+        self.pos = 0
+
+    def peek(self) -> _Token:
+        return self.tokens[self.pos]
+
+    def advance(self) -> _Token:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def accept(self, kind: str, text: str) -> bool:
+        token = self.peek()
+        if token.kind == kind and token.text == text:
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, kind: str, text: str) -> None:
+        if not self.accept(kind, text):
+            raise self.error(f"Expected {text.upper() if kind == 'keyword' else repr(text)}")
+
+    def error(self, message: str) -> FilterExpressionError:
+        token = self.peek()
+        found = f"{token.text!r}" if token.kind != 'end' else 'end of expression'
+        return FilterExpressionError(f"{message} at position {token.position}, found {found}")
+
+    def parse(self) -> Node:
+        node = self.expression()
+        if self.peek().kind != 'end':
+            raise self.error('Expected AND, OR or end of expression')
+        return node
+
+    def expression(self) -> Node:
+        operands = [self.term()]
+        while self.accept('keyword', 'or'):
+            operands.append(self.term())
+        return operands[0] if len(operands) == 1 else Or(tuple(operands))
+
+    def term(self) -> Node:
+        operands = [self.factor()]
+        while self.accept('keyword', 'and'):
+            operands.append(self.factor())
+        return operands[0] if len(operands) == 1 else And(tuple(operands))
+
+    def factor(self) -> Node:
+        if self.accept('keyword', 'not'):
+            return Not(self.factor())
+        if self.accept('symbol', '('):
+            node = self.expression()
+            self.expect('symbol', ')')
+            return node
+        return self.comparison()
+
+    def comparison(self) -> Comparison:
+        token = self.peek()
+        if token.kind != 'word':
+            raise self.error('Expected a field name')
+        field = FILTER_FIELDS.get(token.text.lower())
+        if field is None:
+            raise FilterExpressionError(
+                f"Unknown field {token.text!r} at position {token.position}. Use: {', '.join(FILTER_FIELDS)}"
+            )
+        self.advance()
+
+        operator_token = self.peek()
+        if operator_token.kind == 'symbol' and operator_token.text in ('=', '==', '!=', '<>'):
+            self.advance()
+            operator = '=' if operator_token.text in ('=', '==') else '!='
+        else:
+            negated = self.accept('keyword', 'not')
+            if self.accept('keyword', 'in'):
+                operator = 'in'
+            elif self.accept('keyword', 'like'):
+                operator = 'like'
+            elif negated:
+                raise self.error('Expected IN or LIKE')
+            elif field.kind == 'boolean':
+                # Bare boolean field
+                return Comparison(field, '=', (True,))
+            else:
+                raise self.error(f"Expected an operator after {field.name!r} (=, !=, IN, LIKE)")
+            if negated:
+                operator = f"not {operator}"
+
+        allowed = STRING_OPERATORS if field.kind == 'string' else BOOLEAN_OPERATORS
+        if operator not in allowed:
+            raise FilterExpressionError(
+                f"Operator {operator.upper()} is not supported for {field.kind} field {field.name!r}"
+            )
+        values = self.value_list(field) if operator in ('in', 'not in') else (self.value(field),)
+        return Comparison(field, operator, values)
+
+    def value_list(self, field: FilterField) -> Tuple[Value, ...]:
+        self.expect('symbol', '(')
+        values = [self.value(field)]
+        while self.accept('symbol', ','):
+            values.append(self.value(field))
+        self.expect('symbol', ')')
+        return tuple(values)
+
+    def value(self, field: FilterField) -> Value:
+        token = self.peek()
+        if token.kind == 'string':
+            value: Value = _ESCAPE.sub(r'\1', token.text[1:-1])
+        elif token.kind in ('number', 'word'):
+            value = token.text
+        elif token.kind == 'keyword' and token.text in ('true', 'false'):
+            value = token.text == 'true'
+        else:
+            raise self.error('Expected a value')
+        self.advance()
+
+        if field.kind == 'boolean':
+            if not isinstance(value, bool):
+                raise FilterExpressionError(
+                    f"Field {field.name!r} expects true or false at position {token.position}, found {token.text!r}"
+                )
+            return value
+        # Numbers and true/false compare against the text of string columns
+        return token.text if isinstance(value, bool) else value
+
+
+# Evaluation
+
+class _Columns:
+    """Per-evaluation cache of factorized columns"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._strings: Dict[str, Tuple[np.ndarray, List[str]]] = {}
+
+    def _column(self, field: FilterField) -> pd.Series:
+        if field.column not in self.df.columns:
+            raise FilterExpressionError(f"Field {field.name!r} is not available in this table")
+        return self.df[field.column]
+
+    def strings(self, field: FilterField) -> Tuple[np.ndarray, List[str]]:
+        """Codes of each row into the distinct lowercased values of a string field"""
+        cached = self._strings.get(field.name)
+        if cached is None:
+            codes, uniques = pd.factorize(self._column(field))
+            values = [str(value) for value in uniques]
+            if field.name == 'module':
+                values = [module_address_from_address(value) for value in values]
+            values = [value.lower() for value in values]
+            # Missing cells compare as ''
+            codes = np.where(codes < 0, len(values), codes)
+            values.append('')
+            cached = self._strings[field.name] = (codes, values)
+        return cached
+
+    def booleans(self, field: FilterField) -> np.ndarray:
+        return self._column(field).fillna(False).to_numpy(dtype=bool)
+
+
+def _like_pattern(pattern: str) -> 're.Pattern':
+    parts = ['.*' if char == '%' else '.' if char == '_' else re.escape(char) for char in pattern.lower()]
+    return re.compile(''.join(parts), re.DOTALL)
+
+
+def _evaluate_comparison(node: Comparison, columns: _Columns) -> np.ndarray:
+    if node.field.kind == 'boolean':
+        flags = columns.booleans(node.field)
+        if node.operator in ('=', 'in'):
+            return np.isin(flags, node.values)
+        return ~np.isin(flags, node.values)
+
+    codes, values = columns.strings(node.field)
+    operator = node.operator
+    if operator in ('like', 'not like'):
+        pattern = _like_pattern(node.values[0])
+        hits = np.fromiter((pattern.fullmatch(value) is not None for value in values), dtype=bool, count=len(values))
+    else:
+        wanted = {value.lower() for value in node.values}
+        hits = np.fromiter((value in wanted for value in values), dtype=bool, count=len(values))
+    if operator in ('!=', 'not in', 'not like'):
+        hits = ~hits
+    return hits[codes]
+
+
+def _evaluate(node: Node, columns: _Columns) -> np.ndarray:
+    if isinstance(node, Comparison):
+        return _evaluate_comparison(node, columns)
+    if isinstance(node, Not):
+        return ~_evaluate(node.operand, columns)
+    if isinstance(node, And):
+        mask = _evaluate(node.operands[0], columns)
+        for operand in node.operands[1:]:
+            if not mask.any():
+                break
+            mask = mask & _evaluate(operand, columns)
+        return mask
+    mask = _evaluate(node.operands[0], columns)
+    for operand in node.operands[1:]:
+        if mask.all():
+            break
+        mask = mask | _evaluate(operand, columns)
+    return mask
+
+
+class FilterExpression:
+    """Compiled filter expression"""
+
+    def __init__(self, text: str, ast: Node):
+        self.text = text
+        self.ast = ast
+
+    @property
+    def fields(self) -> List[str]:
+        """Names of the fields the expression refers to, in order of first use."""
+        names: List[str] = []
+        stack = [self.ast]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Comparison):
+                if node.field.name not in names:
+                    names.append(node.field.name)
+            elif isinstance(node, Not):
+                stack.append(node.operand)
+            else:
+                stack.extend(reversed(node.operands))
+        return names
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Evaluate the expression against the rows of a resource table.
+
+        Args:
+            df: Resource table
+
+        Returns:
+            Boolean array aligned with the rows of ``df``
+
+        Raises:
+            FilterExpressionError: If a referenced field has no column in ``df``
+        """
+        if df.empty:
+            return np.zeros(0, dtype=bool)
+        return _evaluate(self.ast, _Columns(df))
+
+    def __str__(self) -> str:
+        return str(self.ast)
+
+    def __repr__(self) -> str:
+        return f"FilterExpression({str(self)!r})"
+
+
+@lru_cache(maxsize=DEFAULT_COMPILED_EXPRESSIONS)
+def compile_filter_expression(expression: str) -> FilterExpression:
+    """
+    Parse and compile a filter expression, cached by its text.
+
+    Args:
+        expression: Filter expression
+
+    Returns:
+        FilterExpression
+
+    Raises:
+        FilterExpressionError: If the expression is not valid
+    """
+    if not expression.strip():
+        raise FilterExpressionError('Filter expression is empty')
+    return FilterExpression(expression, _Parser(expression).parse())
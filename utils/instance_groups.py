@@ -0,0 +1,232 @@
+"""
+Instance Groups
+
+Compression of count/for_each fan-outs into homogeneous instance groups.
+
+Instances are grouped by their configuration address (module path, type and
+name without instance keys), their actions and a diff-shape hash: the shape
+(keys, list lengths and scalar types, see utils.structural_hash.hash_shape)
+of ``before`` and ``after``, the unknown/sensitive markers, the
+replace_paths and, for updates and replacements, which top-level attributes
+changed. Four thousand ``aws_route53_record.x["..."]`` records that are all
+created with the same attributes form one group.
+
+Everything the risk scoring reads (type, actions, attribute names, the
+``(sensitive)`` placeholder and the findings of embedded policy documents)
+is part of the group key, so a group is scored once and the assessment is
+shared by all its members. Tables and reports
+show one row per group with the instance count.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from parsers.address_parser import AddressParseError, parse_address
+from utils.dependency_graph import config_address
+from utils.policy_analyzer import get_policy_analyzer
+from utils.structural_hash import DIGEST_SIZE, hash_shape
+
+
+# Scalar values that are part of the shape because the risk scoring looks at them
+SENSITIVE_PLACEHOLDERS = frozenset({'(sensitive)'})
+
+GroupKey = Tuple[str, Tuple[str, ...], str]
+
+
+def diff_shape_hash(change: Dict[str, Any]) -> str:
+    """
+    Hash the shape of a resource change, ignoring attribute values.
+
+    Args:
+        change: Entry of the plan's resource_changes
+
+    Returns:
+        Hex digest; equal for changes that differ only in attribute values
+        and whose embedded policies have the same findings
+    """
+    change_data = change.get('change') or {}
+    before = change_data.get('before')
+    after = change_data.get('after')
+
+    digest = hashlib.blake2b(b'S', digest_size=DIGEST_SIZE)
+    for side in (before, after, change_data.get('after_unknown'),
+                 change_data.get('before_sensitive'), change_data.get('after_sensitive')):
+        digest.update(hash_shape(side, SENSITIVE_PLACEHOLDERS))
+
+    replace_paths = change_data.get('replace_paths')
+    if replace_paths:
+        digest.update(json.dumps(replace_paths, sort_keys=True, default=str).encode('utf-8'))
+
+    if isinstance(before, dict) and isinstance(after, dict):
+        changed = sorted(
+            str(key) for key in before.keys() | after.keys()
+            if before.get(key) != after.get(key)
+        )
+        digest.update(json.dumps(changed).encode('utf-8'))
+
+    # Policy texts are values, but their findings drive risk factors
+    policy_signature = get_policy_analyzer().signature(change)
+    if policy_signature:
+        digest.update(json.dumps(policy_signature).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def instance_group_key(change: Dict[str, Any]) -> GroupKey:
+    """
+    Group key of a resource change.
+
+    Args:
+        change: Entry of the plan's resource_changes
+
+    Returns:
+        Tuple of (configuration address, actions, diff-shape hash)
+    """
+    actions = tuple((change.get('change') or {}).get('actions', []))
+    return config_address(change.get('address', '')), actions, diff_shape_hash(change)
+
+
+def group_label(address: str) -> str:
+    """
+    Display label of a group, with every instance key replaced by ``[*]``.
+
+    Args:
+        address: Address of one member of the group
+
+    Returns:
+        Label such as ``module.dns[*].aws_route53_record.x[*]``
+    """
+    try:
+        parsed = parse_address(address)
+    except AddressParseError:
+        return address
+    parts = [f"module.{step.name}{'[*]' if step.key is not None else ''}" for step in parsed.module_path]
+    resource = f"{'data.' if parsed.mode == 'data' else ''}{parsed.type}.{parsed.name}"
+    parts.append(resource + ('[*]' if parsed.key is not None else ''))
+    return '.'.join(parts)
+
+
+class InstanceGroup:
+    """Resource changes of one configuration block with the same actions and diff shape"""
+
+    __slots__ = ('key', 'members')
+
+    def __init__(self, key: GroupKey):
+        self.key = key
+        self.members: List[Dict[str, Any]] = []
+
+    @property
+    def config_address(self) -> str:
+        """Configuration address shared by the members."""
+        return self.key[0]
+
+    @property
+    def actions(self) -> Tuple[str, ...]:
+        """Plan actions shared by the members."""
+        return self.key[1]
+
+    @property
+    def count(self) -> int:
+        """Number of instances in the group."""
+        return len(self.members)
+
+    @property
+    def representative(self) -> Dict[str, Any]:
+        """First member, used wherever one instance stands for the group."""
+        return self.members[0]
+
+    @property
+    def addresses(self) -> List[str]:
+        """Addresses of all members."""
+        return [member.get('address', '') for member in self.members]
+
+    @property
+    def label(self) -> str:
+        """Address of a single member, or the ``[*]`` label of the group."""
+        address = self.representative.get('address', '')
+        return address if self.count == 1 else group_label(address)
+
+
+class InstanceGroups:
+    """Instance groups of a plan, in order of first appearance"""
+
+    def __init__(self):
+        self.groups: List[InstanceGroup] = []
+        self._by_key: Dict[GroupKey, InstanceGroup] = {}
+        self._by_address: Dict[str, InstanceGroup] = {}
+
+    @classmethod
+    def build(cls, resource_changes: List[Dict[str, Any]]) -> 'InstanceGroups':
+        """
+        Group the resource changes of a plan.
+
+        Args:
+            resource_changes: Raw or normalized resource changes
+
+        Returns:
+            InstanceGroups
+        """
+        groups = cls()
+        for change in resource_changes:
+            groups.add(change)
+        return groups
+
+    def add(self, change: Dict[str, Any], key: Optional[GroupKey] = None) -> InstanceGroup:
+        """
+        Add one resource change to its group.
+
+        Args:
+            change: Entry of the plan's resource_changes
+            key: Group key computed elsewhere (e.g. by a worker process);
+                computed from the change when omitted
+
+        Returns:
+            The group of the change
+        """
+        if key is None:
+            key = instance_group_key(change)
+        group = self._by_key.get(key)
+        if group is None:
+            group = self._by_key[key] = InstanceGroup(key)
+            self.groups.append(group)
+        group.members.append(change)
+        self._by_address[change.get('address', '')] = group
+        return group
+
+    def group_of(self, address: str) -> Optional[InstanceGroup]:
+        """
+        Get the group of a resource.
+
+        Args:
+            address: Resource address
+
+        Returns:
+            InstanceGroup or None if the address is not in the plan
+        """
+        return self._by_address.get(address)
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def __iter__(self) -> Iterator[InstanceGroup]:
+        return iter(self.groups)
+
+    @property
+    def instance_count(self) -> int:
+        """Number of grouped resource changes."""
+        return len(self._by_address)
+
+    @property
+    def compressed_instances(self) -> int:
+        """Number of resource changes represented by another member of their group."""
+        return sum(group.count - 1 for group in self.groups)
+
+    def group_ids(self) -> Dict[str, int]:
+        """
+        Group index of every resource address.
+
+        Returns:
+            Dictionary of address -> position of its group in ``groups``
+        """
+        positions = {id(group): position for position, group in enumerate(self.groups)}
+        return {address: positions[id(group)] for address, group in self._by_address.items()}
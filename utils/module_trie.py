@@ -0,0 +1,231 @@
+"""
+Module Trie
+
+Module hierarchy of a plan with aggregated counts at every node.
+
+The trie is built once per plan: each resource change is parsed with the
+address parser and its action, provider and risk level are added to the
+module instance that contains it and to every ancestor. Drill-down tables,
+treemaps and sunbursts then read the precomputed node aggregates instead of
+regrouping the full resource list.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional
+
+from parsers.address_parser import AddressParseError, format_module_path, parse_address
+
+
+ROOT_LABEL = 'root'
+
+RISK_LEVELS = ('High', 'Medium', 'Low')
+
+
+def _add_count(counts: Dict[str, int], key: str) -> None:
+    counts[key] = counts.get(key, 0) + 1
+
+
+class ModuleNode:
+    """One module instance with aggregates over itself and its descendants"""
+
+    __slots__ = ('name', 'address', 'parent_address', 'depth', 'children', 'direct_count', 'total_count',
+                 'actions', 'providers', 'risk_levels')
+
+    def __init__(self, name: str, address: str, depth: int, parent_address: str = ''):
+        self.name = name
+        self.address = address
+        self.parent_address = parent_address
+        self.depth = depth
+        self.children: Dict[str, 'ModuleNode'] = {}
+        self.direct_count = 0
+        self.total_count = 0
+        self.actions: Dict[str, int] = {}
+        self.providers: Dict[str, int] = {}
+        self.risk_levels: Dict[str, int] = {}
+
+    @property
+    def label(self) -> str:
+        """Display label ('root' for the root module)."""
+        return self.name or ROOT_LABEL
+
+    def add(self, action: str, provider: str, risk_level: Optional[str]) -> None:
+        """Count one resource change in this node's subtree."""
+        self.total_count += 1
+        _add_count(self.actions, action)
+        _add_count(self.providers, provider)
+        if risk_level:
+            _add_count(self.risk_levels, risk_level)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Aggregates of the node as a flat row.
+
+        Returns:
+            Dictionary with module address, resource counts, actions and risk levels
+        """
+        row = {
+            'module': self.address or ROOT_LABEL,
+            'resources': self.total_count,
+            'direct_resources': self.direct_count,
+            'submodules': len(self.children)
+        }
+        for action in ('create', 'update', 'delete', 'replace'):
+            row[action] = self.actions.get(action, 0)
+        for level in RISK_LEVELS:
+            row[level] = self.risk_levels.get(level, 0)
+        return row
+
+
+class ModuleTrie:
+    """Trie of module instances keyed by module address"""
+
+    def __init__(self):
+        self.root = ModuleNode('', '', 0)
+        self._nodes: Dict[str, ModuleNode] = {'': self.root}
+        self.unparsed_addresses: List[str] = []
+
+    @classmethod
+    def build(cls, resource_changes: List[Dict[str, Any]],
+              risk_levels: Optional[Dict[str, str]] = None) -> 'ModuleTrie':
+        """
+        Build the trie for a plan.
+
+        Args:
+            resource_changes: Normalized resource changes from PlanParser.get_resource_changes()
+            risk_levels: Optional risk level per resource address
+
+        Returns:
+            ModuleTrie with aggregates at every node
+        """
+        trie = cls()
+        risk_levels = risk_levels or {}
+        for change in resource_changes:
+            address = change.get('address', '')
+            trie.add(
+                address,
+                action=change.get('action', 'unknown'),
+                provider=change.get('provider', 'unknown'),
+                risk_level=risk_levels.get(address)
+            )
+        return trie
+
+    def add(self, address: str, action: str, provider: str, risk_level: Optional[str] = None) -> None:
+        """
+        Add one resource change.
+
+        Addresses that cannot be parsed are counted in the root module.
+
+        Args:
+            address: Resource address
+            action: Normalized action (create, update, delete, replace)
+            provider: Provider name
+            risk_level: Risk level of the change, if assessed
+        """
+        try:
+            module_path = parse_address(address).module_path
+        except AddressParseError:
+            self.unparsed_addresses.append(address)
+            module_path = ()
+
+        node = self.root
+        node.add(action, provider, risk_level)
+        for depth in range(1, len(module_path) + 1):
+            step = module_path[depth - 1]
+            key = str(step)
+            child = node.children.get(key)
+            if child is None:
+                child = ModuleNode(key, format_module_path(module_path[:depth]), depth, node.address)
+                node.children[key] = child
+                self._nodes[child.address] = child
+            child.add(action, provider, risk_level)
+            node = child
+        node.direct_count += 1
+
+    def get(self, module_address: str = '') -> Optional[ModuleNode]:
+        """
+        Get the node of a module instance.
+
+        Args:
+            module_address: Module address ('' for the root module)
+
+        Returns:
+            ModuleNode or None if the plan has no resources in that module
+        """
+        return self._nodes.get(module_address)
+
+    def __len__(self) -> int:
+        """Number of module instances, including the root module."""
+        return len(self._nodes)
+
+    def iter_nodes(self, start: str = '', max_depth: Optional[int] = None) -> Iterator[ModuleNode]:
+        """
+        Iterate over a subtree in pre-order.
+
+        Args:
+            start: Module address of the subtree root
+            max_depth: Maximum depth below the subtree root (None for all)
+
+        Returns:
+            Iterator of ModuleNodes
+        """
+        start_node = self.get(start)
+        if start_node is None:
+            return
+        stack = [start_node]
+        while stack:
+            node = stack.pop()
+            yield node
+            if max_depth is None or node.depth - start_node.depth < max_depth:
+                stack.extend(sorted(node.children.values(), key=lambda child: child.name, reverse=True))
+
+    def drill_down(self, module_address: str = '') -> List[Dict[str, Any]]:
+        """
+        Summarize a module and its direct submodules.
+
+        Args:
+            module_address: Module address ('' for the root module)
+
+        Returns:
+            Summary rows: the module itself, then submodules by descending size
+        """
+        node = self.get(module_address)
+        if node is None:
+            return []
+        children = sorted(node.children.values(), key=lambda child: (-child.total_count, child.name))
+        return [node.summary()] + [child.summary() for child in children]
+
+    def to_hierarchy(self, start: str = '', max_depth: Optional[int] = None) -> Dict[str, List[Any]]:
+        """
+        Flatten a subtree for treemap and sunburst charts.
+
+        Values are the resources directly in each module, to be used with
+        ``branchvalues='remainder'``; the risk share is the fraction of a
+        module's resources (including submodules) assessed as High risk.
+
+        Args:
+            start: Module address of the subtree root
+            max_depth: Maximum depth below the subtree root (None for all)
+
+        Returns:
+            Dictionary of parallel lists: ids, labels, parents, values,
+            totals and high_risk_shares
+        """
+        hierarchy = {'ids': [], 'labels': [], 'parents': [], 'values': [], 'totals': [], 'high_risk_shares': []}
+        start_node = self.get(start)
+        if start_node is None:
+            return hierarchy
+
+        for node in self.iter_nodes(start, max_depth):
+            at_depth_limit = max_depth is not None and node.depth - start_node.depth >= max_depth
+            hierarchy['ids'].append(node.address or ROOT_LABEL)
+            hierarchy['labels'].append(node.label)
+            if node is start_node:
+                hierarchy['parents'].append('')
+            else:
+                hierarchy['parents'].append(node.parent_address or ROOT_LABEL)
+            # Modules at the depth limit stand for their whole subtree
+            hierarchy['values'].append(node.total_count if at_depth_limit else node.direct_count)
+            hierarchy['totals'].append(node.total_count)
+            hierarchy['high_risk_shares'].append(
+                node.risk_levels.get('High', 0) / node.total_count if node.total_count else 0.0
+            )
+        return hierarchy
@@ -0,0 +1,484 @@
+"""
+Plan Aggregates
+
+Mergeable partial aggregates for plan summaries and risk totals.
+
+Every aggregate here is built from a slice of ``resource_changes`` and only
+holds counters, so aggregates of independent shards can be merged in any
+grouping (``(a + b) + c == a + (b + c)``) and produce exactly the result of
+aggregating the whole plan at once. Risk scores are accumulated as integer
+tenths (assessment scores carry one decimal), which keeps sums exact
+regardless of how the shards are combined.
+
+Each aggregate has a compact JSON-serializable form (``to_dict``/``from_dict``)
+so shards can be analyzed on different workers or machines and merged
+wherever their results land. Plan-wide context that a shard cannot know
+(multi-cloud detection, provider deployment multipliers) is only applied
+when the merged aggregate is finalized.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+# Serialized format version, bumped when the layout changes
+AGGREGATE_FORMAT_VERSION = 1
+
+RISK_LEVELS = ('High', 'Medium', 'Low')
+
+# Provider name of resources assessed without a matching cloud provider
+UNKNOWN_PROVIDER = 'unknown'
+
+# Seconds per resource by risk level, as used by the deployment time estimate
+SECONDS_PER_LEVEL = {'Low': 30, 'Medium': 45, 'High': 60}
+
+
+def _is_actionable(actions: List[str]) -> bool:
+    """Whether a change has any action other than no-op."""
+    return bool(actions) and actions != ['no-op']
+
+
+def _merge_counts(left: Dict[str, List[int]], right: Dict[str, List[int]]) -> Dict[str, List[int]]:
+    """Add per-key counter lists; keys keep their first-seen order."""
+    merged = {key: list(values) for key, values in left.items()}
+    for key, values in right.items():
+        if key in merged:
+            merged[key] = [a + b for a, b in zip(merged[key], values)]
+        else:
+            merged[key] = list(values)
+    return merged
+
+
+def _score_tenths(score: float) -> int:
+    """Convert a one-decimal score into exact integer tenths."""
+    return int(round(score * 10))
+
+
+class ChangeAggregate:
+    """
+    Action counts of a plan (or shard), overall and per provider.
+
+    Reproduces PlanParser.get_summary() and get_actions_by_provider():
+    replacements count as both create and delete in the summary, but as a
+    create in the per-provider breakdown.
+    """
+
+    __slots__ = ('create', 'update', 'delete', 'total', 'providers')
+
+    def __init__(self):
+        self.create = 0
+        self.update = 0
+        self.delete = 0
+        self.total = 0
+        # provider -> [create, update, delete, total]
+        self.providers: Dict[str, List[int]] = {}
+
+    @classmethod
+    def from_resource_changes(cls, resource_changes: Iterable[Dict[str, Any]],
+                              provider_of: Callable[[str], str]) -> 'ChangeAggregate':
+        """
+        Aggregate raw plan resource changes.
+
+        Args:
+            resource_changes: Entries of the plan's resource_changes
+            provider_of: Callable mapping a resource type to a provider name
+
+        Returns:
+            ChangeAggregate for the changes
+        """
+        aggregate = cls()
+        for change in resource_changes:
+            aggregate.add_change(change, provider_of)
+        return aggregate
+
+    def add_change(self, change: Dict[str, Any], provider_of: Callable[[str], str]) -> None:
+        """
+        Count one raw resource change.
+
+        Args:
+            change: Entry of the plan's resource_changes
+            provider_of: Callable mapping a resource type to a provider name
+        """
+        actions = change.get('change', {}).get('actions', [])
+        if not _is_actionable(actions):
+            return
+
+        self.total += 1
+        if actions == ['create']:
+            self.create += 1
+        elif actions == ['delete']:
+            self.delete += 1
+        elif actions == ['update']:
+            self.update += 1
+        elif set(actions) == {'create', 'delete'}:
+            # Replacement: destroy old, create new
+            self.create += 1
+            self.delete += 1
+        elif 'update' in actions:
+            self.update += 1
+        elif 'create' in actions:
+            self.create += 1
+        elif 'delete' in actions:
+            self.delete += 1
+
+        provider = provider_of(change.get('type', 'unknown'))
+        bucket = self.providers.get(provider)
+        if bucket is None:
+            bucket = self.providers[provider] = [0, 0, 0, 0]
+        bucket[3] += 1
+        if 'create' in actions:
+            bucket[0] += 1
+        elif 'update' in actions:
+            bucket[1] += 1
+        elif 'delete' in actions:
+            bucket[2] += 1
+
+    def merge(self, other: 'ChangeAggregate') -> 'ChangeAggregate':
+        """
+        Combine with the aggregate of another shard.
+
+        Args:
+            other: Aggregate of a later shard
+
+        Returns:
+            New aggregate covering both shards
+        """
+        merged = ChangeAggregate()
+        merged.create = self.create + other.create
+        merged.update = self.update + other.update
+        merged.delete = self.delete + other.delete
+        merged.total = self.total + other.total
+        merged.providers = _merge_counts(self.providers, other.providers)
+        return merged
+
+    __add__ = merge
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ChangeAggregate) and self.to_dict() == other.to_dict()
+
+    def summary(self) -> Dict[str, int]:
+        """Summary in the format of PlanParser.get_summary()."""
+        return {'create': self.create, 'update': self.update, 'delete': self.delete, 'total': self.total}
+
+    def actions_by_provider(self) -> Dict[str, Dict[str, int]]:
+        """Breakdown in the format of PlanParser.get_actions_by_provider()."""
+        return {
+            provider: {'create': bucket[0], 'update': bucket[1], 'delete': bucket[2], 'total': bucket[3]}
+            for provider, bucket in self.providers.items()
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize to a compact JSON-compatible form.
+
+        Returns:
+            Dictionary with counter lists in [create, update, delete, total] order
+        """
+        return {
+            'v': AGGREGATE_FORMAT_VERSION,
+            'summary': [self.create, self.update, self.delete, self.total],
+            'providers': {provider: list(bucket) for provider, bucket in self.providers.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ChangeAggregate':
+        """
+        Restore an aggregate serialized with to_dict().
+
+        Args:
+            data: Serialized aggregate
+
+        Returns:
+            ChangeAggregate
+
+        Raises:
+            ValueError: If the format version is not supported
+        """
+        _check_version(data)
+        aggregate = cls()
+        aggregate.create, aggregate.update, aggregate.delete, aggregate.total = data['summary']
+        aggregate.providers = {provider: list(bucket) for provider, bucket in data['providers'].items()}
+        return aggregate
+
+
+class RiskAggregate:
+    """
+    Risk totals of assessed resources, overall and per provider.
+
+    Reproduces the overall risk and provider risk summary computed by
+    MultiCloudRiskAssessment from per-resource assessments.
+    """
+
+    __slots__ = ('count', 'score_tenths', 'levels', 'providers')
+
+    def __init__(self):
+        self.count = 0
+        self.score_tenths = 0
+        # [high, medium, low]
+        self.levels = [0, 0, 0]
+        # provider -> [total, high, medium, low, score_tenths]
+        self.providers: Dict[str, List[int]] = {}
+
+    @classmethod
+    def from_assessments(cls, assessments: Iterable[Dict[str, Any]]) -> 'RiskAggregate':
+        """
+        Aggregate per-resource risk assessments.
+
+        Args:
+            assessments: Assessments with 'level', 'score' and 'provider'
+
+        Returns:
+            RiskAggregate for the assessments
+        """
+        aggregate = cls()
+        for assessment in assessments:
+            aggregate.add_assessment(assessment)
+        return aggregate
+
+    def add_assessment(self, assessment: Dict[str, Any]) -> None:
+        """
+        Count one per-resource risk assessment.
+
+        Args:
+            assessment: Assessment with 'level', 'score' and 'provider'
+        """
+        tenths = _score_tenths(assessment['score'])
+        level_index = RISK_LEVELS.index(assessment['level'])
+
+        self.count += 1
+        self.score_tenths += tenths
+        self.levels[level_index] += 1
+
+        provider = assessment.get('provider', UNKNOWN_PROVIDER)
+        bucket = self.providers.get(provider)
+        if bucket is None:
+            bucket = self.providers[provider] = [0, 0, 0, 0, 0]
+        bucket[0] += 1
+        bucket[1 + level_index] += 1
+        bucket[4] += tenths
+
+    def merge(self, other: 'RiskAggregate') -> 'RiskAggregate':
+        """
+        Combine with the aggregate of another shard.
+
+        Args:
+            other: Aggregate of a later shard
+
+        Returns:
+            New aggregate covering both shards
+        """
+        merged = RiskAggregate()
+        merged.count = self.count + other.count
+        merged.score_tenths = self.score_tenths + other.score_tenths
+        merged.levels = [a + b for a, b in zip(self.levels, other.levels)]
+        merged.providers = _merge_counts(self.providers, other.providers)
+        return merged
+
+    __add__ = merge
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, RiskAggregate) and self.to_dict() == other.to_dict()
+
+    @property
+    def total_score(self) -> float:
+        """Sum of all resource scores."""
+        return self.score_tenths / 10
+
+    def level_counts(self) -> Dict[str, int]:
+        """Number of resources per risk level."""
+        return dict(zip(RISK_LEVELS, self.levels))
+
+    def provider_risk_summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-provider totals in the format of MultiCloudRiskAssessment.
+
+        Resources assessed without a matching cloud provider are left out,
+        as in the original summary.
+        """
+        return {
+            provider: {
+                'total_resources': bucket[0],
+                'high_risk_count': bucket[1],
+                'medium_risk_count': bucket[2],
+                'low_risk_count': bucket[3],
+                'total_risk_score': bucket[4] / 10
+            }
+            for provider, bucket in self.providers.items()
+            if provider != UNKNOWN_PROVIDER
+        }
+
+    def estimated_deployment_seconds(self, provider_multipliers: Dict[str, float],
+                                     is_multi_cloud: bool) -> float:
+        """
+        Estimate deployment time from the per-provider level histograms.
+
+        Args:
+            provider_multipliers: Deployment time multiplier per provider
+            is_multi_cloud: Whether cross-cloud coordination overhead applies
+
+        Returns:
+            Estimated deployment time in seconds
+        """
+        total_time = 0.0
+        for provider, bucket in self.providers.items():
+            seconds = sum(
+                count * SECONDS_PER_LEVEL[level]
+                for level, count in zip(RISK_LEVELS, bucket[1:4])
+            )
+            total_time += seconds * provider_multipliers.get(provider, 1.0)
+
+        if is_multi_cloud:
+            total_time *= 1.3  # 30% overhead for multi-cloud coordination
+        return total_time
+
+    def overall_risk(self, is_multi_cloud: bool,
+                     provider_multipliers: Optional[Dict[str, float]] = None,
+                     deployment_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Finalize the overall plan risk.
+
+        Args:
+            is_multi_cloud: Whether the whole plan spans several cloud providers
+            provider_multipliers: Deployment time multiplier per provider
+            deployment_seconds: Simulated deployment time (see
+                utils.deployment_schedule); estimated from the histograms if omitted
+
+        Returns:
+            Overall risk dictionary (level, score, counts, estimated time)
+        """
+        if not self.count:
+            return {
+                'level': 'Low',
+                'score': 0,
+                'total_resources': 0,
+                'high_risk_count': 0,
+                'medium_risk_count': 0,
+                'low_risk_count': 0,
+                'estimated_time': '< 5 minutes'
+            }
+
+        high, medium, low = self.levels
+        total_score = self.total_score
+
+        # Weighted risk score
+        overall_score = (total_score / (self.count * 10)) * 100
+
+        # Adjust for multi-cloud complexity
+        if is_multi_cloud:
+            overall_score *= 1.15
+
+        # Adjust for high-risk resource concentration
+        if high / self.count > 0.3:
+            overall_score *= 1.2
+
+        overall_score = min(100, overall_score)
+
+        if overall_score >= 70 or high > 0:
+            overall_level = "High"
+        elif overall_score >= 40 or medium > 2:
+            overall_level = "Medium"
+        else:
+            overall_level = "Low"
+
+        total_time = deployment_seconds
+        if total_time is None:
+            total_time = self.estimated_deployment_seconds(provider_multipliers or {}, is_multi_cloud)
+
+        return {
+            'level': overall_level,
+            'score': round(overall_score),
+            'total_resources': self.count,
+            'high_risk_count': high,
+            'medium_risk_count': medium,
+            'low_risk_count': low,
+            'estimated_time': format_deployment_time(total_time),
+            'average_risk_score': round(total_score / self.count, 1)
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize to a compact JSON-compatible form.
+
+        Returns:
+            Dictionary with integer counters; provider lists are
+            [total, high, medium, low, score_tenths]
+        """
+        return {
+            'v': AGGREGATE_FORMAT_VERSION,
+            'count': self.count,
+            'score_tenths': self.score_tenths,
+            'levels': list(self.levels),
+            'providers': {provider: list(bucket) for provider, bucket in self.providers.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RiskAggregate':
+        """
+        Restore an aggregate serialized with to_dict().
+
+        Args:
+            data: Serialized aggregate
+
+        Returns:
+            RiskAggregate
+
+        Raises:
+            ValueError: If the format version is not supported
+        """
+        _check_version(data)
+        aggregate = cls()
+        aggregate.count = data['count']
+        aggregate.score_tenths = data['score_tenths']
+        aggregate.levels = list(data['levels'])
+        aggregate.providers = {provider: list(bucket) for provider, bucket in data['providers'].items()}
+        return aggregate
+
+
+def format_deployment_time(total_seconds: float) -> str:
+    """
+    Convert an estimated deployment time into a human-readable range.
+
+    Args:
+        total_seconds: Estimated deployment time in seconds
+
+    Returns:
+        Range such as '5-15 minutes' or '2+ hours'
+    """
+    if total_seconds < 300:
+        return "< 5 minutes"
+    elif total_seconds < 900:
+        return "5-15 minutes"
+    elif total_seconds < 1800:
+        return "15-30 minutes"
+    elif total_seconds < 3600:
+        return "30-60 minutes"
+    else:
+        hours = total_seconds // 3600
+        return f"{int(hours)}+ hours"
+
+
+def merge_aggregates(aggregates: Iterable[Any]) -> Any:
+    """
+    Merge shard aggregates in order.
+
+    Args:
+        aggregates: ChangeAggregate or RiskAggregate instances of one kind
+
+    Returns:
+        Merged aggregate
+
+    Raises:
+        ValueError: If no aggregates are given
+    """
+    merged = None
+    for aggregate in aggregates:
+        merged = aggregate if merged is None else merged.merge(aggregate)
+    if merged is None:
+        raise ValueError("No aggregates to merge")
+    return merged
+
+
+def _check_version(data: Dict[str, Any]) -> None:
+    """Reject serialized aggregates written in an unknown format."""
+    if data.get('v') != AGGREGATE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported aggregate format version: {data.get('v')}")
+
@@ -0,0 +1,181 @@
+"""
+Plan Arena
+
+Arena-backed storage for Terraform plan JSON. The plan is kept once, as
+compact ASCII JSON bytes in a single mutable buffer, instead of as a Python
+object graph. An index of byte spans gives direct access to top-level plan
+sections and to individual resource changes without decoding the whole plan.
+
+Because the plan lives in one buffer, a secure wipe is a single in-place
+zeroing of that buffer rather than a walk over every string in the plan.
+"""
+
+import ctypes
+import json
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+# Compact, ASCII-only encoding so byte offsets equal character offsets
+_ENCODER = json.JSONEncoder(ensure_ascii=True, separators=(',', ':'))
+
+Span = Tuple[int, int]
+
+
+class PlanArena:
+    """
+    Single-buffer storage for one plan with an offset index.
+
+    Layout of the buffer is the plan's compact JSON encoding. The index maps
+    each top-level key to the span of its value and stores one span per
+    ``resource_changes`` element.
+    """
+
+    def __init__(self, plan_data: Dict[str, Any]):
+        """
+        Encode a plan into the arena.
+
+        Args:
+            plan_data: Parsed Terraform plan JSON
+
+        Raises:
+            TypeError: If the plan is not a JSON object
+        """
+        if not isinstance(plan_data, dict):
+            raise TypeError("Plan data must be a JSON object")
+
+        self._sections: Dict[str, Span] = {}
+        self._resource_change_spans: List[Span] = []
+        self._buffer = self._encode(plan_data)
+        self._wiped = False
+
+    @classmethod
+    def from_json_bytes(cls, raw: bytes) -> 'PlanArena':
+        """
+        Build an arena from raw plan JSON bytes.
+
+        Args:
+            raw: Plan JSON as uploaded or downloaded
+
+        Returns:
+            PlanArena holding the re-encoded plan
+        """
+        return cls(json.loads(raw))
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the arena buffer in bytes."""
+        return len(self._buffer)
+
+    @property
+    def wiped(self) -> bool:
+        """Whether the arena has been securely wiped."""
+        return self._wiped
+
+    def keys(self) -> List[str]:
+        """Top-level plan keys in their original order."""
+        return list(self._sections)
+
+    def get_section(self, key: str, default: Any = None) -> Any:
+        """
+        Decode one top-level plan section.
+
+        Args:
+            key: Top-level plan key (e.g. 'resource_changes')
+            default: Value returned if the key is not present
+
+        Returns:
+            Freshly decoded value of the section
+        """
+        span = self._sections.get(key)
+        if span is None:
+            return default
+        return self._decode(span)
+
+    @property
+    def resource_change_count(self) -> int:
+        """Number of entries in resource_changes."""
+        return len(self._resource_change_spans)
+
+    def get_resource_change(self, index: int) -> Dict[str, Any]:
+        """
+        Decode a single resource change.
+
+        Args:
+            index: Position in resource_changes
+
+        Returns:
+            Freshly decoded resource change
+        """
+        return self._decode(self._resource_change_spans[index])
+
+    def iter_resource_changes(self) -> Iterator[Dict[str, Any]]:
+        """Decode resource changes one at a time."""
+        for span in self._resource_change_spans:
+            yield self._decode(span)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Decode the complete plan.
+
+        Returns:
+            New plan dictionary independent of the arena
+        """
+        self._check_not_wiped()
+        return json.loads(self._buffer.decode('ascii'))
+
+    def wipe(self) -> None:
+        """Zero the buffer in place and drop the index."""
+        size = len(self._buffer)
+        if size:
+            view = (ctypes.c_char * size).from_buffer(self._buffer)
+            ctypes.memset(ctypes.addressof(view), 0, size)
+            # Release the buffer export so the bytearray can be resized
+            del view
+        self._buffer = bytearray()
+        self._sections = {}
+        self._resource_change_spans = []
+        self._wiped = True
+
+    def _encode(self, plan_data: Dict[str, Any]) -> bytearray:
+        """Encode the plan section by section, recording value spans."""
+        buffer = bytearray(b'{')
+        for position, (key, value) in enumerate(plan_data.items()):
+            if position:
+                buffer += b','
+            buffer += _ENCODER.encode(str(key)).encode('ascii')
+            buffer += b':'
+
+            start = len(buffer)
+            if key == 'resource_changes' and isinstance(value, list):
+                self._resource_change_spans = self._encode_list(buffer, value)
+            else:
+                buffer += _ENCODER.encode(value).encode('ascii')
+            self._sections[str(key)] = (start, len(buffer))
+        buffer += b'}'
+        return buffer
+
+    @staticmethod
+    def _encode_list(buffer: bytearray, items: List[Any]) -> List[Span]:
+        """Encode a list into the buffer, returning the span of every element."""
+        spans = []
+        buffer += b'['
+        for position, item in enumerate(items):
+            if position:
+                buffer += b','
+            start = len(buffer)
+            buffer += _ENCODER.encode(item).encode('ascii')
+            spans.append((start, len(buffer)))
+        buffer += b']'
+        return spans
+
+    def _decode(self, span: Span) -> Any:
+        """Decode the JSON value stored at a span."""
+        self._check_not_wiped()
+        start, end = span
+        return json.loads(self._buffer[start:end].decode('ascii'))
+
+    def _check_not_wiped(self) -> None:
+        """Refuse access after a wipe."""
+        if self._wiped:
+            raise ValueError("Plan arena has been wiped")
+
@@ -0,0 +1,202 @@
+"""
+Plan Comparison
+
+Compares consecutive plans for the same workspace using per-resource
+structural hashes, and caches per-resource risk assessments by hash so that
+analyzing plan N+1 only assesses the resources that actually changed.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from utils.structural_hash import ResourceHashes, resource_hashes
+
+
+DEFAULT_CACHE_ENTRIES = 50000
+
+
+class PlanIndex:
+    """Structural hashes of every resource change in a plan, by address"""
+
+    def __init__(self, hashes: Dict[str, ResourceHashes], actions: Dict[str, List[str]]):
+        self.hashes = hashes
+        self.actions = actions
+        self._root_hashes: Optional[Dict[str, str]] = None
+
+    @classmethod
+    def from_plan(cls, plan_data: Dict[str, Any]) -> 'PlanIndex':
+        """
+        Hash the resource changes of a plan.
+
+        Args:
+            plan_data: Parsed Terraform plan JSON
+
+        Returns:
+            PlanIndex for the plan
+        """
+        hashes = {}
+        actions = {}
+        for change in plan_data.get('resource_changes', []):
+            address = change.get('address', '')
+            hashes[address] = resource_hashes(change)
+            actions[address] = list((change.get('change') or {}).get('actions', []))
+        return cls(hashes, actions)
+
+    def root_hashes(self) -> Dict[str, str]:
+        """
+        Get the root hash of every resource change.
+
+        Returns:
+            Address -> root hash, usable as AssessmentCache keys without
+            hashing the resources again
+        """
+        if self._root_hashes is None:
+            self._root_hashes = {address: hashes.root for address, hashes in self.hashes.items()}
+        return self._root_hashes
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+
+@dataclass
+class PlanComparison:
+    """Differences between two plans of the same workspace"""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    altered: List[Dict[str, Any]] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether the plans differ at all."""
+        return bool(self.added or self.removed or self.altered)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable view of the comparison."""
+        return {
+            'added': list(self.added),
+            'removed': list(self.removed),
+            'altered': [dict(entry) for entry in self.altered],
+            'unchanged': self.unchanged
+        }
+
+
+def compare_plans(previous: Union[Dict[str, Any], PlanIndex],
+                  current: Union[Dict[str, Any], PlanIndex]) -> PlanComparison:
+    """
+    Identify added, removed and altered resource changes between two plans.
+
+    Args:
+        previous: Earlier plan (or its PlanIndex)
+        current: Later plan (or its PlanIndex)
+
+    Returns:
+        PlanComparison; altered entries say which parts of the change differ
+    """
+    if not isinstance(previous, PlanIndex):
+        previous = PlanIndex.from_plan(previous)
+    if not isinstance(current, PlanIndex):
+        current = PlanIndex.from_plan(current)
+
+    comparison = PlanComparison()
+    for address, hashes in current.hashes.items():
+        old = previous.hashes.get(address)
+        if old is None:
+            comparison.added.append(address)
+        elif old.root == hashes.root:
+            comparison.unchanged += 1
+        else:
+            comparison.altered.append({
+                'address': address,
+                'previous_actions': previous.actions[address],
+                'actions': current.actions[address],
+                'before_changed': old.before != hashes.before,
+                'after_changed': old.after != hashes.after,
+                'metadata_changed': old.meta != hashes.meta
+            })
+
+    comparison.removed = [address for address in previous.hashes if address not in current.hashes]
+    return comparison
+
+
+class AssessmentCache:
+    """
+    Bounded LRU cache of per-resource risk assessments.
+
+    Keys combine the resource's structural hash with the set of active cloud
+    providers, because the provider chosen for a resource depends on it.
+    Stored assessments are copied on the way in and out so callers can never
+    modify a cached entry.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached assessments
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple[str, Tuple[str, ...]], Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, content_hash: str, provider_context: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached assessment.
+
+        Args:
+            content_hash: Structural hash of the resource change
+            provider_context: Sorted names of the active cloud providers
+
+        Returns:
+            Copy of the cached assessment, or None
+        """
+        key = (content_hash, provider_context)
+        with self._lock:
+            assessment = self._entries.get(key)
+            if assessment is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return _copy_assessment(assessment)
+
+    def put(self, content_hash: str, provider_context: Tuple[str, ...], assessment: Dict[str, Any]) -> None:
+        """
+        Store an assessment.
+
+        Args:
+            content_hash: Structural hash of the resource change
+            provider_context: Sorted names of the active cloud providers
+            assessment: Risk assessment of the resource
+        """
+        key = (content_hash, provider_context)
+        with self._lock:
+            self._entries[key] = _copy_assessment(assessment)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache size and hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups * 100) if lookups else 0.0
+            }
+
+
+def _copy_assessment(assessment: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy an assessment including its list values."""
+    return {key: list(value) if isinstance(value, list) else value for key, value in assessment.items()}
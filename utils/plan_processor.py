@@ -6,10 +6,16 @@ Extracted from app.py to improve code organization and maintainability.
 """
 
 import streamlit as st
+from parsers.columnar_plan import ColumnarPlanParser
 from parsers.plan_parser import PlanParser
 from visualizers.charts import ChartGenerator
 from ui.progress_tracker import ProgressTracker
 from ui.performance_optimizer import PerformanceOptimizer
+from utils.analysis_engine import AnalysisResult, analyze_plan
+from utils.instance_groups import InstanceGroups
+from utils.plan_aggregates import ChangeAggregate
+from utils.plan_comparison import AssessmentCache, PlanIndex, compare_plans
+from utils.module_trie import ModuleTrie
 
 # Try to import enhanced features, fall back to basic if not available
 try:
@@ -26,10 +32,17 @@ class PlanProcessor:
     Maintains compatibility with existing parsers, risk assessors, and chart generators.
     """
     
-    def __init__(self):
-        """Initialize the PlanProcessor with required components."""
+    def __init__(self, worker_pool=None):
+        """
+        Initialize the PlanProcessor with required components.
+        
+        Args:
+            worker_pool: Optional PlanWorkerPool used to analyze large plans in
+                worker processes instead of the Streamlit server process
+        """
         self.progress_tracker = ProgressTracker()
         self.performance_optimizer = PerformanceOptimizer()
+        self.worker_pool = worker_pool
     
     def process_plan_data(self, plan_input, upload_component, error_handler, show_debug, enable_multi_cloud):
         """
@@ -47,22 +60,48 @@ class PlanProcessor:
             Dict containing processed data or None if processing failed
         """
         # Determine if we have a file or plan data already
+        import functools
+        import hashlib
         import json
         
         # Use progress tracking context manager for file processing
         file_size = 1024  # Default size
+        use_enhanced = ENHANCED_FEATURES_AVAILABLE and enable_multi_cloud
         
         with self.progress_tracker.track_file_processing(file_size) as stage_tracker:
             try:
                 # Stage 1: Data extraction/validation
                 stage_tracker.next_stage()  # Show parsing progress
+                analysis = None
+                plan_index = None
                 with self.performance_optimizer.performance_monitor("plan_data_validation"):
-                    # Check if we have plan data directly or need to extract from file
+                    # Check if we have plan data directly or an uploaded file
                     if isinstance(plan_input, dict):
                         # Plan data is already provided (e.g., from TFE)
                         plan_data = plan_input
-                        file_size = len(json.dumps(plan_data))
+                        plan_bytes = json.dumps(plan_data).encode('utf-8')
                     else:
+                        # Uploaded file, parsed below (or by the worker pool for large plans)
+                        plan_data = None
+                        plan_bytes = plan_input.getvalue()
+                    file_size = len(plan_bytes)
+                    # Identifies the plan across Streamlit reruns without hashing every resource again
+                    plan_key = hashlib.blake2b(plan_bytes, digest_size=16).hexdigest()
+                    
+                    # Large plans are parsed, indexed and analyzed in a worker process
+                    if plan_data is None or self._get_prefetched_analysis(plan_data, use_enhanced) is None:
+                        offloaded = self._analyze_in_worker(plan_bytes, plan_key, use_enhanced)
+                        if offloaded is not None:
+                            error_msg = self._report_worker_validation(offloaded, upload_component, error_handler)
+                            if error_msg:
+                                error_handler.handle_processing_error(ValueError(error_msg), "plan data validation")
+                                return None
+                            analysis, plan_index = offloaded['analysis'], offloaded['index']
+                            if plan_data is None:
+                                plan_data = analysis.plan_data
+                    del plan_bytes
+                    
+                    if plan_data is None:
                         # We have a file object, need to validate and parse it
                         plan_data, error_msg = upload_component.validate_and_parse_file(plan_input)
                         if plan_data is None:
@@ -72,49 +111,64 @@ class PlanProcessor:
                                     "plan data validation"
                                 )
                             return None
-                        file_size = len(json.dumps(plan_data))
                     
                     # Plan data is now validated and secured
                     st.success("✅ **Plan data processed successfully!**")
                 
-                # Stage 2: Validation - Parse the uploaded file using existing PlanParser
-                stage_tracker.next_stage()  # Show validation progress
-                with self.performance_optimizer.performance_monitor("plan_parser_init"):
-                    parser = PlanParser(plan_data)
+                # Compare with the previously analyzed plan; the structural hashes
+                # of its resources also key the assessment cache
+                with self.performance_optimizer.performance_monitor("plan_comparison"):
+                    plan_index, plan_comparison = self._track_plan_changes(plan_data, plan_key, plan_index)
+                
+                # Reuse the analysis prefetched by the TFE run watcher for this exact plan
+                enhanced_risk_assessor = (
+                    EnhancedRiskAssessment(assessment_cache=self._get_assessment_cache()) if use_enhanced else None
+                )
+                # count/for_each groups are built once per plan and reused by reruns
+                instance_groups = self._get_cached_instance_groups(plan_index)
+                if analysis is None:
+                    analysis = self._get_prefetched_analysis(plan_data, use_enhanced)
                 
-                # Stage 3: Extraction - Extract metrics using existing data structures
-                stage_tracker.next_stage()  # Show extraction progress
-                with self.performance_optimizer.performance_monitor("data_extraction"):
-                    summary = parser.get_summary()
-                    resource_changes = parser.get_resource_changes()
-                    resource_types = parser.get_resource_types()
-                    debug_info = parser.get_debug_info()
+                if analysis is None:
+                    # Stages 2-4: parsing, extraction and risk assessment via the headless engine
+                    analysis = analyze_plan(
+                        plan_data,
+                        enhanced=use_enhanced,
+                        include_security=False,
+                        progress=lambda stage, index, total: stage_tracker.next_stage(),
+                        metrics=self.performance_optimizer,
+                        parser_factory=functools.partial(PlanParser, instance_groups=instance_groups),
+                        risk_assessor=enhanced_risk_assessor,
+                        content_hashes=plan_index.root_hashes() if use_enhanced else None
+                    )
+                else:
+                    # Stages 2-4 were already completed elsewhere
+                    for _ in range(3):
+                        stage_tracker.next_stage()
                 
-                # Stage 4: Risk Assessment - Risk assessment with error handling and fallback
-                stage_tracker.next_stage()  # Show risk assessment progress
-                with self.performance_optimizer.performance_monitor("risk_assessment"):
+                if analysis.risk_error is not None:
+                    # Enhanced assessment failed; the engine fell back to basic assessment
+                    error_handler.handle_processing_error(analysis.risk_error, "enhanced risk assessment")
                     enhanced_risk_assessor = None
-                    if ENHANCED_FEATURES_AVAILABLE and enable_multi_cloud:
-                        try:
-                            enhanced_risk_assessor = EnhancedRiskAssessment()
-                            enhanced_risk_result = enhanced_risk_assessor.assess_plan_risk(resource_changes, plan_data)
-                            risk_summary = enhanced_risk_result  # For compatibility
-                        except Exception as e:
-                            error_handler.handle_processing_error(e, "enhanced risk assessment")
-                            from utils.risk_assessment import RiskAssessment
-                            risk_assessor = RiskAssessment()
-                            risk_summary = risk_assessor.assess_plan_risk(resource_changes)
-                            enhanced_risk_result = risk_summary
-                            enhanced_risk_assessor = None
-                    else:
-                        # Use basic risk assessment
-                        from utils.risk_assessment import RiskAssessment
-                        risk_assessor = RiskAssessment()
-                        risk_summary = risk_assessor.assess_plan_risk(resource_changes)
-                        enhanced_risk_result = risk_summary
-
-                    # Chart generator using existing ChartGenerator
-                    chart_gen = ChartGenerator()
+                
+                parser = analysis.parser
+                if instance_groups is None and hasattr(parser, 'get_instance_groups'):
+                    instance_groups = parser.get_instance_groups()
+                    if isinstance(instance_groups, InstanceGroups):
+                        st.session_state['instance_groups_cache'] = {'index': plan_index, 'groups': instance_groups}
+                summary = analysis.summary
+                resource_changes = analysis.resource_changes
+                resource_types = analysis.resource_types
+                debug_info = analysis.debug_info
+                enhanced_risk_result = analysis.risk_result
+                risk_summary = enhanced_risk_result  # For compatibility
+                
+                # Module hierarchy with per-module aggregates
+                with self.performance_optimizer.performance_monitor("module_trie"):
+                    module_trie = self._get_module_trie(resource_changes, enhanced_risk_result)
+                
+                # Chart generator using existing ChartGenerator
+                chart_gen = ChartGenerator()
                 
                 # Mark processing as complete
                 stage_tracker.complete()
@@ -151,5 +205,231 @@ class PlanProcessor:
             'enhanced_risk_result': enhanced_risk_result,
             'risk_summary': risk_summary,
             'chart_gen': chart_gen,
+            'plan_comparison': plan_comparison,
+            'module_trie': module_trie,
             'performance_optimizer': self.performance_optimizer  # Include for components to use
-        }
\ No newline at end of file
+        }
+    
+    def _get_assessment_cache(self):
+        """
+        Get the session's per-resource assessment cache.
+        
+        Resources unchanged since an earlier plan in this session reuse their
+        risk assessment instead of being assessed again.
+        
+        Returns:
+            AssessmentCache stored in session state
+        """
+        cache = st.session_state.get('plan_assessment_cache')
+        if not isinstance(cache, AssessmentCache):
+            cache = AssessmentCache()
+            st.session_state['plan_assessment_cache'] = cache
+        return cache
+    
+    def _track_plan_changes(self, plan_data, plan_key=None, plan_index=None):
+        """
+        Compare a plan with the previous distinct plan analyzed in this session.
+        
+        Streamlit reruns process the same plan again; those keep the index and
+        comparison computed when the plan was first seen. Reruns are recognized
+        by ``plan_key`` without hashing the plan's resources.
+        
+        Args:
+            plan_data: Plan data being processed
+            plan_key: Digest of the plan's JSON (None to compare resource hashes)
+            plan_index: PlanIndex of the plan if already computed (e.g. by a worker process)
+            
+        Returns:
+            Tuple of the plan's PlanIndex and the PlanComparison with the
+            previous plan (None for the first plan)
+        """
+        tracked = st.session_state.get('plan_change_tracking')
+        has_index = isinstance(tracked, dict) and tracked.get('current_index') is not None
+        if has_index and plan_key is not None and tracked.get('plan_key') == plan_key:
+            return tracked['current_index'], tracked.get('comparison')
+        
+        current_index = plan_index if plan_index is not None else PlanIndex.from_plan(plan_data)
+        if has_index:
+            if tracked['current_index'].hashes == current_index.hashes:
+                tracked['plan_key'] = plan_key
+                return tracked['current_index'], tracked.get('comparison')
+            comparison = compare_plans(tracked['current_index'], current_index)
+        else:
+            comparison = None
+        
+        st.session_state['plan_change_tracking'] = {
+            'current_index': current_index,
+            'plan_key': plan_key,
+            'comparison': comparison
+        }
+        return current_index, comparison
+    
+    def _get_cached_instance_groups(self, plan_index):
+        """
+        Get the instance groups built for a plan on an earlier rerun.
+        
+        Args:
+            plan_index: PlanIndex of the plan being processed
+            
+        Returns:
+            InstanceGroups of the plan, or None if they were not built yet
+        """
+        cached = st.session_state.get('instance_groups_cache')
+        if isinstance(cached, dict) and cached.get('index') is plan_index:
+            return cached['groups']
+        return None
+    
+    def _get_module_trie(self, resource_changes, risk_result):
+        """
+        Get the module hierarchy trie of the current plan.
+        
+        The trie is built once per plan and risk mode; Streamlit reruns of
+        the same plan reuse it.
+        
+        Args:
+            resource_changes: Normalized resource changes
+            risk_result: Plan risk assessment result
+            
+        Returns:
+            ModuleTrie for the plan
+        """
+        tracked = st.session_state.get('plan_change_tracking')
+        plan_index = tracked.get('current_index') if isinstance(tracked, dict) else None
+        detailed_assessments = risk_result.get('detailed_assessments') if isinstance(risk_result, dict) else None
+        
+        cached = st.session_state.get('module_trie_cache')
+        if (isinstance(cached, dict) and plan_index is not None and cached.get('index') is plan_index
+                and cached.get('detailed') == (detailed_assessments is not None)):
+            return cached['trie']
+        
+        if detailed_assessments is not None:
+            risk_levels = {assessment['address']: assessment['level'] for assessment in detailed_assessments}
+        else:
+            from utils.risk_assessment import RiskAssessment
+            basic_assessor = RiskAssessment()
+            risk_levels = {
+                change['address']: basic_assessor.assess_resource_risk(change)['level']
+                for change in resource_changes
+                if change.get('change', {}).get('actions')
+            }
+        
+        module_trie = ModuleTrie.build(resource_changes, risk_levels)
+        st.session_state['module_trie_cache'] = {
+            'index': plan_index,
+            'detailed': detailed_assessments is not None,
+            'trie': module_trie
+        }
+        return module_trie
+    
+    def _analyze_in_worker(self, plan_bytes, plan_key, use_enhanced):
+        """
+        Parse, index and analyze a large plan in the worker pool.
+        
+        The Streamlit process only hands over the raw bytes; the parser view,
+        resource changes and PlanIndex are built from the columnar change
+        table returned by the worker. Streamlit reruns of the same plan reuse
+        the result instead of submitting it again.
+        
+        Args:
+            plan_bytes: Plan JSON bytes (the upload as received)
+            plan_key: Digest of the plan bytes
+            use_enhanced: Whether enhanced risk assessment is requested
+            
+        Returns:
+            Dictionary with the AnalysisResult ('analysis') and PlanIndex
+            ('index') of the plan, or with the worker's 'error' and
+            'validation_issues'; None to analyze in-process
+        """
+        if self.worker_pool is None or not self.worker_pool.should_offload(len(plan_bytes)):
+            return None
+        
+        cached = st.session_state.get('worker_analysis_cache')
+        if isinstance(cached, dict) and cached.get('plan_key') == plan_key and cached.get('enhanced') == use_enhanced:
+            return cached['result']
+        
+        try:
+            with self.performance_optimizer.performance_monitor("worker_analysis"):
+                worker_result = self.worker_pool.analyze(plan_bytes, enhanced=use_enhanced)
+        except Exception:
+            # Worker failures fall back to in-process analysis
+            return None
+        
+        if worker_result.get('error'):
+            result = {'error': worker_result['error'], 'validation_issues': worker_result.get('validation_issues', [])}
+        else:
+            result = self._build_worker_analysis(worker_result)
+        st.session_state['worker_analysis_cache'] = {'plan_key': plan_key, 'enhanced': use_enhanced, 'result': result}
+        return result
+    
+    def _build_worker_analysis(self, worker_result):
+        """
+        Build the AnalysisResult of a plan analyzed in a worker process.
+        
+        Args:
+            worker_result: Result of PlanWorkerPool.analyze()
+            
+        Returns:
+            Dictionary with the AnalysisResult ('analysis'), PlanIndex ('index')
+            and structure issues ('validation_issues') of the plan
+        """
+        parser = ColumnarPlanParser(
+            worker_result['table'],
+            worker_result['sections'],
+            ChangeAggregate.from_dict(worker_result['change_aggregate']),
+            worker_result['resource_types'],
+            worker_result['debug_info'],
+            worker_result['detected_providers']
+        )
+        risk_error = worker_result.get('risk_error')
+        return {
+            'analysis': AnalysisResult(
+                plan_data=parser.plan_data,
+                parser=parser,
+                summary=worker_result['summary'],
+                resource_changes=parser.get_resource_changes(),
+                resource_types=worker_result['resource_types'],
+                debug_info=worker_result['debug_info'],
+                risk_result=worker_result['risk_result'],
+                enhanced=worker_result['enhanced'],
+                risk_error=RuntimeError(risk_error) if risk_error else None
+            ),
+            'index': parser.get_plan_index(),
+            'validation_issues': worker_result['validation_issues']
+        }
+    
+    def _report_worker_validation(self, worker_result, upload_component, error_handler):
+        """
+        Show the structure issues the worker found in a plan.
+        
+        Args:
+            worker_result: Result of _analyze_in_worker()
+            upload_component: UploadComponent instance
+            error_handler: ErrorHandler instance
+            
+        Returns:
+            Error message if the plan cannot be analyzed, None otherwise
+        """
+        issues = worker_result.get('validation_issues')
+        can_proceed = 'error' not in worker_result
+        if issues:
+            error_msg = upload_component.report_structure_issues(issues, can_proceed, error_handler)
+            if error_msg:
+                return error_msg
+        return None if can_proceed else worker_result['error']
+    
+    def _get_prefetched_analysis(self, plan_data, use_enhanced):
+        """
+        Get the analysis pre-computed by the TFE run watcher for this plan.
+        
+        Args:
+            plan_data: Plan data about to be processed
+            use_enhanced: Whether enhanced risk assessment is requested
+            
+        Returns:
+            Prefetched AnalysisResult or None if not available for this plan
+        """
+        prefetched = st.session_state.get('tfe_prefetched_analysis')
+        if (isinstance(prefetched, AnalysisResult) and prefetched.plan_data is plan_data
+                and prefetched.enhanced == use_enhanced):
+            return prefetched
+        return None
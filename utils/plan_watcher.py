@@ -0,0 +1,301 @@
+"""
+Plan Directory Watcher
+
+Watches a directory that CI runners refresh with plan JSON files and keeps a
+portfolio of up-to-date analyses with incremental re-analysis:
+
+- a file is only re-read when its mtime or size changed, and only
+  re-analyzed when its content hash changed;
+- for a re-analyzed file, the previous per-resource index is kept, so a
+  resource whose address and structural hash are unchanged reuses its
+  previous risk assessment instead of being assessed again;
+- plan totals are rebuilt from the per-resource assessments with the
+  mergeable risk aggregate.
+
+Steady-state risk work is therefore proportional to what actually changed.
+Security analysis is not incremental: it re-runs on every re-analyzed
+file, since validating a reused result would need the same per-resource
+hash that the compiled rules cost to evaluate.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.batch_analysis import PortfolioReport, build_plan_summary
+from utils.structural_hash import resource_hash
+
+
+DEFAULT_PATTERN = '*.json'
+DEFAULT_POLL_INTERVAL = 5.0
+
+# Change kinds reported by scan()
+CHANGE_ADDED = 'added'
+CHANGE_MODIFIED = 'modified'
+CHANGE_REMOVED = 'removed'
+
+# address -> (content hash, risk assessment)
+ResourceIndex = Dict[str, Tuple[str, Dict[str, Any]]]
+
+
+@dataclass
+class WatchedFile:
+    """Last known state of one plan file"""
+    path: str
+    mtime_ns: int
+    size: int
+    content_hash: str
+    summary: Dict[str, Any]
+    index: ResourceIndex = field(default_factory=dict)
+    provider_context: Tuple[str, ...] = ()
+
+
+@dataclass
+class WatchStats:
+    """Work done by the watcher, for monitoring steady-state cost"""
+    scans: int = 0
+    files_read: int = 0
+    files_analyzed: int = 0
+    resources_assessed: int = 0
+    resources_reused: int = 0
+
+
+class IncrementalPlanAnalyzer:
+    """
+    Analyzes plans while reusing per-resource assessments from a previous index.
+
+    Produces the same compact summary as batch analysis.
+    """
+
+    def __init__(self, include_security: bool = True):
+        """
+        Initialize the analyzer.
+
+        Args:
+            include_security: Run security and compliance analysis
+        """
+        from utils.provider_factory import MultiCloudProviderFactory, MultiCloudRiskAssessment
+
+        self.include_security = include_security
+        self.provider_factory = MultiCloudProviderFactory()
+        self.risk_assessment = MultiCloudRiskAssessment(self.provider_factory)
+
+    def analyze(self, path: str, plan_data: Dict[str, Any],
+                previous: Optional[WatchedFile] = None,
+                stats: Optional[WatchStats] = None) -> Tuple[Dict[str, Any], ResourceIndex, Tuple[str, ...]]:
+        """
+        Analyze a plan, reusing unchanged resource assessments.
+
+        Args:
+            path: Path of the plan file (used in the summary)
+            plan_data: Parsed plan
+            previous: Previous state of the same file, if any
+            stats: Optional counters updated with assessed/reused resources
+
+        Returns:
+            Tuple of (plan summary, new resource index, provider context)
+        """
+        from parsers.plan_parser import PlanParser
+        from utils.plan_aggregates import RiskAggregate
+
+        start = time.perf_counter()
+        parser = PlanParser(plan_data)
+        provider_info = self.provider_factory.detect_and_create_providers(plan_data)
+
+        # Assessments depend on which cloud providers are active in the plan
+        provider_context = tuple(sorted(provider_info['active_providers']))
+        previous_index: ResourceIndex = {}
+        if previous is not None and previous.provider_context == provider_context:
+            previous_index = previous.index
+
+        index: ResourceIndex = {}
+        assessments = []
+        risk_aggregate = RiskAggregate()
+        for change in plan_data.get('resource_changes', []):
+            if not self.risk_assessment.is_actionable_change(change):
+                continue
+
+            address = change.get('address', '')
+            content_hash = resource_hash(change)
+            cached = previous_index.get(address)
+            if cached is not None and cached[0] == content_hash:
+                assessment = cached[1]
+                if stats is not None:
+                    stats.resources_reused += 1
+            else:
+                assessment = self.risk_assessment.assess_resources([change], provider_info)[0]
+                if stats is not None:
+                    stats.resources_assessed += 1
+
+            index[address] = (content_hash, assessment)
+            assessments.append(assessment)
+            risk_aggregate.add_assessment(assessment)
+
+        schedule = self.risk_assessment.schedule_deployment(
+            plan_data, assessments, provider_info, parser.get_dependency_graph()
+        )
+        risk_result = self.risk_assessment.finalize_overall_risk(
+            risk_aggregate, provider_info, schedule.makespan_seconds
+        )
+
+        security = None
+        if self.include_security:
+            from utils.security_analyzer import SecurityAnalyzer
+            security = SecurityAnalyzer().get_security_dashboard_data(parser.get_resource_changes())
+
+        summary = build_plan_summary(
+            path,
+            terraform_version=plan_data.get('terraform_version', 'Unknown'),
+            changes=parser.get_change_aggregate(),
+            providers=dict(parser.detected_providers),
+            risk_result=risk_result,
+            risk=risk_aggregate,
+            security=security,
+            duration=time.perf_counter() - start
+        )
+        return summary, index, provider_context
+
+
+class PlanDirectoryWatcher:
+    """
+    Polls a directory of plan files and re-analyzes only what changed.
+
+    Polling (rather than OS file events) works the same on local disks and
+    on the network shares runners usually write to.
+    """
+
+    def __init__(self, directory: str, pattern: str = DEFAULT_PATTERN,
+                 analyzer: Optional[IncrementalPlanAnalyzer] = None):
+        """
+        Initialize the watcher.
+
+        Args:
+            directory: Directory to watch (not recursive)
+            pattern: Glob pattern of plan file names
+            analyzer: Analyzer used for changed files
+        """
+        self.directory = directory
+        self.pattern = pattern
+        self.analyzer = analyzer or IncrementalPlanAnalyzer()
+        self.stats = WatchStats()
+        self._files: Dict[str, WatchedFile] = {}
+        self._errors: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def scan(self) -> List[Dict[str, Any]]:
+        """
+        Check the directory once and re-analyze changed files.
+
+        Returns:
+            One event per added, modified or removed file with its new summary
+        """
+        events = []
+        seen = set()
+        self.stats.scans += 1
+
+        for entry in sorted(os.scandir(self.directory), key=lambda item: item.name):
+            if not entry.is_file() or not fnmatch(entry.name, self.pattern):
+                continue
+            seen.add(entry.path)
+            event = self._check_file(entry.path, entry.stat())
+            if event is not None:
+                events.append(event)
+
+        with self._lock:
+            for path in sorted(set(self._files) - seen):
+                del self._files[path]
+                events.append({'change': CHANGE_REMOVED, 'file': path})
+            for path in sorted(set(self._errors) - seen):
+                del self._errors[path]
+
+        return events
+
+    def watch(self, on_change: Callable[[List[Dict[str, Any]]], None],
+              interval: float = DEFAULT_POLL_INTERVAL,
+              stop_event: Optional[threading.Event] = None) -> None:
+        """
+        Scan repeatedly until stopped.
+
+        Args:
+            on_change: Called with the events of every scan that found changes
+            interval: Seconds between scans
+            stop_event: Event that ends the loop when set
+        """
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            events = self.scan()
+            if events:
+                on_change(events)
+            stop_event.wait(interval)
+
+    def get_summaries(self) -> List[Dict[str, Any]]:
+        """Current summaries of all analyzed files, including errors."""
+        with self._lock:
+            summaries = [watched.summary for watched in self._files.values()]
+            summaries.extend({'file': error['file'], 'error': error['error']} for error in self._errors.values())
+        return sorted(summaries, key=lambda summary: summary['file'])
+
+    def portfolio(self) -> PortfolioReport:
+        """Portfolio report over the current state of the directory."""
+        report = PortfolioReport()
+        for summary in self.get_summaries():
+            report.add(summary)
+        return report
+
+    def _check_file(self, path: str, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+        """Re-analyze one file if its content changed since the last scan."""
+        with self._lock:
+            previous = self._files.get(path)
+            error = self._errors.get(path)
+
+        if previous is not None and previous.mtime_ns == stat.st_mtime_ns and previous.size == stat.st_size:
+            return None
+        if error is not None and error.get('mtime_ns') == stat.st_mtime_ns:
+            return None
+
+        try:
+            with open(path, 'rb') as plan_file:
+                raw = plan_file.read()
+        except OSError:
+            # Removed or replaced between listing and reading; retry next scan
+            return None
+        self.stats.files_read += 1
+
+        content_hash = hashlib.sha256(raw).hexdigest()
+        if previous is not None and previous.content_hash == content_hash:
+            # Touched but identical: remember the new mtime, skip analysis
+            with self._lock:
+                previous.mtime_ns = stat.st_mtime_ns
+                previous.size = stat.st_size
+            return None
+
+        try:
+            plan_data = json.loads(raw)
+            if not isinstance(plan_data, dict):
+                raise ValueError("Plan JSON must be an object")
+            summary, index, provider_context = self.analyzer.analyze(path, plan_data, previous, self.stats)
+        except Exception as e:
+            # Often a file caught mid-write; it is retried once its mtime changes
+            with self._lock:
+                self._errors[path] = {'file': path, 'error': str(e), 'mtime_ns': stat.st_mtime_ns}
+                self._files.pop(path, None)
+            return {'change': CHANGE_MODIFIED if previous else CHANGE_ADDED, 'file': path, 'error': str(e)}
+
+        self.stats.files_analyzed += 1
+        with self._lock:
+            self._errors.pop(path, None)
+            self._files[path] = WatchedFile(
+                path=path,
+                mtime_ns=stat.st_mtime_ns,
+                size=stat.st_size,
+                content_hash=content_hash,
+                summary=summary,
+                index=index,
+                provider_context=provider_context
+            )
+        return {'change': CHANGE_MODIFIED if previous else CHANGE_ADDED, 'file': path, 'summary': summary}
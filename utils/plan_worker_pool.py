@@ -0,0 +1,421 @@
+"""
+Plan Worker Pool
+
+Offloads everything CPU-bound about very large plans (JSON parsing,
+validation, structural hashing, summaries, instance groups and per-resource
+risk scoring) to a pool of worker processes so that it does not hold the GIL
+of the Streamlit server process (which would freeze every other session).
+
+The Streamlit process hands over the raw upload bytes and gets back summaries
+and a columnar table of the resource changes, from which
+parsers.columnar_plan.ColumnarPlanParser answers the dashboard's queries.
+It never decodes the plan as a whole.
+
+Data crosses the process boundary through ``multiprocessing.shared_memory``
+instead of pickling the plan tree:
+
+- the parent writes the plan JSON bytes into a shared block once;
+- the worker parses it, runs the analysis and writes the resource change
+  table and the per-resource risk assessments back as compact columnar
+  blocks (UTF-8 string blobs with int64 offsets, float64 numeric columns);
+- only small summary dictionaries and the block layouts are pickled.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+# Plans smaller than this are analyzed in-process; the handoff is not worth it
+DEFAULT_OFFLOAD_THRESHOLD_BYTES = 5 * 1024 * 1024
+DEFAULT_WORKER_TIMEOUT = 300.0
+
+# Kinds of assessment columns: UTF-8 strings, lists of strings, float64 numbers
+_STRING, _LIST, _FLOAT = 'string', 'list', 'float'
+# Separator for list-valued columns (never present in addresses or factor names)
+_LIST_SEPARATOR = '\x1f'
+
+
+def _column_kind(name: str, values: List[Any]) -> str:
+    """
+    Choose the columnar encoding of one assessment key.
+
+    Raises:
+        ValueError: If the values fit none of the column kinds
+    """
+    if all(isinstance(value, str) for value in values):
+        return _STRING
+    if all(isinstance(value, list) and all(isinstance(item, str) and item and _LIST_SEPARATOR not in item
+                                           for item in value) for value in values):
+        return _LIST
+    if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+        return _FLOAT
+    raise ValueError(f"Assessment key '{name}' has values that cannot be stored in a column")
+
+
+@dataclass
+class ColumnarAssessments:
+    """Per-resource records (risk assessments, plan changes) stored column by column"""
+    kinds: Dict[str, str]
+    columns: Dict[str, Union[List[str], List[List[str]], np.ndarray]]
+    rows: int
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> 'ColumnarAssessments':
+        """
+        Build columns from assessment dictionaries.
+
+        The columns are derived from the records' keys, so no key is ever
+        dropped; every record must have every key.
+
+        Args:
+            records: Assessments as produced by the risk assessment
+
+        Returns:
+            ColumnarAssessments with one entry per record
+
+        Raises:
+            ValueError: If a key is missing from some records or its values
+                are not strings, lists of strings or numbers
+        """
+        names = list(dict.fromkeys(name for record in records for name in record))
+        kinds: Dict[str, str] = {}
+        columns: Dict[str, Union[List[str], List[List[str]], np.ndarray]] = {}
+        for name in names:
+            values = [record.get(name) for record in records]
+            kind = kinds[name] = _column_kind(name, values)
+            columns[name] = np.array(values, dtype=np.float64) if kind == _FLOAT else values
+        return cls(kinds=kinds, columns=columns, rows=len(records))
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        Rebuild assessment dictionaries.
+
+        Returns:
+            List of assessments with the keys (in the same order) of the
+            records the columns were built from
+        """
+        if not self.kinds:
+            return [{} for _ in range(self.rows)]
+        names = list(self.kinds)
+        values = [
+            self.columns[name].tolist() if kind == _FLOAT else self.columns[name]
+            for name, kind in self.kinds.items()
+        ]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+    def to_shared_memory(self) -> Dict[str, Any]:
+        """
+        Write the columns into a new shared memory block.
+
+        Ownership of the block passes to whoever calls from_shared_memory().
+
+        Returns:
+            Picklable layout describing the block
+        """
+        segments: List[Tuple[str, bytes]] = []
+        for name, kind in self.kinds.items():
+            if kind == _STRING:
+                segments.extend(_encode_strings(name, self.columns[name]))
+            elif kind == _LIST:
+                joined = [_LIST_SEPARATOR.join(values) for values in self.columns[name]]
+                segments.extend(_encode_strings(name, joined))
+            else:
+                segments.append((f'{name}.values', self.columns[name].tobytes()))
+
+        layout = _write_segments(segments, rows=self.rows)
+        layout['kinds'] = dict(self.kinds)
+        return layout
+
+    @classmethod
+    def from_shared_memory(cls, layout: Dict[str, Any]) -> 'ColumnarAssessments':
+        """
+        Read columns from a shared memory block, then release and unlink it.
+
+        Args:
+            layout: Layout returned by to_shared_memory()
+
+        Returns:
+            ColumnarAssessments copied out of the block
+        """
+        rows = layout['rows']
+        kinds = layout['kinds']
+        segments = layout['segments']
+        block = shared_memory.SharedMemory(name=layout['name'])
+        try:
+            buf = block.buf
+
+            def read(key: str) -> bytes:
+                start, size = segments[key]
+                return bytes(buf[start:start + size])
+
+            columns: Dict[str, Union[List[str], List[List[str]], np.ndarray]] = {}
+            for name, kind in kinds.items():
+                if kind == _FLOAT:
+                    columns[name] = np.frombuffer(read(f'{name}.values'), dtype=np.float64)
+                    continue
+                decoded = _decode_strings(read(f'{name}.offsets'), read(f'{name}.data'))
+                if kind == _LIST:
+                    decoded = [value.split(_LIST_SEPARATOR) if value else [] for value in decoded]
+                columns[name] = decoded
+            del buf
+        finally:
+            block.close()
+            block.unlink()
+
+        return cls(kinds=kinds, columns=columns, rows=rows)
+
+
+def _encode_strings(name: str, values: List[str]) -> List[Tuple[str, bytes]]:
+    """Encode a string column as an int64 offsets array and a UTF-8 blob."""
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return [(f'{name}.offsets', offsets.tobytes()), (f'{name}.data', b''.join(encoded))]
+
+
+def _decode_strings(offsets_bytes: bytes, data: bytes) -> List[str]:
+    """Decode a string column written by _encode_strings()."""
+    offsets = np.frombuffer(offsets_bytes, dtype=np.int64).tolist()
+    return [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+
+
+def _write_segments(segments: List[Tuple[str, bytes]], rows: int) -> Dict[str, Any]:
+    """Copy named byte segments into one shared memory block."""
+    total = sum(len(data) for _, data in segments)
+    block = shared_memory.SharedMemory(create=True, size=max(total, 1))
+    layout_segments = {}
+    position = 0
+    for key, data in segments:
+        block.buf[position:position + len(data)] = data
+        layout_segments[key] = (position, len(data))
+        position += len(data)
+
+    layout = {'name': block.name, 'rows': rows, 'segments': layout_segments}
+    _release_ownership(block)
+    block.close()
+    return layout
+
+
+def _release_ownership(block: shared_memory.SharedMemory) -> None:
+    """
+    Stop this process's resource tracker from unlinking a block it created.
+
+    The reader unlinks the block once it has copied the data out.
+    """
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(block._name, 'shared_memory')
+    except Exception:
+        pass
+
+
+def _share_bytes(data: bytes) -> Tuple[shared_memory.SharedMemory, Dict[str, Any]]:
+    """Copy raw bytes into a shared block owned by the caller."""
+    block = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    block.buf[:len(data)] = data
+    return block, {'name': block.name, 'size': len(data)}
+
+
+def analyze_shared_plan(source: Dict[str, Any], enhanced: bool) -> Dict[str, Any]:
+    """
+    Parse, index and analyze a plan stored in shared memory (runs in a worker process).
+
+    Args:
+        source: Descriptor of the shared block holding the plan JSON bytes
+        enhanced: Whether to use the enhanced multi-cloud risk assessment
+
+    Returns:
+        Small summary dictionaries, the plan sections the dashboard reads, and
+        the layouts of the columnar change table and risk assessments; or a
+        dictionary with an 'error' message if the plan cannot be analyzed
+    """
+    import json
+    from parsers.columnar_plan import STATE_SECTIONS, build_change_table
+    from utils.analysis_engine import analyze_plan, has_minimal_plan_structure, load_plan, plan_structure_issues
+    from utils.plan_comparison import PlanIndex
+
+    block = shared_memory.SharedMemory(name=source['name'])
+    try:
+        plan_bytes = bytes(block.buf[:source['size']])
+    finally:
+        block.close()
+
+    try:
+        plan_data = load_plan(plan_bytes)
+    except json.JSONDecodeError:
+        return {'error': "Invalid JSON format"}
+    except ValueError as e:
+        return {'error': str(e)}
+    del plan_bytes
+
+    validation_issues = plan_structure_issues(plan_data)
+    if validation_issues and not has_minimal_plan_structure(plan_data):
+        return {'error': "File structure is incompatible with analysis", 'validation_issues': validation_issues}
+
+    plan_index = PlanIndex.from_plan(plan_data)
+    analysis = analyze_plan(plan_data, enhanced=enhanced, include_security=False)
+    parser = analysis.parser
+    risk_result = analysis.risk_result
+
+    assessments_layout = None
+    if 'detailed_assessments' in risk_result:
+        assessments = ColumnarAssessments.from_records(risk_result.pop('detailed_assessments'))
+        assessments_layout = assessments.to_shared_memory()
+
+    return {
+        'error': None,
+        'validation_issues': validation_issues,
+        'sections': {key: value for key, value in plan_data.items() if key not in STATE_SECTIONS},
+        'table_layout': build_change_table(parser, plan_index).to_shared_memory(),
+        'change_aggregate': parser.get_change_aggregate().to_dict(),
+        'detected_providers': dict(parser.detected_providers),
+        'summary': analysis.summary,
+        'resource_types': analysis.resource_types,
+        'debug_info': analysis.debug_info,
+        'risk_result': risk_result,
+        'assessments_layout': assessments_layout,
+        'enhanced': analysis.enhanced,
+        'risk_error': str(analysis.risk_error) if analysis.risk_error is not None else None
+    }
+
+
+class PlanWorkerPool:
+    """
+    Process pool for plan analysis with shared-memory result handoff.
+
+    Workers are started with the 'spawn' method because the Streamlit server
+    is multi-threaded, where forking is unsafe.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD_BYTES,
+                 timeout: float = DEFAULT_WORKER_TIMEOUT):
+        """
+        Initialize the worker pool.
+
+        Args:
+            max_workers: Number of worker processes (defaults to CPU count)
+            offload_threshold: Minimum plan size in bytes worth offloading
+            timeout: Maximum seconds to wait for a worker result
+        """
+        self.max_workers = max_workers
+        self.offload_threshold = offload_threshold
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def should_offload(self, plan_size: int) -> bool:
+        """Whether a plan of this size should be analyzed in a worker."""
+        return plan_size >= self.offload_threshold
+
+    def submit(self, plan_json: Union[str, bytes], enhanced: bool = True) -> Future:
+        """
+        Start analyzing a plan in a worker process.
+
+        Args:
+            plan_json: Plan JSON text or bytes
+            enhanced: Whether to use the enhanced multi-cloud risk assessment
+
+        Returns:
+            Future resolving to the analysis dictionary (see analyze())
+        """
+        if isinstance(plan_json, str):
+            plan_json = plan_json.encode('utf-8')
+
+        block, source = _share_bytes(plan_json)
+        try:
+            future = self._get_executor().submit(analyze_shared_plan, source, enhanced)
+        except Exception:
+            block.close()
+            block.unlink()
+            raise
+
+        result_future: Future = Future()
+
+        def handoff(done: Future) -> None:
+            # The worker has copied the plan; release the input block
+            block.close()
+            block.unlink()
+            try:
+                result_future.set_result(_collect_result(done.result()))
+            except Exception as e:
+                result_future.set_exception(e)
+
+        future.add_done_callback(handoff)
+        return result_future
+
+    def analyze(self, plan_json: Union[str, bytes], enhanced: bool = True) -> Dict[str, Any]:
+        """
+        Analyze a plan in a worker process and wait for the result.
+
+        Waiting releases the GIL, so other sessions keep running meanwhile.
+
+        Args:
+            plan_json: Plan JSON text or bytes
+            enhanced: Whether to use the enhanced multi-cloud risk assessment
+
+        Returns:
+            Dictionary with summary, resource_types, debug_info, risk_result
+            (including detailed_assessments), enhanced, risk_error, the change
+            table (ColumnarAssessments, see parsers.columnar_plan), sections,
+            change_aggregate, detected_providers and validation_issues; or
+            with an 'error' message if the plan is not a valid plan
+        """
+        return self.submit(plan_json, enhanced).result(timeout=self.timeout)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the process pool on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+
+def _collect_result(worker_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Read the change table and columnar assessments of a worker result from shared memory."""
+    table_layout = worker_result.pop('table_layout', None)
+    if table_layout is not None:
+        worker_result['table'] = ColumnarAssessments.from_shared_memory(table_layout)
+    layout = worker_result.pop('assessments_layout', None)
+    if layout is not None:
+        assessments = ColumnarAssessments.from_shared_memory(layout)
+        worker_result['risk_result']['detailed_assessments'] = assessments.to_records()
+    return worker_result
+
+
+_shared_pool: Optional[PlanWorkerPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_plan_worker_pool(max_workers: Optional[int] = None) -> PlanWorkerPool:
+    """
+    Get the process-wide worker pool shared by all dashboard sessions.
+
+    Args:
+        max_workers: Number of worker processes used when the pool is created
+
+    Returns:
+        Shared PlanWorkerPool
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = PlanWorkerPool(max_workers=max_workers)
+        return _shared_pool
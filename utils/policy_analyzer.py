@@ -0,0 +1,353 @@
+"""
+Policy Analyzer
+
+Structured checks of policy documents embedded in resource changes.
+
+IAM, bucket, key and queue policies appear in ``change.after`` as JSON
+strings, and the same policy text is often repeated across hundreds of
+resources. Each distinct policy string is parsed and checked once; the
+findings are cached by the digest of the text and shared by the security
+analysis and the risk assessment.
+
+AWS policy documents (``Statement`` lists) and GCP IAM policies
+(``bindings`` lists, e.g. ``policy_data``) are recognized. Checks cover
+wildcard actions, ``NotAction`` grants, wildcard resources, public
+principals and trust or public grants without conditions. Only ``Allow``
+statements are checked.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from utils.attribute_diff import format_path
+
+
+# Policy checks
+CHECK_WILDCARD_ACTION = 'wildcard_action'
+CHECK_NOT_ACTION = 'not_action'
+CHECK_WILDCARD_RESOURCE = 'wildcard_resource'
+CHECK_PUBLIC_PRINCIPAL = 'public_principal'
+CHECK_MISSING_CONDITION = 'missing_condition'
+
+# Findings of these severities become risk factors of the resource
+RISK_FACTOR_SEVERITIES = ('critical', 'high')
+
+POLICY_RISK_FACTORS = {
+    CHECK_WILDCARD_ACTION: 'Policy allows wildcard actions',
+    CHECK_NOT_ACTION: 'Policy allows all but the listed actions',
+    CHECK_WILDCARD_RESOURCE: 'Policy applies to all resources',
+    CHECK_PUBLIC_PRINCIPAL: 'Policy grants public access',
+    CHECK_MISSING_CONDITION: 'Policy grant has no conditions'
+}
+
+PUBLIC_MEMBERS = frozenset({'allUsers', 'allAuthenticatedUsers'})
+PRIMITIVE_ROLES = frozenset({'roles/owner', 'roles/editor'})
+FEDERATED_ACTIONS = frozenset({'sts:assumerolewithwebidentity', 'sts:assumerolewithsaml'})
+
+DEFAULT_POLICY_CACHE_ENTRIES = 4096
+
+
+class PolicyFinding(NamedTuple):
+    """One issue found in a policy document"""
+    check: str
+    severity: str
+    description: str
+    statement: str
+
+
+class PolicyAnalysis(NamedTuple):
+    """Checks of one policy document"""
+    valid: bool
+    statement_count: int
+    findings: Tuple[PolicyFinding, ...]
+
+    @property
+    def signature(self) -> Tuple[Tuple[str, str], ...]:
+        """Distinct (check, severity) pairs of the findings, sorted."""
+        return tuple(sorted({(finding.check, finding.severity) for finding in self.findings}))
+
+
+INVALID_POLICY = PolicyAnalysis(False, 0, ())
+
+
+def _as_list(value: Any) -> List[Any]:
+    """Policy elements may be a single value or a list."""
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def looks_like_policy(text: str) -> bool:
+    """
+    Cheap test whether a string value may be a policy document.
+
+    Args:
+        text: Attribute value
+
+    Returns:
+        True for JSON objects containing a ``Statement`` or ``bindings`` key
+    """
+    return text[:1] == '{' and ('"Statement"' in text or '"bindings"' in text)
+
+
+def find_policy_documents(value: Any, path: Tuple[Any, ...] = ()) -> Iterator[Tuple[str, str]]:
+    """
+    Find the policy documents in a resource value.
+
+    Args:
+        value: ``change.after`` (or any nested part of it)
+        path: Attribute path of ``value``
+
+    Returns:
+        Iterator of (attribute path, policy text)
+    """
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from find_policy_documents(item, path + (key,))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from find_policy_documents(item, path + (index,))
+    elif isinstance(value, str):
+        text = value.strip()
+        if looks_like_policy(text):
+            yield format_path(path), text
+
+
+def _statement_label(statement: Dict[str, Any], index: int) -> str:
+    sid = statement.get('Sid')
+    return f"statement {sid!r}" if isinstance(sid, str) and sid else f"statement {index}"
+
+
+def _public_principal(principal: Any) -> bool:
+    """Whether a Principal element matches everyone."""
+    if principal == '*':
+        return True
+    if isinstance(principal, dict):
+        return any(value == '*' for value in _as_list(principal.get('AWS')))
+    return False
+
+
+def _check_statement(statement: Dict[str, Any], label: str) -> List[PolicyFinding]:
+    """Check one statement of an AWS policy document."""
+    if statement.get('Effect') != 'Allow':
+        return []
+
+    findings = []
+    actions = [action for action in _as_list(statement.get('Action')) if isinstance(action, str)]
+    if '*' in actions:
+        findings.append(PolicyFinding(CHECK_WILDCARD_ACTION, 'critical', "Allows every action", label))
+    else:
+        services = sorted(action[:-2] for action in actions if action.endswith(':*'))
+        if services:
+            findings.append(PolicyFinding(
+                CHECK_WILDCARD_ACTION, 'high', f"Allows every action of {', '.join(services)}", label
+            ))
+
+    if 'NotAction' in statement:
+        findings.append(PolicyFinding(CHECK_NOT_ACTION, 'high', "Allows every action except the listed ones", label))
+
+    if '*' in _as_list(statement.get('Resource')):
+        findings.append(PolicyFinding(CHECK_WILDCARD_RESOURCE, 'medium', "Applies to every resource", label))
+
+    has_condition = bool(statement.get('Condition'))
+    principal = statement.get('Principal')
+    if _public_principal(principal):
+        findings.append(PolicyFinding(CHECK_PUBLIC_PRINCIPAL, 'high', "Grants access to any principal", label))
+        if not has_condition:
+            findings.append(PolicyFinding(
+                CHECK_MISSING_CONDITION, 'critical', "Grants public access without conditions", label
+            ))
+    elif not has_condition and (
+            (isinstance(principal, dict) and 'Federated' in principal)
+            or any(action.lower() in FEDERATED_ACTIONS for action in actions)):
+        findings.append(PolicyFinding(
+            CHECK_MISSING_CONDITION, 'high', "Trusts a federated identity without conditions", label
+        ))
+    return findings
+
+
+def _check_binding(binding: Dict[str, Any], index: int) -> List[PolicyFinding]:
+    """Check one binding of a GCP IAM policy."""
+    role = binding.get('role', '')
+    label = f"binding {role or index}"
+    findings = []
+    if role in PRIMITIVE_ROLES:
+        findings.append(PolicyFinding(CHECK_WILDCARD_ACTION, 'high', f"Grants the primitive role {role}", label))
+
+    public = sorted(PUBLIC_MEMBERS.intersection(member for member in _as_list(binding.get('members'))
+                                                if isinstance(member, str)))
+    if public:
+        findings.append(PolicyFinding(CHECK_PUBLIC_PRINCIPAL, 'high', f"Grants access to {', '.join(public)}", label))
+        if not binding.get('condition'):
+            findings.append(PolicyFinding(
+                CHECK_MISSING_CONDITION, 'critical', "Grants public access without conditions", label
+            ))
+    return findings
+
+
+def analyze_policy_document(text: str) -> PolicyAnalysis:
+    """
+    Parse and check one policy document.
+
+    Args:
+        text: Policy JSON
+
+    Returns:
+        PolicyAnalysis (``valid`` is False if the text is not a policy document)
+    """
+    try:
+        document = json.loads(text)
+    except ValueError:
+        return INVALID_POLICY
+    if not isinstance(document, dict):
+        return INVALID_POLICY
+
+    findings = []
+    if 'Statement' in document:
+        statements = [statement for statement in _as_list(document['Statement']) if isinstance(statement, dict)]
+        for index, statement in enumerate(statements):
+            findings.extend(_check_statement(statement, _statement_label(statement, index)))
+    elif isinstance(document.get('bindings'), list):
+        statements = [binding for binding in document['bindings'] if isinstance(binding, dict)]
+        for index, binding in enumerate(statements):
+            findings.extend(_check_binding(binding, index))
+    else:
+        return INVALID_POLICY
+    return PolicyAnalysis(True, len(statements), tuple(findings))
+
+
+class PolicyDocumentAnalyzer:
+    """
+    Bounded LRU cache of policy analyses, keyed by the digest of the policy text.
+
+    Resources that embed the same policy share one parse and one set of
+    findings. Analyses are immutable and safe to share between threads.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_POLICY_CACHE_ENTRIES):
+        """
+        Initialize the analyzer.
+
+        Args:
+            max_entries: Maximum number of cached policy analyses
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[bytes, PolicyAnalysis]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def analyze(self, text: str) -> PolicyAnalysis:
+        """
+        Get the analysis of a policy document, parsing it on first use.
+
+        Args:
+            text: Policy JSON
+
+        Returns:
+            PolicyAnalysis
+        """
+        key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return analysis
+            self.misses += 1
+
+        analysis = analyze_policy_document(text)
+
+        with self._lock:
+            self._entries[key] = analysis
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return analysis
+
+    def analyze_change(self, change: Dict[str, Any]) -> List[Tuple[str, PolicyAnalysis]]:
+        """
+        Analyze the policy documents of a resource change.
+
+        Args:
+            change: Entry of the plan's resource_changes
+
+        Returns:
+            List of (attribute path, analysis) for every valid policy document
+        """
+        after = (change.get('change') or {}).get('after')
+        if not isinstance(after, (dict, list)):
+            return []
+        analyses = []
+        for attribute, text in find_policy_documents(after):
+            analysis = self.analyze(text)
+            if analysis.valid:
+                analyses.append((attribute, analysis))
+        return analyses
+
+    def change_findings(self, change: Dict[str, Any]) -> List[Tuple[str, PolicyFinding]]:
+        """
+        Get the policy findings of a resource change.
+
+        Args:
+            change: Entry of the plan's resource_changes
+
+        Returns:
+            List of (attribute path, finding)
+        """
+        return [
+            (attribute, finding)
+            for attribute, analysis in self.analyze_change(change)
+            for finding in analysis.findings
+        ]
+
+    def signature(self, change: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+        """
+        Distinct (check, severity) pairs over all policies of a resource change.
+
+        Args:
+            change: Entry of the plan's resource_changes
+
+        Returns:
+            Sorted tuple; empty if the change has no policy findings
+        """
+        pairs = set()
+        for _, analysis in self.analyze_change(change):
+            pairs.update(analysis.signature)
+        return tuple(sorted(pairs))
+
+    def risk_factors(self, change: Dict[str, Any]) -> List[str]:
+        """
+        Risk factors from the critical and high policy findings of a resource change.
+
+        Args:
+            change: Entry of the plan's resource_changes
+
+        Returns:
+            Risk factor descriptions, one per check, in a stable order
+        """
+        checks = {check for check, severity in self.signature(change) if severity in RISK_FACTOR_SEVERITIES}
+        return [factor for check, factor in POLICY_RISK_FACTORS.items() if check in checks]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop all cached analyses."""
+        with self._lock:
+            self._entries.clear()
+
+
+_shared_analyzer: Optional[PolicyDocumentAnalyzer] = None
+_shared_analyzer_lock = threading.Lock()
+
+
+def get_policy_analyzer() -> PolicyDocumentAnalyzer:
+    """Get the process-wide policy analyzer shared by the security and risk analysis."""
+    global _shared_analyzer
+    with _shared_analyzer_lock:
+        if _shared_analyzer is None:
+            _shared_analyzer = PolicyDocumentAnalyzer()
+        return _shared_analyzer
@@ -4,6 +4,20 @@ from providers.aws_provider import AWSProvider
 from providers.azure_provider import AzureProvider
 from providers.gcp_provider import GCPProvider
 from providers.cloud_detector import CloudProviderDetector
+from utils.dependency_graph import DependencyGraph
+from utils.deployment_schedule import TERRAFORM_DEFAULT_PARALLELISM, DeploymentSchedule, schedule_deployment
+from utils.instance_groups import InstanceGroups
+from utils.plan_aggregates import UNKNOWN_PROVIDER, RiskAggregate, format_deployment_time
+from utils.policy_analyzer import PolicyDocumentAnalyzer, get_policy_analyzer
+
+
+def _member_assessment(shared: Dict[str, Any], change: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a group's assessment for another member of the group."""
+    assessment = dict(shared)
+    assessment['address'] = change.get('address', '')
+    assessment['actions'] = list(shared['actions'])
+    assessment['risk_factors'] = list(shared['risk_factors'])
+    return assessment
 
 
 class MultiCloudProviderFactory:
@@ -66,16 +80,26 @@ class MultiCloudProviderFactory:
 class MultiCloudRiskAssessment:
     """Multi-cloud aware risk assessment"""
 
-    def __init__(self, provider_factory: MultiCloudProviderFactory):
+    def __init__(self, provider_factory: MultiCloudProviderFactory, assessment_cache=None,
+                 parallelism: int = TERRAFORM_DEFAULT_PARALLELISM,
+                 policy_analyzer: Optional[PolicyDocumentAnalyzer] = None):
         self.factory = provider_factory
+        # Parsed policy documents, shared with the security analysis by default
+        self.policy_analyzer = policy_analyzer if policy_analyzer is not None else get_policy_analyzer()
+        # Optional AssessmentCache reused across plans for unchanged resources
+        self.assessment_cache = assessment_cache
+        # Concurrent operations assumed for the deployment time estimate (terraform apply -parallelism)
+        self.parallelism = parallelism
         self.base_action_multipliers = {
             'create': 1.0,
             'update': 1.5,
             'delete': 2.5
         }
 
-    def assess_multi_cloud_plan_risk(self, plan_data: Dict) -> Dict[str, Any]:
-        """Assess risk for a multi-cloud Terraform plan"""
+    def assess_multi_cloud_plan_risk(self, plan_data: Dict,
+                                     instance_groups: Optional[InstanceGroups] = None,
+                                     content_hashes: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Assess risk for a multi-cloud Terraform plan, once per instance group if groups are given"""
         # Detect providers and create instances
         provider_info = self.factory.detect_and_create_providers(plan_data)
 
@@ -84,49 +108,14 @@ class MultiCloudRiskAssessment:
             return self._empty_risk_assessment()
 
         # Assess each resource with its appropriate provider
-        risk_assessments = []
-        provider_risk_summary = {}
-
-        for change in resource_changes:
-            if not self._is_actionable_change(change):
-                continue
-
-            resource_type = change.get('type', '')
-            provider = self.factory.get_provider_for_resource(resource_type, provider_info['active_providers'])
-
-            if provider:
-                risk_assessment = self._assess_resource_with_provider(change, provider)
-                risk_assessment['provider'] = provider.provider_name
-                risk_assessments.append(risk_assessment)
-
-                # Track by provider
-                provider_name = provider.provider_name
-                if provider_name not in provider_risk_summary:
-                    provider_risk_summary[provider_name] = {
-                        'total_resources': 0,
-                        'high_risk_count': 0,
-                        'medium_risk_count': 0,
-                        'low_risk_count': 0,
-                        'total_risk_score': 0.0
-                    }
-
-                provider_risk_summary[provider_name]['total_resources'] += 1
-                provider_risk_summary[provider_name]['total_risk_score'] += risk_assessment['score']
-
-                if risk_assessment['level'] == 'High':
-                    provider_risk_summary[provider_name]['high_risk_count'] += 1
-                elif risk_assessment['level'] == 'Medium':
-                    provider_risk_summary[provider_name]['medium_risk_count'] += 1
-                else:
-                    provider_risk_summary[provider_name]['low_risk_count'] += 1
-            else:
-                # Fallback for unknown providers
-                risk_assessment = self._assess_unknown_resource(change)
-                risk_assessment['provider'] = 'unknown'
-                risk_assessments.append(risk_assessment)
+        risk_assessments = self.assess_resources(resource_changes, provider_info, instance_groups, content_hashes)
 
-        # Calculate overall risk
-        overall_risk = self._calculate_overall_risk(risk_assessments, provider_info)
+        # Aggregate overall and per-provider totals; the deployment time comes
+        # from a simulated apply over the dependency graph
+        risk_aggregate = RiskAggregate.from_assessments(risk_assessments)
+        schedule = self.schedule_deployment(plan_data, risk_assessments, provider_info)
+        overall_risk = self.finalize_overall_risk(risk_aggregate, provider_info, schedule.makespan_seconds)
+        provider_risk_summary = risk_aggregate.provider_risk_summary()
 
         # Generate multi-cloud specific recommendations
         recommendations = self._generate_multi_cloud_recommendations(
@@ -139,14 +128,144 @@ class MultiCloudRiskAssessment:
             'provider_risk_summary': provider_risk_summary,
             'resource_assessments': risk_assessments,
             'recommendations': recommendations,
+            'deployment_schedule': schedule.to_dict(),
             'is_multi_cloud': provider_info['is_multi_cloud'],
             'primary_provider': provider_info['primary_provider']
         }
 
-    def _is_actionable_change(self, change: Dict[str, Any]) -> bool:
-        """Check if change has actionable operations"""
+    def schedule_deployment(self, plan_data: Dict, risk_assessments: List[Dict[str, Any]],
+                            provider_info: Dict, graph: Optional[DependencyGraph] = None) -> DeploymentSchedule:
+        """
+        Simulate applying the assessed resource changes.
+
+        Args:
+            plan_data: Parsed plan JSON (its configuration provides the dependencies)
+            risk_assessments: Per-resource assessments of the plan
+            provider_info: Result of detect_and_create_providers() for the plan
+            graph: Dependency graph of the plan, if already built
+
+        Returns:
+            DeploymentSchedule with the estimated duration and critical path
+        """
+        if graph is None:
+            graph = DependencyGraph.from_plan(plan_data)
+        return schedule_deployment(
+            risk_assessments, graph,
+            parallelism=self.parallelism,
+            provider_multipliers=self._get_provider_multipliers(provider_info)
+        )
+
+    def assess_resources(self, resource_changes: List[Dict[str, Any]], provider_info: Dict,
+                         instance_groups: Optional[InstanceGroups] = None,
+                         content_hashes: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """
+        Assess each actionable resource change with its provider.
+
+        Works on any shard of the plan's resource_changes as long as
+        provider_info was detected from the whole plan.
+
+        Args:
+            resource_changes: Raw resource changes (all or a shard)
+            provider_info: Result of detect_and_create_providers() for the plan
+            instance_groups: Optional instance groups of the plan; each group
+                is assessed once and its members share the assessment
+            content_hashes: Structural hashes of the resources by address
+                (PlanIndex.root_hashes()). The assessment cache is only used
+                for resources with a known hash: hashing a resource is more
+                expensive than scoring it.
+
+        Returns:
+            Per-resource assessments tagged with their provider
+        """
+        cache = self.assessment_cache if content_hashes is not None else None
+        provider_context = tuple(sorted(provider_info['active_providers'])) if cache is not None else ()
+        if not isinstance(instance_groups, InstanceGroups):
+            instance_groups = None
+        group_assessments: Dict[int, Dict[str, Any]] = {}
+
+        risk_assessments = []
+        for change in resource_changes:
+            if not self.is_actionable_change(change):
+                continue
+
+            group = instance_groups.group_of(change.get('address', '')) if instance_groups is not None else None
+            shared = group_assessments.get(id(group)) if group is not None else None
+            if shared is not None:
+                risk_assessments.append(_member_assessment(shared, change))
+                continue
+
+            content_hash = content_hashes.get(change.get('address', '')) if cache is not None else None
+            if content_hash is not None:
+                risk_assessment = cache.get(content_hash, provider_context)
+                if risk_assessment is None:
+                    risk_assessment = self._assess_resource(change, provider_info)
+                    cache.put(content_hash, provider_context, risk_assessment)
+            else:
+                risk_assessment = self._assess_resource(change, provider_info)
+            if group is not None and group.count > 1:
+                group_assessments[id(group)] = risk_assessment
+            risk_assessments.append(risk_assessment)
+
+        return risk_assessments
+
+    def _assess_resource(self, change: Dict[str, Any], provider_info: Dict) -> Dict[str, Any]:
+        """Assess one actionable change with its provider (or as unknown)"""
+        resource_type = change.get('type', '')
+        provider = self.factory.get_provider_for_resource(resource_type, provider_info['active_providers'])
+
+        if provider:
+            risk_assessment = self._assess_resource_with_provider(change, provider)
+            risk_assessment['provider'] = provider.provider_name
+        else:
+            # Fallback for unknown providers
+            risk_assessment = self._assess_unknown_resource(change)
+            risk_assessment['provider'] = UNKNOWN_PROVIDER
+        return risk_assessment
+
+    def aggregate_shard(self, resource_changes: List[Dict[str, Any]], provider_info: Dict) -> RiskAggregate:
+        """
+        Assess a shard of resource changes into a mergeable risk aggregate.
+
+        Args:
+            resource_changes: Shard of the plan's resource_changes
+            provider_info: Result of detect_and_create_providers() for the plan
+
+        Returns:
+            RiskAggregate that can be merged with the other shards
+        """
+        return RiskAggregate.from_assessments(self.assess_resources(resource_changes, provider_info))
+
+    def finalize_overall_risk(self, risk_aggregate: RiskAggregate, provider_info: Dict,
+                              deployment_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Compute the overall plan risk from a (merged) risk aggregate.
+
+        Args:
+            risk_aggregate: Aggregate covering all assessed resources
+            provider_info: Result of detect_and_create_providers() for the plan
+            deployment_seconds: Simulated deployment time of the plan; when
+                omitted it is estimated from the aggregate alone
+
+        Returns:
+            Overall risk dictionary
+        """
+        return risk_aggregate.overall_risk(
+            provider_info['is_multi_cloud'],
+            self._get_provider_multipliers(provider_info),
+            deployment_seconds
+        )
+
+    def _get_provider_multipliers(self, provider_info: Dict) -> Dict[str, float]:
+        """Deployment time multipliers of the active providers"""
+        return {
+            provider_name: provider_instance.get_deployment_time_multiplier()
+            for provider_name, provider_instance in provider_info['active_providers'].items()
+        }
+
+    def is_actionable_change(self, change: Dict[str, Any]) -> bool:
+        """Check if a change has actionable operations (anything but no-op); only these are assessed"""
         actions = change.get('change', {}).get('actions', [])
-        return actions and actions != ['no-op']
+        return bool(actions) and actions != ['no-op']
 
     def _assess_resource_with_provider(self, change: Dict[str, Any], provider: BaseCloudProvider) -> Dict[str, Any]:
         """Assess resource risk using appropriate provider"""
@@ -240,6 +359,9 @@ class MultiCloudRiskAssessment:
         if self._has_sensitive_changes(change):
             factors.append("Sensitive data involved")
 
+        # Critical findings in embedded policy documents
+        factors.extend(self.policy_analyzer.risk_factors(change))
+
         return factors
 
     def _has_sensitive_changes(self, change: Dict[str, Any]) -> bool:
@@ -255,99 +377,17 @@ class MultiCloudRiskAssessment:
 
     def _calculate_overall_risk(self, risk_assessments: List[Dict[str, Any]], provider_info: Dict) -> Dict[str, Any]:
         """Calculate overall risk for the multi-cloud plan"""
-        if not risk_assessments:
-            return {
-                'level': 'Low',
-                'score': 0,
-                'total_resources': 0,
-                'high_risk_count': 0,
-                'medium_risk_count': 0,
-                'low_risk_count': 0,
-                'estimated_time': '< 5 minutes'
-            }
-
-        # Count risk levels
-        risk_counts = {'High': 0, 'Medium': 0, 'Low': 0}
-        total_score = 0
+        return self.finalize_overall_risk(RiskAggregate.from_assessments(risk_assessments), provider_info)
 
-        for assessment in risk_assessments:
-            risk_counts[assessment['level']] += 1
-            total_score += assessment['score']
-
-        # Calculate weighted risk score
-        total_resources = len(risk_assessments)
-        max_possible_score = total_resources * 10
-        overall_score = (total_score / max_possible_score) * 100 if max_possible_score > 0 else 0
-
-        # Adjust for multi-cloud complexity
-        if provider_info['is_multi_cloud']:
-            overall_score *= 1.15  # 15% increase for multi-cloud complexity
-
-        # Adjust for high-risk resource concentration
-        high_risk_ratio = risk_counts['High'] / total_resources
-        if high_risk_ratio > 0.3:
-            overall_score *= 1.2
-
-        overall_score = min(100, overall_score)
-
-        # Determine overall level
-        if overall_score >= 70 or risk_counts['High'] > 0:
-            overall_level = "High"
-        elif overall_score >= 40 or risk_counts['Medium'] > 2:
-            overall_level = "Medium"
-        else:
-            overall_level = "Low"
-
-        # Estimate deployment time
-        estimated_time = self._estimate_multi_cloud_deployment_time(risk_assessments, provider_info)
-
-        return {
-            'level': overall_level,
-            'score': round(overall_score),
-            'total_resources': total_resources,
-            'high_risk_count': risk_counts['High'],
-            'medium_risk_count': risk_counts['Medium'],
-            'low_risk_count': risk_counts['Low'],
-            'estimated_time': estimated_time,
-            'average_risk_score': round(total_score / total_resources, 1) if total_resources > 0 else 0
-        }
-
-    def _estimate_multi_cloud_deployment_time(self, risk_assessments: List[Dict[str, Any]], provider_info: Dict) -> str:
+    def _estimate_multi_cloud_deployment_time(self, risk_assessments: List[Dict[str, Any]], provider_info: Dict,
+                                              graph: Optional[DependencyGraph] = None) -> str:
         """Estimate deployment time for multi-cloud setup"""
-        base_time_per_resource = 30  # seconds
-
-        total_time = 0
-        provider_multipliers = {}
-
-        # Get deployment multipliers from active providers
-        for provider_name, provider_instance in provider_info['active_providers'].items():
-            provider_multipliers[provider_name] = provider_instance.get_deployment_time_multiplier()
-
-        # Calculate time per resource with provider-specific multipliers
-        for assessment in risk_assessments:
-            provider = assessment.get('provider', 'unknown')
-            risk_multiplier = {'Low': 1.0, 'Medium': 1.5, 'High': 2.0}[assessment['level']]
-            provider_multiplier = provider_multipliers.get(provider, 1.0)
-
-            resource_time = base_time_per_resource * risk_multiplier * provider_multiplier
-            total_time += resource_time
-
-        # Add multi-cloud coordination overhead
-        if provider_info['is_multi_cloud']:
-            total_time *= 1.3  # 30% overhead for multi-cloud coordination
-
-        # Convert to human-readable format
-        if total_time < 300:
-            return "< 5 minutes"
-        elif total_time < 900:
-            return "5-15 minutes"
-        elif total_time < 1800:
-            return "15-30 minutes"
-        elif total_time < 3600:
-            return "30-60 minutes"
-        else:
-            hours = total_time // 3600
-            return f"{int(hours)}+ hours"
+        schedule = schedule_deployment(
+            risk_assessments, graph,
+            parallelism=self.parallelism,
+            provider_multipliers=self._get_provider_multipliers(provider_info)
+        )
+        return format_deployment_time(schedule.makespan_seconds)
 
     def _generate_multi_cloud_recommendations(self, risk_assessments: List[Dict[str, Any]],
                                               provider_info: Dict,
@@ -412,6 +452,7 @@ class MultiCloudRiskAssessment:
             'provider_risk_summary': {},
             'resource_assessments': [],
             'recommendations': ["✅ No changes detected in this plan"],
+            'deployment_schedule': schedule_deployment([], parallelism=self.parallelism).to_dict(),
             'is_multi_cloud': False,
             'primary_provider': None
         }
\ No newline at end of file
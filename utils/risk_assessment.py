@@ -1,6 +1,8 @@
 from typing import Dict, List, Any
 from collections import defaultdict
 
+from utils.policy_analyzer import get_policy_analyzer
+
 
 class RiskAssessment:
     """Assess risk levels for Terraform plan changes"""
@@ -255,6 +257,9 @@ class RiskAssessment:
         if self._has_sensitive_changes(resource_change):
             factors.append("Sensitive data involved")
 
+        # Critical findings in embedded policy documents
+        factors.extend(get_policy_analyzer().risk_factors(resource_change))
+
         return factors
 
     def _has_sensitive_changes(self, resource_change: Dict[str, Any]) -> bool:
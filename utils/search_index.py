@@ -0,0 +1,256 @@
+"""
+Search Index
+
+Trigram index for substring search over the resource table.
+
+The index is built once per plan over the name, type, address and provider
+columns. Cell values are lowercased and interned, so repeated values (types,
+providers) are stored and indexed once; each distinct string is split into
+trigrams and added to an inverted index of sorted string-id posting lists.
+
+A query of three or more characters intersects the posting lists of its
+trigrams, smallest first, and verifies the few remaining candidates with a
+substring test. Shorter queries scan the distinct strings. The matching
+string ids are turned into per-column row flags with one vectorized lookup,
+which serves both the row filter and the match indicators.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+SEARCH_COLUMNS = ('resource_name', 'resource_type', 'resource_address', 'provider')
+
+# Short labels of the matched columns shown in the table's Match column
+MATCH_LABELS = {
+    'resource_name': 'NAME',
+    'resource_type': 'TYPE',
+    'resource_address': 'ADDR',
+    'provider': 'PROV'
+}
+
+DEFAULT_QUERY_CACHE_ENTRIES = 32
+
+_EMPTY_IDS = np.empty(0, dtype=np.int64)
+
+
+def trigrams(text: str) -> set:
+    """
+    Get the distinct trigrams of a string.
+
+    Args:
+        text: Lowercased string
+
+    Returns:
+        Set of three-character substrings
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchMatches:
+    """Per-column match flags of one query, aligned with the indexed rows"""
+
+    def __init__(self, labels: pd.Index, columns: Dict[str, np.ndarray]):
+        self.labels = labels
+        self.columns = columns
+        any_match = np.zeros(len(labels), dtype=bool)
+        for flags in columns.values():
+            any_match |= flags
+        self.any = any_match
+
+    @property
+    def count(self) -> int:
+        """Number of matching rows."""
+        return int(self.any.sum())
+
+    def _positions(self, index: pd.Index) -> np.ndarray:
+        if index.equals(self.labels):
+            return np.arange(len(index))
+        return self.labels.get_indexer(index)
+
+    def _take(self, flags: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        # Rows that are not in the index (position -1) never match
+        taken = flags[positions]
+        taken[positions < 0] = False
+        return taken
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Row mask for a dataframe whose rows are a subset of the indexed rows.
+
+        Args:
+            df: Dataframe with the index labels of the indexed dataframe
+
+        Returns:
+            Boolean array aligned with the rows of ``df``
+        """
+        return self._take(self.any, self._positions(df.index))
+
+    def indicators(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Match indicators such as ``🔍 NAME+ADDR`` for the rows of a dataframe.
+
+        Args:
+            df: Dataframe with the index labels of the indexed dataframe
+
+        Returns:
+            Object array of indicator strings ('' for rows without a match)
+        """
+        positions = self._positions(df.index)
+        names = [column for column in SEARCH_COLUMNS if column in self.columns]
+        codes = np.zeros(len(df), dtype=np.int64)
+        for bit, column in enumerate(names):
+            codes |= self._take(self.columns[column], positions).astype(np.int64) << bit
+
+        lookup = np.empty(1 << len(names), dtype=object)
+        for code in range(len(lookup)):
+            matched = [MATCH_LABELS[column] for bit, column in enumerate(names) if code >> bit & 1]
+            lookup[code] = '🔍 ' + '+'.join(matched) if matched else ''
+        return lookup[codes]
+
+
+class ResourceSearchIndex:
+    """Interned lowercase strings of the searchable columns with a trigram inverted index"""
+
+    def __init__(self, labels: Iterable, columns: Dict[str, Sequence[str]],
+                 query_cache_entries: int = DEFAULT_QUERY_CACHE_ENTRIES):
+        """
+        Build the index.
+
+        Args:
+            labels: Row labels of the indexed dataframe
+            columns: Column name -> lowercased cell strings, one per row
+            query_cache_entries: Number of recent query results to keep
+        """
+        self.labels = pd.Index(labels)
+        self.strings: List[str] = []
+        interned: Dict[str, int] = {}
+        self._column_ids: Dict[str, np.ndarray] = {}
+        for column, values in columns.items():
+            ids = np.empty(len(values), dtype=np.int64)
+            for row, value in enumerate(values):
+                string_id = interned.get(value)
+                if string_id is None:
+                    string_id = interned[value] = len(self.strings)
+                    self.strings.append(value)
+                ids[row] = string_id
+            self._column_ids[column] = ids
+
+        postings: Dict[str, List[int]] = {}
+        for string_id, value in enumerate(self.strings):
+            for trigram in trigrams(value):
+                posting = postings.get(trigram)
+                if posting is None:
+                    postings[trigram] = [string_id]
+                else:
+                    posting.append(string_id)
+        # String ids are appended in increasing order, so every posting list is sorted
+        self._postings = {trigram: np.array(ids, dtype=np.int64) for trigram, ids in postings.items()}
+
+        self.query_cache_entries = query_cache_entries
+        self._queries: 'OrderedDict[str, SearchMatches]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, columns: Sequence[str] = SEARCH_COLUMNS) -> 'ResourceSearchIndex':
+        """
+        Index the searchable columns of the resource table.
+
+        Args:
+            df: Resource table
+            columns: Columns to index (missing ones are skipped; missing values index as '')
+
+        Returns:
+            ResourceSearchIndex over the rows of ``df``
+        """
+        return cls(df.index, {
+            column: df[column].fillna('').astype(str).str.lower().tolist()
+            for column in columns if column in df.columns
+        })
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def columns(self) -> List[str]:
+        """Indexed column names."""
+        return list(self._column_ids)
+
+    def matching_strings(self, query: str) -> np.ndarray:
+        """
+        Find the distinct strings that contain a query.
+
+        Args:
+            query: Lowercased, stripped query
+
+        Returns:
+            Sorted array of string ids
+        """
+        if len(query) < 3:
+            return np.array([string_id for string_id, value in enumerate(self.strings) if query in value],
+                            dtype=np.int64)
+
+        postings = []
+        for trigram in trigrams(query):
+            posting = self._postings.get(trigram)
+            if posting is None:
+                return _EMPTY_IDS
+            postings.append(posting)
+        postings.sort(key=len)
+
+        candidates = postings[0]
+        for posting in postings[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+
+        if len(query) == 3:
+            return candidates
+        # Trigrams may occur apart from each other; confirm the substring
+        strings = self.strings
+        return np.array([string_id for string_id in candidates.tolist() if query in strings[string_id]],
+                        dtype=np.int64)
+
+    def search(self, query: str) -> SearchMatches:
+        """
+        Search all indexed columns for a case-insensitive substring.
+
+        Args:
+            query: Search query
+
+        Returns:
+            SearchMatches with the per-column flags of every indexed row
+        """
+        query = query.strip().lower()
+        with self._lock:
+            matches = self._queries.get(query)
+            if matches is not None:
+                self._queries.move_to_end(query)
+                return matches
+
+        hit = np.zeros(len(self.strings), dtype=bool)
+        hit[self.matching_strings(query)] = True
+        matches = SearchMatches(self.labels, {column: hit[ids] for column, ids in self._column_ids.items()})
+
+        with self._lock:
+            self._queries[query] = matches
+            while len(self._queries) > self.query_cache_entries:
+                self._queries.popitem(last=False)
+        return matches
+
+    def covers(self, df: pd.DataFrame) -> bool:
+        """
+        Check whether the index was built for a dataframe's rows.
+
+        Args:
+            df: Resource table
+
+        Returns:
+            True if the index has the same row labels as ``df``
+        """
+        return len(df) == len(self.labels) and df.index.equals(self.labels)
+
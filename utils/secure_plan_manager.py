@@ -8,10 +8,19 @@ plan data throughout the application lifecycle.
 
 import weakref
 import atexit
+import time
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 import json
 
+from utils.expiry_scheduler import ExpiryHandle, get_expiry_scheduler
+from utils.plan_arena import PlanArena
+
+
+# Storage modes for plan data
+STORAGE_MODE_OBJECTS = 'objects'  # Python object graph (default)
+STORAGE_MODE_ARENA = 'arena'      # Single zeroable buffer with an offset index
+
 
 @dataclass
 class PlanMetadata:
@@ -34,16 +43,37 @@ class SecurePlanManager:
     - Automatic cleanup on session end
     - Masked values in error messages and logs
     - Secure handling throughout lifecycle
+    
+    In arena storage mode the plan is kept once as JSON bytes in a single
+    buffer, so clearing it is one in-place zeroing instead of a walk over
+    every string in the plan.
     """
     
     # Class-level registry to track all instances for cleanup
     _instances = weakref.WeakSet()
     
-    def __init__(self):
-        """Initialize secure plan manager with memory-only storage."""
+    def __init__(self, retention_timeout: Optional[float] = None,
+                 storage_mode: str = STORAGE_MODE_OBJECTS):
+        """
+        Initialize secure plan manager with memory-only storage.
+        
+        Args:
+            retention_timeout: Optional idle time (seconds) after which plan data
+                is cleared automatically; None keeps it until cleared explicitly
+            storage_mode: 'objects' to keep the plan as Python objects, or
+                'arena' to keep it in a single zeroable buffer
+        """
+        if storage_mode not in (STORAGE_MODE_OBJECTS, STORAGE_MODE_ARENA):
+            raise ValueError(f"Unknown storage mode: {storage_mode}")
+        
+        self._storage_mode = storage_mode
         self._plan_data: Optional[Dict[str, Any]] = None
+        self._plan_arena: Optional[PlanArena] = None
         self._plan_metadata: Optional[PlanMetadata] = None
         self._is_sensitive = True  # Always treat plan data as sensitive
+        self._retention_timeout = retention_timeout
+        self._last_access_time = time.time()
+        self._expiry_handle: Optional[ExpiryHandle] = None
         
         # Register this instance for cleanup
         SecurePlanManager._instances.add(self)
@@ -62,14 +92,25 @@ class SecurePlanManager:
             workspace_id: Optional workspace ID for TFE plans
             run_id: Optional run ID for TFE plans
         """
+        # Replace (and wipe) any previously stored arena
+        self._wipe_arena()
+        
         # Store plan data in memory only (even empty dict is valid plan data)
-        self._plan_data = plan_data.copy() if plan_data is not None else None
+        if plan_data is not None and self._storage_mode == STORAGE_MODE_ARENA:
+            self._plan_arena = PlanArena(plan_data)
+            self._plan_data = None
+        else:
+            self._plan_data = plan_data.copy() if plan_data is not None else None
         
         # Extract and store non-sensitive metadata
         if plan_data is not None:
             self._plan_metadata = self._extract_metadata(plan_data, source, workspace_id, run_id)
         else:
             self._plan_metadata = None
+        
+        self._last_access_time = time.time()
+        if self.has_plan_data() and self._retention_timeout is not None:
+            self._schedule_expiry(self._retention_timeout)
     
     def get_plan_data(self) -> Optional[Dict[str, Any]]:
         """
@@ -78,12 +119,43 @@ class SecurePlanManager:
         Returns:
             Deep copy of plan data or None if not stored
         """
-        if self._plan_data is None:
+        if not self.has_plan_data():
             return None
         
+        self._last_access_time = time.time()
+        
+        # Arena decoding always produces a fresh, independent copy
+        if self._plan_arena is not None:
+            return self._plan_arena.to_dict()
+        
         # Return deep copy to prevent external modification
         return json.loads(json.dumps(self._plan_data))
     
+    def get_plan_section(self, key: str, default: Any = None) -> Any:
+        """
+        Retrieve a copy of one top-level plan section (e.g. 'resource_changes').
+        
+        In arena mode only that section is decoded.
+        
+        Args:
+            key: Top-level plan key
+            default: Value returned if the section is not present
+            
+        Returns:
+            Copy of the section value, or default
+        """
+        if not self.has_plan_data():
+            return default
+        
+        self._last_access_time = time.time()
+        
+        if self._plan_arena is not None:
+            return self._plan_arena.get_section(key, default)
+        
+        if key not in self._plan_data:
+            return default
+        return json.loads(json.dumps(self._plan_data[key]))
+    
     def get_plan_metadata(self) -> Optional[PlanMetadata]:
         """
         Get non-sensitive plan metadata.
@@ -100,7 +172,7 @@ class SecurePlanManager:
         Returns:
             True if plan data is available, False otherwise
         """
-        return self._plan_data is not None
+        return self._plan_data is not None or self._plan_arena is not None
     
     def get_masked_summary(self) -> Dict[str, Any]:
         """
@@ -120,7 +192,7 @@ class SecurePlanManager:
             "source": self._plan_metadata.source,
             "workspace_id": self._mask_id(self._plan_metadata.workspace_id) if self._plan_metadata.workspace_id else None,
             "run_id": self._mask_id(self._plan_metadata.run_id) if self._plan_metadata.run_id else None,
-            "data_size": f"~{len(str(self._plan_data)) // 1024}KB" if self._plan_data else "0KB"
+            "data_size": self._get_data_size()
         }
     
     def clear_plan_data(self) -> None:
@@ -130,7 +202,68 @@ class SecurePlanManager:
             self._overwrite_sensitive_data(self._plan_data)
             self._plan_data = None
         
+        # Arena plans are wiped by zeroing their buffer in place
+        self._wipe_arena()
+        
         self._plan_metadata = None
+        self._cancel_expiry()
+    
+    def _wipe_arena(self) -> None:
+        """Zero and drop the arena buffer if one is stored."""
+        if self._plan_arena is not None:
+            self._plan_arena.wipe()
+            self._plan_arena = None
+    
+    def _get_data_size(self) -> str:
+        """Approximate size of the stored plan for display."""
+        if self._plan_arena is not None:
+            return f"~{self._plan_arena.nbytes // 1024}KB"
+        if self._plan_data:
+            return f"~{len(str(self._plan_data)) // 1024}KB"
+        return "0KB"
+    
+    def set_retention_timeout(self, timeout_seconds: Optional[float]) -> None:
+        """
+        Set the idle time after which stored plan data is cleared automatically.
+        
+        Args:
+            timeout_seconds: Idle timeout in seconds, or None to disable expiry
+        """
+        self._retention_timeout = timeout_seconds
+        
+        if timeout_seconds is None:
+            self._cancel_expiry()
+        elif self.has_plan_data():
+            self._schedule_expiry(timeout_seconds - (time.time() - self._last_access_time))
+    
+    def _schedule_expiry(self, delay: float) -> None:
+        """Schedule the idle expiry check on the shared expiry scheduler."""
+        self._cancel_expiry()
+        manager_ref = weakref.ref(self)
+        
+        def expire() -> None:
+            manager = manager_ref()
+            if manager is not None:
+                manager._expire_if_idle()
+        
+        self._expiry_handle = get_expiry_scheduler().schedule(delay, expire)
+    
+    def _cancel_expiry(self) -> None:
+        """Cancel the scheduled idle expiry check."""
+        if self._expiry_handle is not None:
+            self._expiry_handle.cancel()
+            self._expiry_handle = None
+    
+    def _expire_if_idle(self) -> None:
+        """Clear plan data if it was not accessed within the retention timeout."""
+        if not self.has_plan_data() or self._retention_timeout is None:
+            return
+        
+        idle_time = time.time() - self._last_access_time
+        if idle_time >= self._retention_timeout:
+            self.clear_plan_data()
+        else:
+            self._schedule_expiry(self._retention_timeout - idle_time)
     
     def get_safe_error_context(self, error_context: str = "") -> str:
         """
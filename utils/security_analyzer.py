@@ -9,14 +9,25 @@ Provides security-focused analysis for Terraform plan changes including:
 
 from typing import Dict, List, Any, Optional, Set
 from collections import defaultdict
-import re
+
+from utils.policy_analyzer import PolicyDocumentAnalyzer, get_policy_analyzer
+from utils.security_rules import SecurityRuleSet, get_security_rules
 
 
 class SecurityAnalyzer:
     """Analyzes Terraform plans for security-related resources and risks"""
     
-    def __init__(self):
-        """Initialize the security analyzer with security patterns and frameworks"""
+    def __init__(self, policy_analyzer: Optional[PolicyDocumentAnalyzer] = None,
+                 security_rules: Optional[SecurityRuleSet] = None):
+        """
+        Initialize the security analyzer with security rules and frameworks
+        
+        Args:
+            policy_analyzer: Cache of parsed policy documents (the shared analyzer by default)
+            security_rules: Compiled security rule packs (the built-in and configured packs by default)
+        """
+        self.policy_analyzer = policy_analyzer if policy_analyzer is not None else get_policy_analyzer()
+        self.security_rules = security_rules if security_rules is not None else get_security_rules()
         
         # Security-critical resource types with their risk weights
         self.security_resource_types = {
@@ -70,35 +81,6 @@ class SecurityAnalyzer:
             'aws_acm_certificate_validation': {'weight': 7, 'category': 'certificates', 'description': 'Certificate validation'},
         }
         
-        # Security-sensitive configuration patterns
-        self.security_patterns = {
-            'open_to_world': {
-                'pattern': r'0\.0\.0\.0/0',
-                'severity': 'critical',
-                'description': 'Resource allows access from anywhere on the internet'
-            },
-            'admin_access': {
-                'pattern': r'(\*|Administrator|admin|root)',
-                'severity': 'high',
-                'description': 'Resource grants administrative or wildcard permissions'
-            },
-            'unencrypted': {
-                'pattern': r'(encrypt|encryption).*false',
-                'severity': 'high',
-                'description': 'Resource has encryption disabled'
-            },
-            'public_access': {
-                'pattern': r'(public|Public)',
-                'severity': 'medium',
-                'description': 'Resource may allow public access'
-            },
-            'sensitive_ports': {
-                'pattern': r'(22|3389|1433|3306|5432|6379|27017)',
-                'severity': 'high',
-                'description': 'Resource exposes sensitive ports (SSH, RDP, databases)'
-            }
-        }
-        
         # Compliance frameworks and their requirements
         self.compliance_frameworks = {
             'SOC2': {
@@ -168,8 +150,9 @@ class SecurityAnalyzer:
                 weight = security_info.get('weight', 5)
                 description = security_info.get('description', 'Security-related resource')
                 
-                # Calculate risk score based on action and resource type
-                risk_score = self._calculate_security_risk_score(change, weight)
+                # Calculate risk score based on action, resource type and configuration
+                security_issues = self._identify_security_issues(change)
+                risk_score = self._calculate_security_risk_score(change, weight, security_issues)
                 total_security_score += risk_score
                 
                 security_resource = {
@@ -180,7 +163,7 @@ class SecurityAnalyzer:
                     'risk_score': risk_score,
                     'weight': weight,
                     'description': description,
-                    'security_issues': self._identify_security_issues(change)
+                    'security_issues': security_issues
                 }
                 
                 security_resources.append(security_resource)
@@ -301,8 +284,9 @@ class SecurityAnalyzer:
         """Check if a resource type is security-related"""
         return resource_type in self.security_resource_types
     
-    def _calculate_security_risk_score(self, change: Dict[str, Any], base_weight: int) -> float:
-        """Calculate security risk score for a resource change"""
+    def _calculate_security_risk_score(self, change: Dict[str, Any], base_weight: int,
+                                       security_issues: Optional[List[Dict[str, str]]] = None) -> float:
+        """Calculate security risk score for a resource change (issues are identified if not given)"""
         actions = change.get('change', {}).get('actions', [])
         
         # Action multipliers for security risk
@@ -322,7 +306,8 @@ class SecurityAnalyzer:
         risk_score = min(10.0, base_score * 10 * max_multiplier)
         
         # Check for additional security issues
-        security_issues = self._identify_security_issues(change)
+        if security_issues is None:
+            security_issues = self._identify_security_issues(change)
         if security_issues:
             risk_score += len(security_issues) * 0.5  # Add 0.5 per security issue
         
@@ -330,25 +315,29 @@ class SecurityAnalyzer:
     
     def _identify_security_issues(self, change: Dict[str, Any]) -> List[Dict[str, str]]:
         """Identify specific security issues in a resource change"""
-        issues = []
-        
-        # Get the resource configuration
-        after_config = change.get('change', {}).get('after', {})
-        if not isinstance(after_config, dict):
-            return issues
-        
-        # Convert config to string for pattern matching
-        config_str = str(after_config).lower()
-        
-        # Check for security patterns
-        for pattern_name, pattern_info in self.security_patterns.items():
-            if re.search(pattern_info['pattern'], config_str, re.IGNORECASE):
-                issues.append({
-                    'type': pattern_name,
-                    'severity': pattern_info['severity'],
-                    'description': pattern_info['description']
-                })
+        # All rules for the resource type are checked in one walk of the configuration
+        issues = self.security_rules.evaluate(change)
+        issues.extend(self._identify_policy_issues(change))
+        return issues
+    
+    def _identify_policy_issues(self, change: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Identify issues in embedded policy documents, one per check with its most severe finding"""
+        severity_order = ['critical', 'high', 'medium', 'low']
+        by_check = defaultdict(list)
+        for attribute, finding in self.policy_analyzer.change_findings(change):
+            by_check[finding.check].append((attribute, finding))
         
+        issues = []
+        for check, findings in by_check.items():
+            attribute, finding = min(findings, key=lambda item: severity_order.index(item[1].severity))
+            description = f"{finding.description} ({attribute}, {finding.statement})"
+            if len(findings) > 1:
+                description += f" and {len(findings) - 1} more"
+            issues.append({
+                'type': f"policy_{check}",
+                'severity': finding.severity,
+                'description': description
+            })
         return issues
     
     def _get_security_level(self, score: float) -> str:
@@ -0,0 +1,527 @@
+"""
+Security Rules
+
+Declarative security rule packs compiled into per-resource-type dispatch
+tables.
+
+A rule has one or more conditions (all must hold) of the form
+``<path> <operator> [<value>]`` on the planned values of a resource:
+
+    ingress[*].cidr_blocks contains "0.0.0.0/0"
+    server_side_encryption_configuration missing
+    ingress[*] exposes [22, 3389]
+    policy_arn matches ":policy/AdministratorAccess$"
+
+Paths use Terraform notation with ``[*]`` for every element of a list or
+value of a map; ``$`` selects the resource itself. Operators are
+``missing``, ``present``, ``contains``, ``==``, ``!=``, ``in``, ``not in``,
+``matches``, ``<``, ``<=``, ``>``, ``>=`` and ``exposes``, which holds if
+the ``from_port``..``to_port`` range of a selected object (every port for
+protocol ``-1``) includes one of the listed ports. Values are JSON literals; bare words are strings. A path that
+selects several values matches if any of them does (``missing``, ``!=``
+and ``not in`` hold only if none of them is set or equal). Conditions of
+one rule are independent, so they are not correlated per list element.
+Negative conditions never match attributes that are only known after
+apply.
+
+Rules are indexed by resource type (glob patterns such as
+``aws_iam_*_policy_attachment`` are resolved once per type). The paths of
+all rules for a type are merged into one trie, so a resource is checked
+against every rule in a single walk of ``change.after`` that only visits
+the selected attributes. Adding rule packs adds trie branches, not passes.
+"""
+
+import fnmatch
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import yaml
+
+from config.provider_settings import get_environment_settings
+from config.security_rule_packs import DEFAULT_SECURITY_RULE_PACK
+
+logger = logging.getLogger(__name__)
+
+SEVERITIES = ('critical', 'high', 'medium', 'low')
+
+NEGATIVE_OPERATORS = frozenset({'missing', '!=', 'not in'})
+
+# Path selecting the planned values of the resource itself
+ROOT_PATH = '$'
+
+
+class SecurityRuleError(ValueError):
+    """Raised when a rule pack or rule condition is not valid"""
+
+
+class _Wildcard:
+    """Path step selecting every element of a list or value of a map"""
+
+    def __repr__(self) -> str:
+        return '[*]'
+
+
+WILDCARD = _Wildcard()
+
+_CONDITION_RE = re.compile(
+    r'^\s*(?P<path>\S+)\s+(?P<op>missing|present|contains|matches|exposes|not\s+in|in|==|!=|<=|>=|<|>)(?:\s+(?P<value>.+?))?\s*$'
+)
+_PATH_STEP_RE = re.compile(r'\.?([A-Za-z0-9_\-]+)|\[(\*)\]|\[(\d+)\]|\[("(?:[^"\\]|\\.)*")\]')
+
+
+def parse_path(path: str) -> Tuple[Any, ...]:
+    """
+    Parse an attribute path selector.
+
+    Args:
+        path: Path such as ``ingress[*].cidr_blocks`` or ``tags["kubernetes.io/role"]``,
+            or ``$`` for the resource itself
+
+    Returns:
+        Tuple of steps: map keys, list indices and WILDCARD (empty for ``$``)
+
+    Raises:
+        SecurityRuleError: If the path is not valid
+    """
+    if path == ROOT_PATH:
+        return ()
+    steps = []
+    pos = 0
+    while pos < len(path):
+        match = _PATH_STEP_RE.match(path, pos)
+        key, wildcard, index, quoted = match.groups() if match else (None,) * 4
+        # Keys are separated by dots, except the first one
+        if match is None or (key is not None and match.group(0).startswith('.') != bool(steps)):
+            raise SecurityRuleError(f"Invalid path {path!r} at position {pos}")
+        if wildcard:
+            steps.append(WILDCARD)
+        elif index is not None:
+            steps.append(int(index))
+        elif quoted is not None:
+            steps.append(json.loads(quoted))
+        else:
+            steps.append(key)
+        pos = match.end()
+    if not steps:
+        raise SecurityRuleError("Empty path")
+    return tuple(steps)
+
+
+def _parse_value(text: Optional[str]) -> Any:
+    """Parse a condition value: a JSON literal or a bare string."""
+    if text is None:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _is_set(value: Any) -> bool:
+    return value is not None and value != [] and value != {} and value != ''
+
+
+def _equal(value: Any, expected: Any) -> bool:
+    """Equality that does not treat booleans as the numbers 0 and 1."""
+    return isinstance(value, bool) == isinstance(expected, bool) and value == expected
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _exposes(value: Any, ports: List[Any]) -> bool:
+    """Whether an object's from_port..to_port range (all ports for protocol -1) includes a port."""
+    if not isinstance(value, dict):
+        return False
+    if str(value.get('protocol', value.get('ip_protocol'))) == '-1':
+        return True
+    low = value.get('from_port')
+    if not _is_number(low):
+        return False
+    high = value.get('to_port')
+    if not _is_number(high):
+        high = low
+    return any(low <= port <= high for port in ports)
+
+
+class Condition(NamedTuple):
+    """One compiled condition of a rule"""
+    text: str
+    path: Tuple[Any, ...]
+    operator: str
+    value: Any = None
+
+    def matches(self, values: List[Any]) -> bool:
+        """
+        Evaluate the condition on the values selected by its path.
+
+        Args:
+            values: Values found at the path (empty if the path does not exist)
+
+        Returns:
+            True if the condition holds
+        """
+        operator, expected = self.operator, self.value
+        if operator == 'missing':
+            return not any(_is_set(value) for value in values)
+        if operator == 'present':
+            return any(_is_set(value) for value in values)
+        if operator == '==':
+            return any(_equal(value, expected) for value in values)
+        if operator == '!=':
+            return not any(_equal(value, expected) for value in values)
+        if operator == 'in':
+            return any(_equal(value, option) for value in values for option in expected)
+        if operator == 'not in':
+            return not any(_equal(value, option) for value in values for option in expected)
+        if operator == 'contains':
+            for value in values:
+                if isinstance(value, list) and any(_equal(item, expected) for item in value):
+                    return True
+                if isinstance(value, str) and isinstance(expected, str) and expected in value:
+                    return True
+            return False
+        if operator == 'matches':
+            return any(isinstance(value, str) and expected.search(value) for value in values)
+        if operator == 'exposes':
+            return any(_exposes(value, expected) for value in values)
+        compare = {
+            '<': lambda a, b: a < b, '<=': lambda a, b: a <= b,
+            '>': lambda a, b: a > b, '>=': lambda a, b: a >= b
+        }[operator]
+        return any(_is_number(value) and compare(value, expected) for value in values)
+
+
+def parse_condition(text: str) -> Condition:
+    """
+    Compile one rule condition.
+
+    Args:
+        text: Condition such as ``ingress[*].cidr_blocks contains "0.0.0.0/0"``
+
+    Returns:
+        Condition
+
+    Raises:
+        SecurityRuleError: If the condition is not valid
+    """
+    match = _CONDITION_RE.match(text)
+    if match is None:
+        raise SecurityRuleError(f"Invalid condition {text!r}")
+    operator = ' '.join(match.group('op').split())
+    value = _parse_value(match.group('value'))
+
+    if operator in ('missing', 'present'):
+        if match.group('value') is not None:
+            raise SecurityRuleError(f"Operator {operator!r} takes no value in {text!r}")
+    elif match.group('value') is None:
+        raise SecurityRuleError(f"Operator {operator!r} needs a value in {text!r}")
+    elif operator in ('in', 'not in') and not isinstance(value, list):
+        raise SecurityRuleError(f"Operator {operator!r} needs a list in {text!r}")
+    elif operator == 'exposes' and not (isinstance(value, list) and all(_is_number(port) for port in value)):
+        raise SecurityRuleError(f"Operator {operator!r} needs a list of ports in {text!r}")
+    elif operator == 'matches':
+        try:
+            value = re.compile(str(value))
+        except re.error as e:
+            raise SecurityRuleError(f"Invalid regular expression in {text!r}: {e}") from e
+    elif operator in ('<', '<=', '>', '>=') and not _is_number(value):
+        raise SecurityRuleError(f"Operator {operator!r} needs a number in {text!r}")
+
+    return Condition(text, parse_path(match.group('path')), operator, value)
+
+
+class SecurityRule(NamedTuple):
+    """One compiled rule of a rule pack"""
+    id: str
+    resource_types: Tuple[str, ...]
+    conditions: Tuple[Condition, ...]
+    issue: str
+    severity: str
+    description: str
+    pack: str = ''
+
+    def to_issue(self) -> Dict[str, str]:
+        """Security issue reported when the rule matches."""
+        return {'type': self.issue, 'severity': self.severity, 'description': self.description, 'rule': self.id}
+
+
+def compile_rule(rule: Dict[str, Any], pack: str = '') -> SecurityRule:
+    """
+    Compile one rule of a rule pack.
+
+    Args:
+        rule: Rule with id, resource_types, when, issue, severity and description
+        pack: Name of the rule pack
+
+    Returns:
+        SecurityRule
+
+    Raises:
+        SecurityRuleError: If the rule is not valid
+    """
+    if not isinstance(rule, dict) or not rule.get('id'):
+        raise SecurityRuleError(f"Rule without id in pack {pack!r}")
+    rule_id = str(rule['id'])
+
+    resource_types = rule.get('resource_types')
+    if isinstance(resource_types, str):
+        resource_types = [resource_types]
+    if not resource_types:
+        raise SecurityRuleError(f"Rule {rule_id!r} has no resource_types")
+
+    when = rule.get('when')
+    if isinstance(when, str):
+        when = [when]
+    if not when:
+        raise SecurityRuleError(f"Rule {rule_id!r} has no conditions")
+
+    severity = str(rule.get('severity', 'medium')).lower()
+    if severity not in SEVERITIES:
+        raise SecurityRuleError(f"Rule {rule_id!r} has unknown severity {severity!r}")
+
+    return SecurityRule(
+        id=rule_id,
+        resource_types=tuple(str(resource_type) for resource_type in resource_types),
+        conditions=tuple(parse_condition(str(condition)) for condition in when),
+        issue=str(rule.get('issue', rule_id)),
+        severity=severity,
+        description=str(rule.get('description', rule_id)),
+        pack=pack
+    )
+
+
+class _PathNode:
+    """Trie node of merged rule paths"""
+
+    __slots__ = ('children', 'slots')
+
+    def __init__(self):
+        self.children: Dict[Any, '_PathNode'] = {}
+        self.slots: List[int] = []
+
+
+class _TypeTable:
+    """Rules of one resource type with their merged path trie"""
+
+    __slots__ = ('rules', 'root', 'slot_count')
+
+    def __init__(self, rules: List[SecurityRule]):
+        self.rules: List[Tuple[SecurityRule, Tuple[int, ...]]] = []
+        self.root = _PathNode()
+        slots: Dict[Tuple[Any, ...], int] = {}
+        for rule in rules:
+            rule_slots = []
+            for condition in rule.conditions:
+                slot = slots.get(condition.path)
+                if slot is None:
+                    slot = slots[condition.path] = len(slots)
+                    node = self.root
+                    for step in condition.path:
+                        node = node.children.setdefault(step, _PathNode())
+                    node.slots.append(slot)
+                rule_slots.append(slot)
+            self.rules.append((rule, tuple(rule_slots)))
+        self.slot_count = len(slots)
+
+
+def _collect(node: _PathNode, value: Any, found: List[List[Any]]) -> None:
+    """Walk a value along the trie, collecting the values at every rule path."""
+    for slot in node.slots:
+        found[slot].append(value)
+    for step, child in node.children.items():
+        if step is WILDCARD:
+            if isinstance(value, list):
+                items = value
+            elif isinstance(value, dict):
+                items = value.values()
+            else:
+                continue
+            for item in items:
+                _collect(child, item, found)
+        elif isinstance(step, int):
+            if isinstance(value, list) and step < len(value):
+                _collect(child, value[step], found)
+        elif isinstance(value, dict) and step in value:
+            _collect(child, value[step], found)
+
+
+class SecurityRuleSet:
+    """Compiled rule packs with a dispatch table keyed by resource type"""
+
+    def __init__(self, rules: Iterable[SecurityRule]):
+        """
+        Initialize the rule set.
+
+        Args:
+            rules: Compiled rules, in evaluation order
+        """
+        self.rules = list(rules)
+        self._exact: Dict[str, List[SecurityRule]] = {}
+        self._patterns: List[SecurityRule] = []
+        for rule in self.rules:
+            for resource_type in rule.resource_types:
+                if any(char in resource_type for char in '*?['):
+                    if rule not in self._patterns:
+                        self._patterns.append(rule)
+                else:
+                    self._exact.setdefault(resource_type, []).append(rule)
+        self._tables: Dict[str, _TypeTable] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_packs(cls, packs: Iterable[Dict[str, Any]]) -> 'SecurityRuleSet':
+        """
+        Compile rule packs; later packs replace or disable rules by id.
+
+        Args:
+            packs: Rule packs, each with a name and a list of rules
+
+        Returns:
+            SecurityRuleSet
+
+        Raises:
+            SecurityRuleError: If a pack or rule is not valid
+        """
+        rules: Dict[str, SecurityRule] = {}
+        for pack in packs:
+            if not isinstance(pack, dict) or not isinstance(pack.get('rules'), list):
+                raise SecurityRuleError("A rule pack must be a mapping with a list of rules")
+            name = str(pack.get('name', ''))
+            for rule in pack['rules']:
+                if isinstance(rule, dict) and rule.get('enabled') is False:
+                    rules.pop(str(rule.get('id')), None)
+                    continue
+                compiled = compile_rule(rule, name)
+                rules.pop(compiled.id, None)
+                rules[compiled.id] = compiled
+        return cls(rules.values())
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def rules_for(self, resource_type: str) -> List[SecurityRule]:
+        """
+        Get the rules that apply to a resource type.
+
+        Args:
+            resource_type: Terraform resource type
+
+        Returns:
+            Rules in evaluation order
+        """
+        return [rule for rule, _ in self._table(resource_type).rules]
+
+    def _table(self, resource_type: str) -> _TypeTable:
+        table = self._tables.get(resource_type)
+        if table is None:
+            matching = set(id(rule) for rule in self._exact.get(resource_type, []))
+            matching.update(
+                id(rule) for rule in self._patterns
+                if any(fnmatch.fnmatchcase(resource_type, pattern) for pattern in rule.resource_types)
+            )
+            table = _TypeTable([rule for rule in self.rules if id(rule) in matching])
+            with self._lock:
+                self._tables[resource_type] = table
+        return table
+
+    def evaluate(self, change: Dict[str, Any]) -> List[Dict[str, str]]:
+        """
+        Check a resource change against every rule for its type in one walk.
+
+        Args:
+            change: Entry of the plan's resource_changes
+
+        Returns:
+            Security issues of the matching rules
+        """
+        table = self._table(change.get('type', ''))
+        if not table.rules:
+            return []
+        change_data = change.get('change') or {}
+        after = change_data.get('after')
+        if not isinstance(after, dict):
+            return []
+        after_unknown = change_data.get('after_unknown')
+        if not isinstance(after_unknown, dict):
+            after_unknown = {}
+
+        found: List[List[Any]] = [[] for _ in range(table.slot_count)]
+        _collect(table.root, after, found)
+
+        issues = []
+        for rule, slots in table.rules:
+            if all(
+                not (condition.operator in NEGATIVE_OPERATORS and condition.path
+                     and after_unknown.get(condition.path[0]))
+                and condition.matches(found[slot])
+                for condition, slot in zip(rule.conditions, slots)
+            ):
+                issues.append(rule.to_issue())
+        return issues
+
+
+def load_rule_pack(path: str) -> Dict[str, Any]:
+    """
+    Load a user rule pack file.
+
+    Args:
+        path: YAML (.yml/.yaml) or JSON file
+
+    Returns:
+        Rule pack dictionary (name defaults to the file name)
+
+    Raises:
+        SecurityRuleError: If the file cannot be read or is not a rule pack
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.lower().endswith(('.yml', '.yaml')):
+                pack = yaml.safe_load(f)
+            else:
+                pack = json.load(f)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        raise SecurityRuleError(f"Cannot load rule pack {path}: {e}") from e
+    if not isinstance(pack, dict):
+        raise SecurityRuleError(f"Rule pack {path} must be a mapping")
+    pack.setdefault('name', os.path.basename(path))
+    return pack
+
+
+_shared_rule_sets: Dict[Tuple[str, ...], SecurityRuleSet] = {}
+_shared_rule_sets_lock = threading.Lock()
+
+
+def get_security_rules() -> SecurityRuleSet:
+    """
+    Get the process-wide rule set: the built-in pack plus the user packs of
+    the ``security_rule_packs`` environment setting
+    (TERRAFORM_DASHBOARD_SECURITY_RULE_PACKS).
+
+    Invalid user packs are logged and skipped. The rule set is compiled once
+    per distinct setting.
+    """
+    paths = tuple(get_environment_settings()['security_rule_packs'])
+    with _shared_rule_sets_lock:
+        rule_set = _shared_rule_sets.get(paths)
+        if rule_set is None:
+            rule_set = _shared_rule_sets[paths] = _compile_configured_packs(paths)
+        return rule_set
+
+
+def _compile_configured_packs(paths: Tuple[str, ...]) -> SecurityRuleSet:
+    packs = [DEFAULT_SECURITY_RULE_PACK]
+    for path in paths:
+        try:
+            pack = load_rule_pack(path)
+            SecurityRuleSet.from_packs([pack])
+        except SecurityRuleError as e:
+            logger.warning("Skipping security rule pack: %s", e)
+            continue
+        packs.append(pack)
+    return SecurityRuleSet.from_packs(packs)
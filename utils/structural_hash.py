@@ -0,0 +1,255 @@
+"""
+Structural Hashing
+
+Merkle-style hashes of JSON values and of plan resource changes.
+
+A container's digest is computed bottom-up from its children: scalars are
+encoded inline (type tag plus length-prefixed bytes, or a digest for long
+strings) and nested containers contribute their own digest. Two values have the same digest exactly when
+they are structurally equal (dictionary key order does not matter), so equal
+subtrees can be recognized by comparing digests instead of walking them.
+
+Resource hashes combine the digests of ``change.before`` and ``change.after``
+with the rest of the resource change entry, so callers can tell whether a
+resource changed at all and, if so, which side did.
+
+``hash_tree`` keeps the digest of every subtree, which lets a diff of two
+values skip identical branches with a single comparison.
+
+``hash_shape`` hashes only the structure of a value (keys, list lengths and
+scalar types), so instances that differ only in their values share a digest.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Union
+
+
+DIGEST_SIZE = 16
+
+# Strings longer than this (in bytes) are encoded by their own digest
+LARGE_STRING_BYTES = 256
+
+
+def _encode_scalar(value: Any) -> bytes:
+    """Tagged, length-prefixed encoding of a JSON scalar."""
+    if value is None:
+        return b'n'
+    if value is True:
+        return b't'
+    if value is False:
+        return b'f'
+    if isinstance(value, int):
+        data = str(value).encode('ascii')
+        tag = b'i'
+    elif isinstance(value, float):
+        data = repr(value).encode('ascii')
+        tag = b'r'
+    elif isinstance(value, str):
+        data = value.encode('utf-8')
+        tag = b's'
+        if len(data) > LARGE_STRING_BYTES:
+            # Policies, user_data and the like are represented by their digest
+            data = hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+            tag = b'h'
+    else:
+        data = json.dumps(value, default=str).encode('utf-8')
+        tag = b'o'
+    return tag + len(data).to_bytes(8, 'little') + data
+
+
+def _encode_key(key: str) -> bytes:
+    """Length-prefixed encoding of a dictionary key."""
+    data = str(key).encode('utf-8')
+    return len(data).to_bytes(8, 'little') + data
+
+
+def hash_value(value: Any) -> bytes:
+    """
+    Compute the Merkle digest of a JSON value.
+
+    Args:
+        value: Parsed JSON value (dict, list or scalar)
+
+    Returns:
+        Digest bytes; equal for structurally equal values
+    """
+    if isinstance(value, dict):
+        digest = hashlib.blake2b(b'd', digest_size=DIGEST_SIZE)
+        for key in sorted(value, key=str):
+            digest.update(_encode_key(key))
+            digest.update(_hash_child(value[key]))
+        return digest.digest()
+
+    if isinstance(value, (list, tuple)):
+        digest = hashlib.blake2b(b'l', digest_size=DIGEST_SIZE)
+        digest.update(len(value).to_bytes(8, 'little'))
+        for item in value:
+            digest.update(_hash_child(item))
+        return digest.digest()
+
+    return hashlib.blake2b(b'v' + _encode_scalar(value), digest_size=DIGEST_SIZE).digest()
+
+
+def _hash_child(value: Any) -> bytes:
+    """Digest of a nested container, or the inline encoding of a scalar."""
+    if isinstance(value, (dict, list, tuple)):
+        return b'#' + hash_value(value)
+    return _encode_scalar(value)
+
+
+class HashNode:
+    """
+    A JSON value together with the structural digests of all its subtrees.
+
+    ``token`` is what the node contributes to its parent's digest: the tagged
+    encoding of a scalar, or ``b'#'`` plus the digest of a container. Two
+    nodes hold structurally equal values exactly when their tokens are equal.
+    """
+
+    __slots__ = ('value', 'token', 'children')
+
+    def __init__(self, value: Any, token: bytes,
+                 children: Optional[Union[Dict[str, 'HashNode'], List['HashNode']]] = None):
+        self.value = value
+        self.token = token
+        self.children = children
+
+    @property
+    def digest(self) -> bytes:
+        """Digest of the value, equal to hash_value(value)."""
+        if self.children is None:
+            return hash_value(self.value)
+        return self.token[1:]
+
+
+def hash_tree(value: Any) -> HashNode:
+    """
+    Hash a JSON value bottom-up, keeping the digest of every subtree.
+
+    Args:
+        value: Parsed JSON value (dict, list or scalar)
+
+    Returns:
+        HashNode for the value
+    """
+    if isinstance(value, dict):
+        children = {key: hash_tree(value[key]) for key in value}
+        digest = hashlib.blake2b(b'd', digest_size=DIGEST_SIZE)
+        for key in sorted(children, key=str):
+            digest.update(_encode_key(key))
+            digest.update(children[key].token)
+        return HashNode(value, b'#' + digest.digest(), children)
+
+    if isinstance(value, (list, tuple)):
+        items = [hash_tree(item) for item in value]
+        digest = hashlib.blake2b(b'l', digest_size=DIGEST_SIZE)
+        digest.update(len(items).to_bytes(8, 'little'))
+        for item in items:
+            digest.update(item.token)
+        return HashNode(value, b'#' + digest.digest(), items)
+
+    return HashNode(value, _encode_scalar(value))
+
+
+def _scalar_type_tag(value: Any) -> bytes:
+    """Type tag of a JSON scalar, without its value."""
+    if value is None:
+        return b'n'
+    if isinstance(value, bool):
+        return b'b'
+    if isinstance(value, int):
+        return b'i'
+    if isinstance(value, float):
+        return b'r'
+    if isinstance(value, str):
+        return b's'
+    return b'o'
+
+
+def hash_shape(value: Any, kept_scalars: FrozenSet[str] = frozenset()) -> bytes:
+    """
+    Compute the digest of a JSON value's shape.
+
+    Args:
+        value: Parsed JSON value (dict, list or scalar)
+        kept_scalars: String values that are part of the shape (e.g. the
+            ``(sensitive)`` placeholder) rather than ignored
+
+    Returns:
+        Digest bytes; equal for values with the same keys, list lengths and
+        scalar types
+    """
+    if isinstance(value, dict):
+        digest = hashlib.blake2b(b'd', digest_size=DIGEST_SIZE)
+        for key in sorted(value, key=str):
+            digest.update(_encode_key(key))
+            digest.update(_shape_token(value[key], kept_scalars))
+        return digest.digest()
+
+    if isinstance(value, (list, tuple)):
+        digest = hashlib.blake2b(b'l', digest_size=DIGEST_SIZE)
+        digest.update(len(value).to_bytes(8, 'little'))
+        for item in value:
+            digest.update(_shape_token(item, kept_scalars))
+        return digest.digest()
+
+    return hashlib.blake2b(b'v' + _shape_token(value, kept_scalars), digest_size=DIGEST_SIZE).digest()
+
+
+def _shape_token(value: Any, kept_scalars: FrozenSet[str]) -> bytes:
+    """Shape digest of a nested container, or the type tag of a scalar."""
+    if isinstance(value, (dict, list, tuple)):
+        return b'#' + hash_shape(value, kept_scalars)
+    if isinstance(value, str) and value in kept_scalars:
+        return _encode_scalar(value)
+    return _scalar_type_tag(value)
+
+
+class ResourceHashes(NamedTuple):
+    """Structural hashes of one resource change entry (hex digests)"""
+    root: str
+    before: str
+    after: str
+    meta: str
+
+
+def resource_hashes(change: Dict[str, Any]) -> ResourceHashes:
+    """
+    Hash a raw resource change entry.
+
+    ``before`` and ``after`` cover the corresponding sides of the change;
+    ``meta`` covers everything else (address, type, provider, actions,
+    unknown and sensitive markers); ``root`` combines all three.
+
+    Args:
+        change: Entry of the plan's resource_changes
+
+    Returns:
+        ResourceHashes for the entry
+    """
+    change_data = change.get('change') or {}
+    before = hash_value(change_data.get('before'))
+    after = hash_value(change_data.get('after'))
+
+    meta_fields = {key: value for key, value in change.items() if key != 'change'}
+    meta_fields['change'] = {
+        key: value for key, value in change_data.items() if key not in ('before', 'after')
+    } if isinstance(change_data, dict) else change_data
+    meta = hash_value(meta_fields)
+
+    root = hashlib.blake2b(b'R' + meta + before + after, digest_size=DIGEST_SIZE).digest()
+    return ResourceHashes(root=root.hex(), before=before.hex(), after=after.hex(), meta=meta.hex())
+
+
+def resource_hash(change: Dict[str, Any]) -> str:
+    """
+    Hash a raw resource change entry into a single hex digest.
+
+    Args:
+        change: Entry of the plan's resource_changes
+
+    Returns:
+        Root digest of resource_hashes()
+    """
+    return resource_hashes(change).root
@@ -0,0 +1,135 @@
+"""
+Table Styles
+
+Vectorized risk coloring for dashboard tables.
+
+A row-wise ``Styler.apply(func, axis=1)`` calls a Python function for every
+row and builds a list of CSS strings per row. Here the CSS of a page is
+computed per column with one vectorized lookup of the values' colors, is
+restricted to the visible page (so the cost is bounded by the page size) and
+is cached per page, so reruns that show the same page skip the work.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Hashable, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.io.formats.style import Styler
+
+
+# Background colors of risk levels (light red, orange, yellow, green)
+RISK_LEVEL_BACKGROUNDS = {
+    'Critical': '#ffebee',
+    'High': '#fff3e0',
+    'Medium': '#fffde7',
+    'Low': '#e8f5e8'
+}
+
+DEFAULT_CACHED_PAGES = 32
+
+
+def risk_levels_from_scores(scores: pd.Series) -> np.ndarray:
+    """
+    Map 0-10 risk scores to risk levels.
+
+    Args:
+        scores: Risk scores
+
+    Returns:
+        Array of 'Critical' (>= 8), 'High' (>= 6), 'Medium' (>= 4) or 'Low'
+    """
+    values = scores.to_numpy(dtype=float)
+    return np.select([values >= 8, values >= 6, values >= 4], ['Critical', 'High', 'Medium'], 'Low').astype(object)
+
+
+def background_css(values: pd.Series, colors: Mapping[str, str] = RISK_LEVEL_BACKGROUNDS) -> np.ndarray:
+    """
+    Get the background CSS of each value.
+
+    Args:
+        values: Column values
+        colors: Value -> CSS color
+
+    Returns:
+        Object array of ``background-color`` declarations ('' for values without a color)
+    """
+    css = {value: f"background-color: {color}" for value, color in colors.items()}
+    return values.map(css).fillna('').to_numpy(dtype=object)
+
+
+def page_styles(page: pd.DataFrame, by: str, columns: Optional[Sequence[str]] = None,
+                colors: Mapping[str, str] = RISK_LEVEL_BACKGROUNDS) -> pd.DataFrame:
+    """
+    Compute the CSS of a page, coloring rows by the value of one column.
+
+    Args:
+        page: Rows of the visible page
+        by: Column whose value selects the color
+        columns: Columns to color (all columns by default)
+        colors: Value -> CSS color
+
+    Returns:
+        Dataframe of CSS strings with the page's index and the colored columns
+    """
+    styled_columns = list(page.columns) if columns is None else [column for column in columns if column in page.columns]
+    css = background_css(page[by], colors)
+    return pd.DataFrame(np.repeat(css[:, np.newaxis], len(styled_columns), axis=1),
+                        index=page.index, columns=styled_columns)
+
+
+def style_page(page: pd.DataFrame, styles: pd.DataFrame) -> Styler:
+    """
+    Attach precomputed CSS to a page.
+
+    Args:
+        page: Rows of the visible page
+        styles: CSS frame from page_styles
+
+    Returns:
+        Styler for st.dataframe
+    """
+    return page.style.apply(lambda _: styles, axis=None, subset=list(styles.columns))
+
+
+class PageStyleCache:
+    """LRU cache of the CSS frames of recently shown pages"""
+
+    def __init__(self, max_pages: int = DEFAULT_CACHED_PAGES):
+        self.max_pages = max_pages
+        self._pages: 'OrderedDict[Hashable, pd.DataFrame]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, page: pd.DataFrame,
+            build: Callable[[pd.DataFrame], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Get the CSS frame of a page, building it on a miss.
+
+        Args:
+            key: Identity of the page (e.g. start row, sort column and direction)
+            page: Rows of the page; a cached frame is only reused for the same rows
+            build: Function computing the CSS frame of ``page``
+
+        Returns:
+            CSS frame of the page
+        """
+        styles = self._pages.get(key)
+        if styles is not None and styles.index.equals(page.index):
+            self._pages.move_to_end(key)
+            self.hits += 1
+            return styles
+
+        self.misses += 1
+        styles = self._pages[key] = build(page)
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return styles
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def clear(self) -> None:
+        """Drop all cached pages."""
+        self._pages.clear()
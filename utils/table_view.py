@@ -0,0 +1,198 @@
+"""
+Table View
+
+Server-side pagination and sorting for the resource table.
+
+Stable sort permutations are computed once per column of the full, unfiltered
+table and cached for the plan. Sorting a filtered subset then costs one
+vectorized pass that keeps the subset's rows in permutation order, and only
+the rows of the visible page are taken out of the dataframe, so the work
+sent to the browser is bounded by the page size, not by the plan size.
+"""
+
+import math
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+PAGE_SIZES = (25, 50, 100, 250, 500)
+DEFAULT_PAGE_SIZE = 100
+
+# Columns whose natural order is not alphabetical
+SORT_ORDERS = {
+    'risk_level': ('Low', 'Medium', 'High'),
+}
+
+
+def page_count(rows: int, page_size: int) -> int:
+    """
+    Get the number of pages of a table (at least one, even when empty).
+
+    Args:
+        rows: Number of rows
+        page_size: Rows per page
+
+    Returns:
+        Number of pages
+    """
+    return max(1, math.ceil(rows / page_size))
+
+
+def _sort_positions(values: pd.Series, ascending: bool) -> np.ndarray:
+    """Stable sort permutation of a column, missing values last."""
+    order = SORT_ORDERS.get(values.name)
+    if order is not None:
+        values = pd.Series(pd.Categorical(values, categories=order, ordered=True), name=values.name)
+    ranked = values.reset_index(drop=True).sort_values(ascending=ascending, kind='stable', na_position='last')
+    return ranked.index.to_numpy(dtype=np.int64)
+
+
+class SortPermutations:
+    """Cached stable sort permutations of the columns of one table"""
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Initialize the cache.
+
+        Args:
+            df: Full table; permutations are positions into its rows
+        """
+        self.df = df
+        self.labels = df.index
+        self._permutations: Dict[Tuple[str, bool], np.ndarray] = {}
+
+    def permutation(self, column: str, ascending: bool = True) -> np.ndarray:
+        """
+        Get the stable sort permutation of a column.
+
+        Args:
+            column: Column of the table
+            ascending: Sort direction
+
+        Returns:
+            Row positions in sorted order
+        """
+        key = (column, ascending)
+        permutation = self._permutations.get(key)
+        if permutation is None:
+            permutation = self._permutations[key] = _sort_positions(self.df[column], ascending)
+        return permutation
+
+    def order(self, index: pd.Index, column: str, ascending: bool = True) -> Optional[np.ndarray]:
+        """
+        Sort the rows of a subset of the table by a column.
+
+        Args:
+            index: Row labels of the subset (e.g. a filtered table)
+            column: Column of the table
+            ascending: Sort direction
+
+        Returns:
+            Positions into ``index`` in sorted order, or None if the subset has
+            rows that are not in the table
+        """
+        if column not in self.df.columns:
+            return None
+        permutation = self.permutation(column, ascending)
+        if index.equals(self.labels):
+            return permutation
+
+        positions = self.labels.get_indexer(index)
+        if (positions < 0).any():
+            return None
+        # Subset row of every table row (-1 if filtered out), read in sorted order
+        subset_rows = np.full(len(self.labels), -1, dtype=np.int64)
+        subset_rows[positions] = np.arange(len(index))
+        ordered = subset_rows[permutation]
+        return ordered[ordered >= 0]
+
+    def covers(self, df: pd.DataFrame) -> bool:
+        """
+        Check whether the permutations were built for a dataframe's rows.
+
+        Args:
+            df: Full table
+
+        Returns:
+            True if the permutations have the same row labels as ``df``
+        """
+        return len(df) == len(self.labels) and df.index.equals(self.labels)
+
+
+def _subset_order(df: pd.DataFrame, sort_column: str, ascending: bool,
+                  permutations: Optional[SortPermutations]) -> np.ndarray:
+    order = permutations.order(df.index, sort_column, ascending) if permutations is not None else None
+    if order is None:
+        # Columns or rows the cached permutations do not know are sorted directly
+        order = _sort_positions(df[sort_column], ascending)
+    return order
+
+
+class TablePage(NamedTuple):
+    """One page of a sorted table"""
+    rows: pd.DataFrame
+    page: int
+    page_count: int
+    start: int
+    total_rows: int
+    sort_column: Optional[str] = None
+    ascending: bool = True
+
+
+def paginate(df: pd.DataFrame, page: int, page_size: int, sort_column: Optional[str] = None,
+             ascending: bool = True, permutations: Optional[SortPermutations] = None) -> TablePage:
+    """
+    Get one page of a table, optionally sorted by a column.
+
+    Args:
+        df: Table (possibly a filtered subset of the permutations' table)
+        page: 1-based page number, clamped to the available pages
+        page_size: Rows per page
+        sort_column: Column to sort by (None keeps the table order)
+        ascending: Sort direction
+        permutations: Cached permutations of the full table; the subset is
+            sorted directly if not given or if they do not cover the column
+
+    Returns:
+        TablePage with the rows of the page
+    """
+    pages = page_count(len(df), page_size)
+    page = min(max(page, 1), pages)
+    start = (page - 1) * page_size
+    stop = min(start + page_size, len(df))
+
+    if sort_column is None or sort_column not in df.columns:
+        return TablePage(df.iloc[start:stop], page, pages, start, len(df))
+
+    order = _subset_order(df, sort_column, ascending, permutations)
+    return TablePage(df.iloc[order[start:stop]], page, pages, start, len(df), sort_column, ascending)
+
+
+def page_of_row(df: pd.DataFrame, label, page_size: int, sort_column: Optional[str] = None,
+                ascending: bool = True, permutations: Optional[SortPermutations] = None) -> Optional[int]:
+    """
+    Find the page that shows a row.
+
+    Args:
+        df: Table
+        label: Row label to find
+        page_size: Rows per page
+        sort_column: Column the table is sorted by (None for table order)
+        ascending: Sort direction
+        permutations: Cached permutations of the full table
+
+    Returns:
+        1-based page number, or None if the row is not in the table
+    """
+    if label not in df.index:
+        return None
+    row = df.index.get_loc(label)
+    if not isinstance(row, (int, np.integer)):
+        return None
+
+    if sort_column is not None and sort_column in df.columns:
+        order = _subset_order(df, sort_column, ascending, permutations)
+        row = int(np.flatnonzero(order == row)[0])
+    return row // page_size + 1
@@ -4,16 +4,27 @@ TFE Error Handler
 Comprehensive error handling for TFE integration with specific handlers for
 authentication, API, and network failures. Includes retry logic with exponential
 backoff and user-friendly error messages with troubleshooting guidance.
+
+This handler is the single retry scheduler for TFE requests: HTTP sessions are
+created without transport-level retries, and every retry honors server
+rate-limit hints, a shared per-server token bucket, and a per-operation deadline.
 """
 
-import time
 import re
+import threading
 from typing import Dict, Any, Optional, Tuple, Callable
 from dataclasses import dataclass
 from enum import Enum
 import requests
 import streamlit as st
 
+from utils.tfe_rate_limiter import (
+    DEFAULT_OPERATION_DEADLINE,
+    RateLimitRegistry,
+    RetryBudget,
+    parse_retry_delay,
+)
+
 
 class TFEErrorType(Enum):
     """Types of TFE errors for categorized handling"""
@@ -50,16 +61,28 @@ class TFEErrorHandler:
     with retry logic, exponential backoff, and user-friendly error messages.
     """
     
-    def __init__(self, max_retries: int = 3, base_delay: float = 1.0):
+    def __init__(self, max_retries: int = 3, base_delay: float = 1.0,
+                 operation_deadline: float = DEFAULT_OPERATION_DEADLINE,
+                 wait: Optional[Callable[[float], bool]] = None,
+                 notify: Optional[Callable[[str], None]] = None):
         """
         Initialize TFE error handler.
         
         Args:
             max_retries: Maximum number of retry attempts
             base_delay: Base delay for exponential backoff (seconds)
+            operation_deadline: Total time budget per operation including waits (seconds)
+            wait: Interruptible wait function such as the ``threading.Event.wait``
+                of the watcher thread running the operation; it returns True
+                when the wait was interrupted, which cancels remaining retries
+            notify: Receives retry status messages (defaults to ``st.info``);
+                background threads pass a function that records them instead
         """
         self.max_retries = max_retries
         self.base_delay = base_delay
+        self.operation_deadline = operation_deadline
+        self._wait_for = wait or threading.Event().wait
+        self._notify = notify or st.info
         
         # Workspace ID pattern: ws-[alphanumeric string]
         self.workspace_id_pattern = re.compile(r'^ws-[a-zA-Z0-9]+$')
@@ -181,22 +204,42 @@ class TFEErrorHandler:
         else:
             return self._handle_unknown_error(context)
     
-    def retry_with_backoff(self, operation: Callable, context: TFEErrorContext) -> Tuple[Any, Optional[str]]:
+    def retry_with_backoff(self, operation: Callable, context: TFEErrorContext,
+                           requests_per_attempt: int = 1) -> Tuple[Any, Optional[str]]:
         """
         Execute operation with exponential backoff retry logic.
         
+        Retries honor ``Retry-After``/``X-RateLimit-Reset`` headers, draw from
+        the token bucket shared by all sessions on the same server, and stop
+        once the operation deadline would be exceeded or the wait function is
+        interrupted.
+        
         Args:
             operation: The operation to retry
             context: Error context for tracking retries
+            requests_per_attempt: HTTP requests the operation sends per attempt;
+                one bucket token is reserved for each
             
         Returns:
             Tuple of (result, error_message)
         """
         last_error = None
+        budget = RetryBudget(deadline=self.operation_deadline)
+        bucket = RateLimitRegistry.get_bucket(context.server_url) if context.server_url else None
         
         for attempt in range(self.max_retries + 1):
             try:
                 context.retry_count = attempt
+                
+                # Respect the shared per-server request rate
+                if bucket is not None:
+                    throttle = bucket.reserve(requests_per_attempt)
+                    if throttle > 0:
+                        if not budget.can_wait(throttle):
+                            return None, self._deadline_exceeded_message(context)
+                        if self._wait(throttle, budget):
+                            return None, self._cancelled_message(context)
+                
                 result = operation()
                 return result, None
                 
@@ -211,25 +254,70 @@ class TFEErrorHandler:
                 if not should_retry or attempt >= self.max_retries:
                     return None, error_message
                 
-                # Calculate delay with exponential backoff
-                delay = self.base_delay * (2 ** attempt)
+                # Prefer the delay requested by the server over our own backoff
+                server_delay = parse_retry_delay(self._get_response_headers(e))
+                if server_delay is not None:
+                    total_delay = server_delay
+                    if bucket is not None:
+                        bucket.penalize(server_delay)
+                else:
+                    # Calculate delay with exponential backoff
+                    delay = self.base_delay * (2 ** attempt)
+                    
+                    # Add jitter to prevent thundering herd
+                    import random
+                    jitter = random.uniform(0.1, 0.3) * delay
+                    total_delay = delay + jitter
                 
-                # Add jitter to prevent thundering herd
-                import random
-                jitter = random.uniform(0.1, 0.3) * delay
-                total_delay = delay + jitter
+                if not budget.can_wait(total_delay):
+                    return None, self._deadline_exceeded_message(context)
                 
                 # Show retry message to user
                 if context.error_type == TFEErrorType.API_RATE_LIMIT:
-                    st.info(f"⏳ Rate limited. Waiting {total_delay:.1f} seconds before retry {attempt + 1}/{self.max_retries}...")
+                    self._notify(f"⏳ Rate limited. Waiting {total_delay:.1f} seconds before retry {attempt + 1}/{self.max_retries}...")
                 else:
-                    st.info(f"🔄 Retrying operation in {total_delay:.1f} seconds (attempt {attempt + 1}/{self.max_retries})...")
+                    self._notify(f"🔄 Retrying operation in {total_delay:.1f} seconds (attempt {attempt + 1}/{self.max_retries})...")
                 
-                time.sleep(total_delay)
+                if self._wait(total_delay, budget):
+                    return None, self._cancelled_message(context)
         
         # All retries exhausted
         return None, f"Operation failed after {self.max_retries} retries: {str(last_error)}"
     
+    def _wait(self, delay: float, budget: RetryBudget) -> bool:
+        """
+        Wait before the next attempt and charge the wait to the budget.
+        
+        Returns:
+            True if the wait was interrupted and the operation should stop
+        """
+        budget.record_wait(delay)
+        return bool(self._wait_for(delay))
+    
+    def _get_response_headers(self, error: Exception) -> Optional[Dict[str, str]]:
+        """Get response headers from an HTTP error, if any."""
+        response = getattr(error, 'response', None)
+        if response is None:
+            return None
+        headers = getattr(response, 'headers', None)
+        return headers if hasattr(headers, 'get') else None
+    
+    def _deadline_exceeded_message(self, context: TFEErrorContext) -> str:
+        """Build the error message for an operation that ran out of time budget."""
+        reason = "rate limited by the TFE server" if context.error_type == TFEErrorType.API_RATE_LIMIT else "retries did not succeed"
+        return (
+            f"❌ **Operation Timed Out**\n\n"
+            f"The {context.operation} operation did not complete within "
+            f"{self.operation_deadline:.0f} seconds ({reason}).\n\n"
+            "**What you can do:**\n"
+            "• Try again in a few minutes\n"
+            "• Use file upload as an alternative"
+        )
+    
+    def _cancelled_message(self, context: TFEErrorContext) -> str:
+        """Build the error message for an operation whose retry wait was interrupted."""
+        return f"The {context.operation} operation was cancelled before it completed."
+    
     def _handle_authentication_error(self, context: TFEErrorContext) -> Tuple[bool, str]:
         """Handle authentication errors."""
         error_message = (
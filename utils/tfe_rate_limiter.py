@@ -0,0 +1,196 @@
+"""
+TFE Rate Limiter
+
+Shared retry scheduling primitives for TFE API access. Provides a per-server
+token bucket shared by every session in the process, parsing of Retry-After
+and TFE rate-limit headers, and a per-operation retry budget with a hard
+deadline so a single rate-limited call cannot turn into a long chain of
+blocking retries.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+
+# TFE allows 30 requests per second per user token
+DEFAULT_REQUESTS_PER_SECOND = 30.0
+DEFAULT_BURST = 30
+DEFAULT_OPERATION_DEADLINE = 60.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket for a single TFE server.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Callers reserve a token and receive the time they must wait before
+    using it, so the bucket itself never sleeps.
+    """
+
+    def __init__(self, rate: float = DEFAULT_REQUESTS_PER_SECOND, capacity: int = DEFAULT_BURST):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens held at once
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        Reserve tokens, one per HTTP request about to be sent.
+
+        Args:
+            tokens: Number of requests the caller will send
+
+        Returns:
+            Seconds the caller must wait before sending the request (0 if none)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+
+            wait = 0.0
+            if self._tokens < 0:
+                wait = -self._tokens / self.rate
+            if self._blocked_until > now:
+                wait = max(wait, self._blocked_until - now)
+            return wait
+
+    def penalize(self, seconds: float) -> None:
+        """
+        Block the bucket for a server-provided cool-down period.
+
+        Every session sharing this bucket waits until the cool-down ends.
+
+        Args:
+            seconds: Cool-down duration reported by the server
+        """
+        if seconds <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._blocked_until = max(self._blocked_until, now + seconds)
+            self._tokens = min(self._tokens, 0.0)
+
+    def _refill(self, now: float) -> None:
+        """Add tokens for the time elapsed since the last update."""
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+
+class RateLimitRegistry:
+    """Process-wide registry of token buckets keyed by TFE server."""
+
+    _buckets: Dict[str, TokenBucket] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_bucket(cls, server: str) -> TokenBucket:
+        """
+        Get the shared token bucket for a server, creating it if needed.
+
+        Args:
+            server: TFE server host or URL
+
+        Returns:
+            TokenBucket shared by all sessions talking to this server
+        """
+        key = cls._normalize_server(server)
+        with cls._lock:
+            bucket = cls._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket()
+                cls._buckets[key] = bucket
+            return bucket
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop all buckets (used when configuration changes and in tests)."""
+        with cls._lock:
+            cls._buckets.clear()
+
+    @staticmethod
+    def _normalize_server(server: str) -> str:
+        """Normalize server URL so http/https and trailing slashes share a bucket."""
+        server = server.lower().strip()
+        for prefix in ('https://', 'http://'):
+            if server.startswith(prefix):
+                server = server[len(prefix):]
+        return server.rstrip('/')
+
+
+def parse_retry_delay(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Extract the server-requested retry delay from response headers.
+
+    Honors ``Retry-After`` (seconds or HTTP date) first and falls back to the
+    TFE ``X-RateLimit-Reset`` header, which reports seconds until the limit
+    resets.
+
+    Args:
+        headers: Response headers (case-insensitive mapping)
+
+    Returns:
+        Delay in seconds, or None if the server gave no hint
+    """
+    if not headers:
+        return None
+
+    retry_after = headers.get('Retry-After')
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except (TypeError, ValueError):
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+                return max(0.0, retry_at.timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    reset = headers.get('X-RateLimit-Reset')
+    if reset:
+        try:
+            return max(0.0, float(reset))
+        except (TypeError, ValueError):
+            pass
+
+    return None
+
+
+@dataclass
+class RetryBudget:
+    """Attempt and deadline budget for a single TFE operation"""
+    deadline: float = DEFAULT_OPERATION_DEADLINE
+    started_at: float = field(default_factory=time.monotonic)
+    waited: float = 0.0
+
+    def remaining(self) -> float:
+        """Seconds left before the operation deadline."""
+        elapsed = max(time.monotonic() - self.started_at, self.waited)
+        return max(0.0, self.deadline - elapsed)
+
+    def can_wait(self, delay: float) -> bool:
+        """Check whether waiting ``delay`` seconds still fits in the budget."""
+        return delay <= self.remaining()
+
+    def record_wait(self, delay: float) -> None:
+        """
+        Account for time spent waiting.
+
+        Waits are tracked explicitly so the deadline also holds when the
+        wait function is replaced (e.g. by a watcher's stop event).
+        """
+        self.waited += delay
@@ -438,19 +438,24 @@ class ChartGenerator:
 
         for i, provider in enumerate(providers):
             provider_data = timeline_data['provider_specific_times'][provider]
-            # Estimate duration in minutes (rough approximation)
-            duration = provider_data['resource_count'] * 2  # 2 minutes per resource
+            if 'start_minutes' in provider_data:
+                # Simulated schedule: when the provider's first and last resources run
+                start = provider_data['start_minutes']
+                duration = round(provider_data['finish_minutes'] - start, 1)
+            else:
+                # Estimate duration in minutes (rough approximation)
+                start = start_time
+                duration = provider_data['resource_count'] * 2  # 2 minutes per resource
+                start_time += duration * 0.3  # 30% overlap
 
             df_data.append({
                 'Provider': provider.upper(),
-                'Start': start_time,
-                'Finish': start_time + duration,
+                'Start': start,
+                'Finish': start + duration,
                 'Duration': duration,
                 'Resources': provider_data['resource_count']
             })
 
-            start_time += duration * 0.3  # 30% overlap
-
         df = pd.DataFrame(df_data)
 
         fig = go.Figure()
@@ -459,12 +464,14 @@ class ChartGenerator:
             fig.add_trace(go.Bar(
                 y=[row['Provider']],
                 x=[row['Duration']],
+                base=[row['Start']],
                 orientation='h',
                 marker_color=self.provider_colors.get(row['Provider'].lower(), '#666666'),
                 name=row['Provider'],
                 text=f"{row['Resources']} resources",
-                textposition='middle',
+                textposition='inside',
                 hovertemplate=f"<b>{row['Provider']}</b><br>" +
+                              f"Start: {row['Start']} min<br>" +
                               f"Duration: {row['Duration']} min<br>" +
                               f"Resources: {row['Resources']}<br>" +
                               "<extra></extra>"
@@ -476,7 +483,7 @@ class ChartGenerator:
                 x=0.5,
                 font=dict(size=16, family="Arial, sans-serif")
             ),
-            xaxis_title="Duration (minutes)",
+            xaxis_title="Time since apply start (minutes)",
             yaxis_title="Cloud Provider",
             template=self.template,
             showlegend=False,
@@ -561,6 +568,71 @@ class ChartGenerator:
 
         return fig
 
+    def create_module_treemap(self, hierarchy: Dict[str, List[Any]]) -> go.Figure:
+        """
+        Create a treemap of the module hierarchy colored by high-risk share
+
+        Args:
+            hierarchy: Non-empty result of ModuleTrie.to_hierarchy()
+        """
+        fig = go.Figure(go.Treemap(
+            **self._module_hierarchy_trace_args(hierarchy),
+            root_color="#F0F0F0"
+        ))
+        fig.update_layout(
+            title=dict(
+                text="Resource Changes by Module",
+                x=0.5,
+                font=dict(size=16, family="Arial, sans-serif")
+            ),
+            template=self.template,
+            height=500,
+            margin=dict(t=50, b=10, l=10, r=10)
+        )
+        return fig
+
+    def create_module_sunburst(self, hierarchy: Dict[str, List[Any]]) -> go.Figure:
+        """
+        Create a sunburst of the module hierarchy colored by high-risk share
+
+        Args:
+            hierarchy: Non-empty result of ModuleTrie.to_hierarchy()
+        """
+        fig = go.Figure(go.Sunburst(**self._module_hierarchy_trace_args(hierarchy)))
+        fig.update_layout(
+            title=dict(
+                text="Module Hierarchy",
+                x=0.5,
+                font=dict(size=16, family="Arial, sans-serif")
+            ),
+            template=self.template,
+            height=500,
+            margin=dict(t=50, b=10, l=10, r=10)
+        )
+        return fig
+
+    def _module_hierarchy_trace_args(self, hierarchy: Dict[str, List[Any]]) -> Dict[str, Any]:
+        """Shared treemap/sunburst arguments for a module hierarchy"""
+        return dict(
+            ids=hierarchy['ids'],
+            labels=hierarchy['labels'],
+            parents=hierarchy['parents'],
+            values=hierarchy['values'],
+            branchvalues="remainder",
+            customdata=[
+                [total, share * 100]
+                for total, share in zip(hierarchy['totals'], hierarchy['high_risk_shares'])
+            ],
+            marker=dict(
+                colors=hierarchy['high_risk_shares'],
+                colorscale=[[0, self.risk_colors['Low']], [0.5, self.risk_colors['Medium']], [1, self.risk_colors['High']]],
+                cmin=0,
+                cmax=1,
+                showscale=False
+            ),
+            hovertemplate="<b>%{id}</b><br>Resources: %{customdata[0]}<br>High risk: %{customdata[1]:.0f}%<extra></extra>"
+        )
+
         def create_summary_gauge(self, risk_score: int, title: str = "Risk Score") -> go.Figure:
             """Create a gauge chart for risk score"""
             fig = go.Figure(go.Indicator(